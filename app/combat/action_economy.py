@@ -5,9 +5,12 @@ This module handles tracking and management of the D&D 5e action economy system,
 including actions, bonus actions, reactions and movement during combat.
 """
 
+import logging
 from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum, auto
 
+logger = logging.getLogger(__name__)
+
 
 class ActionType(Enum):
     """Types of actions in D&D 5e"""
@@ -52,7 +55,7 @@ class ActionEconomyManager:
         
         # Ensure combatant has a name logged for debugging
         combatant_name = combatant.get("name", "Unknown")
-        print(f"[ActionEconomyManager] Resetting action economy for {combatant_name} with base speed {base_speed}")
+        logger.debug(f"Resetting action economy for {combatant_name} with base speed {base_speed}")
         
         # Initialize action economy dict if not present
         if "action_economy" not in combatant:
@@ -211,7 +214,7 @@ class ActionEconomyManager:
             has_legendary = legendary_actions > 0
             
         if has_legendary and "action_economy" in combatant:
-            print(f"[ActionEconomyManager] Resetting legendary actions for {combatant.get('name', 'Unknown')}")
+            logger.debug(f"Resetting legendary actions for {combatant.get('name', 'Unknown')}")
             combatant["action_economy"]["legendary_actions_used"] = 0
         
         return combatant
@@ -0,0 +1,926 @@
+"""
+Local Combat Engine for D&D 5e Combat System
+
+This module resolves a whole combat without an LLM. Monster actions are
+parsed from their stat block text, a rule-based policy chooses what each
+combatant does, and the outcome is rolled and applied deterministically
+using the action economy and condition systems.
+
+The action specs produced by the policy use the same format as the
+combined (single-call) mode of CombatResolver, so both share
+resolve_action_spec() for rolling and applying results.
+"""
+
+import logging
+import random
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+from app.combat.action_economy import ActionEconomyManager, ActionType
+from app.combat.combat_state import copy_combat_state
+from app.combat.condition_resolver import ConditionResolver
+from app.combat.conditions import ConditionManager, ConditionType, DurationType
+from app.core import dice
+from app.core.dice import compile_expression, DiceError
+from app.core.dice_probability import (
+    distribution, hit_probability, save_success_probability, expected_attack_damage, expected_save_damage
+)
+
+logger = logging.getLogger(__name__)
+
+# Full ability names accepted for saving throws
+SAVE_ABILITIES = {
+    "str": "strength", "dex": "dexterity", "con": "constitution",
+    "int": "intelligence", "wis": "wisdom", "cha": "charisma",
+}
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+_DICE_EXPR_RE = re.compile(r'\d+d\d+(?:\s*[+-]\s*\d+)?')
+_TO_HIT_RE = re.compile(r'([+-]\s*\d+)\s*to hit', re.I)
+_HIT_RE = re.compile(r'Hit:(.*)', re.I | re.S)
+_PAREN_DICE_RE = re.compile(r'\(\s*(\d+d\d+(?:\s*[+-]\s*\d+)?)\s*\)')
+_FLAT_DAMAGE_RE = re.compile(r'^\s*(\d+)\s+\w+\s+damage', re.I)
+_SAVE_RE = re.compile(r'DC\s*(\d+)\s+(Strength|Dexterity|Constitution|Intelligence|Wisdom|Charisma)\s+saving throw', re.I)
+_RECHARGE_RE = re.compile(r'Recharge\s+(\d)(?:\s*[-–]\s*(\d))?', re.I)
+_USES_RE = re.compile(r'(\d+)\s*/\s*Day', re.I)
+_HEAL_RE = re.compile(r'regains?\s+(?:\d+\s*)?\(?\s*(\d+d\d+(?:\s*[+-]\s*\d+)?)\s*\)?\s+hit points', re.I)
+_MULTI_PART_RE = re.compile(r'\b(one|two|three|four|five|\d+)\s+(?:attacks?\s+)?with\s+(?:its|his|her|their)\s+([\w\s]+?)(?=,|\.|\s+and\b|$)', re.I)
+_MULTI_COUNT_RE = re.compile(r'makes\s+(one|two|three|four|five|\d+)\s+([\w\s]*?)attacks', re.I)
+_AREA_RE = re.compile(r'\b(each creature|cone|line|radius|cube|sphere|creatures? of (?:its|his|her) choice)\b', re.I)
+
+_CONDITION_WORDS = [c.name.lower() for c in ConditionType]
+
+
+# ---------------------------------------------------------------------------
+# Dice helpers
+# ---------------------------------------------------------------------------
+
+def average_roll(expression: str) -> float:
+    """Expected value of a dice expression (0 if it cannot be parsed)"""
+    try:
+        return compile_expression(str(expression)).average
+    except DiceError:
+        return 0.0
+
+
+def make_dice_roller(rng: Optional[random.Random] = None) -> Callable[[str], int]:
+    """
+    Create a dice_roller(expression) -> int function backed by rng.
+
+    Args:
+        rng: Random generator to use (a fresh one if None)
+    """
+    return dice.make_dice_roller(rng or random.Random())
+
+
+def critical_damage_expression(expression: str) -> str:
+    """Double the dice (not the modifier) of a damage expression for a critical hit"""
+    try:
+        return compile_expression(expression).doubled_dice().notation()
+    except DiceError:
+        return re.sub(r'(\d*)d(\d+)', lambda m: f"{int(m.group(1) or 1) * 2}d{m.group(2)}", expression)
+
+
+def roll_d20(dice_roller: Callable[[str], int], advantage: bool = False,
+             disadvantage: bool = False) -> Tuple[int, List[int]]:
+    """Roll a d20 honouring advantage/disadvantage; returns (kept roll, all rolls)"""
+    first = int(dice_roller("1d20"))
+    if advantage == disadvantage:
+        return first, [first]
+    second = int(dice_roller("1d20"))
+    kept = max(first, second) if advantage else min(first, second)
+    return kept, [first, second]
+
+
+# ---------------------------------------------------------------------------
+# Stat block parsing
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ParsedAction:
+    """Mechanics extracted from a stat block action"""
+    name: str
+    attack_bonus: Optional[int] = None
+    damage: List[str] = field(default_factory=list)
+    save_ability: Optional[str] = None
+    save_dc: Optional[int] = None
+    half_on_save: bool = False
+    area: bool = False
+    healing: Optional[str] = None
+    conditions: List[str] = field(default_factory=list)
+    multiattack: List[Tuple[str, int]] = field(default_factory=list)
+    recharge: Optional[Tuple[int, int]] = None
+    uses_per_day: Optional[int] = None
+
+    @property
+    def is_attack(self) -> bool:
+        return self.attack_bonus is not None and bool(self.damage)
+
+    @property
+    def is_save(self) -> bool:
+        return self.save_dc is not None and self.attack_bonus is None
+
+    @property
+    def is_healing(self) -> bool:
+        return self.healing is not None
+
+    @property
+    def is_multiattack(self) -> bool:
+        return bool(self.multiattack)
+
+    @cached_property
+    def average_damage(self) -> float:
+        return sum(average_roll(expr) for expr in self.damage)
+
+    @cached_property
+    def damage_expression(self) -> Optional[str]:
+        """All damage dice as one expression, or None if it cannot be computed exactly"""
+        try:
+            compiled = compile_expression("+".join(str(expr) for expr in self.damage))
+            distribution(compiled.doubled_dice())
+            return compiled.notation()
+        except DiceError:
+            return None
+
+
+def _count(word: str) -> int:
+    word = word.lower()
+    return int(word) if word.isdigit() else NUMBER_WORDS.get(word, 1)
+
+
+def parse_action(action: Any) -> Optional[ParsedAction]:
+    """
+    Parse an action dict (name/description, optional attack_bonus/damage) into mechanics.
+
+    Args:
+        action: Action dictionary from a combatant's "actions" list
+
+    Returns:
+        ParsedAction, or None if nothing usable was found
+    """
+    if not isinstance(action, dict):
+        return None
+    name = str(action.get("name", "")).strip()
+    desc = str(action.get("description", action.get("desc", "")) or "")
+    text = f"{name}. {desc}"
+    parsed = ParsedAction(name=name or "Action")
+
+    # Explicit fields win over text parsing
+    if action.get("attack_bonus") not in (None, ""):
+        try:
+            parsed.attack_bonus = int(str(action["attack_bonus"]).replace(" ", ""))
+        except ValueError:
+            pass
+    explicit_damage = action.get("damage")
+    if isinstance(explicit_damage, str) and _DICE_EXPR_RE.search(explicit_damage):
+        parsed.damage = [m.replace(" ", "") for m in _DICE_EXPR_RE.findall(explicit_damage)]
+
+    recharge = _RECHARGE_RE.search(text)
+    if recharge:
+        low = int(recharge.group(1))
+        parsed.recharge = (low, int(recharge.group(2) or 6))
+    uses = _USES_RE.search(text)
+    if uses:
+        parsed.uses_per_day = int(uses.group(1))
+
+    if name.lower().startswith("multiattack"):
+        parts = [(part.strip(), _count(n)) for n, part in _MULTI_PART_RE.findall(desc)]
+        if not parts:
+            match = _MULTI_COUNT_RE.search(desc)
+            if match:
+                parts = [(match.group(2).strip(), _count(match.group(1)))]
+        parsed.multiattack = parts or [("", 2)]
+        return parsed
+
+    if parsed.attack_bonus is None:
+        to_hit = _TO_HIT_RE.search(desc)
+        if to_hit:
+            parsed.attack_bonus = int(to_hit.group(1).replace(" ", ""))
+
+    save = _SAVE_RE.search(desc)
+    if save:
+        parsed.save_dc = int(save.group(1))
+        parsed.save_ability = save.group(2).lower()
+        parsed.half_on_save = "half as much" in desc.lower()
+        parsed.area = bool(_AREA_RE.search(desc))
+
+    if not parsed.damage:
+        hit = _HIT_RE.search(desc)
+        damage_text = hit.group(1) if hit else desc
+        parsed.damage = [m.replace(" ", "") for m in _PAREN_DICE_RE.findall(damage_text)]
+        if not parsed.damage and hit:
+            flat = _FLAT_DAMAGE_RE.search(damage_text)
+            if flat:
+                parsed.damage = [flat.group(1)]
+
+    heal = _HEAL_RE.search(desc)
+    if heal:
+        parsed.healing = heal.group(1).replace(" ", "")
+
+    lowered = desc.lower()
+    parsed.conditions = [c for c in _CONDITION_WORDS if re.search(rf'\b{c}\b', lowered)
+                         and c not in ("concentration", "surprised")]
+
+    if parsed.is_attack or parsed.is_save or parsed.is_healing:
+        return parsed
+    return None
+
+
+# Weapon used by combatants (usually player characters) with no parsable actions.
+# A combatant can override it with "attack_bonus" and "damage" keys.
+DEFAULT_ATTACK_BONUS = 5
+DEFAULT_DAMAGE = "1d8+3"
+
+
+def get_combatant_actions(combatant: Dict[str, Any]) -> List[ParsedAction]:
+    """
+    Return the parsed actions of a combatant, caching them on the combatant.
+
+    Args:
+        combatant: Combatant dictionary
+
+    Returns:
+        List of ParsedAction (never empty)
+    """
+    cached = combatant.get("_parsed_actions")
+    if cached is not None:
+        return cached
+    actions = [a for a in (parse_action(action) for action in combatant.get("actions", []) or []) if a]
+    if not any(a.is_attack or a.is_save or a.is_multiattack for a in actions):
+        try:
+            bonus = int(combatant.get("attack_bonus", DEFAULT_ATTACK_BONUS))
+        except (TypeError, ValueError):
+            bonus = DEFAULT_ATTACK_BONUS
+        damage = str(combatant.get("damage") or DEFAULT_DAMAGE)
+        actions.append(ParsedAction(name="Weapon Attack", attack_bonus=bonus, damage=[damage]))
+    combatant["_parsed_actions"] = actions
+    return actions
+
+
+def consume_ability(combatant: Dict[str, Any], action_name: str):
+    """
+    Record that a combatant used a limited ability.
+
+    Per-day uses are counted down in the combatant's "_uses_left" and recharge
+    abilities are marked unavailable, so RuleBasedPolicy.is_available skips
+    them until they come back.
+
+    Args:
+        combatant: Combatant dictionary
+        action_name: Name of the parsed action that was used
+    """
+    action = next((a for a in get_combatant_actions(combatant) if a.name == action_name), None)
+    if action is None:
+        return
+    if action.uses_per_day:
+        uses = combatant.setdefault("_uses_left", {})
+        uses[action_name] = uses.get(action_name, action.uses_per_day) - 1
+    if action.recharge:
+        combatant.setdefault("recharge_abilities", {})[action_name] = {
+            "available": False,
+            "recharge_text": f"Recharge {action.recharge[0]}-{action.recharge[1]}",
+        }
+
+
+# Engine bookkeeping kept on combatants during a fight
+ENGINE_CACHE_FIELDS = ("_parsed_actions", "_uses_left")
+
+
+def strip_engine_fields(combatants: List[Dict[str, Any]]):
+    """Remove the engine's bookkeeping before combatants are serialized or handed back"""
+    for combatant in combatants:
+        if isinstance(combatant, dict):
+            for field_name in ENGINE_CACHE_FIELDS:
+                combatant.pop(field_name, None)
+
+
+# ---------------------------------------------------------------------------
+# Probabilities used by the policy (exact values come from dice_probability)
+# ---------------------------------------------------------------------------
+
+def save_bonus(combatant: Dict[str, Any], ability: str) -> int:
+    """Saving throw bonus of a combatant for an ability (full or short name)"""
+    saves = combatant.get("saves") or {}
+    try:
+        return int(saves.get(ability, saves.get(ability[:3], 0)) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_monster(combatant: Dict[str, Any]) -> bool:
+    return str(combatant.get("type", "")).lower() == "monster"
+
+
+def is_down(combatant: Dict[str, Any]) -> bool:
+    """True if the combatant cannot act (0 HP, dead, unconscious or stable)"""
+    return combatant.get("hp", 0) <= 0 or str(combatant.get("status", "")).lower() in ("dead", "unconscious", "stable")
+
+
+def _attack_modifiers(attacker, target):
+    if not attacker.get("conditions") and not target.get("conditions"):
+        return False, False
+    try:
+        return ConditionResolver.check_attack_modifiers(attacker, target)
+    except (KeyError, TypeError, ValueError):
+        # Free-form condition names or non-numeric speeds
+        return False, False
+
+
+def _save_modifiers(target, ability):
+    if not target.get("conditions"):
+        return False, False, False
+    try:
+        return ConditionResolver.check_saving_throw_modifiers(target, ability)
+    except (KeyError, TypeError, ValueError):
+        return False, False, False
+
+
+# ---------------------------------------------------------------------------
+# Applying an action spec
+# ---------------------------------------------------------------------------
+
+def _roll_expression(dice_roller, expression):
+    expression = str(expression).strip()
+    if expression.lstrip("+-").isdigit():
+        return int(expression)
+    return int(dice_roller(expression))
+
+
+def _add_condition(target, condition, source, save):
+    """Add a condition using ConditionManager where the name is a known ConditionType"""
+    key = condition.strip().upper()
+    if key in ConditionType.__members__:
+        if save:
+            ConditionManager.add_condition(
+                target, ConditionType[key], source,
+                duration_type=DurationType.SAVE_ENDS,
+                save_dc=save.get("dc"), save_ability=save.get("ability"))
+        else:
+            ConditionManager.add_condition(target, ConditionType[key], source,
+                                           duration_type=DurationType.ROUNDS, duration_value=1)
+    else:
+        target.setdefault("conditions", {})[condition.strip().lower()] = {"source": source}
+
+
+def resolve_action_spec(spec: Dict[str, Any], combatants: List[Dict[str, Any]], active_idx: int,
+                        dice_roller: Callable[[str], int]) -> Dict[str, Any]:
+    """
+    Roll and apply a structured action spec deterministically.
+
+    Attack rolls are compared against target AC (natural 20 crits, natural
+    1 misses), saving throws use the target's "saves" bonuses and condition
+    modifiers, and healing is capped at max HP. HP changes are returned as
+    updates rather than applied; conditions are applied to the targets.
+
+    Spec format::
+
+        {"action": str, "targets": [names], "narrative": str,
+         "attacks": [{"target": name, "attack_bonus": int, "damage": expr or [exprs]}],
+         "save": {"ability": str, "dc": int, "damage": expr, "half_on_save": bool},
+         "healing": expr, "conditions": [names], "uses_ability": name}
+
+    Args:
+        spec: The action spec
+        combatants: List of all combatants
+        active_idx: Index of the acting combatant
+        dice_roller: Function that rolls a dice expression and returns an int
+
+    Returns:
+        Dictionary with turn results (action, narrative, dice, updates)
+    """
+    active_combatant = combatants[active_idx]
+    actor = active_combatant.get("name", "Unknown")
+    action = spec.get("action") or "Unknown action"
+    dice_results = []
+    outcome = []
+
+    # Track HP as we go so several hits on one target stack correctly
+    hp_after = {}
+    conditions_changed = []
+    save_spec = spec.get("save") if isinstance(spec.get("save"), dict) else None
+
+    def roll(expression, purpose):
+        try:
+            result = _roll_expression(dice_roller, expression)
+        except Exception as e:
+            logger.warning(f"Dice roll error for '{expression}': {e}")
+            result = 0
+        dice_results.append({"expression": str(expression), "result": result, "purpose": purpose})
+        return result
+
+    def roll_damage(expressions, purpose, critical=False):
+        if isinstance(expressions, str):
+            expressions = [expressions]
+        total = 0
+        for expression in expressions or []:
+            expression = str(expression)
+            if critical:
+                expression = critical_damage_expression(expression)
+            total += roll(expression, purpose)
+        return max(0, total)
+
+    def find(target_name):
+        return next((c for c in combatants if c.get("name") == target_name), None)
+
+    def current_hp(target):
+        return hp_after.get(target["name"], target.get("hp", 0))
+
+    def apply_conditions(target):
+        conditions = spec.get("conditions") or []
+        if isinstance(conditions, str):
+            conditions = [conditions]
+        conditions = [c for c in conditions if isinstance(c, str) and c.strip()]
+        if not conditions:
+            return
+        if not isinstance(target.get("conditions"), dict):
+            target["conditions"] = {}
+        for condition in conditions:
+            _add_condition(target, condition, actor, save_spec)
+        if target["name"] not in conditions_changed:
+            conditions_changed.append(target["name"])
+        outcome.append(f"{target['name']} is {', '.join(conditions)}.")
+
+    targets = spec.get("targets")
+    if targets is None:
+        targets = spec.get("target")
+    if isinstance(targets, str):
+        targets = [] if targets.lower() in ("", "none", "null") else [targets]
+    targets = [find(t) for t in targets or [] if isinstance(t, str)]
+    targets = [t for t in targets if t is not None]
+
+    # Attack rolls
+    attacks = spec.get("attacks") or []
+    if isinstance(attacks, dict):
+        attacks = [attacks]
+    hostile_targets = [t for t in targets if t.get("name") != actor]
+    for i, attack in enumerate(attacks):
+        if not isinstance(attack, dict) or not hostile_targets:
+            continue
+        # Attacks without an explicit target cycle through the chosen targets;
+        # an attack aimed at a target that already dropped moves to the next one standing
+        target = find(attack.get("target")) if attack.get("target") else None
+        if target is None:
+            target = hostile_targets[i % len(hostile_targets)]
+        if current_hp(target) <= 0:
+            target = next((t for t in hostile_targets if current_hp(t) > 0), None)
+        if target is None:
+            break
+        try:
+            bonus = int(str(attack.get("attack_bonus", 0)).replace("+", "") or 0)
+        except ValueError:
+            bonus = 0
+        advantage, disadvantage = _attack_modifiers(active_combatant, target)
+        natural, rolls = roll_d20(dice_roller, advantage, disadvantage)
+        total = natural + bonus
+        dice_results.append({"expression": f"1d20{bonus:+d}", "result": total, "purpose": f"Attack roll vs {target['name']}"})
+        target_ac = int(target.get("ac", 10) or 10)
+        hit = natural == 20 or (natural != 1 and total >= target_ac)
+        if not hit:
+            outcome.append(f"{actor} misses {target['name']} ({total} vs AC {target_ac}).")
+            continue
+        damage = roll_damage(attack.get("damage"), f"Damage to {target['name']}", critical=natural == 20)
+        hp_after[target["name"]] = max(0, current_hp(target) - damage)
+        crit = "critically hits" if natural == 20 else "hits"
+        outcome.append(f"{actor} {crit} {target['name']} ({total} vs AC {target_ac}) for {damage} damage.")
+        apply_conditions(target)
+
+    # Saving throw effects
+    if save_spec and targets:
+        ability = str(save_spec.get("ability", "dexterity")).lower()
+        ability = SAVE_ABILITIES.get(ability[:3], ability)
+        try:
+            dc = int(save_spec.get("dc", 10))
+        except (TypeError, ValueError):
+            dc = 10
+        half_on_save = bool(save_spec.get("half_on_save", True))
+        # Area effects roll damage once for every target
+        base_damage = roll_damage(save_spec.get("damage"), f"{action} damage") if save_spec.get("damage") else 0
+        for target in targets:
+            if target.get("name") == actor or current_hp(target) <= 0:
+                continue
+            advantage, disadvantage, auto_fail = _save_modifiers(target, ability)
+            if auto_fail:
+                saved = False
+                outcome.append(f"{target['name']} automatically fails the {ability.capitalize()} save.")
+            else:
+                natural, rolls = roll_d20(dice_roller, advantage, disadvantage)
+                bonus = save_bonus(target, ability)
+                total = natural + bonus
+                dice_results.append({"expression": f"1d20{bonus:+d}", "result": total, "purpose": f"{target['name']} {ability.capitalize()} save"})
+                saved = total >= dc
+                outcome.append(f"{target['name']} {'succeeds' if saved else 'fails'} the DC {dc} {ability.capitalize()} save ({total}).")
+            damage = base_damage
+            if saved:
+                damage = damage // 2 if half_on_save else 0
+            if damage:
+                hp_after[target["name"]] = max(0, current_hp(target) - damage)
+                outcome.append(f"{target['name']} takes {damage} damage.")
+            if not saved:
+                apply_conditions(target)
+
+    # Healing
+    healing_expr = spec.get("healing")
+    if healing_expr and targets:
+        for target in targets:
+            healed = max(0, roll(str(healing_expr), f"Healing for {target['name']}"))
+            max_hp = target.get("max_hp", target.get("hp", 0))
+            hp_after[target["name"]] = min(max_hp, current_hp(target) + healed)
+            outcome.append(f"{target['name']} regains {healed} HP.")
+
+    # Conditions from non-attack, non-save actions (e.g. buffs)
+    if not attacks and not save_spec and not healing_expr:
+        for target in targets:
+            apply_conditions(target)
+
+    updates = [{"name": name, "hp": hp} for name, hp in hp_after.items()]
+    for name in conditions_changed:
+        updates.append({"name": name, "conditions": find(name)["conditions"]})
+
+    # Consume recharge abilities
+    used = spec.get("uses_ability")
+    recharge_abilities = active_combatant.get("recharge_abilities") or {}
+    if isinstance(used, str) and isinstance(recharge_abilities.get(used), dict):
+        recharge_abilities[used]["available"] = False
+        updates.append({"name": actor, "limited_use": {used: "Expended (awaiting recharge)"}})
+
+    narrative = spec.get("narrative") or spec.get("reasoning") or f"{actor} uses {action}."
+    if outcome:
+        narrative = f"{narrative} {' '.join(outcome)}"
+
+    return {
+        "action": action,
+        "narrative": narrative,
+        "dice": dice_results,
+        "updates": updates,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Rule-based policy
+# ---------------------------------------------------------------------------
+
+class RuleBasedPolicy:
+    """
+    Chooses actions without an LLM.
+
+    - Heal when low: a combatant with healing tends to the ally with the
+      lowest HP fraction once it drops to heal_threshold or below.
+    - Highest expected damage: every usable option is scored by expected
+      damage, capped at the target's remaining HP so overkill counts for nothing.
+    - Focus fire: single-target options aim at the enemy that dies soonest
+      (lowest HP relative to the damage the option can deal).
+    """
+
+    def __init__(self, heal_threshold: float = 0.3, area_targets: int = 2):
+        """
+        Args:
+            heal_threshold: HP fraction at or below which allies get healed
+            area_targets: Number of enemies assumed caught by area effects
+        """
+        self.heal_threshold = heal_threshold
+        self.area_targets = area_targets
+
+    def is_available(self, combatant: Dict[str, Any], action: ParsedAction) -> bool:
+        """Check recharge and per-day limits for an action"""
+        recharge_abilities = combatant.get("recharge_abilities") or {}
+        info = recharge_abilities.get(action.name)
+        if isinstance(info, dict) and not info.get("available", True):
+            return False
+        uses = combatant.get("_uses_left", {}).get(action.name)
+        if uses is not None and uses <= 0:
+            return False
+        return True
+
+    def _attack_value(self, attacker, action, target):
+        advantage, disadvantage = _attack_modifiers(attacker, target)
+        target_ac = int(target.get("ac", 10) or 10)
+        if action.damage_expression:
+            return expected_attack_damage(action.attack_bonus, target_ac, action.damage_expression,
+                                          advantage, disadvantage)
+        return hit_probability(action.attack_bonus, target_ac, advantage, disadvantage) * action.average_damage
+
+    def _save_value(self, action, target):
+        ability = action.save_ability or "dexterity"
+        bonus = save_bonus(target, ability)
+        if action.damage_expression:
+            return expected_save_damage(bonus, action.save_dc, action.damage_expression, action.half_on_save)
+        p_save = save_success_probability(bonus, action.save_dc)
+        return action.average_damage * ((1 - p_save) + (0.5 * p_save if action.half_on_save else 0))
+
+    def _multiattack_parts(self, combatant, action):
+        """Resolve multiattack parts into (ParsedAction, count) pairs"""
+        attacks = [a for a in get_combatant_actions(combatant) if a.is_attack]
+        if not attacks:
+            return []
+        parts = []
+        for part_name, count in action.multiattack:
+            part_name = part_name.lower().rstrip("s")
+            match = next((a for a in attacks if part_name and part_name in a.name.lower()), None)
+            if match is None:
+                match = max(attacks, key=lambda a: a.average_damage)
+            parts.append((match, count))
+        return parts
+
+    def choose(self, combatant: Dict[str, Any], combatants: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Choose the combatant's action for this turn.
+
+        Args:
+            combatant: The acting combatant
+            combatants: List of all combatants
+
+        Returns:
+            Action spec for resolve_action_spec, or None to do nothing
+        """
+        side = is_monster(combatant)
+        enemies = [c for c in combatants if is_monster(c) != side and not is_down(c)]
+        allies = [c for c in combatants if is_monster(c) == side and str(c.get("status", "")).lower() != "dead"]
+        actions = [a for a in get_combatant_actions(combatant) if self.is_available(combatant, a)]
+
+        # Heal when low
+        healing = [a for a in actions if a.is_healing]
+        if healing:
+            wounded = [c for c in allies if c.get("max_hp", 0) > 0
+                       and c.get("hp", 0) / c["max_hp"] <= self.heal_threshold]
+            if wounded:
+                patient = min(wounded, key=lambda c: c.get("hp", 0) / c["max_hp"])
+                heal = max(healing, key=lambda a: average_roll(a.healing))
+                return {
+                    "action": heal.name,
+                    "targets": [patient["name"]],
+                    "healing": heal.healing,
+                    "uses_ability": heal.name,
+                }
+
+        if not enemies:
+            return None
+
+        best_score, best_spec = -1.0, None
+        for action in actions:
+            if action.is_multiattack:
+                parts = self._multiattack_parts(combatant, action)
+                if not parts:
+                    continue
+                per_target = {id(t): sum(self._attack_value(combatant, a, t) * n for a, n in parts) for t in enemies}
+                target = min(enemies, key=lambda t: (t.get("hp", 0) / max(per_target[id(t)], 0.01), t.get("hp", 0)))
+                score = min(per_target[id(target)], target.get("hp", 0))
+                # Spill-over attacks go to the next focus target
+                focus = [target] + sorted((e for e in enemies if e is not target), key=lambda e: e.get("hp", 0))
+                spec = {
+                    "action": action.name,
+                    "targets": [t["name"] for t in focus],
+                    "attacks": [{"target": target["name"], "attack_bonus": a.attack_bonus, "damage": a.damage}
+                                for a, n in parts for _ in range(n)],
+                }
+            elif action.is_attack:
+                values = {id(t): self._attack_value(combatant, action, t) for t in enemies}
+                target = min(enemies, key=lambda t: (t.get("hp", 0) / max(values[id(t)], 0.01), t.get("hp", 0)))
+                score = min(values[id(target)], target.get("hp", 0))
+                spec = {
+                    "action": action.name,
+                    "targets": [target["name"]],
+                    "attacks": [{"attack_bonus": action.attack_bonus, "damage": action.damage}],
+                }
+            elif action.is_save:
+                if action.area:
+                    caught = sorted(enemies, key=lambda t: t.get("hp", 0))[:self.area_targets]
+                else:
+                    caught = [min(enemies, key=lambda t: t.get("hp", 0))]
+                score = sum(min(self._save_value(action, t), t.get("hp", 0)) for t in caught)
+                if not action.damage:
+                    # Pure control effects: worth a little, so damage still wins
+                    score = 0.5 * len(caught) if action.conditions else 0.0
+                spec = {
+                    "action": action.name,
+                    "targets": [t["name"] for t in caught],
+                    "save": {"ability": action.save_ability, "dc": action.save_dc,
+                             "damage": action.damage, "half_on_save": action.half_on_save},
+                }
+            else:
+                continue
+            if action.conditions:
+                spec["conditions"] = list(action.conditions)
+            if action.recharge or action.uses_per_day:
+                spec["uses_ability"] = action.name
+            if score > best_score:
+                best_score, best_spec = score, spec
+        return best_spec
+
+
+# ---------------------------------------------------------------------------
+# Combat loop
+# ---------------------------------------------------------------------------
+
+class CombatEngine:
+    """
+    Resolves an entire combat locally.
+
+    The combat state uses the same dictionary format as CombatResolver
+    (round, combatants with name/type/hp/max_hp/ac/initiative/actions...).
+    Monsters fight everyone else; combat ends when either side has no one
+    left standing or max_rounds is reached.
+    """
+
+    def __init__(self, policy: Optional[RuleBasedPolicy] = None, rng: Optional[random.Random] = None,
+                 dice_roller: Optional[Callable[[str], int]] = None, max_rounds: int = 50,
+                 record_log: bool = True):
+        """
+        Args:
+            policy: Action policy (RuleBasedPolicy by default)
+            rng: Random generator for dice and death saves
+            dice_roller: Optional dice_roller(expression) -> int overriding rng for dice
+            max_rounds: Safety limit on combat length
+            record_log: Keep a per-turn log (disable for bulk simulation)
+        """
+        self.policy = policy or RuleBasedPolicy()
+        self.rng = rng or random.Random()
+        self.dice_roller = dice_roller or make_dice_roller(self.rng)
+        self.max_rounds = max_rounds
+        self.record_log = record_log
+
+    def run(self, combat_state: Dict[str, Any], copy_state: bool = True) -> Dict[str, Any]:
+        """
+        Resolve the combat.
+
+        Args:
+            combat_state: Combat state dictionary
+            copy_state: Work on a copy-on-write copy (False lets callers pass a throwaway copy)
+
+        Returns:
+            Dictionary with winner ("party", "monsters" or "draw"), rounds,
+            narrative, log, and the final combatants under "updates"
+        """
+        state = copy_combat_state(combat_state) if copy_state else combat_state
+        combatants = state.get("combatants", [])
+        order = sorted(range(len(combatants)), key=lambda i: -int(combatants[i].get("initiative", 0) or 0))
+        sides = [is_monster(c) for c in combatants]
+        log = []
+        rounds = 0
+        winner = self._winner(combatants, sides)
+
+        while winner is None and rounds < self.max_rounds:
+            rounds += 1
+            ActionEconomyManager.reset_legendary_actions(combatants)
+            for idx in order:
+                self._take_turn(combatants, idx, rounds, log)
+                winner = self._winner(combatants, sides)
+                if winner is not None:
+                    break
+            if any(c.get("conditions") for c in combatants):
+                self._condition_call(ConditionResolver.resolve_round_end, combatants)
+
+        strip_engine_fields(combatants)
+
+        winner = winner or "draw"
+        survivors = [c.get("name", "Unknown") for c in combatants if c.get("hp", 0) > 0]
+        return {
+            "winner": winner,
+            "rounds": rounds,
+            "narrative": f"Combat ended after {rounds} rounds. Survivors: {survivors}",
+            "log": log,
+            "updates": combatants,
+        }
+
+    @staticmethod
+    def _winner(combatants, sides):
+        """Return the winning side, or None while both sides have someone standing"""
+        monsters_up = party_up = False
+        for combatant, monster in zip(combatants, sides):
+            if not is_down(combatant):
+                if monster:
+                    monsters_up = True
+                else:
+                    party_up = True
+        if monsters_up and party_up:
+            return None
+        if party_up:
+            return "party"
+        if monsters_up:
+            return "monsters"
+        return "draw"
+
+    @staticmethod
+    def _condition_call(func, *args):
+        try:
+            return func(*args)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Condition processing skipped: {e}")
+            return None
+
+    def _take_turn(self, combatants, idx, round_num, log):
+        combatant = combatants[idx]
+        status = str(combatant.get("status", "")).lower()
+        if status == "dead":
+            return
+        if combatant.get("hp", 0) <= 0:
+            if not is_monster(combatant) and status != "stable":
+                self._death_save(combatant, round_num, idx, log)
+            return
+
+        ActionEconomyManager.initialize_action_economy(combatant)
+        self._recharge(combatant)
+
+        if combatant.get("conditions"):
+            # Condition effects set these flags but never clear them; recompute each turn
+            combatant.pop("can_take_actions", None)
+            combatant.pop("can_take_reactions", None)
+            self._condition_call(ConditionResolver.resolve_start_of_turn, combatant)
+            can_act = self._condition_call(ConditionResolver.check_can_take_action, combatant)
+            if can_act is False:
+                self._log(log, round_num, idx, combatant, "Incapacitated", [], f"{combatant.get('name')} cannot act.")
+                self._condition_call(ConditionResolver.resolve_end_of_turn, combatant)
+                return
+
+        spec = self.policy.choose(combatant, combatants)
+        if spec is None:
+            self._log(log, round_num, idx, combatant, "Dodge", [], f"{combatant.get('name')} takes the Dodge action.")
+        else:
+            ActionEconomyManager.use_action(combatant, ActionType.ACTION)
+            used = spec.get("uses_ability")
+            if used:
+                consume_ability(combatant, used)
+            result = resolve_action_spec(spec, combatants, idx, self.dice_roller)
+            self.apply_updates(combatants, result["updates"])
+            self._log(log, round_num, idx, combatant, result["action"], result["dice"], result["narrative"])
+
+        if combatant.get("conditions"):
+            self._condition_call(ConditionResolver.resolve_end_of_turn, combatant)
+
+    def _log(self, log, round_num, idx, combatant, action, dice, result):
+        if self.record_log:
+            log.append({
+                "round": round_num,
+                "turn": idx,
+                "actor": combatant.get("name", "Unknown"),
+                "action": action,
+                "dice": dice,
+                "result": result,
+            })
+
+    def _recharge(self, combatant):
+        """Roll recharge for expended abilities at the start of the turn"""
+        for action in get_combatant_actions(combatant):
+            if not action.recharge:
+                continue
+            info = combatant.setdefault("recharge_abilities", {}).setdefault(
+                action.name, {"available": True, "recharge_text": f"Recharge {action.recharge[0]}-{action.recharge[1]}"})
+            if not info.get("available", True):
+                low, high = action.recharge
+                if low <= self.rng.randint(1, 6) <= high:
+                    info["available"] = True
+
+    def _death_save(self, combatant, round_num, idx, log):
+        saves = combatant.setdefault("death_saves", {"successes": 0, "failures": 0})
+        roll = self.rng.randint(1, 20)
+        if roll == 20:
+            combatant["hp"] = 1
+            combatant["status"] = ""
+            saves.update(successes=0, failures=0)
+            result = f"{combatant.get('name')} rolls a natural 20 and regains 1 HP!"
+        else:
+            if roll == 1:
+                saves["failures"] = saves.get("failures", 0) + 2
+            elif roll >= 10:
+                saves["successes"] = saves.get("successes", 0) + 1
+            else:
+                saves["failures"] = saves.get("failures", 0) + 1
+            if saves.get("failures", 0) >= 3:
+                combatant["status"] = "Dead"
+            elif saves.get("successes", 0) >= 3:
+                combatant["status"] = "Stable"
+            result = f"Death save {roll}: {saves.get('successes', 0)} successes, {saves.get('failures', 0)} failures"
+        self._log(log, round_num, idx, combatant, "Death Save", [{"expression": "1d20", "result": roll, "purpose": "Death Save"}], result)
+
+    @staticmethod
+    def apply_updates(combatants: List[Dict[str, Any]], updates: List[Dict[str, Any]]):
+        """
+        Apply HP updates from resolve_action_spec.
+
+        Monsters at 0 HP die; other combatants fall unconscious and start
+        making death saves. Damage to an unconscious combatant is not
+        produced by resolve_action_spec (it skips downed targets).
+        """
+        by_name = {c.get("name"): c for c in combatants}
+        for update in updates:
+            combatant = by_name.get(update.get("name"))
+            if combatant is None or "hp" not in update:
+                continue
+            new_hp = int(update["hp"])
+            was_down = combatant.get("hp", 0) <= 0
+            combatant["hp"] = new_hp
+            if new_hp <= 0:
+                if is_monster(combatant):
+                    combatant["status"] = "Dead"
+                else:
+                    combatant["status"] = "Unconscious"
+                    combatant.setdefault("death_saves", {"successes": 0, "failures": 0})
+            elif was_down:
+                # Healed back up
+                combatant["status"] = ""
+                combatant["death_saves"] = {"successes": 0, "failures": 0}
@@ -0,0 +1,389 @@
+"""
+Combat state snapshots with structural sharing
+
+The resolvers work on plain combatant dicts and mutate them in place. Instead
+of deep-copying the whole state tree, a fight starts from copy_combat_state(),
+which copies only the per-fight fields (hp, conditions, death saves, action
+economy...) and shares the stat block (actions, traits...) with the caller.
+
+Per-turn history is kept as immutable CombatSnapshots. A snapshot is a tuple
+of slotted CombatantState objects; building the next snapshot reuses every
+combatant whose fields did not change, so a turn costs O(changed fields)
+rather than a copy of the full state, and undo or rewind is just picking an
+earlier snapshot.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+# Combatant fields the tracker table displays
+TRACKED_FIELDS = ("hp", "max_hp", "status", "concentration", "death_saves")
+
+# Combatant fields recorded in each snapshot
+SNAPSHOT_FIELDS = TRACKED_FIELDS + ("conditions", "limited_use", "spell_slots", "position")
+
+# Stat block fields that do not change during a fight and are shared, not copied
+STATIC_FIELDS = frozenset({
+    "actions", "traits", "reactions", "legendary_actions", "lair_actions", "abilities",
+    "spells", "skills", "senses", "languages", "description", "notes", "source", "_parsed_actions",
+})
+
+_EMPTY = MappingProxyType({})
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only mappings and tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert frozen mappings and tuples back into dicts and lists (e.g. for JSON)"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _same(frozen: Any, value: Any) -> bool:
+    """Compare a frozen value with a live one without freezing the live one"""
+    # Read-only mappings compare equal to dicts; only tuples against lists need a walk
+    if frozen is value or frozen == value:
+        return True
+    if type(frozen) is tuple:
+        return (isinstance(value, list) and len(frozen) == len(value)
+                and all(_same(a, b) for a, b in zip(frozen, value)))
+    if type(frozen) is MappingProxyType:
+        return (isinstance(value, (dict, MappingProxyType)) and len(frozen) == len(value)
+                and all(key in value and _same(item, value[key]) for key, item in frozen.items()))
+    return False
+
+
+def _copy_tree(value: Any) -> Any:
+    """Copy nested dicts and lists, sharing everything else"""
+    if isinstance(value, dict):
+        return {key: _copy_tree(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(item) for item in value]
+    return value
+
+
+def combatant_key(combatant: Mapping, index: int) -> str:
+    """Stable key of a combatant: its instance_id, else its name, else its position"""
+    return str(combatant.get("instance_id") or combatant.get("name") or f"combatant_{index}")
+
+
+def copy_combatant(combatant: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a combatant for a resolver to mutate.
+
+    Args:
+        combatant: Combatant dict
+
+    Returns:
+        New dict whose per-fight fields are copied and whose stat block
+        fields (STATIC_FIELDS) are shared with the original
+    """
+    return {key: value if key in STATIC_FIELDS else _copy_tree(value) for key, value in combatant.items()}
+
+
+def copy_combat_state(combat_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy-on-write replacement for deepcopy(combat_state).
+
+    Args:
+        combat_state: Dictionary with combatants, round, etc.
+
+    Returns:
+        Copy that can be mutated by a resolver without touching the original
+    """
+    state_copy = {key: _copy_tree(value) for key, value in combat_state.items() if key != "combatants"}
+    if "combatants" in combat_state:
+        state_copy["combatants"] = [copy_combatant(c) if isinstance(c, dict) else _copy_tree(c)
+                                    for c in combat_state["combatants"]]
+    return state_copy
+
+
+class CombatantState:
+    """Immutable per-turn state of one combatant"""
+
+    __slots__ = ("key", "name", "stat_block", "_fields")
+
+    def __init__(self, key: str, name: str, fields: Mapping[str, Any] = _EMPTY,
+                 stat_block: Mapping[str, Any] = _EMPTY):
+        """
+        Args:
+            key: Combatant key (see combatant_key)
+            name: Display name
+            fields: Frozen values of the snapshot fields that are set
+            stat_block: Read-only stat block, shared by all states of the combatant
+        """
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "stat_block", stat_block)
+        object.__setattr__(self, "_fields", fields)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"CombatantState({self.key!r}, {dict(self._fields)!r})"
+
+    @classmethod
+    def from_combatant(cls, combatant: Mapping[str, Any], index: int = 0,
+                       previous: Optional["CombatantState"] = None) -> "CombatantState":
+        """
+        Build the state of a live combatant dict.
+
+        Args:
+            combatant: Combatant dict
+            index: Position of the combatant (used for its key if it has no id or name)
+            previous: Earlier state of the same combatant to share unchanged data with
+
+        Returns:
+            previous itself if none of its fields changed, otherwise a new state
+            that shares the unchanged values and the stat block with previous
+        """
+        if previous is None:
+            fields = {field: freeze(combatant[field]) for field in SNAPSHOT_FIELDS if field in combatant}
+            stat_block = MappingProxyType({key: value for key, value in combatant.items()
+                                           if key in STATIC_FIELDS})
+            return cls(combatant_key(combatant, index), str(combatant.get("name", "")),
+                       MappingProxyType(fields), stat_block)
+
+        changes = None
+        for field in SNAPSHOT_FIELDS:
+            if field in combatant:
+                value = combatant[field]
+                if field not in previous._fields or not _same(previous._fields[field], value):
+                    if changes is None:
+                        changes = {}
+                    changes[field] = freeze(value)
+        name = str(combatant.get("name", previous.name))
+        if changes is None and name == previous.name:
+            return previous
+        return cls(previous.key, name, MappingProxyType({**previous._fields, **(changes or {})}),
+                   previous.stat_block)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Frozen value of a snapshot field"""
+        return self._fields.get(field, default)
+
+    def __getitem__(self, field: str) -> Any:
+        return self._fields[field]
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._fields
+
+    def evolve(self, **changes) -> "CombatantState":
+        """New state with some fields changed, sharing everything else"""
+        frozen = {field: freeze(value) for field, value in changes.items()}
+        return CombatantState(self.key, self.name, MappingProxyType({**self._fields, **frozen}), self.stat_block)
+
+    def changes_since(self, previous: Optional["CombatantState"],
+                      fields: Tuple[str, ...] = SNAPSHOT_FIELDS) -> Tuple[Tuple[str, Any], ...]:
+        """
+        Fields that differ from an earlier state.
+
+        Args:
+            previous: Earlier state (None means every set field is a change)
+            fields: Fields to compare
+
+        Returns:
+            (field, frozen value) pairs in the order of fields
+        """
+        if previous is self:
+            return ()
+        before = previous._fields if previous is not None else _EMPTY
+        return tuple((field, self._fields[field]) for field in fields
+                     if field in self._fields and (field not in before or before[field] != self._fields[field]))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Mutable combatant dict (stat block shared, snapshot fields thawed)"""
+        combatant = dict(self.stat_block)
+        combatant["name"] = self.name
+        combatant.update((field, thaw(value)) for field, value in self._fields.items())
+        return combatant
+
+
+class CombatSnapshot:
+    """Immutable combat state after one turn"""
+
+    __slots__ = ("round", "current_turn_index", "combatants", "latest_action", "_index")
+
+    def __init__(self, round: int = 1, current_turn_index: int = 0,
+                 combatants: Tuple[CombatantState, ...] = (), latest_action: Optional[Mapping[str, Any]] = None):
+        object.__setattr__(self, "round", round)
+        object.__setattr__(self, "current_turn_index", current_turn_index)
+        object.__setattr__(self, "combatants", combatants)
+        object.__setattr__(self, "latest_action", latest_action)
+        object.__setattr__(self, "_index", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"CombatSnapshot(round={self.round}, turn={self.current_turn_index}, combatants={len(self.combatants)})"
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any], previous: Optional["CombatSnapshot"] = None) -> "CombatSnapshot":
+        """
+        Snapshot a live combat state dict.
+
+        Args:
+            state: Dict with round, current_turn_index, combatants and latest_action
+            previous: Earlier snapshot of the same fight to share unchanged combatants with
+
+        Returns:
+            New snapshot; combatants that did not change are the objects of previous
+        """
+        combatants = []
+        for index, combatant in enumerate(state.get("combatants") or []):
+            if not isinstance(combatant, Mapping):
+                continue
+            prior = None
+            if previous is not None:
+                key = combatant_key(combatant, index)
+                if index < len(previous.combatants) and previous.combatants[index].key == key:
+                    prior = previous.combatants[index]
+                else:
+                    prior = previous.combatant(key)
+            combatants.append(CombatantState.from_combatant(combatant, index, prior))
+        combatants = tuple(combatants)
+        if previous is not None and len(combatants) == len(previous.combatants) and all(
+                a is b for a, b in zip(combatants, previous.combatants)):
+            combatants = previous.combatants
+
+        latest_action = state.get("latest_action")
+        try:
+            round_num = int(state.get("round", 1))
+            current_idx = int(state.get("current_turn_index", 0))
+        except (TypeError, ValueError):
+            round_num, current_idx = 1, 0
+        return cls(round_num, current_idx, combatants, freeze(latest_action) if latest_action else None)
+
+    def combatant(self, key: str) -> Optional[CombatantState]:
+        """Combatant state by key, or None"""
+        if self._index is None:
+            object.__setattr__(self, "_index", {c.key: i for i, c in enumerate(self.combatants)})
+        position = self._index.get(key)
+        return self.combatants[position] if position is not None else None
+
+    def with_combatant(self, key: Union[str, int], **changes) -> "CombatSnapshot":
+        """
+        New snapshot with one combatant's fields changed.
+
+        Args:
+            key: Combatant key or position
+            **changes: Snapshot fields to set
+
+        Returns:
+            Snapshot sharing every other combatant with this one
+        """
+        if isinstance(key, int):
+            position = key
+        else:
+            self.combatant(key)
+            position = self._index.get(key)
+            if position is None:
+                raise KeyError(key)
+        combatants = list(self.combatants)
+        combatants[position] = combatants[position].evolve(**changes)
+        return CombatSnapshot(self.round, self.current_turn_index, tuple(combatants), self.latest_action)
+
+    def changes_since(self, previous: Optional["CombatSnapshot"], fields: Tuple[str, ...] = SNAPSHOT_FIELDS
+                      ) -> Iterator[Tuple[CombatantState, Tuple[Tuple[str, Any], ...]]]:
+        """
+        Yield (combatant, changed fields) for the combatants that changed since previous.
+
+        Combatants shared with previous are skipped without comparing fields.
+        """
+        if previous is not None and previous.combatants is self.combatants:
+            return
+        for position, current in enumerate(self.combatants):
+            if previous is None:
+                prior = None
+            elif position < len(previous.combatants) and previous.combatants[position].key == current.key:
+                prior = previous.combatants[position]
+            else:
+                prior = previous.combatant(current.key)
+            if current is prior:
+                continue
+            changes = current.changes_since(prior, fields)
+            if changes:
+                yield current, changes
+
+    def to_state(self) -> Dict[str, Any]:
+        """Mutable combat state dict, e.g. to resume a fight from this snapshot"""
+        return {
+            "round": self.round,
+            "current_turn_index": self.current_turn_index,
+            "combatants": [c.as_dict() for c in self.combatants],
+            "latest_action": thaw(self.latest_action) if self.latest_action else None,
+        }
+
+
+class CombatHistory:
+    """Turn-by-turn snapshots of one fight, for history, undo and rewind"""
+
+    def __init__(self, initial: Optional[CombatSnapshot] = None):
+        """
+        Args:
+            initial: Snapshot of the fight before the first recorded turn
+        """
+        self._snapshots: List[CombatSnapshot] = [initial] if initial is not None else []
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def __getitem__(self, index):
+        return self._snapshots[index]
+
+    def __iter__(self):
+        return iter(self._snapshots)
+
+    @property
+    def latest(self) -> Optional[CombatSnapshot]:
+        """Most recent snapshot, or None"""
+        return self._snapshots[-1] if self._snapshots else None
+
+    def record(self, state: Union[Mapping[str, Any], CombatSnapshot]) -> CombatSnapshot:
+        """
+        Add the state after a turn.
+
+        Args:
+            state: Live combat state dict (snapshotted against the latest
+                snapshot) or a ready-made snapshot
+
+        Returns:
+            The recorded snapshot
+        """
+        snapshot = state if isinstance(state, CombatSnapshot) else CombatSnapshot.from_state(state, self.latest)
+        self._snapshots.append(snapshot)
+        return snapshot
+
+    def undo(self) -> Optional[CombatSnapshot]:
+        """Drop the latest snapshot and return the one before it"""
+        if self._snapshots:
+            self._snapshots.pop()
+        return self.latest
+
+    def rewind(self, round_num: int) -> Optional[CombatSnapshot]:
+        """
+        Drop every snapshot after the end of a round.
+
+        Args:
+            round_num: Last round to keep
+
+        Returns:
+            The new latest snapshot
+        """
+        keep = len(self._snapshots)
+        while keep and self._snapshots[keep - 1].round > round_num:
+            keep -= 1
+        del self._snapshots[keep:]
+        return self.latest
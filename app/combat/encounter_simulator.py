@@ -0,0 +1,301 @@
+"""
+Monte Carlo Encounter Simulator for D&D 5e Combat System
+
+Runs the same combat state thousands of times through the local combat
+engine with different dice and reports how the fight tends to go: win
+probability, expected number of rounds and each combatant's chance of
+dying. Fights are split into chunks and run on a process pool so all
+cores are used.
+"""
+
+import logging
+import multiprocessing
+import os
+import random
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List
+
+from app.combat.combat_engine import CombatEngine, get_combatant_actions, is_monster
+
+logger = logging.getLogger(__name__)
+
+# Below this many fights a process pool costs more than it saves
+MIN_FIGHTS_PER_PROCESS = 500
+
+# Workers are spawned, not forked: the simulator is called from worker threads
+# of the running Qt application, and a forked child can deadlock on locks
+# another thread held at the time of the fork.
+POOL_START_METHOD = "spawn"
+
+
+@dataclass
+class SimulationResult:
+    """Aggregated outcome of a batch of simulated fights"""
+    fights: int = 0
+    party_wins: int = 0
+    monster_wins: int = 0
+    draws: int = 0
+    total_rounds: int = 0
+    deaths: Dict[str, int] = field(default_factory=dict)
+    party: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def win_probability(self) -> float:
+        """Chance the party wins"""
+        return self.party_wins / self.fights if self.fights else 0.0
+
+    @property
+    def expected_rounds(self) -> float:
+        """Average fight length in rounds"""
+        return self.total_rounds / self.fights if self.fights else 0.0
+
+    @property
+    def death_probability(self) -> Dict[str, float]:
+        """Chance each combatant dies, keyed by name"""
+        if not self.fights:
+            return {}
+        return {name: count / self.fights for name, count in self.deaths.items()}
+
+    def merge(self, other: "SimulationResult"):
+        """Add the counts of another batch to this one"""
+        self.fights += other.fights
+        self.party_wins += other.party_wins
+        self.monster_wins += other.monster_wins
+        self.draws += other.draws
+        self.total_rounds += other.total_rounds
+        for name, count in other.deaths.items():
+            self.deaths[name] = self.deaths.get(name, 0) + count
+        self.party = self.party or list(other.party)
+
+    def summary(self) -> str:
+        """One-line human readable summary"""
+        if not self.fights:
+            return "No simulation"
+        text = f"Party wins {self.win_probability:.0%} · ~{self.expected_rounds:.1f} rounds"
+        risks = {name: p for name, p in self.death_probability.items() if name in self.party}
+        if risks:
+            name = max(risks, key=risks.get)
+            text += f" · highest death risk {risks[name]:.0%} ({name})"
+        return text
+
+
+# ---------------------------------------------------------------------------
+# Building combat states
+# ---------------------------------------------------------------------------
+
+def _ability_modifier(score) -> int:
+    try:
+        return (int(score) - 10) // 2
+    except (TypeError, ValueError):
+        return 0
+
+
+def combatant_from_monster(monster: Dict[str, Any], name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert a Monster.to_dict() dictionary into a combatant.
+
+    Args:
+        monster: Monster dictionary (ac, hp like "136 (16d10 + 48)", ability scores, actions)
+        name: Name to use (e.g. "Goblin 2" when there are several)
+
+    Returns:
+        Combatant dictionary for the combat engine
+    """
+    hp_match = re.match(r'\s*(\d+)', str(monster.get("hp", monster.get("hit_points", "10"))))
+    hp = int(hp_match.group(1)) if hp_match else 10
+    ac_match = re.match(r'\s*(\d+)', str(monster.get("ac", monster.get("armor_class", 10))))
+    abilities = ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")
+    saves = {ability: _ability_modifier(monster.get(ability[:3], monster.get(ability, 10))) for ability in abilities}
+    return {
+        "name": name or monster.get("name", "Monster"),
+        "type": "monster",
+        "hp": hp,
+        "max_hp": hp,
+        "ac": int(ac_match.group(1)) if ac_match else 10,
+        "initiative_bonus": saves["dexterity"],
+        "saves": saves,
+        "actions": [dict(a) for a in monster.get("actions") or [] if isinstance(a, dict)],
+        "status": "",
+        "conditions": {},
+    }
+
+
+def _proficiency_bonus(level: int) -> int:
+    return 2 + (max(1, level) - 1) // 4
+
+
+def build_party(level: int, size: int) -> List[Dict[str, Any]]:
+    """
+    Build a standard party of the given level for simulations.
+
+    Characters use average martial numbers for their level (primary
+    ability +3 rising to +5, Extra Attack from 5th level); the second
+    character can also heal.
+
+    Args:
+        level: Character level (1-20)
+        size: Number of characters
+
+    Returns:
+        List of character combatants
+    """
+    level = max(1, min(20, int(level)))
+    ability = 3 + (level >= 4) + (level >= 8)
+    bonus = ability + _proficiency_bonus(level)
+    damage = f"1d8+{ability}" if level < 11 else f"2d6+{ability}"
+    attacks = 1 + (level >= 5) + (level >= 11) + (level >= 20)
+    hp = 10 + ability + (level - 1) * (6 + ability)
+    party = []
+    for i in range(max(1, int(size))):
+        actions = [{"name": "Weapon Attack", "attack_bonus": bonus, "damage": damage}]
+        if attacks > 1:
+            actions.insert(0, {"name": "Multiattack",
+                               "description": f"The character makes {attacks} weapon attacks."})
+        if i == 1:
+            actions.append({"name": "Healing Word",
+                            "description": f"A creature regains 1d4+{ability} hit points. ({1 + level // 2}/Day)"})
+        party.append({
+            "name": f"Character {i + 1}",
+            "type": "character",
+            "hp": hp,
+            "max_hp": hp,
+            "ac": 15 + (level >= 5) + (level >= 10),
+            "initiative_bonus": 2,
+            "saves": {"strength": ability, "dexterity": 2, "constitution": ability,
+                      "intelligence": 0, "wisdom": 1, "charisma": 0},
+            "actions": actions,
+            "status": "",
+            "conditions": {},
+        })
+    return party
+
+
+def build_encounter_state(party: List[Dict[str, Any]], monsters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine characters and Monster dictionaries into a combat state.
+
+    Duplicate monster names are numbered ("Goblin 1", "Goblin 2") since
+    combatants are looked up by name.
+    """
+    counts = Counter(m.get("name", "Monster") for m in monsters)
+    seen = Counter()
+    combatants = [dict(c) for c in party]
+    for monster in monsters:
+        base = monster.get("name", "Monster")
+        seen[base] += 1
+        name = f"{base} {seen[base]}" if counts[base] > 1 else base
+        combatants.append(combatant_from_monster(monster, name))
+    return {"round": 1, "combatants": combatants}
+
+
+# ---------------------------------------------------------------------------
+# Running fights
+# ---------------------------------------------------------------------------
+
+# Per-fight state that must not leak between fights
+_STATE_KEYS_TO_RESET = ("conditions", "death_saves", "recharge_abilities", "action_economy")
+
+
+def _prepare_template(combat_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Copy the combatants and parse their actions once for the whole batch"""
+    template = []
+    for combatant in combat_state.get("combatants", []):
+        c = dict(combatant)
+        c.pop("_parsed_actions", None)
+        get_combatant_actions(c)
+        template.append(c)
+    return template
+
+
+def _fresh_combatants(template, rng):
+    """Copy the template for one fight and roll initiative"""
+    combatants = []
+    for base in template:
+        c = dict(base)
+        for key in _STATE_KEYS_TO_RESET:
+            value = c.get(key)
+            if isinstance(value, dict):
+                c[key] = {k: dict(v) if isinstance(v, dict) else v for k, v in value.items()}
+        # Parsed actions are read-only and shared between fights
+        c["_parsed_actions"] = base["_parsed_actions"]
+        c["initiative"] = rng.randint(1, 20) + int(c.get("initiative_bonus", 0) or 0)
+        combatants.append(c)
+    return combatants
+
+
+def _run_chunk(combat_state: Dict[str, Any], fights: int, seed: Optional[int], max_rounds: int) -> SimulationResult:
+    """Run a batch of fights in the current process"""
+    rng = random.Random(seed)
+    engine = CombatEngine(rng=rng, max_rounds=max_rounds, record_log=False)
+    template = _prepare_template(combat_state)
+    result = SimulationResult()
+    deaths = Counter()
+    for _ in range(fights):
+        combatants = _fresh_combatants(template, rng)
+        outcome = engine.run({"combatants": combatants}, copy_state=False)
+        winner = outcome["winner"]
+        if winner == "party":
+            result.party_wins += 1
+        elif winner == "monsters":
+            result.monster_wins += 1
+        else:
+            result.draws += 1
+        result.total_rounds += outcome["rounds"]
+        for c in combatants:
+            if str(c.get("status", "")).lower() == "dead":
+                deaths[c["name"]] += 1
+            elif winner == "monsters" and not is_monster(c) and c.get("hp", 0) <= 0:
+                # A wiped party has no one left to stabilize the fallen
+                deaths[c["name"]] += 1
+    result.fights = fights
+    result.deaths = dict(deaths)
+    result.party = [c["name"] for c in template if not is_monster(c)]
+    return result
+
+
+def simulate(combat_state: Dict[str, Any], fights: int = 10000, processes: Optional[int] = None,
+             seed: Optional[int] = None, max_rounds: int = 50) -> SimulationResult:
+    """
+    Simulate a combat many times with different dice.
+
+    Args:
+        combat_state: Combat state dictionary (see CombatEngine.run); initiative
+            is rolled per fight from each combatant's "initiative_bonus"
+        fights: Number of fights to run
+        processes: Worker processes (defaults to the CPU count; 1 runs in-process).
+            Workers are started with the "spawn" method, so each one starts a
+            fresh interpreter and imports the combat engine (about half a second
+            per pool); small batches run in-process instead
+        seed: Base seed for reproducible batches
+        max_rounds: Fights still going after this many rounds count as draws
+
+    Returns:
+        SimulationResult with the aggregated counts
+    """
+    start = time.perf_counter()
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, fights // MIN_FIGHTS_PER_PROCESS or 1))
+    seeds = random.Random(seed).sample(range(2 ** 31), processes)
+
+    if processes == 1:
+        result = _run_chunk(combat_state, fights, seeds[0], max_rounds)
+    else:
+        chunk, extra = divmod(fights, processes)
+        sizes = [chunk + (1 if i < extra else 0) for i in range(processes)]
+        result = SimulationResult()
+        with ProcessPoolExecutor(max_workers=processes,
+                                 mp_context=multiprocessing.get_context(POOL_START_METHOD)) as pool:
+            futures = [pool.submit(_run_chunk, combat_state, size, s, max_rounds)
+                       for size, s in zip(sizes, seeds)]
+            for future in futures:
+                result.merge(future.result())
+
+    result.elapsed = time.perf_counter() - start
+    logger.info(f"Simulated {result.fights} fights in {result.elapsed:.2f}s on {processes} process(es)")
+    return result
@@ -0,0 +1,99 @@
+"""
+Turn deltas for combat UI updates
+
+The resolver reports the whole combat state after every turn. The UI only
+needs what changed since the previous update, so TurnDeltaTracker compares
+each reported state with the last one it sent and produces an immutable
+TurnDelta holding just the changed combatants and fields. Deltas are safe to
+hand from the resolver thread to the UI thread through a queued signal:
+nothing in them is shared with the resolver's mutable state.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from app.combat.combat_state import TRACKED_FIELDS, CombatHistory, CombatSnapshot, freeze, thaw
+
+
+@dataclass(frozen=True)
+class CombatantDelta:
+    """Changed fields of one combatant"""
+    instance_id: str
+    name: str
+    changes: Tuple[Tuple[str, Any], ...]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Combatant update dict (name, instance_id and the changed fields as mutable, JSON-ready values)"""
+        update = {"name": self.name, "instance_id": self.instance_id}
+        update.update((field, thaw(value)) for field, value in self.changes)
+        return update
+
+
+@dataclass(frozen=True)
+class TurnDelta:
+    """Everything the UI needs to apply one resolver turn"""
+    round: int
+    current_turn_index: int
+    combatants: Tuple[CombatantDelta, ...] = ()
+    latest_action: Optional[Mapping[str, Any]] = None
+    # True for deltas read back from the combat log rather than sent by the resolver
+    replayed: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the delta to JSON-serializable data"""
+        return {
+            "round": self.round,
+            "current_turn_index": self.current_turn_index,
+            "combatants": [{"instance_id": c.instance_id, "name": c.name, "changes": thaw(dict(c.changes))}
+                           for c in self.combatants],
+            "latest_action": thaw(self.latest_action) if self.latest_action else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], replayed: bool = True) -> "TurnDelta":
+        """Rebuild a delta from to_dict() data"""
+        return cls(
+            round=int(data["round"]),
+            current_turn_index=int(data["current_turn_index"]),
+            combatants=tuple(
+                CombatantDelta(c["instance_id"], c["name"],
+                               tuple((field, freeze(value)) for field, value in c["changes"].items()))
+                for c in data.get("combatants", ())),
+            latest_action=freeze(data["latest_action"]) if data.get("latest_action") else None,
+            replayed=replayed,
+        )
+
+
+class TurnDeltaTracker:
+    """Turns full per-turn combat states into deltas against the last one sent"""
+
+    def __init__(self, combatants: Iterable[Mapping] = ()):
+        """
+        Args:
+            combatants: Combatants as the UI currently shows them; the first
+                delta is computed against these
+        """
+        combatants = list(combatants)
+        # Every diffed state is kept as a snapshot sharing unchanged combatants
+        self.history = CombatHistory(CombatSnapshot.from_state({"combatants": combatants}) if combatants else None)
+
+    def diff(self, turn_state: Mapping[str, Any]) -> TurnDelta:
+        """
+        Build the delta for a reported turn state and remember it as sent.
+
+        Args:
+            turn_state: Dict with round, current_turn_index, combatants and latest_action
+
+        Returns:
+            TurnDelta with only the combatants whose tracked fields changed
+        """
+        previous = self.history.latest
+        snapshot = self.history.record(turn_state)
+        changed = tuple(CombatantDelta(combatant.key, combatant.name, changes)
+                        for combatant, changes in snapshot.changes_since(previous, TRACKED_FIELDS))
+        return TurnDelta(
+            round=snapshot.round,
+            current_turn_index=snapshot.current_turn_index,
+            combatants=changed,
+            latest_action=snapshot.latest_action,
+        )
@@ -11,10 +11,8 @@ import time
 from pathlib import Path
 from datetime import datetime
 
-from app.core.llm_service import LLMService
 from app.data.llm_data_manager import LLMDataManager
 from app.core.config import get_app_dir
-from app.core.combat_resolver import CombatResolver
 
 # Default application settings
 DEFAULT_SETTINGS = {
@@ -71,10 +69,77 @@ class AppState:
         from app.data.db_manager import DatabaseManager
         self.db_manager = DatabaseManager(self)
         
-        # Initialize LLM services
+        # Persistent combat log, written in the background
+        from app.data.combat_log_store import CombatLogStore
+        self.combat_log_store = CombatLogStore(self.db_manager.connections)
+        
+        # Initialize LLM services. The LLM service and combat resolver pull
+        # in the provider SDKs, so they are created on first use or by
+        # init_services() once the main window is up.
         self.llm_data_manager = LLMDataManager(self)
-        self.llm_service = LLMService(self)
-        self.combat_resolver = CombatResolver(self.llm_service)
+        self._llm_service = None
+        self._combat_resolver = None
+        self._services_callbacks = []
+    
+    @property
+    def llm_service(self):
+        """The LLM service, created on first use"""
+        if self._llm_service is None:
+            self.init_services()
+        return self._llm_service
+    
+    @llm_service.setter
+    def llm_service(self, service):
+        self._llm_service = service
+    
+    @property
+    def combat_resolver(self):
+        """The combat resolver, created on first use"""
+        if self._combat_resolver is None:
+            self.init_services()
+        return self._combat_resolver
+    
+    @combat_resolver.setter
+    def combat_resolver(self, resolver):
+        self._combat_resolver = resolver
+    
+    @property
+    def services_ready(self):
+        """Check whether the LLM service and combat resolver exist"""
+        return self._llm_service is not None and self._combat_resolver is not None
+    
+    def init_services(self):
+        """Create the LLM service and combat resolver if they don't exist yet"""
+        if self.services_ready:
+            return
+        self._create_services()
+        
+        callbacks, self._services_callbacks = self._services_callbacks, []
+        for callback in callbacks:
+            callback()
+    
+    def _create_services(self):
+        """Create the missing LLM service and combat resolver"""
+        from app.core.llm_service import LLMService
+        from app.core.combat_resolver import CombatResolver
+        
+        if self._llm_service is None:
+            self._llm_service = LLMService(self)
+        if self._combat_resolver is None:
+            self._combat_resolver = CombatResolver(self._llm_service)
+    
+    def call_when_services_ready(self, callback):
+        """
+        Run a callback once the LLM service and combat resolver exist
+        
+        Args:
+            callback: Callable without arguments; run immediately if the
+                      services already exist
+        """
+        if self.services_ready:
+            callback()
+        else:
+            self._services_callbacks.append(callback)
     
     def _ensure_directories(self):
         """Create application directories if they don't exist"""
@@ -298,6 +363,10 @@ class AppState:
         # Save current settings
         self.save_settings()
         
+        # Write out queued combat log entries before the database closes
+        if hasattr(self, 'combat_log_store'):
+            self.combat_log_store.close()
+        
         # Close database connection
         if hasattr(self, 'db_manager'):
             self.db_manager.close()
@@ -305,6 +374,10 @@ class AppState:
         # Close LLM data manager
         if hasattr(self, 'llm_data_manager'):
             self.llm_data_manager.close()
+        
+        # Stop the LLM service's async backend
+        if self._llm_service is not None:
+            self._llm_service.close()
 
     def get_panel_widget(self, panel_id):
         """
@@ -7,9 +7,12 @@ properly reflected in the UI.
 """
 
 from app.core.llm_service import LLMService, ModelInfo
+from app.core.decision_prefetch import DecisionPrefetcher
+from app.combat.combat_engine import RuleBasedPolicy, consume_ability, resolve_action_spec, strip_engine_fields
+from app.combat.combat_state import copy_combat_state
+from app.core import dice
 import json as _json
 import re
-import time
 import logging
 
 # Import QObject and Signal for thread-safe communication
@@ -25,12 +28,30 @@ class CombatResolver(QObject):
     # It will carry the result dictionary (or None) and error string (or None)
     resolution_complete = Signal(object, object)
 
+    # Resolution modes. "legacy" lets the LLM narrate the outcome and infers
+    # HP changes from its reply; "combined" asks for the decision and a
+    # structured resolution spec in one reply, then rolls and applies the dice
+    # locally; "local" makes no LLM calls at all and lets the rule-based
+    # policy of the combat engine choose actions. A fight can override the
+    # default via combat_state["resolution_mode"].
+    RESOLUTION_MODE_LEGACY = "legacy"
+    RESOLUTION_MODE_COMBINED = "combined"
+    RESOLUTION_MODE_LOCAL = "local"
+    RESOLUTION_MODES = (RESOLUTION_MODE_LEGACY, RESOLUTION_MODE_COMBINED, RESOLUTION_MODE_LOCAL)
+
     def __init__(self, llm_service: LLMService):
         """Initialize the CombatResolver with the LLM service."""
         # Call QObject initializer
         super().__init__()
         self.llm_service = llm_service
         self.previous_turn_summaries = []  # NEW: Track previous turn results for LLM context
+        self.resolution_mode = self.RESOLUTION_MODE_LEGACY
+        self._fight_resolution_mode = self.resolution_mode
+        # Request decisions for upcoming combatants concurrently (see decision_prefetch)
+        self.prefetch_decisions = True
+        self.prefetch_depth = 4
+        self._decision_prefetcher = None
+        self.local_policy = RuleBasedPolicy()
 
     # ---------------------------------------------------------------------
     # Helper to build LLM messages with previous turn context
@@ -58,16 +79,17 @@ class CombatResolver(QObject):
             combat_state: Dictionary with current combat state (combatants, round, etc.)
             dice_roller: Function that rolls dice (takes expression, returns result)
             callback: Function called with final result or error (DEPRECATED - Use resolution_complete signal)
-            update_ui_callback: Function called after each turn to update UI (optional)
+            update_ui_callback: Function called after each turn to update UI (optional).
+                It runs on the resolver thread and receives the live state, so it
+                must copy anything it keeps (the tracker sends a TurnDelta)
         """
         logging.debug("--- ENTERING resolve_combat_turn_by_turn ---") # TEST LOG
-        import copy
         import threading
         
-        # Make a deep copy to avoid mutating the original
+        # Copy the per-fight fields to avoid mutating the original (stat blocks are shared)
         # Ensure combat_state is a dictionary before copying
         if isinstance(combat_state, dict):
-            state_copy = copy.deepcopy(combat_state)
+            state_copy = copy_combat_state(combat_state)
         else:
             print(f"[CombatResolver] Warning: combat_state is not a dictionary, type: {type(combat_state)}")
             # Create a valid dictionary
@@ -87,6 +109,14 @@ class CombatResolver(QObject):
         
         log = []  # Combat log for transparency
         
+        # Pick the resolution mode for this fight
+        requested_mode = state_copy.get("resolution_mode") or self.resolution_mode
+        if requested_mode not in self.RESOLUTION_MODES:
+            print(f"[CombatResolver] Unknown resolution mode '{requested_mode}', using '{self.RESOLUTION_MODE_LEGACY}'")
+            requested_mode = self.RESOLUTION_MODE_LEGACY
+        self._fight_resolution_mode = requested_mode
+        print(f"[CombatResolver] Resolution mode for this fight: {requested_mode}")
+        
         # Pre-validate the combat state before starting the thread
         combatants = state_copy.get("combatants", [])
         if not combatants:
@@ -120,6 +150,9 @@ class CombatResolver(QObject):
                 combatants = state.get("combatants", [])
                 turn_idx = state.get("current_turn_index", 0)
                 
+                if self.prefetch_decisions and self._fight_resolution_mode != self.RESOLUTION_MODE_LOCAL:
+                    self._decision_prefetcher = DecisionPrefetcher(self.llm_service, max_pending=self.prefetch_depth)
+                
                 # Main combat loop - continue until only one type of combatant remains or max rounds reached
                 while round_num <= 50:
                     print(f"[CombatResolver] Starting round {round_num}")
@@ -151,7 +184,8 @@ class CombatResolver(QObject):
                         break
                     
                     # Process each combatant's turn in initiative order
-                    for idx in sorted(range(len(combatants)), key=lambda i: -int(combatants[i].get("initiative", 0))):
+                    turn_order = sorted(range(len(combatants)), key=lambda i: -int(combatants[i].get("initiative", 0)))
+                    for order_pos, idx in enumerate(turn_order):
                         if idx >= len(combatants):
                             print(f"[CombatResolver] Error: combatant index {idx} out of range")
                             continue
@@ -191,10 +225,13 @@ class CombatResolver(QObject):
                                     "latest_action": turn_log_entry
                                 }
                                 update_ui_callback(combat_display_state)
-                                time.sleep(0.5)
                                 
                             continue
                             
+                        # Request decisions for the combatants acting after this one
+                        if self._decision_prefetcher is not None:
+                            self._prefetch_upcoming_decisions(combatants, turn_order[order_pos + 1:], round_num)
+                        
                         # Process normal turn for conscious combatants
                         turn_result = self._process_turn(combatants, idx, round_num, dice_roller)
                         
@@ -400,8 +437,8 @@ class CombatResolver(QObject):
                         
                         # Update the UI *before* checking end condition based on this turn's results
                         if update_ui_callback:
-                            import copy
-                            combatants_updated = copy.deepcopy(combatants)
+                            # The callback snapshots what it needs before returning, so no copy is made
+                            combatants_updated = combatants
                             combat_display_state = {
                                 "round": round_num,
                                 "current_turn_index": idx,
@@ -412,7 +449,6 @@ class CombatResolver(QObject):
                             for c in combatants_updated:
                                 print(f"[CombatResolver] DEBUG:   {c.get('name', 'Unknown')}: HP {c.get('hp', 0)}/{c.get('max_hp', c.get('hp', 0))}, Status: {c.get('status', '')}")
                             update_ui_callback(combat_display_state)
-                            time.sleep(0.5) # Small delay
 
                         # --- BEGIN ADDED DEBUG LOGGING (Moved after UI update) ---
                         print(f"\n[CombatResolver] DEBUG: STATE BEFORE END CHECK (Round {round_num}, After Actor: {combatant.get('name')}'s turn)")
@@ -528,10 +564,8 @@ class CombatResolver(QObject):
 
                     # Update the UI
                     if update_ui_callback:
-                        # Create a deep copy of the combatants to ensure latest HP values
-                        # are passed to the UI after all updates are applied
-                        import copy
-                        combatants_updated = copy.deepcopy(combatants)
+                        # The callback snapshots what it needs before returning, so no copy is made
+                        combatants_updated = combatants
                         
                         combat_display_state = {
                             "round": round_num,
@@ -544,10 +578,8 @@ class CombatResolver(QObject):
                         for c in combatants_updated:
                             print(f"[CombatResolver] DEBUG: {c.get('name', 'Unknown')}: HP {c.get('hp', 0)}/{c.get('max_hp', c.get('hp', 0))}")
                         
-                        # Give the UI a chance to update between turns
+                        # Playback pacing is up to the UI; the resolver never waits here
                         update_ui_callback(combat_display_state)
-                        # Small delay to let UI update and for more natural combat flow
-                        time.sleep(0.5)
                         
                     # After each turn, check if combat is over
                     remaining_monsters = [c for c in combatants if c.get("type", "").lower() == "monster" and c.get("hp", 0) > 0 and c.get("status", "").lower() != "dead"]
@@ -567,7 +599,8 @@ class CombatResolver(QObject):
                         print(f"[CombatResolver] Combat ending after turn: Monsters alive={len(remaining_monsters)}, Characters alive={len(remaining_characters)}")
                         break # Break inner turn loop
                 
-                # Prepare final summary
+                # Prepare final summary (without the local engine's bookkeeping)
+                strip_engine_fields(combatants)
                 survivors = [c for c in combatants if c.get("hp", 0) > 0]
                 summary = {
                     "narrative": f"Combat ended after {round_num-1} rounds. Survivors: {[c.get('name', 'Unknown') for c in survivors]}",
@@ -587,6 +620,11 @@ class CombatResolver(QObject):
                 traceback.print_exc()
                 # Emit signal with no result and the error message
                 self.resolution_complete.emit(None, f"Error in turn-by-turn resolution: {str(e)}")
+            finally:
+                if self._decision_prefetcher is not None:
+                    print(f"[CombatResolver] Decision prefetch stats: {self._decision_prefetcher.stats}")
+                    self._decision_prefetcher.clear()
+                    self._decision_prefetcher = None
         
         # Run in a background thread
         threading.Thread(target=run_resolution).start()
@@ -714,6 +752,14 @@ class CombatResolver(QObject):
                     "aura_updates": aura_updates
                 }
             
+            # Combined mode: one structured LLM reply, dice rolled and applied locally
+            if self._fight_resolution_mode == self.RESOLUTION_MODE_COMBINED:
+                return self._process_combined_turn(combatants, active_idx, round_num, dice_roller)
+            
+            # Local mode: rule-based decision, no LLM call
+            if self._fight_resolution_mode == self.RESOLUTION_MODE_LOCAL:
+                return self._process_local_turn(combatants, active_idx, dice_roller)
+            
             # 1. Create a prompt for the LLM to decide the action
             # Prepare combat_state and turn_combatant for prompt creation
             combat_state = {"combatants": combatants, "turn_number": round_num}
@@ -723,24 +769,18 @@ class CombatResolver(QObject):
             # 2. Get action decision from LLM
             print(f"[CombatResolver] Requesting action decision from LLM for {active_combatant.get('name', 'Unknown')}")
             try:
-                # Prefer GPT-4.1 Mini for fast combat resolution if available
-                available_models = self.llm_service.get_available_models()
-                model_id = None
-                for m in available_models:
-                    if m["id"] == ModelInfo.OPENAI_GPT4O_MINI:
-                        model_id = m["id"]
-                        break
-                if not model_id:
-                    # Fallback: use first available model
-                    model_id = available_models[0]["id"]
-                # Now use model_id for LLM calls
-                print(f"[CombatResolver] Sending prompt to LLM:\n{prompt}\n---END PROMPT---")
-                decision_response = self.llm_service.generate_completion(
-                    model=model_id,
-                    messages=self.build_llm_messages(self.previous_turn_summaries, prompt),
-                    temperature=0.7,
-                    max_tokens=800
-                )
+                decision_response = self._take_prefetched_decision(active_combatant, combatants)
+                if decision_response is None:
+                    model_id = self._select_combat_model()
+                    # Now use model_id for LLM calls
+                    print(f"[CombatResolver] Sending prompt to LLM:\n{prompt}\n---END PROMPT---")
+                    decision_response = self.llm_service.generate_completion(
+                        model=model_id,
+                        messages=self.build_llm_messages(self.previous_turn_summaries, prompt),
+                        temperature=0.7,
+                        max_tokens=800,
+                        content_type="combat"
+                    )
                 print(f"[CombatResolver] Received LLM decision for {active_combatant.get('name', 'Unknown')}")
                 print(f"[CombatResolver] Raw decision response TYPE: {type(decision_response).__name__}")
                 print(f"[CombatResolver] Raw decision response VALUE: {decision_response!r}")
@@ -1271,12 +1311,267 @@ class CombatResolver(QObject):
                 "updates": []
             }
 
+    def _select_combat_model(self):
+        """Return the model id used for combat turns (GPT-4.1 Mini if available)."""
+        available_models = self.llm_service.get_available_models()
+        for m in available_models:
+            if m["id"] == ModelInfo.OPENAI_GPT4O_MINI:
+                return m["id"]
+        # Fallback: use first available model
+        return available_models[0]["id"]
+
+    def _process_combined_turn(self, combatants, active_idx, round_num, dice_roller):
+        """
+        Resolve a turn with a single LLM call.
+        
+        The LLM returns its decision together with a structured resolution
+        spec (attack bonus, damage expression, save DC, ...). Dice are rolled
+        locally and the outcome is applied by _apply_structured_resolution.
+        
+        Args:
+            combatants: List of all combatants
+            active_idx: Index of active combatant
+            round_num: Current round number
+            dice_roller: Function to roll dice
+            
+        Returns:
+            Dictionary with turn results (action, narrative, dice, updates)
+        """
+        active_combatant = combatants[active_idx]
+        name = active_combatant.get("name", "Unknown")
+        
+        try:
+            response = self._take_prefetched_decision(active_combatant, combatants)
+            if response is None:
+                response = self.llm_service.generate_completion(
+                    **self._build_turn_request(combatants, active_idx, round_num)
+                )
+        except Exception as e:
+            print(f"[CombatResolver] Error getting combined resolution for {name}: {e}")
+            return {
+                "action": "The combatant takes a defensive stance.",
+                "narrative": f"{name} hesitates and takes no effective action.",
+                "dice": [],
+                "updates": []
+            }
+        
+        spec = self._parse_json_response(response)
+        if not isinstance(spec, dict):
+            print(f"[CombatResolver] Combined resolution for {name} was not valid JSON")
+            return {
+                "action": "Unknown action",
+                "narrative": str(response)[:500] if response else f"{name} takes no effective action.",
+                "dice": [],
+                "updates": []
+            }
+        
+        return self._apply_structured_resolution(spec, combatants, active_idx, dice_roller)
+
+    def _process_local_turn(self, combatants, active_idx, dice_roller):
+        """
+        Resolve a turn without the LLM.
+        
+        The combat engine's rule-based policy picks the action from the
+        combatant's parsed stat block and _apply_structured_resolution rolls it.
+        
+        Args:
+            combatants: List of all combatants
+            active_idx: Index of active combatant
+            dice_roller: Function to roll dice
+            
+        Returns:
+            Dictionary with turn results (action, narrative, dice, updates)
+        """
+        active_combatant = combatants[active_idx]
+        name = active_combatant.get("name", "Unknown")
+        spec = self.local_policy.choose(active_combatant, combatants)
+        if spec is None:
+            return {
+                "action": "Dodge",
+                "narrative": f"{name} has no target and takes the Dodge action.",
+                "dice": [],
+                "updates": []
+            }
+        # Count down per-day uses and expend recharge abilities (the parsed
+        # actions stay cached on the combatant until the fight ends)
+        used = spec.get("uses_ability")
+        if used:
+            consume_ability(active_combatant, used)
+        return self._apply_structured_resolution(spec, combatants, active_idx, dice_roller)
+
+    def _build_turn_request(self, combatants, active_idx, round_num):
+        """
+        Build the generate_completion arguments for a combatant's turn.
+        
+        Used both for the blocking call and for prefetching, so a prefetched
+        reply is exactly what the turn itself would have asked for.
+        """
+        combat_state = {"combatants": combatants, "turn_number": round_num}
+        turn_combatant = combatants[active_idx]
+        if self._fight_resolution_mode == self.RESOLUTION_MODE_COMBINED:
+            prompt = self._create_combined_turn_prompt(combat_state, turn_combatant)
+            max_tokens = 600
+        else:
+            prompt = self._create_decision_prompt(combat_state, turn_combatant)
+            max_tokens = 800
+        return {
+            "model": self._select_combat_model(),
+            "messages": self.build_llm_messages(self.previous_turn_summaries, prompt),
+            "temperature": 0.7,
+            "max_tokens": max_tokens,
+            "content_type": "combat",
+        }
+
+    def _can_prefetch_decision(self, combatant, combatants):
+        """
+        Return True if nothing at the start of this combatant's turn can change its prompt.
+        
+        Combatants standing in an aura or waiting on a recharge roll are
+        resolved at their turn instead. Unconscious or dead combatants
+        make no decision at all.
+        """
+        if combatant.get("hp", 0) <= 0 or str(combatant.get("status", "")).lower() in ("dead", "unconscious", "stable"):
+            return False
+        recharge = combatant.get("recharge_abilities") or {}
+        if any(isinstance(info, dict) and not info.get("available", False) for info in recharge.values()):
+            return False
+        if self._get_active_auras(combatant, combatants):
+            return False
+        return True
+
+    def _prefetch_upcoming_decisions(self, combatants, upcoming_indices, round_num):
+        """Start decision requests for combatants acting later this round."""
+        prefetcher = self._decision_prefetcher
+        for idx in upcoming_indices:
+            if prefetcher.pending_count() >= prefetcher.max_pending:
+                break
+            combatant = combatants[idx]
+            if not self._can_prefetch_decision(combatant, combatants):
+                prefetcher.invalidate(combatant)
+                continue
+            if prefetcher.is_pending(combatant):
+                continue
+            try:
+                prefetcher.submit(combatant, self._build_turn_request(combatants, idx, round_num))
+            except Exception as e:
+                print(f"[CombatResolver] Could not prefetch decision for {combatant.get('name', 'Unknown')}: {e}")
+
+    def _take_prefetched_decision(self, active_combatant, combatants):
+        """
+        Return the prefetched LLM reply for the active combatant, if still valid.
+        
+        A reply is discarded when the combatant changed since it was
+        requested or when a target it chose has since been taken out.
+        """
+        if self._decision_prefetcher is None:
+            return None
+        response = self._decision_prefetcher.take(active_combatant, timeout=120)
+        if response is None:
+            return None
+        decision = self._parse_json_response(response)
+        if isinstance(decision, dict):
+            targets = decision.get("targets", decision.get("target"))
+            if isinstance(targets, str):
+                targets = [targets]
+            for target_name in targets or []:
+                target = next((c for c in combatants if c.get("name") == target_name), None)
+                if target is not None and target.get("hp", 0) <= 0:
+                    print(f"[CombatResolver] Prefetched decision for {active_combatant.get('name', 'Unknown')} targets downed {target_name}, re-requesting")
+                    self._decision_prefetcher.stats["invalidated"] += 1
+                    return None
+        print(f"[CombatResolver] Using prefetched decision for {active_combatant.get('name', 'Unknown')}")
+        return response
+
+    def _create_combined_turn_prompt(self, combat_state, turn_combatant):
+        """Create a prompt asking for the decision and its mechanics in one reply."""
+        prompt = self._create_decision_prompt(combat_state, turn_combatant)
+        
+        # Replace the decision-only reply format with the structured resolution spec
+        marker = "Reply with a single JSON object"
+        if marker in prompt:
+            prompt = prompt[:prompt.index(marker)]
+        
+        prompt += "Reply with a single JSON object describing your action AND its game mechanics.\n"
+        prompt += "Do NOT roll dice or decide the outcome - the dice are rolled by the game engine.\n"
+        prompt += '{\n'
+        prompt += '  "action": "[action name]",\n'
+        prompt += '  "targets": ["[target name]", ...],\n'
+        prompt += '  "reasoning": "[brief tactical reasoning]",\n'
+        prompt += '  "narrative": "[one or two sentences describing the attempt]",\n'
+        prompt += '  "attacks": [{"target": "[target name]", "attack_bonus": 5, "damage": "1d8+3", "damage_type": "slashing"}],\n'
+        prompt += '  "save": {"ability": "dex", "dc": 15, "damage": "8d6", "half_on_save": true},\n'
+        prompt += '  "healing": "2d4+2",\n'
+        prompt += '  "conditions": ["poisoned"],\n'
+        prompt += '  "uses_ability": "[recharge or limited-use ability name, or null]"\n'
+        prompt += '}\n\n'
+        prompt += "GUIDELINES:\n"
+        prompt += "- Use 'attacks' for attack rolls; list one entry per attack (e.g. Multiattack has several)\n"
+        prompt += "- Use 'save' for effects that call for a saving throw; omit it otherwise\n"
+        prompt += "- Use 'healing' only when healing the listed targets\n"
+        prompt += "- 'conditions' are applied to targets that are hit or fail their save\n"
+        prompt += "- Use the exact attack bonus, damage dice and DC from your stat block\n"
+        prompt += "- Omit fields that do not apply\n"
+        return prompt
+
+    def _parse_json_response(self, response):
+        """Extract a JSON object from an LLM reply, tolerating code fences."""
+        if isinstance(response, dict):
+            return response
+        if not isinstance(response, str):
+            return None
+        cleaned = re.sub(r'```(?:json)?', '', response).strip()
+        try:
+            return _json.loads(cleaned)
+        except ValueError:
+            pass
+        json_match = re.search(r'\{[\s\S]*\}', cleaned)
+        if not json_match:
+            return None
+        json_str = json_match.group(0)
+        for candidate in (json_str, re.sub(r',\s*([}\]])', r'\1', json_str)):
+            try:
+                return _json.loads(candidate)
+            except ValueError:
+                continue
+        return None
+
+    def _roll_dice(self, expression):
+        """Roll a dice expression with the shared dice engine (0 if it cannot be parsed)."""
+        try:
+            return dice.roll(str(expression))
+        except dice.DiceError as e:
+            print(f"[CombatResolver] Could not roll '{expression}': {e}")
+            return 0
+
+    def _apply_structured_resolution(self, spec, combatants, active_idx, dice_roller):
+        """
+        Roll and apply a structured resolution spec deterministically.
+        
+        Shared with the local combat engine (see
+        app.combat.combat_engine.resolve_action_spec). Dice go through the
+        fight's dice_roller so they appear in the combat log.
+        
+        Args:
+            spec: Parsed LLM reply (see _create_combined_turn_prompt)
+            combatants: List of all combatants
+            active_idx: Index of active combatant
+            dice_roller: Function to roll dice
+            
+        Returns:
+            Dictionary with turn results (action, narrative, dice, updates)
+        """
+        return resolve_action_spec(spec, combatants, active_idx, dice_roller)
+
     def _create_decision_prompt(self, combat_state, turn_combatant):
         """Create a prompt for the LLM to decide a combatant's action."""
         prompt = "You are playing the role of a combatant in a D&D 5e battle. Make a tactical decision for your next action.\n\n"
         
         # Basic combat situation
-        active_combatant = next((c for c in combat_state.get("combatants", []) if c.get("id") == turn_combatant.get("id")), None)
+        # Match by identity first; combatants from the tracker carry no "id",
+        # so comparing ids alone would always pick the first combatant
+        active_combatant = next((c for c in combat_state.get("combatants", []) if c is turn_combatant), None)
+        if active_combatant is None:
+            active_combatant = next((c for c in combat_state.get("combatants", []) if c.get("id") == turn_combatant.get("id")), None)
         if not active_combatant:
             return "Error: Could not find active combatant in combat state."
             
@@ -1296,7 +1591,7 @@ class CombatResolver(QObject):
         initiative_order = []
         for c in sorted([c for c in combat_state.get("combatants", [])], key=lambda x: x.get("initiative", 0), reverse=True):
             initiative_text = f"{c.get('name')} (Initiative: {c.get('initiative')})"
-            if c.get("id") == active_combatant.get("id"):
+            if c is active_combatant:
                 initiative_text += " - ACTIVE TURN"
             initiative_order.append(initiative_text)
         
@@ -1497,8 +1792,6 @@ class CombatResolver(QObject):
 
     def _process_death_save(self, combatant):
         """Process a death save for an unconscious character"""
-        import random
-        
         # Set up death saves tracking if not present
         if "death_saves" not in combatant:
             combatant["death_saves"] = {
@@ -1507,7 +1800,7 @@ class CombatResolver(QObject):
             }
         
         # Roll a d20 for the death save
-        roll = random.randint(1, 20)
+        roll = dice.roll("1d20")
         
         # Natural 20: regain 1 hit point
         if roll == 20:
@@ -1557,6 +1850,7 @@ class CombatResolver(QObject):
                 model=model_id,
                 messages=[{"role": "user", "content": prompt}],
                 callback=lambda response, error: self._handle_llm_response(response, error, callback),
+                content_type="combat",
                 temperature=0.7,
                 max_tokens=1000
             )
@@ -1733,21 +2027,10 @@ Return ONLY the JSON object with no other text.
                         # Get dice expression or default damage amount
                         damage_expr = effect.get("expression", "1d6")
                         
-                        # Roll damage using random if dice_roller not available
+                        # Roll damage with the shared dice engine
                         try:
-                            import re, random
-                            # Simple dice parser for expressions like "2d6+3"
-                            dice_match = re.match(r'(\d+)d(\d+)(?:\+(\d+))?', damage_expr)
-                            if dice_match:
-                                num_dice = int(dice_match.group(1))
-                                dice_size = int(dice_match.group(2))
-                                modifier = int(dice_match.group(3) or 0)
-                                damage = sum(random.randint(1, dice_size) for _ in range(num_dice)) + modifier
-                                print(f"[CombatResolver] Rolled aura damage: {damage_expr} = {damage}")
-                            else:
-                                # Default to fixed damage if expression parsing fails
-                                damage = int(damage_expr) if damage_expr.isdigit() else 1
-                                print(f"[CombatResolver] Using fixed aura damage: {damage}")
+                            damage = dice.roll(str(damage_expr))
+                            print(f"[CombatResolver] Rolled aura damage: {damage_expr} = {damage}")
                         except Exception as e:
                             print(f"[CombatResolver] Error rolling aura damage: {str(e)}")
                             # Continue to next aura
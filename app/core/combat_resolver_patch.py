@@ -671,10 +671,12 @@ def combat_resolver_patch(app_state):
             _active_resolutions.add(resolution_id)
         
         start_time = time.time()
+        turn_finished = threading.Event()
         
         def check_timeout():
             global _last_warning_time
-            while True:
+            # Wake every 5 seconds, or immediately when the turn finishes
+            while not turn_finished.wait(5.0):
                 elapsed = time.time() - start_time
                 
                 if resolution_id not in _active_resolutions:
@@ -685,9 +687,6 @@ def combat_resolver_patch(app_state):
                     # Log warning about long-running resolution
                     _last_warning_time = time.time()
                     logger.warning(f"Combat resolution still running after {elapsed:.1f} seconds")
-                
-                # Check every 5 seconds
-                time.sleep(5.0)
         
         # Start monitoring thread
         monitor_thread = threading.Thread(target=check_timeout, daemon=True)
@@ -702,6 +701,7 @@ def combat_resolver_patch(app_state):
             traceback.print_exc()
             return None
         finally:
+            turn_finished.set()
             # Remove from active resolutions
             with _resolution_lock:
                 if resolution_id in _active_resolutions:
@@ -0,0 +1,185 @@
+"""
+Decision prefetching for turn-by-turn combat resolution.
+
+While one combatant's turn is being resolved, the LLM decisions for the
+combatants that act after it are requested concurrently on the
+LLMService thread pool. Each prefetched request remembers a fingerprint
+of the combatant it was made for; if a later turn changes that
+combatant (damage, conditions, recharge, ...) the request is dropped
+and only that one decision is requested again.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, CancelledError
+
+from PySide6.QtCore import QRunnable
+
+logger = logging.getLogger(__name__)
+
+
+class _PrefetchWorker(QRunnable):
+    """Runs one generate_completion call and resolves a Future with the reply"""
+
+    def __init__(self, llm_service, future, request):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.llm_service = llm_service
+        self.future = future
+        self.request = request
+
+    def run(self):
+        """Run the API call in a pool thread"""
+        # Skip requests that were invalidated before a thread picked them up
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            response = self.llm_service.generate_completion(**self.request)
+        except Exception as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(response)
+
+
+class DecisionPrefetcher:
+    """
+    Keeps at most one in-flight decision request per combatant.
+
+    Requests are keyed by instance_id (falling back to name) and carry the
+    combatant fingerprint taken when the prompt was built.
+    """
+
+    def __init__(self, llm_service, max_pending=4):
+        """
+        Args:
+            llm_service: LLMService whose thread_pool runs the requests
+            max_pending: Maximum number of decisions requested ahead
+        """
+        self.llm_service = llm_service
+        self.max_pending = max_pending
+        self._pending = {}  # key -> (future, fingerprint)
+        self._lock = threading.Lock()
+        self.stats = {"requested": 0, "used": 0, "invalidated": 0}
+
+    @staticmethod
+    def combatant_key(combatant):
+        """Stable key for a combatant within one fight"""
+        return combatant.get("instance_id") or combatant.get("name", "")
+
+    @staticmethod
+    def fingerprint(combatant):
+        """
+        Snapshot of the state a decision depends on.
+
+        A decision made for this snapshot stays valid as long as the
+        combatant's own HP, status, conditions and available recharge
+        abilities are unchanged.
+        """
+        conditions = combatant.get("conditions") or {}
+        if isinstance(conditions, dict):
+            conditions = sorted(conditions)
+        elif isinstance(conditions, list):
+            conditions = sorted(str(c) for c in conditions)
+        recharge = combatant.get("recharge_abilities") or {}
+        available = sorted(
+            name for name, info in recharge.items()
+            if isinstance(info, dict) and info.get("available", False)
+        )
+        return (
+            combatant.get("hp", 0),
+            str(combatant.get("status", "")).lower(),
+            tuple(conditions),
+            tuple(available),
+        )
+
+    def is_pending(self, combatant):
+        """Return True if a request for this combatant's current state is in flight"""
+        key = self.combatant_key(combatant)
+        with self._lock:
+            entry = self._pending.get(key)
+        return entry is not None and entry[1] == self.fingerprint(combatant)
+
+    def pending_count(self):
+        """Number of requests currently held"""
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, combatant, request):
+        """
+        Request a decision for a combatant in the background.
+
+        An existing request for the same state is kept; a stale one is
+        cancelled and replaced.
+
+        Args:
+            combatant: The combatant the decision is for
+            request: Keyword arguments for llm_service.generate_completion
+
+        Returns:
+            True if a new request was started
+        """
+        key = self.combatant_key(combatant)
+        fingerprint = self.fingerprint(combatant)
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is not None:
+                if entry[1] == fingerprint:
+                    return False
+                entry[0].cancel()
+                self.stats["invalidated"] += 1
+                del self._pending[key]
+            if len(self._pending) >= self.max_pending:
+                return False
+            future = Future()
+            self._pending[key] = (future, fingerprint)
+            self.stats["requested"] += 1
+        self.llm_service.thread_pool.start(_PrefetchWorker(self.llm_service, future, request))
+        logger.debug(f"Prefetching decision for {combatant.get('name', key)}")
+        return True
+
+    def take(self, combatant, timeout=None):
+        """
+        Claim the prefetched reply for a combatant whose turn has come.
+
+        Args:
+            combatant: The combatant about to act
+            timeout: Seconds to wait for an in-flight request
+
+        Returns:
+            The LLM reply, or None if nothing valid was prefetched
+        """
+        key = self.combatant_key(combatant)
+        with self._lock:
+            entry = self._pending.pop(key, None)
+        if entry is None:
+            return None
+        future, fingerprint = entry
+        if fingerprint != self.fingerprint(combatant):
+            future.cancel()
+            self.stats["invalidated"] += 1
+            logger.debug(f"Prefetched decision for {combatant.get('name', key)} is stale")
+            return None
+        try:
+            response = future.result(timeout=timeout)
+        except (CancelledError, Exception) as e:
+            logger.warning(f"Prefetched decision for {combatant.get('name', key)} failed: {e}")
+            return None
+        self.stats["used"] += 1
+        return response
+
+    def invalidate(self, combatant):
+        """Drop any request held for a combatant"""
+        key = self.combatant_key(combatant)
+        with self._lock:
+            entry = self._pending.pop(key, None)
+        if entry is not None:
+            entry[0].cancel()
+            self.stats["invalidated"] += 1
+
+    def clear(self):
+        """Cancel everything (end of fight)"""
+        with self._lock:
+            entries = list(self._pending.values())
+            self._pending.clear()
+        for future, _ in entries:
+            future.cancel()
@@ -0,0 +1,520 @@
+"""
+Dice engine shared by the dice roller panel, the combat resolvers and the
+combat simulations.
+
+Expressions are compiled once into a small AST and cached, so rolling
+the same expression again only draws random numbers. Supported syntax
+(case and spaces are ignored)::
+
+    2d6+3         dice and constant terms, added or subtracted
+    d20, d%       count defaults to 1, d% is a d100
+    4d6kh3        keep highest 3 (also k3); 2d20kl1 keeps lowest 1
+    4d6dl1        drop lowest 1 (dh drops highest)
+    d20adv        advantage (2d20kh1); d20dis is disadvantage
+    2d6r1, 2d6r<3 reroll 1s / anything below 3 until it no longer matches
+    2d6ro1        reroll 1s once, keeping the second roll
+    3d6!, 3d6!>5  exploding dice: a die that rolls its maximum (or the
+                  threshold) is rolled again and the new roll added to it
+
+roll(expression) returns one total. roll(expression, n) returns n totals
+at once; with NumPy installed they are drawn as arrays in bulk, otherwise
+a list is built in pure Python.
+"""
+
+import logging
+import random
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+from typing import Optional, Tuple, List, Dict, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; bulk rolls fall back to pure Python
+    np = None
+
+# Limits that keep a typo from hanging the UI
+MAX_DICE = 100
+MAX_SIDES = 1000
+MAX_EXPLOSIONS = 100
+
+logger = logging.getLogger(__name__)
+
+
+class DiceError(ValueError):
+    """Raised for dice expressions that cannot be parsed or rolled"""
+
+
+@dataclass(frozen=True)
+class DiceTerm:
+    """One group of identical dice with its modifiers"""
+    sign: int
+    count: int
+    sides: int
+    keep: Optional[Tuple[str, int]] = None      # ("h" | "l", number of dice kept)
+    reroll: Optional[Tuple[str, int]] = None    # ("<" | ">" | "=", value)
+    reroll_once: bool = False
+    explode: Optional[int] = None               # dice rolling at least this value explode
+
+    def rerolls(self, value: int) -> bool:
+        """Return True if a die showing value is rerolled"""
+        if self.reroll is None:
+            return False
+        op, target = self.reroll
+        if op == "<":
+            return value < target
+        if op == ">":
+            return value > target
+        return value == target
+
+    def notation(self) -> str:
+        text = f"{self.count}d{self.sides}"
+        if self.reroll:
+            op, target = self.reroll
+            text += f"r{'o' if self.reroll_once else ''}{'' if op == '=' else op}{target}"
+        if self.explode is not None:
+            text += "!" if self.explode == self.sides else f"!>{self.explode - 1}"
+        if self.keep:
+            text += f"k{self.keep[0]}{self.keep[1]}"
+        return text
+
+
+@dataclass(frozen=True)
+class ConstantTerm:
+    """A flat modifier"""
+    sign: int
+    value: int
+
+    def notation(self) -> str:
+        return str(self.value)
+
+
+Term = Union[DiceTerm, ConstantTerm]
+
+_TERM_RE = re.compile(r'([+-]?)(?:(\d*)d(\d+|%)((?:[a-z!<>=]+\d*)*)|(\d+))')
+_MODIFIER_RE = re.compile(r'(kh|kl|k|dh|dl)(\d*)|(ro|r)([<>=]?)(\d+)|(!!?)(?:([<>=]?)(\d+))?|(adv|dis)')
+
+
+def _parse_term(sign, count_text, sides_text, modifiers, expression):
+    count = int(count_text) if count_text else 1
+    sides = 100 if sides_text == "%" else int(sides_text)
+    if count < 1 or sides < 1:
+        raise DiceError(f"Invalid dice in '{expression}'")
+    keep = reroll = explode = None
+    reroll_once = False
+
+    pos = 0
+    while pos < len(modifiers):
+        match = _MODIFIER_RE.match(modifiers, pos)
+        if not match:
+            raise DiceError(f"Unknown dice modifier '{modifiers[pos:]}' in '{expression}'")
+        pos = match.end()
+        kind, amount, reroll_kind, reroll_op, reroll_value, bang, explode_op, explode_value, adv = match.groups()
+        if kind:
+            n = int(amount) if amount else 1
+            if kind in ("kh", "k"):
+                keep = ("h", n)
+            elif kind == "kl":
+                keep = ("l", n)
+            elif kind == "dl":
+                keep = ("h", count - n)
+            else:
+                keep = ("l", count - n)
+        elif reroll_kind:
+            reroll = (reroll_op or "=", int(reroll_value))
+            reroll_once = reroll_kind == "ro"
+        elif bang:
+            threshold = int(explode_value) if explode_value else sides
+            if explode_op == ">":
+                threshold += 1
+            elif explode_op == "<":
+                raise DiceError(f"Dice can only explode on high rolls in '{expression}'")
+            explode = threshold
+        elif adv:
+            count = max(count, 2)
+            keep = ("h" if adv == "adv" else "l", 1)
+
+    if count > MAX_DICE:
+        raise DiceError(f"Too many dice (maximum {MAX_DICE} per type)")
+    if sides > MAX_SIDES:
+        raise DiceError(f"Die has too many sides (maximum {MAX_SIDES})")
+    if keep is not None:
+        if keep[1] < 1:
+            raise DiceError(f"Cannot keep fewer than one die in '{expression}'")
+        keep = (keep[0], min(keep[1], count))
+        if keep[1] == count:
+            keep = None
+    term = DiceTerm(sign, count, sides, keep, reroll, reroll_once, explode)
+    if reroll is not None and not reroll_once and all(term.rerolls(v) for v in range(1, sides + 1)):
+        raise DiceError(f"Reroll condition matches every face in '{expression}'")
+    if explode is not None and explode <= 1:
+        raise DiceError(f"Dice would explode on every roll in '{expression}'")
+    if explode is not None and explode > sides:
+        term = DiceTerm(sign, count, sides, keep, reroll, reroll_once, None)
+    return term
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str) -> "DiceExpression":
+    """
+    Parse a dice expression into a reusable DiceExpression (cached).
+
+    Raises:
+        DiceError: If the expression is invalid
+    """
+    text = str(expression).replace(" ", "").lower()
+    if not text:
+        raise DiceError("Empty dice expression")
+    terms = []
+    pos = 0
+    while pos < len(text):
+        match = _TERM_RE.match(text, pos)
+        if not match or match.end() == pos or (terms and not match.group(1)):
+            raise DiceError(f"Invalid dice expression format: '{expression}'")
+        pos = match.end()
+        sign = -1 if match.group(1) == "-" else 1
+        if match.group(5) is not None:
+            terms.append(ConstantTerm(sign, int(match.group(5))))
+        else:
+            terms.append(_parse_term(sign, match.group(2), match.group(3), match.group(4) or "", expression))
+    return DiceExpression(str(expression), tuple(terms))
+
+
+class DiceExpression:
+    """A compiled dice expression"""
+
+    def __init__(self, source: str, terms: Tuple[Term, ...]):
+        self.source = source
+        self.terms = terms
+        self.has_dice = any(isinstance(t, DiceTerm) for t in terms)
+
+    def __repr__(self):
+        return f"DiceExpression({self.source!r})"
+
+    def notation(self) -> str:
+        """Canonical expression text, e.g. "2d6+3" """
+        text = ""
+        for term in self.terms:
+            if term.sign < 0:
+                text += "-"
+            elif text:
+                text += "+"
+            text += term.notation()
+        return text
+
+    # ------------------------------------------------------------------
+    # Single rolls (pure Python: faster than NumPy for one value)
+    # ------------------------------------------------------------------
+
+    def roll(self, rng=None) -> int:
+        """Roll once and return the total"""
+        randint = (rng or random).randint
+        total = 0
+        for term in self.terms:
+            if isinstance(term, ConstantTerm):
+                total += term.sign * term.value
+            elif term.keep is None and term.reroll is None and term.explode is None:
+                sides = term.sides
+                total += term.sign * sum(randint(1, sides) for _ in range(term.count))
+            else:
+                kept, _ = self._roll_term(term, randint)
+                total += term.sign * sum(kept)
+        return total
+
+    def roll_detailed(self, rng=None) -> Tuple[int, str]:
+        """
+        Roll once and describe every die.
+
+        Returns:
+            (total, details) where details reads like "4d6kh3[6, 5, 3, (1)] +2";
+            dropped dice are in parentheses and exploded dice end in "!"
+        """
+        randint = (rng or random).randint
+        total = 0
+        parts = []
+        for term in self.terms:
+            prefix = "-" if term.sign < 0 else ("+" if parts else "")
+            if isinstance(term, ConstantTerm):
+                total += term.sign * term.value
+                if term.value:
+                    parts.append(f"{prefix}{term.value}")
+                continue
+            kept, faces = self._roll_term(term, randint)
+            total += term.sign * sum(kept)
+            parts.append(f"{prefix}{term.notation()}[{', '.join(faces)}]")
+        return total, " ".join(parts)
+
+    def _roll_term(self, term, randint):
+        """Roll one dice term; returns (kept values, display strings)"""
+        sides = term.sides
+        values = []
+        exploded = []
+        for _ in range(term.count):
+            value = randint(1, sides)
+            if term.reroll is not None and term.rerolls(value):
+                value = randint(1, sides)
+                if not term.reroll_once:
+                    while term.rerolls(value):
+                        value = randint(1, sides)
+            die_total = value
+            explosions = 0
+            if term.explode is not None:
+                while value >= term.explode and explosions < MAX_EXPLOSIONS:
+                    value = randint(1, sides)
+                    die_total += value
+                    explosions += 1
+            values.append(die_total)
+            exploded.append(explosions > 0)
+
+        kept_idx = range(len(values))
+        if term.keep is not None:
+            order = sorted(range(len(values)), key=values.__getitem__, reverse=term.keep[0] == "h")
+            kept_idx = set(order[:term.keep[1]])
+        faces = []
+        for i, value in enumerate(values):
+            face = f"{value}{'!' if exploded[i] else ''}"
+            faces.append(face if i in kept_idx else f"({face})")
+        return [values[i] for i in sorted(kept_idx)], faces
+
+    # ------------------------------------------------------------------
+    # Bulk rolls
+    # ------------------------------------------------------------------
+
+    def roll_many(self, n: int, rng=None):
+        """
+        Roll n times.
+
+        Returns:
+            A NumPy int64 array when NumPy is available, otherwise a list of ints
+        """
+        n = int(n)
+        if n < 0:
+            raise DiceError("Number of rolls cannot be negative")
+        if np is None:
+            rng = rng or random
+            return [self.roll(rng) for _ in range(n)]
+        generator = np.random.default_rng((rng or random).getrandbits(64))
+        totals = np.zeros(n, dtype=np.int64)
+        for term in self.terms:
+            if isinstance(term, ConstantTerm):
+                totals += term.sign * term.value
+            else:
+                totals += term.sign * self._roll_term_many(term, n, generator)
+        return totals
+
+    @staticmethod
+    def _roll_term_many(term, n, generator):
+        sides = term.sides
+        rolls = generator.integers(1, sides + 1, size=(n, term.count))
+        if term.reroll is not None:
+            op, target = term.reroll
+            def matches(values):
+                if op == "<":
+                    return values < target
+                if op == ">":
+                    return values > target
+                return values == target
+            mask = matches(rolls)
+            while mask.any():
+                rolls[mask] = generator.integers(1, sides + 1, size=int(mask.sum()))
+                if term.reroll_once:
+                    break
+                mask &= matches(rolls)
+        if term.explode is not None:
+            last = rolls.copy()
+            for _ in range(MAX_EXPLOSIONS):
+                mask = last >= term.explode
+                if not mask.any():
+                    break
+                last = np.zeros_like(rolls)
+                last[mask] = generator.integers(1, sides + 1, size=int(mask.sum()))
+                rolls += last
+        if term.keep is not None:
+            direction, keep = term.keep
+            rolls = np.sort(rolls, axis=1)
+            rolls = rolls[:, -keep:] if direction == "h" else rolls[:, :keep]
+        return rolls.sum(axis=1)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    @property
+    def minimum(self) -> int:
+        return sum(t.sign * (t.value if isinstance(t, ConstantTerm) else self._term_bound(t, low=t.sign > 0))
+                   for t in self.terms)
+
+    @property
+    def maximum(self) -> Optional[int]:
+        """Highest possible total (None if exploding dice make it unbounded)"""
+        if any(isinstance(t, DiceTerm) and t.explode is not None and t.sign > 0 for t in self.terms):
+            return None
+        return sum(t.sign * (t.value if isinstance(t, ConstantTerm) else self._term_bound(t, low=t.sign < 0))
+                   for t in self.terms)
+
+    @staticmethod
+    def _term_bound(term, low):
+        faces = [v for v, p in die_distribution(term).items() if p > 0]
+        dice = term.keep[1] if term.keep else term.count
+        return dice * (min(faces) if low else max(faces))
+
+    @property
+    def average(self) -> float:
+        """Exact expected total"""
+        return sum(t.sign * (t.value if isinstance(t, ConstantTerm) else term_average(t)) for t in self.terms)
+
+    @property
+    def dice_average(self) -> float:
+        """Expected total of the dice alone, without constant modifiers"""
+        return sum(t.sign * term_average(t) for t in self.terms if isinstance(t, DiceTerm))
+
+    def doubled_dice(self) -> "DiceExpression":
+        """Expression with twice as many dice per term (critical hit damage)"""
+        terms = []
+        for term in self.terms:
+            if isinstance(term, DiceTerm):
+                count = min(term.count * 2, MAX_DICE * 2)
+                keep = (term.keep[0], term.keep[1] * 2) if term.keep else None
+                term = DiceTerm(term.sign, count, term.sides, keep, term.reroll, term.reroll_once, term.explode)
+            terms.append(term)
+        return DiceExpression(self.source, tuple(terms))
+
+
+@lru_cache(maxsize=512)
+def die_distribution(term: DiceTerm) -> Dict[int, float]:
+    """
+    Exact probability of each value of a single die of a term, after
+    rerolls and explosions (explosions are followed until their
+    probability is negligible).
+    """
+    sides = term.sides
+    base = {v: 1.0 / sides for v in range(1, sides + 1)}
+    if term.reroll is not None:
+        rerolled = sum(p for v, p in base.items() if term.rerolls(v))
+        if term.reroll_once:
+            base = {v: (0.0 if term.rerolls(v) else p) + rerolled / sides for v, p in base.items()}
+        else:
+            kept = 1.0 - rerolled
+            base = {v: (0.0 if term.rerolls(v) else p / kept) for v, p in base.items()}
+    if term.explode is None:
+        return base
+
+    # Compounding explosions: an exploding value v continues with a fresh die roll
+    fresh = {v: 1.0 / sides for v in range(1, sides + 1)}
+    result = {}
+    frontier = {0: 1.0}
+    step = base
+    for _ in range(MAX_EXPLOSIONS + 1):
+        next_frontier = {}
+        for offset, weight in frontier.items():
+            for v, p in step.items():
+                total, prob = offset + v, weight * p
+                if v >= term.explode:
+                    next_frontier[total] = next_frontier.get(total, 0.0) + prob
+                else:
+                    result[total] = result.get(total, 0.0) + prob
+        frontier = next_frontier
+        step = fresh
+        if sum(frontier.values()) < 1e-12:
+            break
+    for total, prob in frontier.items():
+        result[total] = result.get(total, 0.0) + prob
+    return result
+
+
+def term_average(term: DiceTerm) -> float:
+    """Exact expected value of a dice term, including keep-highest/lowest"""
+    distribution = die_distribution(term)
+    die_mean = sum(v * p for v, p in distribution.items())
+    if term.keep is None:
+        return term.count * die_mean
+
+    # Order statistics: E[X(j)] = sum over v of P(X(j) >= v) for dice sorted high to low
+    n = term.count
+    values = sorted(distribution)
+    at_least = {}
+    running = 0.0
+    for v in reversed(values):
+        running += distribution[v]
+        at_least[v] = min(1.0, running)
+    direction, keep = term.keep
+    ranks = range(1, keep + 1) if direction == "h" else range(n - keep + 1, n + 1)
+    total = 0.0
+    previous = 0
+    for v in values:
+        q = at_least[v]  # P(one die >= v)
+        width = v - previous
+        previous = v
+        for j in ranks:
+            # P(at least j of n dice are >= v)
+            total += width * sum(comb(n, i) * q ** i * (1 - q) ** (n - i) for i in range(j, n + 1))
+    return total
+
+
+def roll(expression: str, n: Optional[int] = None, rng=None):
+    """
+    Roll a dice expression.
+
+    Args:
+        expression: Dice expression such as "2d6+3" or "d20adv"
+        n: Number of rolls; None returns a single int
+        rng: random.Random to draw from (the module generator if None)
+
+    Returns:
+        int for a single roll, otherwise an array (NumPy) or list of ints
+
+    Raises:
+        DiceError: If the expression is invalid
+    """
+    compiled = compile_expression(expression)
+    if n is None:
+        return compiled.roll(rng)
+    return compiled.roll_many(n, rng)
+
+
+def compile_leading_expression(text: str) -> "DiceExpression":
+    """
+    Compile the dice expression at the start of a text, ignoring trailing
+    words such as "1d8+3 slashing" or "1d20+5 to hit".
+
+    Raises:
+        DiceError: If the text does not start with a dice expression
+    """
+    try:
+        return compile_expression(text)
+    except DiceError as error:
+        words = str(text).split()
+        for end in range(len(words) - 1, 0, -1):
+            try:
+                return compile_expression(" ".join(words[:end]).rstrip(",.;:"))
+            except DiceError:
+                continue
+        raise error
+
+
+def make_dice_roller(rng=None, on_roll=None, default=0):
+    """
+    Create a dice_roller(expression) -> int function for the combat resolvers.
+
+    Text after the dice expression (e.g. "1d8+3 slashing") is ignored.
+
+    Args:
+        rng: random.Random to draw from (the module generator if None)
+        on_roll: Optional callback(expression, total) run after every roll
+        default: Value returned (and logged) for expressions that cannot be parsed
+
+    Returns:
+        The dice_roller function
+    """
+    def dice_roller(expression):
+        try:
+            total = compile_leading_expression(str(expression)).roll(rng)
+        except DiceError as e:
+            logger.warning("Could not roll %r, using %r: %s", expression, default, e)
+            return default
+        if on_roll is not None:
+            on_roll(expression, total)
+        return total
+
+    return dice_roller
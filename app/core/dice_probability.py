@@ -0,0 +1,329 @@
+"""
+Exact probability distributions for dice expressions.
+
+Every expression the dice parser accepts (see app.core.dice) can be
+turned into its full probability mass function without sampling. Each
+dice term is built from the memoized single-die distribution (which
+already accounts for rerolls and explosions) by repeated convolution,
+or by an order-statistics pass for keep-highest/lowest; terms are then
+convolved together.
+
+On top of that this module answers the questions combat code asks all
+the time: the chance to hit an AC (with advantage, disadvantage and
+natural 1/20 rules), the chance to fail a save, and expected damage.
+"""
+
+from functools import lru_cache
+from math import comb, sqrt
+from typing import Dict, Iterable, Tuple, Union
+
+from app.core.dice import (
+    DiceExpression, DiceTerm, ConstantTerm, DiceError, compile_expression, die_distribution
+)
+
+# Probabilities below this are dropped after each convolution
+EPSILON = 1e-15
+
+# Largest number of distinct totals a single term may have (keeps convolution interactive)
+MAX_OUTCOMES = 2000
+
+# Largest estimated step count for a keep-highest/lowest term (about 0.3 s);
+# see _keep_cost
+MAX_KEEP_STEPS = 3_000_000
+
+
+class Distribution:
+    """Immutable probability mass function over integer totals"""
+
+    __slots__ = ("_pmf",)
+
+    def __init__(self, pmf: Dict[int, float]):
+        self._pmf = {v: p for v, p in sorted(pmf.items()) if p > EPSILON}
+
+    @classmethod
+    def constant(cls, value: int) -> "Distribution":
+        return cls({int(value): 1.0})
+
+    @classmethod
+    def mixture(cls, weighted: Iterable[Tuple[float, "Distribution"]]) -> "Distribution":
+        """Distribution that is each component with the given probability"""
+        pmf = {}
+        for weight, distribution in weighted:
+            for v, p in distribution._pmf.items():
+                pmf[v] = pmf.get(v, 0.0) + weight * p
+        return cls(pmf)
+
+    def __repr__(self):
+        return f"Distribution(mean={self.mean:.3f}, min={self.minimum}, max={self.maximum})"
+
+    def items(self):
+        """(value, probability) pairs in ascending order of value"""
+        return self._pmf.items()
+
+    def __add__(self, other: Union["Distribution", int]) -> "Distribution":
+        if isinstance(other, int):
+            return self.shift(other)
+        return Distribution(_convolve(self._pmf, other._pmf))
+
+    def __neg__(self) -> "Distribution":
+        return Distribution({-v: p for v, p in self._pmf.items()})
+
+    def shift(self, amount: int) -> "Distribution":
+        return Distribution({v + amount: p for v, p in self._pmf.items()})
+
+    def clamp_min(self, low: int) -> "Distribution":
+        """Distribution of max(low, X), e.g. damage that cannot go below 0"""
+        pmf = {}
+        for v, p in self._pmf.items():
+            v = max(low, v)
+            pmf[v] = pmf.get(v, 0.0) + p
+        return Distribution(pmf)
+
+    @property
+    def minimum(self) -> int:
+        return next(iter(self._pmf))
+
+    @property
+    def maximum(self) -> int:
+        return next(reversed(self._pmf))
+
+    @property
+    def mean(self) -> float:
+        return sum(v * p for v, p in self._pmf.items())
+
+    @property
+    def variance(self) -> float:
+        mean = self.mean
+        return sum((v - mean) ** 2 * p for v, p in self._pmf.items())
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+    def probability(self, value: int) -> float:
+        """P(X == value)"""
+        return self._pmf.get(value, 0.0)
+
+    def at_least(self, value: float) -> float:
+        """P(X >= value)"""
+        return min(1.0, sum(p for v, p in self._pmf.items() if v >= value))
+
+    def at_most(self, value: float) -> float:
+        """P(X <= value)"""
+        return min(1.0, sum(p for v, p in self._pmf.items() if v <= value))
+
+    def percentile(self, fraction: float) -> int:
+        """Smallest value v with P(X <= v) >= fraction"""
+        running = 0.0
+        for v, p in self._pmf.items():
+            running += p
+            if running >= fraction - EPSILON:
+                return v
+        return self.maximum
+
+
+def _convolve(a: Dict[int, float], b: Dict[int, float]) -> Dict[int, float]:
+    if len(a) < len(b):
+        a, b = b, a
+    result = {}
+    for vb, pb in b.items():
+        for va, pa in a.items():
+            key = va + vb
+            result[key] = result.get(key, 0.0) + pa * pb
+    return result
+
+
+def _keep_distribution(die: Dict[int, float], count: int, keep: int, highest: bool) -> Dict[int, float]:
+    """
+    Distribution of the sum of the highest (or lowest) keep of count dice.
+
+    Face values are visited best first; at each value the number of the
+    still unassigned dice showing it is binomial, and once keep dice are
+    assigned the rest no longer matter.
+    """
+    values = sorted(die, reverse=highest)
+    tail = []
+    running = 0.0
+    for v in reversed(values):
+        running += die[v]
+        tail.append(running)
+    tail.reverse()
+
+    result = {}
+    states = {(0, 0): 1.0}  # (dice assigned, sum of kept dice) -> probability
+    for i, v in enumerate(values):
+        if not states:
+            break
+        q = 1.0 if i == len(values) - 1 else min(1.0, die[v] / tail[i]) if tail[i] > 0 else 0.0
+        next_states = {}
+        for (assigned, total), weight in states.items():
+            remaining = count - assigned
+            for j in range(remaining + 1):
+                pj = comb(remaining, j) * q ** j * (1 - q) ** (remaining - j)
+                if pj <= 0.0:
+                    continue
+                kept_total = total + min(j, keep - assigned) * v
+                if assigned + j >= keep:
+                    result[kept_total] = result.get(kept_total, 0.0) + weight * pj
+                else:
+                    key = (assigned + j, kept_total)
+                    next_states[key] = next_states.get(key, 0.0) + weight * pj
+        states = next_states
+    return result
+
+
+def _keep_cost(die: Dict[int, float], count: int, keep: int) -> int:
+    """
+    Estimated steps of _keep_distribution.
+
+    For each face value, every (assigned, total) state (up to keep times the
+    keep * range possible totals) is split over up to count + 1 outcomes.
+    """
+    spread = max(die) - min(die)
+    return len(die) * count * keep * (keep * spread + 1)
+
+
+@lru_cache(maxsize=512)
+def term_distribution(term: DiceTerm) -> Distribution:
+    """
+    Distribution of one dice term (ignoring its sign)
+
+    Raises:
+        DiceError: If the term has too many possible totals to compute
+    """
+    die = die_distribution(term)
+    kept = term.keep[1] if term.keep is not None else term.count
+    if kept * (max(die) - min(die)) + 1 > MAX_OUTCOMES:
+        raise DiceError(f"{term.notation()} has too many possible totals to compute exactly")
+    if term.keep is not None:
+        direction, keep = term.keep
+        if _keep_cost(die, term.count, keep) > MAX_KEEP_STEPS:
+            raise DiceError(f"{term.notation()} keeps too many dice to compute exactly")
+        return Distribution(_keep_distribution(die, term.count, keep, direction == "h"))
+
+    # Sum of count dice by repeated squaring
+    result = {0: 1.0}
+    power = die
+    count = term.count
+    while count:
+        if count & 1:
+            result = _convolve(result, power)
+        count >>= 1
+        if count:
+            power = _convolve(power, power)
+    return Distribution(result)
+
+
+@lru_cache(maxsize=512)
+def _expression_distribution(expression: DiceExpression) -> Distribution:
+    result = Distribution.constant(0)
+    for term in expression.terms:
+        if isinstance(term, ConstantTerm):
+            result = result.shift(term.sign * term.value)
+        else:
+            part = term_distribution(term)
+            result = result + (part if term.sign > 0 else -part)
+    return result
+
+
+def distribution(expression: Union[str, DiceExpression]) -> Distribution:
+    """
+    Exact distribution of a dice expression.
+
+    Raises:
+        DiceError: If the expression is invalid or has too many possible totals
+    """
+    if not isinstance(expression, DiceExpression):
+        expression = compile_expression(str(expression))
+    return _expression_distribution(expression)
+
+
+def probability_at_least(expression: Union[str, DiceExpression], target: float) -> float:
+    """P(expression >= target), e.g. probability_at_least("2d6+3", 10)"""
+    return distribution(expression).at_least(target)
+
+
+# ---------------------------------------------------------------------------
+# Combat queries
+# ---------------------------------------------------------------------------
+
+def _d20(advantage: bool, disadvantage: bool) -> Distribution:
+    if advantage and not disadvantage:
+        return distribution("d20adv")
+    if disadvantage and not advantage:
+        return distribution("d20dis")
+    return distribution("1d20")
+
+
+@lru_cache(maxsize=4096)
+def attack_probabilities(attack_bonus: int, target_ac: int, advantage: bool = False,
+                         disadvantage: bool = False, crit_threshold: int = 20) -> Tuple[float, float]:
+    """
+    Chance of an ordinary hit and of a critical hit.
+
+    A natural 1 always misses; a natural roll at or above crit_threshold
+    always hits and is a critical hit.
+
+    Returns:
+        (ordinary hit probability, critical hit probability)
+    """
+    hit = crit = 0.0
+    for natural, p in _d20(advantage, disadvantage).items():
+        if natural >= crit_threshold:
+            crit += p
+        elif natural != 1 and natural + attack_bonus >= target_ac:
+            hit += p
+    return hit, crit
+
+
+def hit_probability(attack_bonus: int, target_ac: int, advantage: bool = False,
+                    disadvantage: bool = False, crit_threshold: int = 20) -> float:
+    """Chance an attack hits (critical hits included)"""
+    hit, crit = attack_probabilities(attack_bonus, target_ac, advantage, disadvantage, crit_threshold)
+    return hit + crit
+
+
+def save_success_probability(save_bonus: int, dc: int, advantage: bool = False,
+                             disadvantage: bool = False) -> float:
+    """Chance a saving throw meets the DC (natural 1 and 20 have no special effect)"""
+    return _d20(advantage, disadvantage).at_least(dc - save_bonus)
+
+
+@lru_cache(maxsize=4096)
+def attack_damage_distribution(attack_bonus: int, target_ac: int, damage: str, advantage: bool = False,
+                               disadvantage: bool = False, crit_threshold: int = 20) -> Distribution:
+    """Distribution of the damage one attack deals (0 on a miss; crits double the dice)"""
+    hit, crit = attack_probabilities(attack_bonus, target_ac, advantage, disadvantage, crit_threshold)
+    compiled = compile_expression(damage)
+    normal = distribution(compiled).clamp_min(0)
+    critical = distribution(compiled.doubled_dice()).clamp_min(0)
+    return Distribution.mixture([(1.0 - hit - crit, Distribution.constant(0)), (hit, normal), (crit, critical)])
+
+
+def expected_attack_damage(attack_bonus: int, target_ac: int, damage: str, advantage: bool = False,
+                           disadvantage: bool = False, crit_threshold: int = 20) -> float:
+    """Expected damage of one attack against an AC"""
+    return attack_damage_distribution(attack_bonus, target_ac, damage, advantage, disadvantage,
+                                      crit_threshold).mean
+
+
+@lru_cache(maxsize=4096)
+def save_damage_distribution(save_bonus: int, dc: int, damage: str, half_on_save: bool = True,
+                             advantage: bool = False, disadvantage: bool = False) -> Distribution:
+    """Distribution of the damage a saving throw effect deals to one target"""
+    p_save = save_success_probability(save_bonus, dc, advantage, disadvantage)
+    full = distribution(damage).clamp_min(0)
+    if half_on_save:
+        halved = {}
+        for v, p in full.items():
+            halved[v // 2] = halved.get(v // 2, 0.0) + p
+        saved = Distribution(halved)
+    else:
+        saved = Distribution.constant(0)
+    return Distribution.mixture([(1.0 - p_save, full), (p_save, saved)])
+
+
+def expected_save_damage(save_bonus: int, dc: int, damage: str, half_on_save: bool = True,
+                         advantage: bool = False, disadvantage: bool = False) -> float:
+    """Expected damage of a saving throw effect against one target"""
+    return save_damage_distribution(save_bonus, dc, damage, half_on_save, advantage, disadvantage).mean
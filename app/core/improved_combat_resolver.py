@@ -8,6 +8,8 @@ to create a more realistic and rule-compliant combat experience in D&D 5e.
 from app.core.combat_resolver import CombatResolver
 from app.core.improved_initiative import ImprovedInitiative
 from app.combat.action_economy import ActionEconomyManager, ActionType
+from app.combat.combat_state import copy_combat_state
+from app.core import dice
 from app.core.initiative_integration import (
     initialize_combat_with_improved_initiative,
     update_combat_state_for_next_round,
@@ -18,7 +20,6 @@ from app.core.initiative_integration import (
 import copy
 import logging
 import re
-import random
 import time
 from typing import Dict, List, Any, Optional
 
@@ -245,18 +246,6 @@ class ImprovedCombatResolver(QObject):
                 "latest_action": turn_log_entry
             }
             update_ui_callback(combat_display_state)
-            time.sleep(0.5)
-    
-    
-            import copy
-            combat_display_state = {
-                "round": round_num,
-                "current_turn_index": combatant_idx,
-                "combatants": copy.deepcopy(combatants),
-                "latest_action": turn_log_entry
-            }
-            update_ui_callback(combat_display_state)
-            time.sleep(0.5)
     
     def _process_saving_throws(self, state, target_names, save_ability, save_dc, damage, half_on_save, dice_roller):
         """
@@ -504,8 +493,6 @@ class ImprovedCombatResolver(QObject):
         Returns:
             List of processed opportunity attack results
         """
-        import random
-        
         # Check if any opportunity attacks are triggered
         opportunity_attacks = ActionEconomyManager.check_opportunity_attacks(
             moving_combatant, combatants, previous_position
@@ -533,7 +520,7 @@ class ImprovedCombatResolver(QObject):
             target_ac = target.get("ac", 10)
             
             # Roll d20 + attack bonus
-            attack_roll = random.randint(1, 20)
+            attack_roll = dice.roll("1d20")
             total_attack = attack_roll + attack_bonus
             
             critical = attack_roll == 20
@@ -544,41 +531,26 @@ class ImprovedCombatResolver(QObject):
                 damage_dice = attacker.get("damage_dice", "1d6")
                 damage_bonus = attacker.get("damage_bonus", 0)
                 
-                # Parse damage dice (e.g., "2d6+3" becomes 2 rolls of d6 + 3)
-                import re
-                dice_match = re.match(r'(\d+)?d(\d+)(?:\+(\d+))?', damage_dice)
-                if dice_match:
-                    num_dice = int(dice_match.group(1) or 1)
-                    die_size = int(dice_match.group(2))
-                    bonus = int(dice_match.group(3) or 0)
-                    
-                    # Roll damage
-                    damage = sum(random.randint(1, die_size) for _ in range(num_dice)) + bonus + damage_bonus
-                    
-                    # Double damage on critical hit
+                # Roll damage with the shared dice engine; critical hits double the dice
+                try:
+                    damage_expression = dice.compile_expression(str(damage_dice))
                     if critical:
-                        damage = damage * 2
-                        
-                    # Apply damage to target
-                    target["hp"] = max(0, target["hp"] - damage)
-                    
-                    # Update the attack result
-                    attack["hit"] = True
-                    attack["critical"] = critical
-                    attack["damage"] = damage
-                    attack["attack_roll"] = total_attack
-                    attack["target_ac"] = target_ac
-                    attack["narrative"] = f"{attacker['name']} makes an opportunity attack against {target['name']} as they move away! {attacker['name']} hits with a {total_attack} vs AC {target_ac}" + (f" (CRITICAL HIT!)" if critical else "") + f", dealing {damage} damage."
-                else:
+                        damage_expression = damage_expression.doubled_dice()
+                    damage = damage_expression.roll() + damage_bonus
+                except dice.DiceError:
                     # Default damage if dice format is invalid
-                    damage = random.randint(1, 6) + damage_bonus
-                    target["hp"] = max(0, target["hp"] - damage)
-                    
-                    attack["hit"] = True
-                    attack["damage"] = damage
-                    attack["attack_roll"] = total_attack
-                    attack["target_ac"] = target_ac
-                    attack["narrative"] = f"{attacker['name']} makes an opportunity attack against {target['name']} as they move away! {attacker['name']} hits with a {total_attack} vs AC {target_ac}, dealing {damage} damage."
+                    damage = dice.roll("1d6") + damage_bonus
+                
+                # Apply damage to target
+                target["hp"] = max(0, target["hp"] - damage)
+                
+                # Update the attack result
+                attack["hit"] = True
+                attack["critical"] = critical
+                attack["damage"] = damage
+                attack["attack_roll"] = total_attack
+                attack["target_ac"] = target_ac
+                attack["narrative"] = f"{attacker['name']} makes an opportunity attack against {target['name']} as they move away! {attacker['name']} hits with a {total_attack} vs AC {target_ac}" + (f" (CRITICAL HIT!)" if critical else "") + f", dealing {damage} damage."
             else:
                 # Attack missed
                 attack["hit"] = False
@@ -886,9 +858,9 @@ class ImprovedCombatResolver(QObject):
             logger.warning("Cannot prepare invalid combat state")
             return combat_state
         
-        # Make a deep copy to avoid modifying the original
-        import copy
-        state_copy = copy.deepcopy(combat_state)
+        # Copy the per-fight fields to avoid modifying the original (stat blocks are shared;
+        # validate_monster_abilities replaces actions and traits rather than editing them)
+        state_copy = copy_combat_state(combat_state)
         
         # Get combatants
         combatants = state_copy.get("combatants", [])
@@ -1347,8 +1319,8 @@ The system will handle the mechanics based on the structure you provide. **Follo
             # If it's an attack that requires a roll
             # Ensure attack_bonus is treated as numeric
             if isinstance(attack_bonus, (int, float)) and attack_bonus != 0: 
-                # Roll to hit (using random for now, could use dice_roller)
-                attack_roll = random.randint(1, 20) 
+                # Roll to hit with the shared dice engine
+                attack_roll = dice.roll("1d20")
                 total_attack = attack_roll + attack_bonus
 
                 # Determine if hit or miss
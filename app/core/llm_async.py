@@ -0,0 +1,195 @@
+"""
+Asyncio backend for the LLM service
+
+Asynchronous requests run as coroutines on one event loop in a dedicated
+daemon thread. Each provider has a single async client (AsyncOpenAI /
+AsyncAnthropic), so every request reuses that client's keep-alive
+connection pool, and many requests can be in flight without a thread per
+call. Per-provider asyncio semaphores apply the same concurrency limits
+as the synchronous request layer.
+
+Callers get concurrent.futures.Future objects back; LLMService bridges
+them to its Qt signals and callbacks.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+import anthropic
+import openai
+
+from app.core.llm_service import ModelInfo, ModelProvider, format_openai_messages, format_anthropic_messages
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLLMBackend:
+    """Event-loop thread with one shared async client per provider"""
+
+    def __init__(self, api_key_for: Callable[[ModelProvider], Optional[str]], limits: Dict[ModelProvider, int]):
+        """
+        Args:
+            api_key_for: Returns the current API key for a provider
+            limits: Maximum concurrent requests per provider
+        """
+        self.api_key_for = api_key_for
+        self.limits = dict(limits)
+        self._clients = {}
+        self._semaphores = {}
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_loop(self):
+        """Start the event-loop thread on first use"""
+        with self._lock:
+            if not self.running:
+                started = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._clients.clear()
+                self._semaphores.clear()
+                self._thread = threading.Thread(target=self._run_loop, args=(started,), name="llm-asyncio", daemon=True)
+                self._thread.start()
+                started.wait()
+        return self._loop
+
+    def _run_loop(self, started):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(started.set)
+        self._loop.run_forever()
+
+    def submit(self, coroutine) -> Future:
+        """Schedule a coroutine on the backend loop"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    def _client(self, provider):
+        """The shared client for a provider (created on the loop thread)"""
+        client = self._clients.get(provider)
+        if client is None:
+            api_key = self.api_key_for(provider)
+            if not api_key:
+                raise ValueError(f"{provider.value} client not initialized. Please set an API key.")
+            if provider == ModelProvider.OPENAI:
+                client = openai.AsyncOpenAI(api_key=api_key)
+            else:
+                client = anthropic.AsyncAnthropic(api_key=api_key)
+            self._clients[provider] = client
+        return client
+
+    def _semaphore(self, provider):
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, self.limits.get(provider, 1)))
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    def reset_client(self, provider: ModelProvider):
+        """Drop a provider's client so the next request picks up a new API key"""
+        if not self.running:
+            return
+
+        async def _reset():
+            client = self._clients.pop(provider, None)
+            if client is not None:
+                await client.close()
+
+        self.submit(_reset())
+
+    async def complete(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000, on_chunk=None):
+        """
+        Generate a completion on the backend loop
+
+        Args:
+            model: Model ID string
+            messages: List of message dictionaries (role, content)
+            system_prompt: Optional system prompt
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            on_chunk: Optional callable receiving text as it is streamed
+
+        Returns:
+            Generated text response
+        """
+        provider = ModelInfo.get_provider_for_model(model)
+        if provider is None:
+            raise ValueError(f"Unsupported model: {model}")
+        async with self._semaphore(provider):
+            if provider == ModelProvider.OPENAI:
+                return await self._openai_completion(model, messages, system_prompt, temperature, max_tokens, on_chunk)
+            return await self._anthropic_completion(model, messages, system_prompt, temperature, max_tokens, on_chunk)
+
+    async def _openai_completion(self, model, messages, system_prompt, temperature, max_tokens, on_chunk):
+        client = self._client(ModelProvider.OPENAI)
+        formatted_messages = format_openai_messages(messages, system_prompt)
+        if on_chunk:
+            stream = await client.chat.completions.create(
+                model=model,
+                messages=formatted_messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            parts = []
+            async for event in stream:
+                text = event.choices[0].delta.content if event.choices else None
+                if text:
+                    parts.append(text)
+                    on_chunk(text)
+            return "".join(parts)
+
+        response = await client.chat.completions.create(
+            model=model,
+            messages=formatted_messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        if not response or not response.choices:
+            raise ValueError("Invalid response format from OpenAI")
+        return response.choices[0].message.content or ""
+
+    async def _anthropic_completion(self, model, messages, system_prompt, temperature, max_tokens, on_chunk):
+        client = self._client(ModelProvider.ANTHROPIC)
+        request = dict(
+            model=model,
+            system=system_prompt or "",
+            messages=format_anthropic_messages(messages),
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        if on_chunk:
+            parts = []
+            async with client.messages.stream(**request) as stream:
+                async for text in stream.text_stream:
+                    parts.append(text)
+                    on_chunk(text)
+            return "".join(parts)
+
+        response = await client.messages.create(**request)
+        return response.content[0].text
+
+    def shutdown(self, timeout: float = 5.0):
+        """Close the shared clients and stop the event-loop thread"""
+        if not self.running:
+            return
+
+        async def _close_clients():
+            for client in self._clients.values():
+                await client.close()
+            self._clients.clear()
+
+        try:
+            self.submit(_close_clients()).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error closing async LLM clients: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._thread = None
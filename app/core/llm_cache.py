@@ -0,0 +1,251 @@
+"""
+Persistent LLM response cache
+
+Responses are stored in a small SQLite database keyed by a SHA-256 hash of
+everything that determines the reply: model, system prompt, messages,
+temperature and max_tokens. Recently used entries are also kept in an
+in-memory LRU so repeated prompts are answered without touching the disk.
+
+Each content type has its own time to live (None = never expires,
+0 = never cached), and the on-disk store is trimmed to a maximum number of
+entries and total size, least recently used first.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+# Time to live in seconds per content type (None = no expiry, 0 = do not cache)
+DEFAULT_TTLS = {
+    "rules": 30 * DAY,
+    "monster": None,
+    "combat": 0,
+    "general": 7 * DAY,
+}
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+MEMORY_ENTRIES = 256
+
+
+def cache_key(model: str, system_prompt: Optional[str], messages: Iterable[Mapping],
+              temperature: float, max_tokens: int) -> str:
+    """Content hash identifying a completion request"""
+    payload = json.dumps(
+        [
+            model,
+            system_prompt or "",
+            [[m.get("role", "user"), m.get("content", "")] for m in messages],
+            round(float(temperature), 4),
+            int(max_tokens),
+        ],
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with an in-memory LRU in front"""
+
+    def __init__(self, db_path, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, Optional[int]]] = None, memory_entries: int = MEMORY_ENTRIES,
+                 on_stats: Optional[Callable[[int, int], None]] = None):
+        """
+        Args:
+            db_path: SQLite file for the cache
+            max_entries: Maximum number of cached responses on disk
+            max_bytes: Maximum total size of cached responses on disk
+            ttls: Overrides for DEFAULT_TTLS
+            memory_entries: Size of the in-memory LRU
+            on_stats: Called with (hits, misses) after every lookup
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.memory_entries = memory_entries
+        self.on_stats = on_stats
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()  # key -> (response, expires_at)
+        self._touched = set()          # keys served from memory since the last write
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._create_tables()
+
+    def _connection(self):
+        """Per-thread connection (sqlite3 connections are not shared across threads)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.db_path), timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _create_tables(self):
+        connection = self._connection()
+        connection.execute('''
+        CREATE TABLE IF NOT EXISTS llm_response_cache (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            content_type TEXT NOT NULL,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            expires_at REAL
+        )
+        ''')
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_llm_response_cache_access ON llm_response_cache(last_access)")
+        connection.commit()
+
+    def ttl_for(self, content_type: Optional[str]) -> Optional[int]:
+        """Time to live for a content type (unknown types use "general")"""
+        return self.ttls.get(content_type or "general", self.ttls.get("general"))
+
+    def is_cacheable(self, content_type: Optional[str]) -> bool:
+        return self.ttl_for(content_type) != 0
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            hits, misses = self.hits, self.misses
+        if self.on_stats:
+            self.on_stats(hits, misses)
+
+    def _remember(self, key, response, expires_at):
+        with self._lock:
+            self._memory[key] = (response, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Returns:
+            The response, or None on a miss or if the entry expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._touched.add(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+        if entry is not None:
+            self._record(True)
+            return response
+
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT response, expires_at FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                connection.execute("UPDATE llm_response_cache SET last_access = ? WHERE key = ?", (now, key))
+                connection.commit()
+                self._remember(key, row[0], row[1])
+                self._record(True)
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+        self._record(False)
+        return None
+
+    def put(self, key: str, response: str, model: str = "", content_type: Optional[str] = None):
+        """Store a response (ignored for content types with a TTL of 0)"""
+        ttl = self.ttl_for(content_type)
+        if ttl == 0 or not response:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        self._remember(key, response, expires_at)
+
+        with self._lock:
+            touched, self._touched = self._touched, set()
+        try:
+            connection = self._connection()
+            with connection:
+                connection.executemany("UPDATE llm_response_cache SET last_access = ? WHERE key = ?",
+                                       [(now, k) for k in touched])
+                connection.execute(
+                    "INSERT OR REPLACE INTO llm_response_cache "
+                    "(key, model, content_type, response, size, created_at, last_access, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, model, content_type or "general", response, len(response.encode("utf-8")),
+                     now, now, expires_at)
+                )
+                self._evict(connection, now)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def _evict(self, connection, now):
+        """Drop expired entries, then least recently used ones until within limits"""
+        connection.execute("DELETE FROM llm_response_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        entries, total = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_response_cache"
+        ).fetchone()
+        if entries <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM llm_response_cache ORDER BY last_access"):
+            if entries <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            entries -= 1
+            total -= size
+        connection.executemany("DELETE FROM llm_response_cache WHERE key = ?", evicted)
+        with self._lock:
+            for (key,) in evicted:
+                self._memory.pop(key, None)
+        logger.debug(f"Evicted {len(evicted)} LLM cache entries")
+
+    def clear(self):
+        """Remove every cached response and reset the counters"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self.hits = self.misses = 0
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM llm_response_cache")
+        if self.on_stats:
+            self.on_stats(0, 0)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and the size of the on-disk store"""
+        entries, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_response_cache"
+        ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
+
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
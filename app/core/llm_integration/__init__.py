@@ -141,7 +141,8 @@ IMPORTANT: Respond with ONLY the JSON object. No additional explanations.
                 model=model_id,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
-                max_tokens=1500
+                max_tokens=1500,
+                content_type="monster"
             )
             
             if not response:
@@ -0,0 +1,130 @@
+# app/core/llm_integration/batch_generation.py
+"""
+Batch generation of LLM content (NPCs, locations, treasure, ...)
+
+A batch of N entities is split into requests that each ask for a few
+entities as one JSON array. The requests are sent together on the LLM
+service's asyncio backend, which caps how many run at once per provider.
+The caller gets every parsed entity back in one BatchResult, so it can
+save them all in a single transaction.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Entities requested per call, and the token budget for each of them
+DEFAULT_PER_REQUEST = 4
+TOKENS_PER_ENTITY = 1500
+MAX_TOKENS_PER_REQUEST = 16000
+
+BATCH_INSTRUCTIONS = """
+
+BATCH REQUEST: Generate {count} different {noun} that all match the specifications above.
+Make each one distinct (different names, personalities, features and details).
+Instead of a single JSON object, respond with ONLY a JSON array containing exactly {count}
+objects, each using the JSON format described above. Start with `[` and end with `]`."""
+
+
+@dataclass
+class BatchResult:
+    """Entities produced by a batch, plus the errors of requests that failed"""
+    entities: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    requested: int = 0
+
+
+def batch_prompt(prompt: str, count: int, noun: str) -> str:
+    """Extend a single-entity prompt to ask for count entities as a JSON array"""
+    return prompt + BATCH_INSTRUCTIONS.format(count=count, noun=noun)
+
+
+def split_batch(count: int, per_request: int = DEFAULT_PER_REQUEST) -> List[int]:
+    """Entity counts for each request, e.g. 10 -> [4, 4, 2]"""
+    per_request = max(1, per_request)
+    return [min(per_request, count - start) for start in range(0, count, per_request)]
+
+
+def parse_entities(response: str) -> List[Dict[str, Any]]:
+    """
+    Parse the entities in a batch response
+
+    Accepts a JSON array, a single object, or an object wrapping the list
+    (e.g. {"npcs": [...], "count": 2}: the one value that is a list of
+    objects, unless the object has a name and is itself an entity), with or
+    without markdown code fences.
+
+    Returns:
+        List of entity dictionaries (empty if nothing could be parsed)
+    """
+    text = (response or "").strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```[a-zA-Z]*\s*|\s*```$", "", text)
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        match = re.search(r"\[.*\]", text, re.DOTALL) or re.search(r"\{.*\}", text, re.DOTALL)
+        if not match:
+            return []
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return []
+
+    if isinstance(data, dict):
+        lists = [value for value in data.values() if isinstance(value, list) and value
+                 and all(isinstance(item, dict) for item in value)]
+        data = lists[0] if len(lists) == 1 and "name" not in data else [data]
+    return [item for item in data if isinstance(item, dict)]
+
+
+async def generate_batch(llm_service, model: str, prompt: str, count: int, noun: str,
+                         per_request: int = DEFAULT_PER_REQUEST, temperature: float = 0.9,
+                         on_progress: Optional[Callable[[int, int], None]] = None) -> BatchResult:
+    """
+    Generate count entities with as few, concurrent requests as possible
+
+    Args:
+        llm_service: LLMService whose asyncio backend runs the requests
+        model: Model ID string
+        prompt: Prompt for a single entity (must ask for JSON)
+        count: Number of entities to generate
+        noun: Plural name of the entities for the prompt ("tavern NPCs")
+        per_request: Entities packed into each request
+        temperature: Temperature for generation
+        on_progress: Optional callable(entities_done, count), called as requests finish
+
+    Returns:
+        BatchResult with the parsed entities (at most count) and any errors
+    """
+    result = BatchResult(requested=count)
+    sizes = split_batch(count, per_request)
+
+    async def _request(size):
+        response = await llm_service.agenerate_completion(
+            model=model,
+            messages=[{"role": "user", "content": batch_prompt(prompt, size, noun) if size > 1 else prompt}],
+            temperature=temperature,
+            max_tokens=min(size * TOKENS_PER_ENTITY, MAX_TOKENS_PER_REQUEST),
+            use_cache=False
+        )
+        entities = parse_entities(response)[:size]
+        if not entities:
+            raise ValueError(f"Could not parse any {noun} from the response")
+        result.entities.extend(entities)
+        if on_progress:
+            on_progress(len(result.entities), count)
+        return entities
+
+    outcomes = await asyncio.gather(*(_request(size) for size in sizes), return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            logger.warning(f"Batch request for {noun} failed: {outcome}")
+            result.errors.append(str(outcome))
+    logger.info(f"Batch of {noun}: {len(result.entities)}/{count} generated in {len(sizes)} requests")
+    return result
@@ -205,7 +205,7 @@ async def generate_monster_from_prompt(llm_service: LLMService, prompt: str) ->
         
         # 3. Call LLM service
         logger.debug("Sending monster generation prompt to LLM")
-        response = llm_service.generate_completion(
+        response = await llm_service.agenerate_completion(
             model=model_id,
             messages=[{"role": "user", "content": formatted_prompt}],
             temperature=0.7,
@@ -314,11 +314,12 @@ async def extract_monster_from_text(llm_service: LLMService, text: str) -> Optio
         
         # 3. Call LLM service
         logger.debug("Sending text extraction prompt to LLM")
-        response = llm_service.generate_completion(
+        response = await llm_service.agenerate_completion(
             model=model_id,
             messages=[{"role": "user", "content": formatted_prompt}],
             temperature=0.3,  # Lower temperature for extraction (more deterministic)
-            max_tokens=1500
+            max_tokens=1500,
+            content_type="monster"
         )
         
         if not response:
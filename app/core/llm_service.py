@@ -6,19 +6,20 @@ Provides API integrations for OpenAI GPT-4.1-mini (preferred) and Anthropic Clau
 """
 
 import os
+import asyncio
 import json
 import time
 import logging
+import threading
 from enum import Enum
 from pathlib import Path
 import base64
 import uuid
 import hashlib
 
-import openai
-from openai import OpenAI
-import anthropic
-from PySide6.QtCore import QObject, Signal, QThreadPool, QRunnable, Slot, QMutex
+from PySide6.QtCore import QObject, Signal, QThreadPool, QRunnable, QMutex
+
+from app.core.llm_cache import LLMResponseCache, cache_key, DEFAULT_MAX_ENTRIES, DEFAULT_MAX_BYTES
 
 
 class ModelProvider(Enum):
@@ -63,42 +64,21 @@ class ModelInfo:
         return None
 
 
-class LLMWorker(QRunnable):
-    """Worker for running LLM API calls in a background thread"""
-    
-    def __init__(self, service, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000, request_id=None):
-        """Initialize the worker"""
-        super().__init__()
-        self.service = service
-        self.model = model
-        self.messages = messages
-        self.system_prompt = system_prompt
-        self.temperature = temperature
-        self.max_tokens = max_tokens
-        self.request_id = request_id
-    
-    @Slot()
-    def run(self):
-        """Run the API call in a background thread"""
-        try:
-            try:
-                response = self.service.generate_completion(
-                    self.model, 
-                    self.messages, 
-                    system_prompt=self.system_prompt,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens
-                )
-                logging.info(f"LLM generation completed. Response length: {len(response) if response else 0}")
-                logging.debug(f"Full response content: {response}")
-                print(f"[DEBUG] Emitting completion_ready with response: {repr(response)} from LLMService id: {id(self.service)}", flush=True)
-                self.service.completion_ready.emit(response, self.request_id)
-            except Exception as e:
-                logging.error(f"LLM API error: {str(e)}", exc_info=True)
-                print(f"[DEBUG] Exception in LLMWorker.run: {e}", flush=True)
-                self.service.completion_error.emit(str(e), self.request_id)
-        except Exception as outer_e:
-            print(f"[DEBUG] Outer exception in LLMWorker.run: {outer_e}", flush=True)
+def format_openai_messages(messages, system_prompt=None):
+    """Messages in OpenAI chat format, with the system prompt first"""
+    formatted_messages = []
+    if system_prompt:
+        formatted_messages.append({"role": "system", "content": system_prompt})
+    formatted_messages.extend(messages)
+    return formatted_messages
+
+
+def format_anthropic_messages(messages):
+    """Messages in Anthropic format (only user and assistant roles)"""
+    return [
+        {"role": "assistant" if msg["role"] == "assistant" else "user", "content": msg["content"]}
+        for msg in messages
+    ]
 
 
 class LLMService(QObject):
@@ -112,14 +92,18 @@ class LLMService(QObject):
     # Signals
     completion_ready = Signal(str, object)  # response, request_id
     completion_error = Signal(str, object)  # error message, request_id
+    completion_chunk = Signal(str, object)  # streamed text, request_id
+    cache_stats_changed = Signal(int, int)  # hits, misses
     
     def __init__(self, app_state):
         """Initialize the LLM service"""
         super().__init__()
         print(f"[DEBUG] LLMService instance created: {id(self)}", flush=True)
         self.app_state = app_state
-        self.openai_client = None
-        self.anthropic_client = None
+        # API clients are created on first use; importing the provider SDKs
+        # takes over a second, so it is kept off the startup path
+        self._openai_client = None
+        self._anthropic_client = None
         self.thread_pool = QThreadPool()
         self.mutex = QMutex()
         
@@ -127,9 +111,17 @@ class LLMService(QObject):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("LLMService")
         
-        # Initialize API clients
+        # Look up API keys (clients are created on first use)
         self._init_clients()
         
+        # Persistent response cache (opened on the first cacheable request)
+        self._response_cache = None
+        self._response_cache_opened = False
+        self._response_cache_lock = threading.Lock()
+        
+        # Asyncio backend for generate_completion_async (started on first use)
+        self.async_backend = None
+        
         # Ensure image directory exists
         self.monster_images_dir = self.app_state.app_dir / "data" / "monster_images"
         self.monster_images_dir.mkdir(parents=True, exist_ok=True)
@@ -147,92 +139,193 @@ class LLMService(QObject):
         if not anthropic_api_key:
             anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
         
-        # Initialize clients if we have keys
-        if openai_api_key:
-            try:
-                self.openai_client = OpenAI(api_key=openai_api_key)
-                self.logger.info("OpenAI client initialized")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize OpenAI client: {e}")
+        self.api_keys = {ModelProvider.OPENAI: openai_api_key, ModelProvider.ANTHROPIC: anthropic_api_key}
+    
+    def _create_client(self, provider, api_key):
+        """Import the provider SDK and create its client
         
-        if anthropic_api_key:
-            try:
-                self.anthropic_client = anthropic.Anthropic(api_key=anthropic_api_key)
+        Args:
+            provider (ModelProvider): The provider
+            api_key (str): API key for the provider
+            
+        Returns:
+            The client, or None if it could not be created
+        """
+        try:
+            if provider == ModelProvider.OPENAI:
+                from openai import OpenAI
+                client = OpenAI(api_key=api_key)
+                self.logger.info("OpenAI client initialized")
+            else:
+                import anthropic
+                client = anthropic.Anthropic(api_key=api_key)
                 self.logger.info("Anthropic client initialized")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize Anthropic client: {e}")
+            return client
+        except Exception as e:
+            self.logger.error(f"Failed to initialize {provider.value} client: {e}")
+            return None
+    
+    @property
+    def openai_client(self):
+        """OpenAI client, created on first use if an API key is set"""
+        if self._openai_client is None and self.api_keys.get(ModelProvider.OPENAI):
+            self._openai_client = self._create_client(ModelProvider.OPENAI, self.api_keys[ModelProvider.OPENAI])
+        return self._openai_client
+    
+    @openai_client.setter
+    def openai_client(self, client):
+        self._openai_client = client
+    
+    @property
+    def anthropic_client(self):
+        """Anthropic client, created on first use if an API key is set"""
+        if self._anthropic_client is None and self.api_keys.get(ModelProvider.ANTHROPIC):
+            self._anthropic_client = self._create_client(ModelProvider.ANTHROPIC, self.api_keys[ModelProvider.ANTHROPIC])
+        return self._anthropic_client
+    
+    @anthropic_client.setter
+    def anthropic_client(self, client):
+        self._anthropic_client = client
+    
+    @property
+    def response_cache(self):
+        """The response cache, opened on first use (None if it is unavailable)"""
+        if not self._response_cache_opened:
+            with self._response_cache_lock:
+                if not self._response_cache_opened:
+                    self._response_cache = self._init_response_cache()
+                    self._response_cache_opened = True
+        return self._response_cache
+    
+    @response_cache.setter
+    def response_cache(self, cache):
+        self._response_cache = cache
+        self._response_cache_opened = True
+    
+    def _init_response_cache(self):
+        """Open the response cache with limits from the llm_cache_* settings"""
+        try:
+            max_mb = self.app_state.get_setting("llm_cache_max_mb", None)
+            return LLMResponseCache(
+                self.app_state.app_dir / "data" / "llm" / "response_cache.db",
+                max_entries=int(self.app_state.get_setting("llm_cache_max_entries", None) or DEFAULT_MAX_ENTRIES),
+                max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES,
+                ttls=self.app_state.get_setting("llm_cache_ttls", None) or None,
+                on_stats=self.cache_stats_changed.emit
+            )
+        except Exception as e:
+            self.logger.error(f"LLM response cache disabled: {e}")
+            return None
     
     def set_api_key(self, provider, api_key):
         """Set API key for a provider"""
+        self.api_keys[provider] = api_key
+        if self.async_backend is not None:
+            self.async_backend.reset_client(provider)
+        
         if provider == ModelProvider.OPENAI:
             self.app_state.set_setting("openai_api_key", api_key)
-            try:
-                self.openai_client = OpenAI(api_key=api_key)
-                self.logger.info("OpenAI client updated with new API key")
-                return True
-            except Exception as e:
-                self.logger.error(f"Failed to update OpenAI client: {e}")
-                return False
+            self._openai_client = self._create_client(provider, api_key)
+            return self._openai_client is not None
         
         elif provider == ModelProvider.ANTHROPIC:
             self.app_state.set_setting("anthropic_api_key", api_key)
-            try:
-                self.anthropic_client = anthropic.Anthropic(api_key=api_key)
-                self.logger.info("Anthropic client updated with new API key")
-                return True
-            except Exception as e:
-                self.logger.error(f"Failed to update Anthropic client: {e}")
-                return False
+            self._anthropic_client = self._create_client(provider, api_key)
+            return self._anthropic_client is not None
         
         return False
     
-    def generate_completion(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000):
+    def generate_completion(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000,
+                            use_cache=True, content_type=None, on_chunk=None):
         """
         Generate a completion using the specified model
         
+        Identical requests are answered from the response cache. Without a
+        content_type only deterministic (temperature 0) requests are cached;
+        with one, that content type's TTL decides ("combat" is never cached).
+        
         Args:
             model: Model ID string
             messages: List of message dictionaries (role, content)
             system_prompt: Optional system prompt
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
+            use_cache: Set to False to bypass the response cache
+            content_type: Kind of content requested ("rules", "monster", "combat", ...)
+            on_chunk: Optional callable receiving the text as it is streamed
+                      (a cached response arrives as a single chunk)
             
         Returns:
             Generated text response
         """
+        key = self._response_cache_key(model, messages, system_prompt, temperature, max_tokens, use_cache, content_type)
+        if key is None:
+            return self._generate_uncached(model, messages, system_prompt, temperature, max_tokens, on_chunk=on_chunk)
+
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            if on_chunk:
+                on_chunk(cached)
+            return cached
+        result = self._generate_uncached(model, messages, system_prompt, temperature, max_tokens, on_chunk=on_chunk)
+        self.response_cache.put(key, result, model, content_type)
+        return result
+    
+    def _response_cache_key(self, model, messages, system_prompt, temperature, max_tokens, use_cache, content_type):
+        """Cache key for a request, or None if it should not be cached"""
+        if (not use_cache or not self.app_state.get_setting("llm_cache_enabled", True)
+                or (content_type is None and temperature > 0)):
+            return None
+        cache = self.response_cache
+        if cache is None or not cache.is_cacheable(content_type):
+            return None
+        return cache_key(model, system_prompt, messages, temperature, max_tokens)
+    
+    def _generate_uncached(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000, on_chunk=None):
+        """Send a completion request to the model's provider"""
         print(f"[DEBUG] generate_completion called on LLMService id: {id(self)} with model: {model}", flush=True)
         provider = ModelInfo.get_provider_for_model(model)
         if provider == ModelProvider.OPENAI:
-            result = self._generate_openai_completion(model, messages, system_prompt, temperature, max_tokens)
+            result = self._generate_openai_completion(model, messages, system_prompt, temperature, max_tokens, on_chunk)
             print(f"[DEBUG] generate_completion returning from _generate_openai_completion: {repr(result)}", flush=True)
             return result
         elif provider == ModelProvider.ANTHROPIC:
-            result = self._generate_anthropic_completion(model, messages, system_prompt, temperature, max_tokens)
+            result = self._generate_anthropic_completion(model, messages, system_prompt, temperature, max_tokens, on_chunk)
             print(f"[DEBUG] generate_completion returning from _generate_anthropic_completion: {repr(result)}", flush=True)
             return result
         else:
             raise ValueError(f"Unsupported model: {model}")
     
-    def _generate_openai_completion(self, model, messages, system_prompt, temperature, max_tokens):
-        """Generate a completion using OpenAI"""
+    def _generate_openai_completion(self, model, messages, system_prompt, temperature, max_tokens, on_chunk=None):
+        """Generate a completion using OpenAI (streamed to on_chunk if given)"""
         print(f"[DEBUG] _generate_openai_completion called with model: {model}", flush=True)
         if not self.openai_client:
             raise ValueError("OpenAI client not initialized. Please set an API key.")
         
         # Format messages for OpenAI
-        formatted_messages = []
-        
-        # Add system prompt if provided
-        if system_prompt:
-            formatted_messages.append({"role": "system", "content": system_prompt})
-        
-        # Add the rest of the messages
-        for msg in messages:
-            formatted_messages.append(msg)
+        formatted_messages = format_openai_messages(messages, system_prompt)
         
         try:
             self.logger.info(f"Sending request to OpenAI API. Model: {model}, Messages count: {len(formatted_messages)}")
             
+            if on_chunk:
+                stream = self.openai_client.chat.completions.create(
+                    model=model,
+                    messages=formatted_messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True
+                )
+                parts = []
+                for event in stream:
+                    text = event.choices[0].delta.content if event.choices else None
+                    if text:
+                        parts.append(text)
+                        on_chunk(text)
+                content = "".join(parts)
+                self.logger.info(f"Streamed response from OpenAI. Content length: {len(content)}")
+                return content
+            
             response = self.openai_client.chat.completions.create(
                 model=model,
                 messages=formatted_messages,
@@ -267,8 +360,8 @@ class LLMService(QObject):
             print(f"[DEBUG] Exception in _generate_openai_completion: {e}", flush=True)
             raise
     
-    def _generate_anthropic_completion(self, model, messages, system_prompt, temperature, max_tokens):
-        """Generate a completion using Anthropic"""
+    def _generate_anthropic_completion(self, model, messages, system_prompt, temperature, max_tokens, on_chunk=None):
+        """Generate a completion using Anthropic (streamed to on_chunk if given)"""
         print(f"[DEBUG] _generate_anthropic_completion called with model: {model}", flush=True)
         if not self.anthropic_client:
             raise ValueError("Anthropic client not initialized. Please set an API key.")
@@ -277,10 +370,21 @@ class LLMService(QObject):
         system = system_prompt if system_prompt else ""
         
         # Format messages for Anthropic
-        formatted_messages = []
-        for msg in messages:
-            role = "assistant" if msg["role"] == "assistant" else "user"
-            formatted_messages.append({"role": role, "content": msg["content"]})
+        formatted_messages = format_anthropic_messages(messages)
+        
+        if on_chunk:
+            parts = []
+            with self.anthropic_client.messages.stream(
+                model=model,
+                system=system,
+                messages=formatted_messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            ) as stream:
+                for text in stream.text_stream:
+                    parts.append(text)
+                    on_chunk(text)
+            return "".join(parts)
         
         response = self.anthropic_client.messages.create(
             model=model,
@@ -294,7 +398,81 @@ class LLMService(QObject):
         print(f"[DEBUG] _generate_anthropic_completion returning content: {repr(result)}", flush=True)
         return result
     
-    def generate_completion_async(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000):
+    def _get_async_backend(self):
+        """The asyncio backend, created on first use"""
+        if self.async_backend is None:
+            from app.core.llm_async import AsyncLLMBackend
+            from app.core.llm_service_patch import DEFAULT_PROVIDER_CONCURRENCY
+            limiter = getattr(self, "request_limiter", None)
+            self.async_backend = AsyncLLMBackend(
+                self.api_keys.get,
+                limiter.limits if limiter is not None else DEFAULT_PROVIDER_CONCURRENCY
+            )
+        return self.async_backend
+    
+    async def _generate_on_backend(self, model, messages, system_prompt, temperature, max_tokens,
+                                   use_cache, content_type, on_chunk):
+        """
+        Coroutine run on the backend loop: response cache, then the async provider client
+        
+        The cache is SQLite, so opening, reading and writing it run in a worker
+        thread rather than stalling the other requests on the loop.
+        """
+        key = await asyncio.to_thread(
+            self._response_cache_key, model, messages, system_prompt, temperature, max_tokens, use_cache, content_type
+        )
+        if key is not None:
+            cached = await asyncio.to_thread(self.response_cache.get, key)
+            if cached is not None:
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
+        result = await self.async_backend.complete(model, messages, system_prompt, temperature, max_tokens, on_chunk)
+        if key is not None:
+            await asyncio.to_thread(self.response_cache.put, key, result, model, content_type)
+        return result
+    
+    def submit_completion(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000,
+                          use_cache=True, content_type=None, on_chunk=None):
+        """
+        Start a completion on the asyncio backend
+        
+        Takes the same arguments as generate_completion. on_chunk is called
+        on the backend thread.
+        
+        Returns:
+            concurrent.futures.Future resolving to the response text
+        """
+        backend = self._get_async_backend()
+        messages = [dict(msg) for msg in messages]
+        return backend.submit(self._generate_on_backend(
+            model, messages, system_prompt, temperature, max_tokens, use_cache, content_type, on_chunk
+        ))
+    
+    def run_async(self, coroutine):
+        """
+        Run a coroutine (e.g. several agenerate_completion calls) on the asyncio backend
+        
+        Returns:
+            concurrent.futures.Future resolving to the coroutine's result
+        """
+        return self._get_async_backend().submit(coroutine)
+    
+    async def agenerate_completion(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000,
+                                   use_cache=True, content_type=None, on_chunk=None):
+        """
+        Awaitable generate_completion, usable from any event loop
+        
+        The request itself runs on the backend loop so the shared provider
+        clients are only ever used from one loop.
+        """
+        return await asyncio.wrap_future(self.submit_completion(
+            model, messages, system_prompt, temperature, max_tokens, use_cache, content_type, on_chunk
+        ))
+    
+    def generate_completion_async(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000,
+                                  callback=None, use_cache=True, content_type=None, request_id=None,
+                                  stream=False, chunk_callback=None):
         """
         Generate a completion asynchronously
         
@@ -304,12 +482,54 @@ class LLMService(QObject):
             system_prompt: Optional system prompt
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
+            callback: Optional callback(response, error) run on the backend thread;
+                      without one, completion_ready/completion_error are emitted
+            use_cache: Set to False to bypass the response cache
+            content_type: Kind of content requested (see generate_completion)
+            request_id: Passed back with the completion signals (generated if omitted)
+            stream: Emit completion_chunk for each piece of text as it arrives
+            chunk_callback: Optional callable(chunk) run on the backend thread when streaming
+            
+        Returns:
+            The request id
         """
-        worker = LLMWorker(
-            self, model, messages, system_prompt, temperature, max_tokens
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+        
+        def on_chunk(chunk):
+            self.completion_chunk.emit(chunk, request_id)
+            if chunk_callback:
+                chunk_callback(chunk)
+        
+        def on_done(future):
+            try:
+                response = future.result()
+            except Exception as e:
+                self.logger.error(f"LLM API error: {str(e)}", exc_info=e)
+                if callback:
+                    callback(None, str(e))
+                else:
+                    self.completion_error.emit(str(e), request_id)
+                return
+            self.logger.info(f"LLM generation completed. Response length: {len(response) if response else 0}")
+            if callback:
+                callback(response, None)
+            else:
+                self.completion_ready.emit(response, request_id)
+        
+        future = self.submit_completion(
+            model, messages, system_prompt, temperature, max_tokens,
+            use_cache=use_cache, content_type=content_type, on_chunk=on_chunk if stream else None
         )
-        print(f"[DEBUG] generate_completion_async called on LLMService id: {id(self)}, starting worker id: {id(worker)}", flush=True)
-        self.thread_pool.start(worker)
+        future.add_done_callback(on_done)
+        return request_id
+    
+    def close(self):
+        """Stop the asyncio backend and close the response cache"""
+        if self.async_backend is not None:
+            self.async_backend.shutdown()
+        if self._response_cache is not None:
+            self._response_cache.close()
     
     def is_provider_available(self, provider):
         """Check if a specific provider is available
@@ -320,10 +540,9 @@ class LLMService(QObject):
         Returns:
             bool: True if the provider is available, False otherwise
         """
-        if provider == ModelProvider.OPENAI:
-            return self.openai_client is not None
-        elif provider == ModelProvider.ANTHROPIC:
-            return self.anthropic_client is not None
+        # Judged by the API key so that listing models does not import the SDKs
+        if provider in (ModelProvider.OPENAI, ModelProvider.ANTHROPIC):
+            return bool(self.api_keys.get(provider))
         return False
     
     def get_available_models(self):
@@ -1,163 +1,179 @@
 """
 Patch module for the LLM service
 
-This module provides patches for the LLMService class to address
-thread-safety issues and memory management.
+This module wraps LLMService.generate_completion in a concurrency-safe
+request layer:
+
+- Each provider gets a bounded number of concurrent requests (a semaphore
+  per provider), so parallel callers such as the decision prefetcher can
+  overlap requests without flooding one API.
+- The message history is snapshotted into immutable (role, content) tuples
+  when the call is made. Strings are immutable, so this is a cheap shallow
+  copy; callers may keep mutating their own lists afterwards.
+- No forced garbage collections or deep copies happen on the request path.
+
+The layer wraps the provider dispatch (_generate_uncached) rather than
+generate_completion itself, so response cache hits never wait for a slot.
 """
 
 import logging
 import threading
-import gc
 import time
-import copy
+from contextlib import contextmanager
 from functools import wraps
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from app.core.llm_service import ModelInfo, ModelProvider
 
 logger = logging.getLogger("llm_service_patch")
 
-# Global lock for OpenAI API calls
-openai_api_lock = threading.RLock()
+# Concurrent requests allowed per provider unless overridden by the
+# "llm_max_concurrent_requests" setting (an int for all providers or a
+# {"openai": n, "anthropic": n} dict)
+DEFAULT_PROVIDER_CONCURRENCY = {
+    ModelProvider.OPENAI: 4,
+    ModelProvider.ANTHROPIC: 2,
+}
+
+# A message history frozen as ((role, content), ...)
+FrozenMessages = Tuple[Tuple[str, Any], ...]
+
+
+def freeze_messages(messages: Iterable[Mapping[str, Any]]) -> FrozenMessages:
+    """
+    Snapshot a message list as immutable (role, content) pairs.
+
+    Args:
+        messages: Message dictionaries with role and content
+
+    Returns:
+        Tuple of (role, content) tuples
+    """
+    if isinstance(messages, tuple) and all(isinstance(m, tuple) for m in messages):
+        return messages
+    return tuple((m.get("role", "user"), m.get("content", "")) for m in messages)
+
+
+def thaw_messages(messages: FrozenMessages):
+    """Fresh message dictionaries for an API call"""
+    return [{"role": role, "content": content} for role, content in messages]
+
+
+class ProviderConcurrency:
+    """Bounded per-provider concurrency for LLM requests"""
+
+    def __init__(self, limits: Optional[Dict[ModelProvider, int]] = None):
+        self.limits = dict(DEFAULT_PROVIDER_CONCURRENCY)
+        self.limits.update(limits or {})
+        self._semaphores = {provider: threading.BoundedSemaphore(max(1, n)) for provider, n in self.limits.items()}
+        self._fallback = threading.BoundedSemaphore(1)
+
+    @classmethod
+    def from_settings(cls, app_state) -> "ProviderConcurrency":
+        """Build limits from the llm_max_concurrent_requests setting"""
+        setting = None
+        if app_state is not None and hasattr(app_state, "get_setting"):
+            setting = app_state.get_setting("llm_max_concurrent_requests", None)
+        limits = {}
+        try:
+            if isinstance(setting, int):
+                limits = {provider: setting for provider in ModelProvider}
+            elif isinstance(setting, dict):
+                limits = {ModelProvider(key): int(value) for key, value in setting.items()}
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid llm_max_concurrent_requests setting {setting!r}: {e}")
+            limits = {}
+        return cls(limits)
+
+    @contextmanager
+    def slot(self, provider: Optional[ModelProvider]):
+        """Hold one request slot for the provider for the duration of the block"""
+        semaphore = self._semaphores.get(provider, self._fallback)
+        start = time.perf_counter()
+        semaphore.acquire()
+        waited = time.perf_counter() - start
+        if waited > 0.01:
+            logger.debug(f"Waited {waited:.2f}s for a {getattr(provider, 'value', provider)} request slot")
+        try:
+            yield
+        finally:
+            semaphore.release()
+
 
-def patch_llm_service(llm_service_instance):
+def patch_llm_service(llm_service_instance, app_state=None):
     """
-    Apply patches to an LLMService instance
-    
+    Attach the per-provider request limiter to an LLMService instance
+
     Args:
         llm_service_instance: The LLMService instance to patch
-        
+        app_state: Optional AppState to read concurrency settings from
+
     Returns:
         The patched instance
     """
-    logger.info("Applying patches to LLMService")
-    
-    # Patch _generate_openai_completion
-    original_generate_openai = llm_service_instance._generate_openai_completion
-    
-    @wraps(original_generate_openai)
-    def patched_generate_openai_completion(model, messages, system_prompt, temperature, max_tokens):
-        """Thread-safe version of _generate_openai_completion"""
-        logger.debug(f"Entering patched _generate_openai_completion for model {model}")
-        
-        # Force garbage collection before API call
-        gc.collect()
-        
-        # Create defensive copies of all parameters
-        safe_model = copy.deepcopy(model)
-        safe_messages = copy.deepcopy(messages)
-        safe_system_prompt = copy.deepcopy(system_prompt) if system_prompt else None
-        safe_temperature = float(temperature)
-        safe_max_tokens = int(max_tokens)
-        
-        try:
-            # Use the global lock to ensure thread safety
-            start_time = time.time()
-            logger.debug(f"Acquiring OpenAI API lock for model {safe_model}")
-            
-            with openai_api_lock:
-                logger.debug(f"Lock acquired for model {safe_model} after {time.time() - start_time:.2f}s")
-                
-                # Call the original method with defensive copies
-                result = original_generate_openai(
-                    safe_model, 
-                    safe_messages,
-                    safe_system_prompt,
-                    safe_temperature,
-                    safe_max_tokens
-                )
-                
-                logger.debug(f"OpenAI API call completed in {time.time() - start_time:.2f}s")
-            
-            # Force garbage collection after API call
-            gc.collect()
-            
-            return result
-        except Exception as e:
-            logger.error(f"Error in patched _generate_openai_completion: {e}", exc_info=True)
-            # Force garbage collection after error
-            gc.collect()
-            raise
-    
-    # Apply the patch
-    llm_service_instance._generate_openai_completion = patched_generate_openai_completion
-    logger.info("Successfully patched _generate_openai_completion")
-    
-    # Patch _generate_anthropic_completion if needed
-    # Similar pattern as above
-    
+    llm_service_instance.request_limiter = ProviderConcurrency.from_settings(app_state)
+    logger.info(f"LLM request limits: {({p.value: n for p, n in llm_service_instance.request_limiter.limits.items()})}")
     return llm_service_instance
 
 def patch_generate_completion(llm_service_instance):
     """
-    Patch the generate_completion method to add thread safety and error handling
-    
+    Route generate_completion through the concurrency-safe request layer
+
     Args:
         llm_service_instance: The LLMService instance to patch
-        
+
     Returns:
         The patched instance
     """
     logger.info("Patching generate_completion method")
-    
-    original_generate_completion = llm_service_instance.generate_completion
-    
+
+    if getattr(llm_service_instance, "request_limiter", None) is None:
+        patch_llm_service(llm_service_instance)
+    limiter = llm_service_instance.request_limiter
+    # Services with a response cache dispatch to the provider through _generate_uncached
+    target = "_generate_uncached" if hasattr(llm_service_instance, "_generate_uncached") else "generate_completion"
+    original_generate_completion = getattr(llm_service_instance, target)
+
     @wraps(original_generate_completion)
-    def patched_generate_completion(model, messages, system_prompt=None, temperature=0.7, max_tokens=1000):
-        """Thread-safe version of generate_completion with better error handling"""
-        logger.debug(f"Entering patched generate_completion for model {model}")
-        
-        # Force garbage collection
-        gc.collect()
-        
-        try:
-            # Create defensive copies
-            safe_model = copy.deepcopy(model)
-            safe_messages = copy.deepcopy(messages)
-            safe_system_prompt = copy.deepcopy(system_prompt) if system_prompt else None
-            
-            # Call original with global lock
-            with threading.RLock():
-                result = original_generate_completion(
-                    safe_model,
-                    safe_messages,
-                    safe_system_prompt,
-                    temperature,
-                    max_tokens
-                )
-            
-            # Force garbage collection
-            gc.collect()
-            
-            return result
-        except Exception as e:
-            logger.error(f"Error in patched generate_completion: {e}", exc_info=True)
-            # Force garbage collection after error
-            gc.collect()
-            raise
-    
+    def patched_generate_completion(model, messages, system_prompt=None, temperature=0.7, max_tokens=1000, **kwargs):
+        """generate_completion with per-provider concurrency and a frozen message snapshot"""
+        frozen = freeze_messages(messages)
+        provider = ModelInfo.get_provider_for_model(model)
+        with limiter.slot(provider):
+            return original_generate_completion(
+                model,
+                thaw_messages(frozen),
+                system_prompt,
+                temperature,
+                max_tokens,
+                **kwargs
+            )
+
     # Apply the patch
-    llm_service_instance.generate_completion = patched_generate_completion
-    logger.info("Successfully patched generate_completion")
-    
+    setattr(llm_service_instance, target, patched_generate_completion)
+    logger.info(f"Successfully patched {target}")
+
     return llm_service_instance
 
 def apply_llm_service_patches(app_state):
     """
     Apply all LLM service patches to the app state
-    
+
     Args:
         app_state: The AppState instance
-        
+
     Returns:
         The patched app_state
     """
     logger.info("Applying LLM service patches to app state")
-    
+
     try:
         # Patch the LLM service
-        patch_llm_service(app_state.llm_service)
+        patch_llm_service(app_state.llm_service, app_state)
         patch_generate_completion(app_state.llm_service)
-        
+
         logger.info("LLM service patches applied successfully")
     except Exception as e:
         logger.error(f"Error applying LLM service patches: {e}", exc_info=True)
-    
-    return app_state 
\ No newline at end of file
+
+    return app_state
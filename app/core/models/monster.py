@@ -1,10 +1,12 @@
 # app/core/models/monster.py
 
 import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, MISSING
 from typing import Optional, List, Dict, Any, Union
 import logging
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class MonsterAbility:
     """Represents a single ability score."""
@@ -139,19 +141,6 @@ class Monster:
         field_map = {f.metadata.get("json_key", f.name): f.name for f in cls.__dataclass_fields__.values()}
         mapped_data = {field_map.get(k, k): v for k, v in data.items()}
 
-        logger = logging.getLogger(__name__) # Get logger inside method
-        logger.debug(f"Monster.from_dict called with data: {data}")
-        
-        # Check if image_path is in the data
-        if 'image_path' in mapped_data:
-            logger.info(f"Found image_path in monster data: {mapped_data['image_path']}")
-        elif 'image_path' in data:
-            # Try to extract it directly if mapping failed
-            logger.info(f"Found image_path in original data: {data['image_path']}")
-            mapped_data['image_path'] = data['image_path']
-        else:
-            logger.warning("No image_path found in monster data")
-
         # Process nested dataclass structures
         for field_name, field_type in cls.__annotations__.items():
             # Skip if no value for this field
@@ -193,7 +182,6 @@ class Monster:
         # Create and return the monster object
         try:
             monster = cls(**mapped_data)
-            logger.debug(f"Successfully created monster from dict: {monster.name}, image_path: {monster.image_path}")
             return monster
         except Exception as e:
             logger.error(f"Error creating Monster object from dict: {e}")
@@ -202,22 +190,13 @@ class Monster:
     @classmethod
     def from_db_row(cls, row: Dict[str, Any], is_custom: bool = False) -> 'Monster':
         """Creates a Monster object from a database row (dictionary)."""
-        logger = logging.getLogger(__name__) # Get logger inside method
-        logger.debug(f"Monster.from_db_row called with is_custom={is_custom}, row keys: {list(row.keys())}")
-        
+        # Called once per monster loaded, so only log failures here
         if is_custom:
             # Custom monsters store data in a JSON blob
             try:
                 data_json = row.get('data', '{}')
-                logger.debug(f"Custom monster data JSON: {data_json[:150]}...") # Log start of JSON
                 monster_data = json.loads(data_json)
                 
-                # Check if image_path is in the serialized data
-                if 'image_path' in monster_data:
-                    logger.info(f"Found image_path in serialized data: {monster_data['image_path']}")
-                else:
-                    logger.warning(f"No image_path found in serialized monster data for ID {row.get('id')}")
-                
                 monster_data['id'] = row.get('id') # Add DB ID
                 monster_data['created_at'] = row.get('created_at')
                 monster_data['updated_at'] = row.get('updated_at')
@@ -226,10 +205,7 @@ class Monster:
                 # Ensure core fields are present even if missing in JSON blob
                 monster_data['name'] = row.get('name', monster_data.get('name', 'Unnamed Custom'))
 
-                monster = cls.from_dict(monster_data)
-                logger.debug(f"Created custom monster from DB row: {monster.name}, ID: {monster.id}")
-                logger.info(f"Custom monster image_path after from_dict: {monster.image_path}")
-                return monster
+                return cls.from_dict(monster_data)
             except Exception as e:
                 logger.error(f"Error creating custom monster from DB row: {e}", exc_info=True)
                 raise
@@ -299,14 +275,39 @@ class Monster:
                  if key in cls.__dataclass_fields__:
                     field_type = cls.__annotations__[key]
                     # Check if the field type is Optional (Union[T, None])
-                    is_optional = hasattr(field_type, '__origin__') and field_type.__origin__ is Optional
+                    is_optional = getattr(field_type, '__origin__', None) is Union and type(None) in field_type.__args__
 
                     if value is not None or is_optional:
                         final_init_data[key] = value
                     # If value is None but field isn't optional, use default factory/value
-                    elif hasattr(cls.__dataclass_fields__[key], 'default_factory') and cls.__dataclass_fields__[key].default_factory is not None:
+                    elif cls.__dataclass_fields__[key].default_factory is not MISSING:
                          final_init_data[key] = cls.__dataclass_fields__[key].default_factory()
-                    elif hasattr(cls.__dataclass_fields__[key], 'default') and cls.__dataclass_fields__[key].default is not None:
+                    elif cls.__dataclass_fields__[key].default not in (MISSING, None):
                          final_init_data[key] = cls.__dataclass_fields__[key].default
 
-            return cls(**final_init_data) 
\ No newline at end of file
+            return cls(**final_init_data) 
+
+@dataclass(slots=True)
+class MonsterSummary:
+    """
+    Lightweight compendium index entry for listing a monster.
+    Holds only the facet fields; load the full Monster with
+    DatabaseManager.get_monster_by_id when it is needed.
+    """
+    id: int
+    is_custom: bool
+    name: str
+    challenge_rating: str = "" # As entered, e.g. "1/2"
+    cr: Optional[float] = None # Numeric CR, e.g. 0.5
+    xp: int = 0
+    type: str = "" # Lowercase base type, e.g. "humanoid"
+    subtype: str = "" # e.g. "elf"
+    size: str = ""
+    alignment: str = ""
+    source: str = ""
+    updated_at: Optional[str] = None
+
+    @property
+    def key(self) -> tuple:
+        """(id, is_custom), which identifies the monster across both tables."""
+        return (self.id, self.is_custom)
@@ -14,16 +14,18 @@ logger = logging.getLogger("patched_app_state")
 def apply_patches():
     """Apply patches to the AppState class"""
     from app.core.app_state import AppState
-    from app.core.combat_initializer import init_stabilized_resolver
-    from app.core.llm_service_patch import apply_llm_service_patches
     
-    # Save original __init__ method
-    original_init = AppState.__init__
+    # Save original service factory; the services are created on first use
+    # or after startup rather than in __init__
+    original_create_services = AppState._create_services
     
-    # Define patched __init__ method
-    def patched_init(self):
-        # Call original __init__ first to set up basic state
-        original_init(self)
+    # Define patched service factory
+    def patched_create_services(self):
+        from app.core.combat_initializer import init_stabilized_resolver
+        from app.core.llm_service_patch import apply_llm_service_patches
+        
+        # Create the services first
+        original_create_services(self)
         
         logger.info("Applying stability patches")
         
@@ -53,5 +55,5 @@ def apply_patches():
             logger.warning("Using original unpatched resolver")
     
     # Apply the patch
-    AppState.__init__ = patched_init
+    AppState._create_services = patched_create_services
     logger.info("AppState patched successfully") 
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Background loading of the LLM services
+
+The LLM service and combat resolver import the provider SDKs, which takes
+longer than building the main window. ServiceLoader imports those modules
+on a worker thread once the window is up, then creates the services on the
+UI thread (they are QObjects and must live there). Anything that needs a
+service earlier simply creates it on first use.
+"""
+
+import importlib
+import logging
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from app.core.startup import StartupProfiler
+
+logger = logging.getLogger(__name__)
+
+# Imported on the worker thread, slowest first
+PRELOAD_MODULES = (
+    "openai",
+    "anthropic",
+    "app.core.llm_service",
+    "app.core.combat_resolver",
+    "app.core.llm_service_patch",
+    "app.core.combat_initializer",
+)
+
+
+class ServiceLoader(QObject):
+    """Imports the service modules in the background and then creates the services"""
+
+    modules_loaded = Signal()
+    services_ready = Signal()
+
+    def __init__(self, app_state, profiler: StartupProfiler = None, modules=PRELOAD_MODULES):
+        """
+        Args:
+            app_state: The AppState whose services are created
+            profiler: Optional startup profiler recording the two phases
+            modules: Modules to import on the worker thread
+        """
+        super().__init__()
+        self.app_state = app_state
+        self.profiler = profiler or StartupProfiler(enabled=False)
+        self.modules = modules
+        # Emitted from the worker thread, so this runs queued on the UI thread
+        self.modules_loaded.connect(self._create_services)
+
+    def start(self):
+        """Start importing the service modules"""
+        threading.Thread(target=self._import_modules, name="ServiceLoader", daemon=True).start()
+
+    def _import_modules(self):
+        with self.profiler.phase("Service imports (background)"):
+            for name in self.modules:
+                try:
+                    importlib.import_module(name)
+                except Exception as e:
+                    logger.warning("Could not preload %s: %s", name, e)
+        self.modules_loaded.emit()
+
+    def _create_services(self):
+        with self.profiler.phase("Service initialization"):
+            try:
+                self.app_state.init_services()
+            except Exception as e:
+                logger.error("Failed to initialize services: %s", e, exc_info=True)
+        self.services_ready.emit()
@@ -0,0 +1,163 @@
+"""
+Startup profiling for DM Screen
+
+StartupProfiler records how long each startup phase takes and, through an
+import hook, how long every module takes to import (its own code, and
+including the modules it imports). main.py enables it with
+--profile-startup and writes the report once the background services are
+ready.
+
+This module only uses the standard library, so it can be imported before
+Qt and the application modules whose import time it measures.
+"""
+
+import importlib.abc
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader to time exec_module"""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self.loader = loader
+        self.timer = timer
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        # The module itself should only ever see its real loader
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        self.timer.enter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.leave(module.__name__)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path hook measuring the import time of each newly imported module"""
+
+    def __init__(self):
+        self.times: Dict[str, Tuple[float, float]] = {}  # module -> (self, cumulative) seconds
+        self._local = threading.local()
+        self._finding = threading.local()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path, target=None):
+        if getattr(self._finding, "active", False):
+            return None
+        self._finding.active = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._finding.active = False
+
+    def enter(self):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append([time.perf_counter(), 0.0])  # start, time spent in nested imports
+
+    def leave(self, name: str):
+        start, nested = self._local.stack.pop()
+        total = time.perf_counter() - start
+        self.times[name] = (total - nested, total)
+        if self._local.stack:
+            self._local.stack[-1][1] += total
+
+    def slowest(self, count: int = 25) -> List[Tuple[str, float, float]]:
+        """The modules with the most import time of their own, slowest first"""
+        ranked = sorted(self.times.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, own, total) for name, (own, total) in ranked[:count]]
+
+
+class StartupProfiler:
+    """Per-phase timing of application startup"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: When False, phase() and mark() do nothing
+        """
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.phases: List[Tuple[str, float, Optional[float]]] = []  # name, start offset, duration
+        self.import_timer = ImportTimer() if enabled else None
+        if self.import_timer:
+            self.import_timer.install()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as a startup phase"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, started - self.start, time.perf_counter() - started))
+
+    def mark(self, name: str):
+        """Record a milestone at the current time"""
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - self.start, None))
+
+    def report(self, top_imports: int = 25) -> str:
+        """Format the phase timings and the slowest imports"""
+        lines = ["Startup profile", "", f"{'Phase':<40} {'at (ms)':>10} {'took (ms)':>10}"]
+        for name, offset, duration in sorted(self.phases, key=lambda phase: phase[1]):
+            took = f"{duration * 1000:10.1f}" if duration is not None else f"{'':>10}"
+            lines.append(f"{name:<40} {offset * 1000:10.1f} {took}")
+        if self.import_timer and self.import_timer.times:
+            total = sum(own for own, _ in self.import_timer.times.values())
+            lines += ["", f"Imports: {len(self.import_timer.times)} modules, {total * 1000:.1f} ms",
+                      f"{'Module':<50} {'self (ms)':>10} {'cumul. (ms)':>12}"]
+            for name, own, cumulative in self.import_timer.slowest(top_imports):
+                lines.append(f"{name:<50} {own * 1000:10.1f} {cumulative * 1000:12.1f}")
+        return "\n".join(lines)
+
+    def finish(self, path: Optional[Path] = None) -> str:
+        """
+        Stop timing imports and output the report
+
+        Args:
+            path: Optional file to write the report to
+
+        Returns:
+            The report text
+        """
+        if self.import_timer:
+            self.import_timer.uninstall()
+        text = self.report()
+        print(text)
+        if path is not None:
+            try:
+                Path(path).write_text(text + "\n", encoding="utf-8")
+            except OSError as e:
+                logger.warning("Could not write startup profile to %s: %s", path, e)
+        return text
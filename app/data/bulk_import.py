@@ -0,0 +1,255 @@
+"""
+Bulk import of JSON data into database tables
+
+Records are read from the file one at a time (a top-level JSON array is
+decoded incrementally, so memory use does not grow with the file size),
+checked against the target table's schema and inserted with executemany in
+batches. The caller decides the transaction; DatabaseManager wraps the
+whole import in one, so thousands of records cost a single commit.
+"""
+
+import codecs
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Records inserted per executemany call
+BATCH_SIZE = 500
+
+# Bytes read from the file at a time
+CHUNK_SIZE = 64 * 1024
+
+# Validation errors kept on the result (the rest are only counted)
+MAX_REPORTED_ERRORS = 20
+
+# progress(records_imported, bytes_read, total_bytes)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+class ImportValidationError(ValueError):
+    """A record does not fit the target table"""
+
+
+@dataclass
+class ColumnInfo:
+    """Column of a table, from PRAGMA table_info"""
+    name: str
+    type: str
+    required: bool
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a bulk import"""
+    imported: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def table_schema(connection: sqlite3.Connection, table: str) -> Dict[str, ColumnInfo]:
+    """
+    Read the columns of a table
+
+    Args:
+        connection: Database connection
+        table: Table name
+
+    Returns:
+        Columns by name; a column is required when it is NOT NULL without a
+        default and is not the integer primary key
+    """
+    rows = connection.execute("SELECT name, type, \"notnull\", dflt_value, pk FROM pragma_table_info(?)",
+                              (table,)).fetchall()
+    if not rows:
+        raise ImportValidationError(f"Unknown table '{table}'")
+    return {
+        name: ColumnInfo(name, (col_type or "").upper(), bool(notnull) and default is None and not pk)
+        for name, col_type, notnull, default, pk in rows
+    }
+
+
+def validate_record(record: Any, schema: Dict[str, ColumnInfo]) -> Dict[str, Any]:
+    """
+    Check a record against a table schema and convert its values for storage
+
+    Lists and objects are stored as JSON text, and numeric strings in
+    INTEGER columns are converted to numbers.
+
+    Args:
+        record: Decoded JSON value for one row
+        schema: Columns of the target table (see table_schema)
+
+    Returns:
+        Column values for the row
+
+    Raises:
+        ImportValidationError: If the record cannot be stored in the table
+    """
+    if not isinstance(record, dict):
+        raise ImportValidationError(f"expected an object, got {type(record).__name__}")
+    unknown = [key for key in record if key not in schema]
+    if unknown:
+        raise ImportValidationError(f"unknown columns {', '.join(sorted(unknown))}")
+    missing = [column.name for column in schema.values() if column.required and record.get(column.name) is None]
+    if missing:
+        raise ImportValidationError(f"missing required columns {', '.join(missing)}")
+
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value)
+        elif "INT" in schema[key].type and value is not None and not isinstance(value, int):
+            try:
+                value = int(str(value).strip())
+            except ValueError:
+                raise ImportValidationError(f"column {key} expects an integer, got {value!r}") from None
+        row[key] = value
+    return row
+
+
+def iter_json_records(json_file, chunk_size: int = CHUNK_SIZE,
+                      on_read: Optional[Callable[[int], None]] = None) -> Iterator[Any]:
+    """
+    Yield the records of a JSON file without loading the whole file
+
+    A top-level array yields its elements one by one; any other top-level
+    value is yielded as a single record.
+
+    Args:
+        json_file: Path to the JSON file
+        chunk_size: Bytes read at a time
+        on_read: Called with the number of bytes read so far
+    """
+    decoder = json.JSONDecoder()
+    with open(json_file, "rb") as f:
+        reader = _ChunkReader(f, chunk_size, on_read)
+        reader.skip_whitespace()
+        if reader.peek() != "[":
+            # Single object: it has to be decoded in one piece anyway
+            yield json.loads(reader.read_rest())
+            return
+        reader.pos += 1
+        reader.skip_whitespace()
+        if reader.peek() == "]":
+            return
+        while True:
+            reader.skip_whitespace()
+            yield reader.decode(decoder)
+            reader.skip_whitespace()
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expected ',' or ']'", reader.buffer, reader.pos - 1)
+
+
+class _ChunkReader:
+    """Text buffer over a binary file, refilled as values are decoded"""
+
+    def __init__(self, f, chunk_size: int, on_read: Optional[Callable[[int], None]]):
+        self.file = f
+        self.chunk_size = chunk_size
+        self.on_read = on_read
+        self.bytes_read = 0
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # Handles multi-byte characters split across chunks and a leading BOM
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was consumed"""
+        if self.eof:
+            return False
+        data = self.file.read(self.chunk_size)
+        self.bytes_read += len(data)
+        self.eof = not data
+        if self.on_read and data:
+            self.on_read(self.bytes_read)
+        self.buffer = self.buffer[self.pos:] + self._decoder.decode(data, final=self.eof)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while self.pos >= len(self.buffer):
+            if not self.fill():
+                return ""
+        return self.buffer[self.pos]
+
+    def skip_whitespace(self):
+        while self.peek() and self.peek() in " \t\r\n":
+            self.pos += 1
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the value at the current position, reading more as needed"""
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+    def read_rest(self) -> str:
+        while self.fill():
+            pass
+        return self.buffer[self.pos:]
+
+
+def import_records(connection: sqlite3.Connection, table: str, records: Iterator[Any],
+                   on_progress: Optional[Callable[[int], None]] = None,
+                   batch_size: int = BATCH_SIZE) -> ImportResult:
+    """
+    Validate records and insert them into a table in batches
+
+    Records that fail validation are skipped and reported on the result.
+    Does not commit; run it inside a transaction.
+
+    Args:
+        connection: Database connection
+        table: Table name
+        records: Decoded JSON records
+        on_progress: Called with the number of records imported after each batch
+        batch_size: Records per executemany call
+
+    Returns:
+        ImportResult with the imported and skipped counts
+    """
+    schema = table_schema(connection, table)
+    result = ImportResult()
+    # Pending rows grouped by their column set, one INSERT statement each
+    batches: Dict[Tuple[str, ...], List[tuple]] = {}
+
+    def flush(columns: Tuple[str, ...]):
+        rows = batches.pop(columns)
+        column_list = ", ".join(f'"{name}"' for name in columns)
+        placeholders = ", ".join("?" * len(columns))
+        connection.executemany(f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})', rows)
+        result.imported += len(rows)
+        if on_progress:
+            on_progress(result.imported)
+
+    for number, record in enumerate(records, 1):
+        try:
+            row = validate_record(record, schema)
+        except ImportValidationError as e:
+            result.skipped += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(f"Record {number}: {e}")
+            continue
+        columns = tuple(row)
+        batch = batches.setdefault(columns, [])
+        batch.append(tuple(row.values()))
+        if len(batch) >= batch_size:
+            flush(columns)
+    for columns in list(batches):
+        flush(columns)
+    return result
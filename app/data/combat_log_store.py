@@ -0,0 +1,373 @@
+"""
+Persistent, append-only combat log
+
+Every combat log entry and every turn delta the combat tracker applies is
+written to the combat_log table, grouped into sessions. Writes are queued
+and committed in batches by a background writer thread, so logging never
+waits on the disk. The log survives crashes and does not have to be kept in
+memory: the combat log panel reloads its entries from here, and replay()
+feeds the recorded turn deltas back to the combat tracker.
+
+Rows cannot be updated; sessions can only be deleted as a whole.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from app.combat.turn_delta import TurnDelta
+from app.data.connection import ConnectionManager
+
+logger = logging.getLogger(__name__)
+
+# Most rows written in one transaction
+WRITE_BATCH_SIZE = 500
+
+# Seconds the writer waits for more rows before committing a batch
+FLUSH_INTERVAL = 0.2
+
+# Category of the rows holding turn deltas recorded by the combat tracker
+TURN_DELTA_CATEGORY = "Turn Delta"
+
+_INSERT_ENTRY = """
+    INSERT INTO combat_log (session_id, timestamp, round, turn, actor, target, category, payload)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_SESSION = "INSERT INTO combat_log_sessions (id, title, started_at) VALUES (?, ?, ?)"
+_END_SESSION = "UPDATE combat_log_sessions SET ended_at = ? WHERE id = ? AND ended_at IS NULL"
+
+# Queued to make the writer commit without waiting for more rows
+_FLUSH = ("flush",)
+
+
+@dataclass(frozen=True)
+class CombatLogRecord:
+    """One row of the combat log"""
+    id: int
+    session_id: str
+    timestamp: str
+    round: Optional[int]
+    turn: Optional[int]
+    actor: str
+    target: Optional[str]
+    category: str
+    payload: Dict[str, Any]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "CombatLogRecord":
+        return cls(row["id"], row["session_id"], row["timestamp"], row["round"], row["turn"],
+                   row["actor"], row["target"], row["category"], json.loads(row["payload"] or "{}"))
+
+
+def create_tables(conn: sqlite3.Connection):
+    """Create the combat log tables, indexes and the append-only trigger"""
+    conn.executescript("""
+    CREATE TABLE IF NOT EXISTS combat_log_sessions (
+        id TEXT PRIMARY KEY,
+        title TEXT,
+        started_at TEXT NOT NULL,
+        ended_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS combat_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL REFERENCES combat_log_sessions(id),
+        timestamp TEXT NOT NULL,
+        round INTEGER,
+        turn INTEGER,
+        actor TEXT NOT NULL DEFAULT '',
+        target TEXT,
+        category TEXT NOT NULL,
+        payload TEXT NOT NULL DEFAULT '{}'
+    );
+    CREATE INDEX IF NOT EXISTS idx_combat_log_session ON combat_log(session_id, id);
+    CREATE INDEX IF NOT EXISTS idx_combat_log_actor ON combat_log(session_id, actor, id);
+    CREATE INDEX IF NOT EXISTS idx_combat_log_round ON combat_log(session_id, round, turn, id);
+    CREATE TRIGGER IF NOT EXISTS combat_log_append_only BEFORE UPDATE ON combat_log
+    BEGIN
+        SELECT RAISE(ABORT, 'combat_log is append-only');
+    END;
+    """)
+    conn.commit()
+
+
+class _BatchWriter(threading.Thread):
+    """Background thread committing queued statements in batches"""
+
+    def __init__(self, connections: ConnectionManager):
+        super().__init__(name="CombatLogWriter", daemon=True)
+        self.connections = connections
+        self.queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            taken, batch = 1, []
+            # Give a burst of entries time to arrive so it commits together;
+            # a flush request or stop commits what has arrived right away
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                if item is _FLUSH:
+                    break
+                batch.append(item)
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                taken += 1
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                for _ in range(taken):
+                    self.queue.task_done()
+
+    def _write(self, batch: List[tuple]):
+        """Write a batch in one transaction, running consecutive inserts as executemany"""
+        try:
+            with self.connections.transaction() as conn:
+                start = 0
+                while start < len(batch):
+                    sql = batch[start][0]
+                    end = start
+                    while end < len(batch) and batch[end][0] == sql:
+                        end += 1
+                    conn.executemany(sql, [params for _, params in batch[start:end]])
+                    start = end
+        except sqlite3.Error as e:
+            logger.error("Could not write %d combat log rows: %s", len(batch), e)
+
+    def submit(self, sql: str, params: tuple):
+        self.queue.put((sql, params))
+
+    def flush(self):
+        """Commit the queued rows now and wait until they are written"""
+        self.queue.put(_FLUSH)
+        self.queue.join()
+
+
+class CombatLogStore:
+    """Append-only combat log in the application database"""
+
+    def __init__(self, connections: ConnectionManager):
+        """
+        Args:
+            connections: Connection manager of the application database;
+                         the writer thread uses its own connection from it
+        """
+        self.connections = connections
+        create_tables(connections.get())
+        self._writer: Optional[_BatchWriter] = None
+        self._lock = threading.Lock()
+        self._session_id: Optional[str] = None
+
+    # Sessions
+
+    @property
+    def session_id(self) -> str:
+        """The session new entries are written to, started on first use"""
+        if self._session_id is None:
+            self.start_session()
+        return self._session_id
+
+    @property
+    def active_session_id(self) -> Optional[str]:
+        """The current session, or None if no entry has been written since the last one ended"""
+        return self._session_id
+
+    def start_session(self, title: Optional[str] = None) -> str:
+        """
+        End the current session and start a new one
+
+        Returns:
+            The new session's ID
+        """
+        self.end_session()
+        session_id = uuid.uuid4().hex
+        self._submit(_INSERT_SESSION, (session_id, title, datetime.now().isoformat()))
+        self._session_id = session_id
+        return session_id
+
+    def resume_session(self, session_id: str):
+        """Write new entries to an existing session, e.g. after a restart"""
+        if session_id != self._session_id:
+            self.end_session()
+            self._session_id = session_id
+
+    def end_session(self):
+        """Mark the current session as ended; the next entry starts a new one"""
+        if self._session_id is not None:
+            self._submit(_END_SESSION, (datetime.now().isoformat(), self._session_id))
+            self._session_id = None
+
+    def sessions(self, unfinished_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        List sessions, newest first
+
+        Args:
+            unfinished_only: Only sessions that were never ended, e.g. because
+                             the application crashed
+
+        Returns:
+            Dicts with id, title, started_at, ended_at and entry_count
+        """
+        self.flush()
+        query = """
+            SELECT s.id, s.title, s.started_at, s.ended_at,
+                   (SELECT COUNT(*) FROM combat_log l WHERE l.session_id = s.id) AS entry_count
+            FROM combat_log_sessions s
+        """
+        if unfinished_only:
+            query += " WHERE s.ended_at IS NULL"
+        query += " ORDER BY s.started_at DESC"
+        return [dict(row) for row in self.connections.get().execute(query)]
+
+    def delete_session(self, session_id: str):
+        """Delete a session and all of its entries"""
+        self.flush()
+        if session_id == self._session_id:
+            self._session_id = None
+        with self.connections.transaction() as conn:
+            conn.execute("DELETE FROM combat_log WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM combat_log_sessions WHERE id = ?", (session_id,))
+
+    # Writing
+
+    def append(self, category: str, actor: str = "", target: Optional[str] = None,
+               round_num: Optional[int] = None, turn_num: Optional[int] = None,
+               payload: Optional[Dict[str, Any]] = None, timestamp: Optional[datetime] = None,
+               session_id: Optional[str] = None):
+        """
+        Queue an entry for writing; returns without waiting for the disk
+
+        Args:
+            category: Entry category
+            actor: Who performed the action
+            target: Who received it, if anyone
+            round_num: Combat round
+            turn_num: Combat turn
+            payload: Any other JSON-serializable data of the entry
+            timestamp: When it happened, now by default
+            session_id: Session to write to, the current one by default
+        """
+        self._submit(_INSERT_ENTRY, (
+            session_id or self.session_id,
+            (timestamp or datetime.now()).isoformat(),
+            round_num, turn_num, actor or "", target, category,
+            json.dumps(payload or {}, default=str)
+        ))
+
+    def record_turn_delta(self, delta: TurnDelta, session_id: Optional[str] = None):
+        """Queue a turn delta applied by the combat tracker, for replay"""
+        actor = (delta.latest_action or {}).get("actor", "")
+        self.append(TURN_DELTA_CATEGORY, actor, round_num=delta.round, turn_num=delta.current_turn_index,
+                    payload={"delta": delta.to_dict()}, session_id=session_id)
+
+    def _submit(self, sql: str, params: tuple):
+        with self._lock:
+            if self._writer is None:
+                if self.connections.closed:
+                    raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+                self._writer = _BatchWriter(self.connections)
+                self._writer.start()
+            self._writer.submit(sql, params)
+
+    def flush(self):
+        """Wait until every queued entry has been written"""
+        writer = self._writer
+        if writer is not None:
+            writer.flush()
+
+    def close(self):
+        """End the current session, write the queued entries and stop the writer thread"""
+        if self._writer is not None:
+            self.end_session()
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.queue.put(None)
+            writer.join()
+
+    # Reading
+
+    def entries(self, session_id: Optional[str] = None, actor: Optional[str] = None,
+                round_num: Optional[int] = None, categories: Optional[Sequence[str]] = None,
+                exclude_categories: Sequence[str] = (), limit: Optional[int] = None,
+                newest: bool = False) -> List[CombatLogRecord]:
+        """
+        Query the entries of a session, oldest first
+
+        Args:
+            session_id: Session to read, the current one by default
+            actor: Only entries of this actor
+            round_num: Only entries of this round
+            categories: Only entries in these categories
+            exclude_categories: Leave out entries in these categories
+            limit: Most entries to return
+            newest: With a limit, return the newest entries instead of the oldest
+
+        Returns:
+            CombatLogRecords in the order they were written
+        """
+        self.flush()
+        clauses, params = ["session_id = ?"], [session_id or self._session_id]
+        if actor is not None:
+            clauses.append("actor = ?")
+            params.append(actor)
+        if round_num is not None:
+            clauses.append("round = ?")
+            params.append(round_num)
+        if categories:
+            clauses.append(f"category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        if exclude_categories:
+            clauses.append(f"category NOT IN ({', '.join('?' * len(exclude_categories))})")
+            params.extend(exclude_categories)
+        query = f"SELECT * FROM combat_log WHERE {' AND '.join(clauses)} ORDER BY id {'DESC' if newest else 'ASC'}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self.connections.get().execute(query, params).fetchall()
+        if newest:
+            rows.reverse()
+        return [CombatLogRecord.from_row(row) for row in rows]
+
+    def iter_turn_deltas(self, session_id: Optional[str] = None,
+                         up_to_round: Optional[int] = None) -> Iterator[TurnDelta]:
+        """The recorded turn deltas of a session, in the order they were applied"""
+        for record in self.entries(session_id, categories=(TURN_DELTA_CATEGORY,)):
+            if up_to_round is not None and (record.round or 0) > up_to_round:
+                break
+            yield TurnDelta.from_dict(record.payload["delta"])
+
+    def replay(self, apply: Callable[[TurnDelta], Any], session_id: Optional[str] = None,
+               up_to_round: Optional[int] = None) -> int:
+        """
+        Feed a session's recorded turn deltas to a consumer
+
+        Args:
+            apply: Callable receiving each TurnDelta (marked as replayed), e.g.
+                   the combat tracker's turn pacer
+            session_id: Session to replay, the current one by default
+            up_to_round: Stop after this round
+
+        Returns:
+            Number of deltas replayed
+        """
+        count = 0
+        for delta in self.iter_turn_deltas(session_id, up_to_round):
+            apply(delta)
+            count += 1
+        return count
@@ -0,0 +1,164 @@
+"""
+SQLite connection management shared by the data managers
+
+Each thread gets its own connection to the database file, so background
+workers (LLM generation, combat resolution) can write while the UI thread
+reads. Connections run in WAL journal mode, where readers never block the
+writer and vice versa; concurrent writers wait up to BUSY_TIMEOUT seconds
+instead of failing with "database is locked".
+
+Python's sqlite3 module keeps a cache of compiled statements on every
+connection, keyed by the SQL text. Reusing one long-lived connection per
+thread, with a larger cache, means repeated queries skip the SQL compiler;
+queries should pass values as parameters rather than formatting them into
+the SQL so their text stays the same.
+"""
+
+import logging
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Seconds a writer waits for another thread's write transaction to finish
+BUSY_TIMEOUT = 10.0
+
+# Page cache per connection, in KiB
+CACHE_SIZE_KB = 16 * 1024
+
+# Compiled statements kept per connection
+STATEMENT_CACHE_SIZE = 256
+
+# Applied to every new connection. synchronous=NORMAL is safe in WAL mode:
+# a power loss can roll back the last commits but never corrupts the file.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KB}",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class _ThreadConnection:
+    """Per-thread marker whose finalization closes the thread's connection"""
+    __slots__ = ("__weakref__",)
+
+
+def _close_connection(connections: Dict[int, sqlite3.Connection], lock: threading.Lock, key: int):
+    """Close a finished thread's connection (called by its holder's finalizer)"""
+    with lock:
+        connection = connections.pop(key, None)
+    if connection is not None:
+        try:
+            connection.close()
+        except sqlite3.Error as e:
+            logger.warning("Error closing database connection: %s", e)
+
+
+class ConnectionManager:
+    """Per-thread SQLite connections to one database file"""
+
+    def __init__(self, db_path, timeout: float = BUSY_TIMEOUT):
+        """
+        Args:
+            db_path: SQLite database file
+            timeout: Seconds to wait for a lock held by another connection
+        """
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self.wal_enabled = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._closed = False
+
+    def get(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            connection = self._open()
+            self._local.connection = connection
+            self._local.depth = 0
+        return connection
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a connection for the calling thread"""
+        # check_same_thread is off only so close() and the thread-exit
+        # finalizer can close it; each connection is still used by one thread.
+        connection = sqlite3.connect(str(self.db_path), timeout=self.timeout,
+                                     check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        connection.row_factory = sqlite3.Row
+        if not self.wal_enabled:
+            # WAL mode is stored in the database file, so setting it once is enough
+            mode = connection.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            self.wal_enabled = mode.lower() == "wal"
+            if not self.wal_enabled:
+                logger.warning("WAL journal mode unavailable for %s (using %s)", self.db_path, mode)
+        for pragma in CONNECTION_PRAGMAS:
+            connection.execute(pragma)
+
+        # The holder lives only in this thread's locals, which Python releases
+        # when the thread exits (including threads started by Qt or _thread),
+        # so its finalizer closes the connection of a finished thread.
+        holder = _ThreadConnection()
+        key = id(holder)
+        with self._lock:
+            self._connections[key] = connection
+        weakref.finalize(holder, _close_connection, self._connections, self._lock, key)
+        self._local.holder = holder
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Group the calling thread's writes into a single transaction
+
+        Commits when the outermost block exits and rolls back if it raises.
+        While a block is open, commit() is deferred to the end of the block.
+        """
+        connection = self.get()
+        self._local.depth += 1
+        try:
+            yield connection
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                connection.rollback()
+            raise
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            connection.commit()
+
+    def in_transaction(self) -> bool:
+        """Check whether the calling thread is inside transaction()"""
+        return getattr(self._local, "depth", 0) > 0
+
+    def commit(self):
+        """Commit the calling thread's changes unless a transaction() block is open"""
+        if not self.in_transaction():
+            self.get().commit()
+
+    def rollback(self):
+        """Roll back the calling thread's uncommitted changes"""
+        self.get().rollback()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self):
+        """Close the connections of all threads"""
+        with self._lock:
+            for connection in self._connections.values():
+                try:
+                    connection.close()
+                except sqlite3.Error as e:
+                    logger.warning("Error closing database connection: %s", e)
+            self._connections.clear()
+            self._closed = True
+        self._local = threading.local()
@@ -5,28 +5,44 @@ Database manager for the DM Screen application
 Handles database connections, schema management, and common queries.
 """
 
+import copy
 import os
 import sqlite3
+import threading
 from datetime import datetime, timezone
 import json
 import random
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 from app.core.config import get_database_path
-from app.core.models.monster import Monster
+from app.core.models.monster import Monster, MonsterSummary
+from app.data import bulk_import, fulltext, monster_index
+from app.data.bulk_import import ProgressCallback
+from app.data.connection import ConnectionManager
+
+# Number of fully loaded monsters kept by get_monster_by_id
+MONSTER_CACHE_SIZE = 128
 
 
 class DatabaseManager:
     """
     Manages database connections and operations for the application
+
+    Every thread uses its own connection (see app.data.connection), so the
+    manager can be shared with worker threads.
     """
     
     def __init__(self, app_state):
         """Initialize the database manager"""
         self.app_state = app_state
         self.db_path = get_database_path()
-        self.connection = None
+        self.connections = None
+        self.fts_enabled = False
+        # LRU cache of loaded monsters, keyed by (id, is_custom)
+        self._monster_cache: "OrderedDict[tuple, Monster]" = OrderedDict()
+        self._monster_cache_lock = threading.Lock()
         
         # Initialize the database
         self._init_database()
@@ -36,14 +52,20 @@ class DatabaseManager:
         # Ensure data directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        # Connect to the database
-        self.connection = sqlite3.connect(str(self.db_path))
-        self.connection.row_factory = sqlite3.Row
+        # Per-thread connections in WAL mode
+        self.connections = ConnectionManager(self.db_path)
         
         # Create tables if they don't exist
         self._create_tables()
         # Migrate schema for session_notes (add origin_note_id if missing)
         self._migrate_session_notes_schema()
+        # Full-text index for searching session notes
+        self.fts_enabled = fulltext.ensure_fts_index(self.connection, "session_notes")
+        # Compendium index of monster facets (CR, type, size, ...)
+        try:
+            monster_index.sync_monster_index(self.connection)
+        except sqlite3.Error as e:
+            print(f"Database error building the monster index: {e}")
     
     def _migrate_session_notes_schema(self):
         """
@@ -56,7 +78,24 @@ class DatabaseManager:
         columns = [row[1] for row in cursor.fetchall()]
         if "origin_note_id" not in columns:
             cursor.execute("ALTER TABLE session_notes ADD COLUMN origin_note_id INTEGER")
-            self.connection.commit()
+            self.connections.commit()
+    
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """The calling thread's database connection, or None once closed"""
+        if self.connections is None or self.connections.closed:
+            return None
+        return self.connections.get()
+    
+    def transaction(self):
+        """
+        Context manager grouping writes from the calling thread into one transaction
+        
+        execute_update, insert, update and delete commit individually
+        outside such a block; inside it they are committed (or rolled back
+        on an exception) together when the block exits.
+        """
+        return self.connections.transaction()
     
     def _create_tables(self):
         """Create database tables if they don't exist"""
@@ -172,12 +211,12 @@ class DatabaseManager:
         ''')
         
         # Commit the changes
-        self.connection.commit()
+        self.connections.commit()
     
     def close(self):
-        """Close the database connection"""
-        if self.connection:
-            self.connection.close()
+        """Close the database connections of all threads"""
+        if self.connections:
+            self.connections.close()
     
     def execute_query(self, query, parameters=None):
         """
@@ -219,7 +258,7 @@ class DatabaseManager:
         else:
             cursor.execute(query)
         
-        self.connection.commit()
+        self.connections.commit()
         return cursor.rowcount
     
     def insert(self, table, data):
@@ -246,7 +285,7 @@ class DatabaseManager:
             
             cursor = self.connection.cursor()
             cursor.execute(query, values)
-            self.connection.commit()
+            self.connections.commit()
             
             # Get the last row ID
             row_id = cursor.lastrowid
@@ -343,33 +382,74 @@ class DatabaseManager:
             print(f"An unexpected error occurred during delete: {e}")
             return None
     
-    def import_json_data(self, table, json_file):
+    def search_session_notes(self, text: str, limit: int = 500) -> Optional[List[Dict[str, Any]]]:
+        """
+        Full-text search of session notes, best match first
+
+        Args:
+            text: Words to search for (the last word also matches as a prefix)
+            limit: Maximum number of notes to return
+
+        Returns:
+            Matching notes as dictionaries, each with a 'snippet' of the
+            matching text (matches wrapped in <b></b>), or None if the
+            full-text index is unavailable
+        """
+        if not self.fts_enabled:
+            return None
+        try:
+            return fulltext.search(self.connection, "session_notes", text, limit)
+        except sqlite3.Error as e:
+            print(f"Database error during session note search for '{text}': {e}")
+            return None
+
+    def import_json_data(self, table, json_file, progress: Optional[ProgressCallback] = None):
         """
         Import data from a JSON file into a table
         
+        The file is read incrementally and all records are inserted in a
+        single transaction: either every valid record is imported or, on a
+        database error, none is. Records that do not match the table's
+        columns are skipped.
+        
         Args:
             table: Table name
-            json_file: Path to the JSON file
+            json_file: Path to the JSON file (an array of objects, or one object)
+            progress: Optional callable(records_imported, bytes_read, total_bytes),
+                      called after each batch of records
             
         Returns:
             Number of imported rows
         """
+        total_bytes = os.path.getsize(json_file) if os.path.exists(json_file) else 0
+        bytes_read = 0
+        
+        def on_read(count):
+            nonlocal bytes_read
+            bytes_read = count
+        
+        on_progress = (lambda imported: progress(imported, bytes_read, total_bytes)) if progress else None
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                data = [data]
-            
-            count = 0
-            for item in data:
-                self.insert(table, item)
-                count += 1
-            
-            return count
-        except Exception as e:
+            records = bulk_import.iter_json_records(json_file, on_read=on_read)
+            with self.transaction() as connection:
+                result = bulk_import.import_records(connection, table, records, on_progress)
+        except (OSError, ValueError, sqlite3.Error) as e:
             print(f"Error importing data: {e}")
             return 0
+        
+        if result.skipped:
+            print(f"Skipped {result.skipped} invalid records importing {json_file} into {table}:")
+            for error in result.errors:
+                print(f"  {error}")
+        
+        if table in ("monsters", "custom_monsters"):
+            try:
+                monster_index.rebuild_monster_index(self.connection)
+            except sqlite3.Error as e:
+                print(f"Database error rebuilding the monster index: {e}")
+            self._uncache_monster()
+        
+        return result.imported
 
     # --- Monster Specific Methods ---
 
@@ -449,6 +529,7 @@ class DatabaseManager:
                 monster.id = inserted_id # Update the object with the new ID
                 monster.created_at = now
                 monster.updated_at = now
+                self._index_monster(monster)
                 print(f"Saved new custom monster '{monster.name}' with ID {monster.id}")
                 return monster # Return the updated monster object
             else:
@@ -465,6 +546,7 @@ class DatabaseManager:
             )
             if affected_rows is not None and affected_rows > 0:
                 monster.updated_at = now
+                self._index_monster(monster)
                 print(f"Updated custom monster '{monster.name}' with ID {monster.id}")
                 return monster # Return the updated monster object
             elif affected_rows == 0:
@@ -475,10 +557,66 @@ class DatabaseManager:
                 print(f"DEBUG: Update failed. Data keys: {list(data_to_save.keys())}")
                 return None
 
+    def _index_monster(self, monster: Monster):
+        """Update a saved monster's row in the compendium index and drop its cached copy."""
+        self._uncache_monster((monster.id, monster.is_custom))
+        try:
+            monster_index.update_monster_entry(self.connection, monster_index.entry_for_monster(monster))
+        except sqlite3.Error as e:
+            print(f"Database error indexing monster '{monster.name}': {e}")
+
+    def _uncache_monster(self, key: Optional[tuple] = None):
+        """Drop one monster, or all monsters when key is None, from the cache."""
+        with self._monster_cache_lock:
+            if key is None:
+                self._monster_cache.clear()
+            else:
+                self._monster_cache.pop(key, None)
+
+    def get_monster_summaries(self, **facets) -> List[MonsterSummary]:
+        """
+        Lists monsters from the compendium index without loading full stat blocks.
+
+        Args:
+            **facets: Optional filters - search (name substring), cr_min, cr_max
+                (numeric, e.g. 0.5), types, sizes, sources (lists of values),
+                include_custom, include_standard, limit, offset.
+
+        Returns:
+            MonsterSummary objects sorted by name. Load the full monster with
+            get_monster_by_id.
+        """
+        try:
+            return monster_index.query_summaries(self.connection, **facets)
+        except sqlite3.Error as e:
+            print(f"Database error querying monster summaries: {e}")
+            return []
+
+    def get_monster_facets(self, **facets) -> Dict[str, List[tuple]]:
+        """
+        Counts monsters per CR, type, size and source.
+
+        Args:
+            **facets: Same filters as get_monster_summaries (without limit/offset).
+
+        Returns:
+            {'cr': [(cr, count), ...], 'type': [...], 'size': [...], 'source': [...]}
+        """
+        try:
+            return monster_index.facet_counts(self.connection, **facets)
+        except sqlite3.Error as e:
+            print(f"Database error counting monster facets: {e}")
+            return {'cr': [], 'type': [], 'size': [], 'source': []}
+
     def get_monster_by_id(self, monster_id: int, is_custom: bool) -> Optional[Monster]:
         """
         Retrieves a single monster by its database ID.
 
+        Recently loaded monsters are served from an LRU cache, which is
+        invalidated when a monster is saved, deleted or imported. The cache
+        keeps a private copy and every call returns a fresh copy, so callers
+        (e.g. the edit dialog) may modify the result.
+
         Args:
             monster_id: The ID of the monster.
             is_custom: True if fetching from 'custom_monsters', False for 'monsters'.
@@ -486,12 +624,24 @@ class DatabaseManager:
         Returns:
             A Monster object or None if not found or on error.
         """
+        key = (monster_id, bool(is_custom))
+        with self._monster_cache_lock:
+            monster = self._monster_cache.get(key)
+            if monster is not None:
+                self._monster_cache.move_to_end(key)
+                return copy.deepcopy(monster)
+
         table = "custom_monsters" if is_custom else "monsters"
         query = f"SELECT * FROM {table} WHERE id = ?"
         try:
             results = self.execute_query(query, (monster_id,))
             if results:
-                return Monster.from_db_row(results[0], is_custom=is_custom)
+                monster = Monster.from_db_row(results[0], is_custom=is_custom)
+                with self._monster_cache_lock:
+                    self._monster_cache[key] = copy.deepcopy(monster)
+                    if len(self._monster_cache) > MONSTER_CACHE_SIZE:
+                        self._monster_cache.popitem(last=False)
+                return monster
             else:
                 return None
         except sqlite3.Error as e:
@@ -594,6 +744,11 @@ class DatabaseManager:
         affected_rows = self.delete("custom_monsters", "id = ?", (monster_id,))
 
         if affected_rows is not None:
+            self._uncache_monster((monster_id, True))
+            try:
+                monster_index.remove_monster_entry(self.connection, monster_id, is_custom=True)
+            except sqlite3.Error as e:
+                print(f"Database error removing monster ID {monster_id} from the index: {e}")
             if affected_rows > 0:
                 print(f"Successfully deleted custom monster ID {monster_id}.")
                 return True
@@ -623,17 +778,19 @@ class DatabaseManager:
         try:
             # Check standard monsters
             if include_standard:
-                query_std = "SELECT * FROM monsters WHERE name = ? LIMIT 1"
+                query_std = "SELECT id FROM monsters WHERE name = ? LIMIT 1"
                 results_std = self.execute_query(query_std, (name,))
                 if results_std:
-                    monsters.append(Monster.from_db_row(results_std[0], is_custom=False))
+                    monsters.append(self.get_monster_by_id(results_std[0]['id'], is_custom=False))
 
             # Check custom monsters
             if include_custom:
-                query_custom = "SELECT * FROM custom_monsters WHERE name = ? LIMIT 1"
+                query_custom = "SELECT id FROM custom_monsters WHERE name = ? LIMIT 1"
                 results_custom = self.execute_query(query_custom, (name,))
                 if results_custom:
-                    monsters.append(Monster.from_db_row(results_custom[0], is_custom=True))
+                    monsters.append(self.get_monster_by_id(results_custom[0]['id'], is_custom=True))
+
+            monsters = [monster for monster in monsters if monster]
 
             # Return the first matching monster found
             # (Custom results will be preferred if they come second in the check order)
@@ -0,0 +1,155 @@
+# app/data/fulltext.py - Full-text search indexes
+"""
+SQLite FTS5 indexes for free-text tables
+
+Each indexed table gets an external-content FTS5 table (the text is not
+stored twice) kept current by insert/update/delete triggers. Searches are
+ranked with BM25, titles weighted above tags and body text, and return a
+highlighted snippet of the best matching passage.
+
+The indexes are keyed by the source table's rowid. The app never runs
+VACUUM; if a database is vacuumed, call rebuild_fts_index afterwards.
+"""
+
+import logging
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Indexed tables: table -> (rowid column, indexed columns)
+FTS_TABLES = {
+    "session_notes": ("id", ("title", "content", "tags")),
+    "llm_generated_content": ("rowid", ("title", "content", "tags")),
+}
+
+# BM25 weights, in the column order above
+COLUMN_WEIGHTS = (10.0, 1.0, 5.0)
+
+HIGHLIGHT_START = "<b>"
+HIGHLIGHT_END = "</b>"
+
+
+def fts_table(table: str) -> str:
+    """Name of the FTS5 table indexing a table"""
+    return f"{table}_fts"
+
+
+def ensure_fts_index(connection: sqlite3.Connection, table: str) -> bool:
+    """
+    Create the FTS5 index and triggers for a table if they do not exist
+
+    A newly created index is filled from the existing rows.
+
+    Args:
+        connection: Open connection to the database holding the table
+        table: Name of a table in FTS_TABLES
+
+    Returns:
+        True if the index is available, False if SQLite lacks FTS5
+    """
+    key, columns = FTS_TABLES[table]
+    fts = fts_table(table)
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+    try:
+        with connection:
+            connection.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list}, content='{table}', content_rowid='{key}', tokenize='porter unicode61'
+            )
+            ''')
+            connection.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.{key}, {new_values});
+            END
+            ''')
+            connection.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values});
+            END
+            ''')
+            connection.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values});
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.{key}, {new_values});
+            END
+            ''')
+            if not exists:
+                connection.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Full-text search unavailable for {table}: {e}")
+        return False
+    return True
+
+
+def rebuild_fts_index(connection: sqlite3.Connection, table: str):
+    """Re-index every row of a table"""
+    fts = fts_table(table)
+    with connection:
+        connection.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def match_expression(text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free text typed by the user
+
+    Every word must match; the last word also matches as a prefix so
+    results update while typing. Words are quoted, so FTS5 operators and
+    punctuation in the input are treated as plain text.
+
+    Returns:
+        The expression, or None if the text has no searchable words
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search(connection: sqlite3.Connection, table: str, text: str, limit: int = 100, offset: int = 0,
+           where: str = "", params: Sequence[Any] = (), snippet_tokens: int = 12) -> List[Dict[str, Any]]:
+    """
+    Ranked full-text search of a table
+
+    Args:
+        connection: Connection to the database
+        table: Name of a table in FTS_TABLES
+        text: Free text typed by the user
+        limit: Maximum number of rows to return
+        offset: Offset for pagination
+        where: Optional extra condition on the source table (alias t)
+        params: Parameters for the extra condition
+        snippet_tokens: Approximate snippet length in tokens
+
+    Returns:
+        Source rows as dictionaries, best match first, each with a
+        "snippet" (matches wrapped in <b></b>) and its BM25 "rank"
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    key, columns = FTS_TABLES[table]
+    fts = fts_table(table)
+    weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS[:len(columns)])
+    query = f'''
+        SELECT t.*,
+               snippet({fts}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', {int(snippet_tokens)}) AS snippet,
+               bm25({fts}, {weights}) AS rank
+        FROM {fts}
+        JOIN {table} AS t ON t.{key} = {fts}.rowid
+        WHERE {fts} MATCH ? {"AND " + where if where else ""}
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+    '''
+    cursor = connection.execute(query, [expression, *params, limit, offset])
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
@@ -7,13 +7,15 @@ and LLM-related assets.
 """
 
 import json
+import re
 import sqlite3
 import uuid
-import threading
 from datetime import datetime
 from pathlib import Path
 
 from app.core.config import get_database_path, get_app_dir
+from app.data import fulltext
+from app.data.connection import ConnectionManager
 
 
 class LLMDataManager:
@@ -25,8 +27,8 @@ class LLMDataManager:
         """Initialize the LLM data manager"""
         self.app_state = app_state
         self.db_path = get_database_path()
-        self.connection = None
-        self.local = threading.local()  # Thread-local storage for connections
+        self.connections = None
+        self.fts_enabled = False
         
         # Create LLM content directories
         self.llm_dir = get_app_dir() / "data" / "llm"
@@ -41,22 +43,23 @@ class LLMDataManager:
     
     def _init_database(self):
         """Initialize database connection and tables"""
-        # Create the main connection in the main thread
-        self.connection = sqlite3.connect(str(self.db_path))
-        self.connection.row_factory = sqlite3.Row
+        # Per-thread connections in WAL mode, so generation workers can
+        # write while the UI thread reads
+        self.connections = ConnectionManager(self.db_path)
         
         # Create tables for LLM data
         self._create_tables()
     
+    @property
+    def connection(self):
+        """The calling thread's database connection, or None once closed"""
+        if self.connections is None or self.connections.closed:
+            return None
+        return self.connections.get()
+    
     def _get_connection(self):
-        """Get a thread-safe database connection"""
-        # Check if this thread already has a connection
-        if not hasattr(self.local, 'connection'):
-            # Create a new connection for this thread
-            self.local.connection = sqlite3.connect(str(self.db_path))
-            self.local.connection.row_factory = sqlite3.Row
-        
-        return self.local.connection
+        """Get the calling thread's database connection"""
+        return self.connections.get()
     
     def _create_tables(self):
         """Create database tables for LLM data"""
@@ -160,17 +163,14 @@ class LLMDataManager:
         
         # Commit changes
         self.connection.commit()
+        
+        # Full-text index for searching generated content
+        self.fts_enabled = fulltext.ensure_fts_index(self.connection, "llm_generated_content")
     
     def close(self):
-        """Close the database connection"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-        
-        # Close any thread-local connections - safely check if it exists first
-        if hasattr(self.local, 'connection') and self.local.connection is not None:
-            self.local.connection.close()
-            self.local.connection = None
+        """Close the database connections of all threads"""
+        if self.connections:
+            self.connections.close()
     
     # Conversation Methods
     
@@ -415,7 +415,45 @@ class LLMDataManager:
         
         conn.commit()
         return content_id
-    
+
+    def add_generated_content_batch(self, items):
+        """
+        Add several pieces of generated content in a single transaction
+
+        Args:
+            items: Dictionaries with the add_generated_content arguments
+                   (title, content_type, content, model_id, prompt, tags)
+
+        Returns:
+            List of content IDs, in the order of items
+        """
+        timestamp = datetime.now().isoformat()
+        rows = [
+            (
+                str(uuid.uuid4()),
+                item["title"],
+                item["content_type"],
+                item["content"],
+                item.get("model_id"),
+                item.get("prompt"),
+                json.dumps(item.get("tags") or []),
+                timestamp
+            )
+            for item in items
+        ]
+
+        conn = self._get_connection()
+        with conn:
+            conn.executemany(
+                '''
+                INSERT INTO llm_generated_content
+                (id, title, content_type, content, model_id, prompt, tags, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''',
+                rows
+            )
+        return [row[0] for row in rows]
+
     def get_generated_content(self, content_id):
         """
         Get specific generated content
@@ -537,7 +575,14 @@ class LLMDataManager:
     
     def search_generated_content(self, query, content_type=None, limit=100, offset=0):
         """
-        Search for generated content containing the query string
+        Search generated content for the query words, best match first
+        
+        Uses the full-text index (BM25 ranking, title matches weighted
+        highest), which matches whole (stemmed) words and the last word as a
+        prefix. Without FTS5 every word must appear as a substring of the
+        title, content or tags instead, newest first, so that fallback also
+        matches inside words. A query without words (e.g. empty) lists all
+        content, newest first.
         
         Args:
             query: Text to search for
@@ -546,42 +591,45 @@ class LLMDataManager:
             offset: Offset for pagination
             
         Returns:
-            List of matching content dictionaries
+            List of matching content dictionaries, each with a 'snippet'
+            of the matching text (matches wrapped in <b></b>)
         """
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        search_params = []
-        search_query = f"%{query}%"  # For LIKE operator
         
-        if content_type:
-            sql_query = '''
-                SELECT * FROM llm_generated_content 
-                WHERE (title LIKE ? OR content LIKE ?) 
-                  AND content_type = ? 
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-            '''
-            search_params = [search_query, search_query, content_type, limit, offset]
+        if self.fts_enabled and fulltext.match_expression(query) is not None:
+            where, params = ("t.content_type = ?", [content_type]) if content_type else ("", [])
+            rows = fulltext.search(conn, "llm_generated_content", query, limit, offset, where, params)
         else:
-            sql_query = '''
-                SELECT * FROM llm_generated_content 
-                WHERE title LIKE ? OR content LIKE ? 
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-            '''
-            search_params = [search_query, search_query, limit, offset]
-        
-        cursor.execute(sql_query, search_params)
+            rows = self._scan_generated_content(conn, query, content_type, limit, offset)
         
         result = []
-        for row in cursor.fetchall():
-            content = dict(row)
+        for content in rows:
             content['tags'] = json.loads(content['tags'])
+            content.pop('rank', None)
             result.append(content)
             
         return result
     
+    def _scan_generated_content(self, conn, query, content_type, limit, offset):
+        """Substring search of generated content, for databases without FTS5 and blank queries"""
+        conditions, search_params = [], []
+        for word in re.findall(r"\w+", query or ""):
+            conditions.append("(title LIKE ? OR content LIKE ? OR tags LIKE ?)")
+            search_params += [f"%{word}%"] * 3  # For LIKE operator
+        if content_type:
+            conditions.append("content_type = ?")
+            search_params.append(content_type)
+        
+        sql_query = f'''
+            SELECT * FROM llm_generated_content 
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY created_at DESC
+            LIMIT ? OFFSET ?
+        '''
+        cursor = conn.cursor()
+        cursor.execute(sql_query, search_params + [limit, offset])
+        return [dict(row, snippet=row['content'][:200]) for row in cursor.fetchall()]
+    
     # Campaign Context Management Methods
     
     def create_campaign(self, name, description=None):
@@ -0,0 +1,329 @@
+# app/data/monster_index.py - Monster compendium index
+"""
+Compendium index over standard and custom monsters
+
+The monster tables keep challenge ratings as text ("1/2") and custom
+monsters keep everything inside a JSON blob, so neither can be filtered or
+sorted efficiently. The monster_index table holds one narrow row per
+monster with normalized, indexed facet columns: numeric CR and XP, base
+type and subtype, size, alignment and source. Lists are built from these
+lightweight summaries; the full Monster is loaded only when needed.
+
+DatabaseManager keeps the index current when custom monsters are saved or
+deleted and after imports, and rebuilds it when it is found out of date.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.models.monster import MonsterSummary
+
+logger = logging.getLogger(__name__)
+
+INDEX_TABLE = "monster_index"
+
+# CR to XP mapping (from D&D 5e DMG or Basic Rules)
+CR_TO_XP = {
+    "0": 10,
+    "1/8": 25,
+    "1/4": 50,
+    "1/2": 100,
+    "1": 200,
+    "2": 450,
+    "3": 700,
+    "4": 1100,
+    "5": 1800,
+    "6": 2300,
+    "7": 2900,
+    "8": 3900,
+    "9": 5000,
+    "10": 5900,
+    "11": 7200,
+    "12": 8400,
+    "13": 10000,
+    "14": 11500,
+    "15": 13000,
+    "16": 15000,
+    "17": 18000,
+    "18": 20000,
+    "19": 22000,
+    "20": 25000,
+    "21": 33000,
+    "22": 41000,
+    "23": 50000,
+    "24": 62000,
+    "25": 75000,
+    "26": 90000,
+    "27": 105000,
+    "28": 120000,
+    "29": 135000,
+    "30": 155000
+}
+
+SIZES = ("Tiny", "Small", "Medium", "Large", "Huge", "Gargantuan")
+
+# MonsterSummary fields, in index column order
+SUMMARY_FIELDS = ("id", "is_custom", "name", "challenge_rating", "cr", "xp",
+                  "type", "subtype", "size", "alignment", "source", "updated_at")
+
+
+def parse_cr(value: Any) -> Optional[float]:
+    """
+    Numeric value of a challenge rating
+
+    Accepts "1/2", "0.5", "5", "5 (1,800 XP)" or a number.
+
+    Returns:
+        The CR as a float, or None if it cannot be parsed
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = re.match(r"\s*(\d+)\s*/\s*(\d+)|\s*(\d+(?:\.\d+)?)", str(value or ""))
+    if not match:
+        return None
+    if match.group(1):
+        denominator = int(match.group(2))
+        return int(match.group(1)) / denominator if denominator else None
+    return float(match.group(3))
+
+
+def cr_label(cr: Optional[float]) -> str:
+    """Display text for a numeric CR: 0.5 -> "1/2", 5.0 -> "5" """
+    if cr is None:
+        return ""
+    for label in ("1/8", "1/4", "1/2"):
+        if abs(parse_cr(label) - cr) < 1e-9:
+            return label
+    return str(int(cr)) if cr == int(cr) else str(cr)
+
+
+def xp_for_cr(cr: Optional[float]) -> int:
+    """XP value of a numeric CR (0 if unknown)"""
+    return CR_TO_XP.get(cr_label(cr), 0)
+
+
+def normalize_type(value: Any) -> Tuple[str, str]:
+    """
+    Split a monster type into lowercase base type and subtype
+
+    "Humanoid (elf)" -> ("humanoid", "elf"); "swarm of Tiny beasts" -> ("beast", "swarm")
+    """
+    text = str(value or "").strip().lower()
+    subtype = ""
+    match = re.match(r"([^(]*)\((.*)\)", text)
+    if match:
+        text, subtype = match.group(1).strip(), match.group(2).strip()
+    swarm = re.match(r"swarm of \w+ (\w+?)s?$", text)
+    if swarm:
+        return swarm.group(1), "swarm"
+    return text, subtype
+
+
+def normalize_size(value: Any) -> str:
+    """Canonical size name ("large" -> "Large"), or the stripped input if unknown"""
+    text = str(value or "").strip()
+    return text.capitalize() if text.capitalize() in SIZES else text
+
+
+def index_entry(monster_id: int, is_custom: bool, name: str, cr: Any, monster_type: Any, size: Any,
+                alignment: Any, source: Any, updated_at: Optional[str] = None) -> Tuple:
+    """Index row for a monster, in SUMMARY_FIELDS order"""
+    numeric_cr = parse_cr(cr)
+    base_type, subtype = normalize_type(monster_type)
+    return (monster_id, int(bool(is_custom)), name or "", str(cr if cr is not None else ""), numeric_cr,
+            xp_for_cr(numeric_cr), base_type, subtype, normalize_size(size),
+            str(alignment or ""), str(source or ("Custom" if is_custom else "Unknown")), updated_at)
+
+
+def entry_for_monster(monster) -> Tuple:
+    """Index row for a Monster object"""
+    return index_entry(monster.id, monster.is_custom, monster.name, monster.challenge_rating, monster.type,
+                       monster.size, monster.alignment, monster.source, monster.updated_at)
+
+
+def summary_from_entry(entry: Sequence[Any]) -> MonsterSummary:
+    """MonsterSummary for an index row"""
+    return MonsterSummary(entry[0], bool(entry[1]), *entry[2:])
+
+
+def summary_for_monster(monster) -> MonsterSummary:
+    """MonsterSummary for a Monster object"""
+    return summary_from_entry(entry_for_monster(monster))
+
+
+def ensure_monster_index(connection: sqlite3.Connection):
+    """Create the index table and its SQL indexes if they do not exist"""
+    with connection:
+        connection.execute(f'''
+        CREATE TABLE IF NOT EXISTS {INDEX_TABLE} (
+            id INTEGER NOT NULL,
+            is_custom INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            challenge_rating TEXT NOT NULL,
+            cr REAL,
+            xp INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            subtype TEXT NOT NULL,
+            size TEXT NOT NULL,
+            alignment TEXT NOT NULL,
+            source TEXT NOT NULL,
+            updated_at TEXT,
+            PRIMARY KEY (is_custom, id)
+        )
+        ''')
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{INDEX_TABLE}_name ON {INDEX_TABLE} (name COLLATE NOCASE)")
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{INDEX_TABLE}_cr ON {INDEX_TABLE} (cr)")
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{INDEX_TABLE}_type_cr ON {INDEX_TABLE} (type, cr)")
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{INDEX_TABLE}_size ON {INDEX_TABLE} (size)")
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{INDEX_TABLE}_source ON {INDEX_TABLE} (source)")
+
+
+def _standard_entries(connection: sqlite3.Connection) -> Iterable[Tuple]:
+    cursor = connection.execute("SELECT id, name, cr, type, size, alignment, source FROM monsters")
+    for monster_id, name, cr, monster_type, size, alignment, source in cursor:
+        yield index_entry(monster_id, False, name, cr, monster_type, size, alignment, source)
+
+
+def _custom_entries(connection: sqlite3.Connection) -> Iterable[Tuple]:
+    cursor = connection.execute("SELECT id, name, data, updated_at FROM custom_monsters")
+    for monster_id, name, data, updated_at in cursor:
+        try:
+            fields = json.loads(data or "{}")
+        except json.JSONDecodeError:
+            logger.warning(f"Custom monster {monster_id} has invalid JSON data; indexing name only")
+            fields = {}
+        yield index_entry(monster_id, True, name, fields.get("cr"), fields.get("type"), fields.get("size"),
+                          fields.get("alignment"), fields.get("source", "Custom"), updated_at)
+
+
+def rebuild_monster_index(connection: sqlite3.Connection) -> int:
+    """
+    Re-index every standard and custom monster
+
+    Returns:
+        Number of indexed monsters
+    """
+    placeholders = ", ".join("?" for _ in SUMMARY_FIELDS)
+    with connection:
+        connection.execute(f"DELETE FROM {INDEX_TABLE}")
+        connection.executemany(f"INSERT INTO {INDEX_TABLE} VALUES ({placeholders})", _standard_entries(connection))
+        connection.executemany(f"INSERT INTO {INDEX_TABLE} VALUES ({placeholders})", _custom_entries(connection))
+    count = connection.execute(f"SELECT COUNT(*) FROM {INDEX_TABLE}").fetchone()[0]
+    logger.info(f"Rebuilt monster index with {count} monsters")
+    return count
+
+
+def index_is_current(connection: sqlite3.Connection) -> bool:
+    """
+    Check the index against the monster tables
+
+    Compares monster counts and the latest custom monster update, which
+    catches monsters added or changed outside DatabaseManager.
+    """
+    indexed = dict(connection.execute(
+        f"SELECT is_custom, COUNT(*) FROM {INDEX_TABLE} GROUP BY is_custom").fetchall())
+    standard = connection.execute("SELECT COUNT(*) FROM monsters").fetchone()[0]
+    custom, latest = connection.execute("SELECT COUNT(*), MAX(updated_at) FROM custom_monsters").fetchone()
+    indexed_latest = connection.execute(
+        f"SELECT MAX(updated_at) FROM {INDEX_TABLE} WHERE is_custom = 1").fetchone()[0]
+    return (indexed.get(0, 0), indexed.get(1, 0), indexed_latest) == (standard, custom, latest)
+
+
+def sync_monster_index(connection: sqlite3.Connection):
+    """Create the index if needed and rebuild it if it is out of date"""
+    ensure_monster_index(connection)
+    if not index_is_current(connection):
+        rebuild_monster_index(connection)
+
+
+def update_monster_entry(connection: sqlite3.Connection, entry: Tuple):
+    """Insert or replace one monster's index row (see index_entry)"""
+    placeholders = ", ".join("?" for _ in SUMMARY_FIELDS)
+    with connection:
+        connection.execute(f"INSERT OR REPLACE INTO {INDEX_TABLE} VALUES ({placeholders})", entry)
+
+
+def remove_monster_entry(connection: sqlite3.Connection, monster_id: int, is_custom: bool):
+    """Remove one monster's index row"""
+    with connection:
+        connection.execute(f"DELETE FROM {INDEX_TABLE} WHERE is_custom = ? AND id = ?",
+                           (int(bool(is_custom)), monster_id))
+
+
+def _facet_conditions(search: str = "", cr_min: Optional[float] = None, cr_max: Optional[float] = None,
+                      types: Optional[Sequence[str]] = None, sizes: Optional[Sequence[str]] = None,
+                      sources: Optional[Sequence[str]] = None, include_custom: bool = True,
+                      include_standard: bool = True) -> Tuple[str, List[Any]]:
+    """WHERE clause and parameters for a faceted monster query"""
+    conditions, params = [], []
+    if not include_custom:
+        conditions.append("is_custom = 0")
+    if not include_standard:
+        conditions.append("is_custom = 1")
+    if search:
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conditions.append("name LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+    if cr_min is not None:
+        conditions.append("cr >= ?")
+        params.append(cr_min)
+    if cr_max is not None:
+        conditions.append("cr <= ?")
+        params.append(cr_max)
+    for column, values in (("type", [t.lower() for t in types or []]),
+                           ("size", [normalize_size(s) for s in sizes or []]),
+                           ("source", list(sources or []))):
+        if values:
+            conditions.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+    return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+
+def query_summaries(connection: sqlite3.Connection, limit: Optional[int] = None, offset: int = 0,
+                    **facets) -> List[MonsterSummary]:
+    """
+    Faceted query of monster summaries, sorted by name
+
+    Args:
+        connection: Connection to the database
+        limit: Maximum number of summaries (None for all)
+        offset: Offset for pagination
+        **facets: search (name substring), cr_min, cr_max, types, sizes,
+            sources, include_custom, include_standard
+
+    Returns:
+        MonsterSummary objects
+    """
+    where, params = _facet_conditions(**facets)
+    query = f"SELECT {', '.join(SUMMARY_FIELDS)} FROM {INDEX_TABLE}{where} ORDER BY name COLLATE NOCASE, is_custom"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    return [summary_from_entry(row) for row in connection.execute(query, params)]
+
+
+def facet_counts(connection: sqlite3.Connection, **facets) -> Dict[str, List[Tuple[Any, int]]]:
+    """
+    Counts of monsters per CR, type, size and source
+
+    Args:
+        connection: Connection to the database
+        **facets: Same filters as query_summaries
+
+    Returns:
+        {"cr": [(cr, count), ...], "type": [...], "size": [...], "source": [...]},
+        CRs in numeric order, sizes smallest first, others alphabetical
+    """
+    where, params = _facet_conditions(**facets)
+    counts = {}
+    for column in ("cr", "type", "size", "source"):
+        rows = connection.execute(
+            f"SELECT {column}, COUNT(*) FROM {INDEX_TABLE}{where} GROUP BY {column} ORDER BY {column}", params
+        ).fetchall()
+        counts[column] = [tuple(row) for row in rows]
+    size_order = {size: i for i, size in enumerate(SIZES)}
+    counts["size"].sort(key=lambda item: (size_order.get(item[0], len(SIZES)), item[0]))
+    return counts
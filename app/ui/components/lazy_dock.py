@@ -0,0 +1,110 @@
+"""
+Lazy Dock Widget
+
+A dock widget that holds a lightweight placeholder until it is first
+shown. The real panel is built by a factory callable the first time the
+dock becomes visible (opened from a menu, raised as a tab or restored from
+a saved layout) or when code asks for its widget(). Hidden panels therefore
+cost nothing at startup: no module import, no widgets and no data loading.
+"""
+
+import traceback
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import QDockWidget, QLabel, QWidget
+
+
+class _Placeholder(QLabel):
+    """Stand-in content that asks for the real panel once it is painted"""
+
+    def __init__(self, on_paint: Callable[[], Any]):
+        super().__init__("Loading…")
+        self.setAlignment(Qt.AlignCenter)
+        self.on_paint = on_paint
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # A layout change can reveal a dock without a visibility change;
+        # build outside the paint event
+        QTimer.singleShot(0, self.on_paint)
+
+
+class LazyDockWidget(QDockWidget):
+    """Dock widget whose panel is built on first use"""
+
+    # Emitted once with the panel after it has been built
+    panel_loaded = Signal(object)
+
+    # Emitted with the error message if building the panel failed
+    panel_failed = Signal(str)
+
+    def __init__(self, title: str, factory: Callable[[], QWidget], parent=None):
+        """
+        Args:
+            title: Dock title shown before the panel exists
+            factory: Callable building the panel widget
+            parent: Parent window
+        """
+        super().__init__(title, parent)
+        self.factory = factory
+        self.pending_state: Optional[Any] = None
+        self._panel: Optional[QWidget] = None
+        self._loading = False
+        self._failed = False
+
+        self.placeholder = _Placeholder(self.load)
+        super().setWidget(self.placeholder)
+
+        self.visibilityChanged.connect(self._on_visibility_changed)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check whether the panel has been built"""
+        return self._panel is not None
+
+    @property
+    def panel(self) -> Optional[QWidget]:
+        """The panel if it has been built, without building it"""
+        return self._panel
+
+    def _on_visibility_changed(self, visible: bool):
+        if visible:
+            self.load()
+
+    def load(self) -> Optional[QWidget]:
+        """
+        Build the panel if needed
+
+        Returns:
+            The panel, or None if building it failed
+        """
+        if self._panel is not None or self._loading or self._failed:
+            return self._panel
+        self._loading = True
+        try:
+            panel = self.factory()
+        except Exception as e:
+            self._failed = True
+            print(f"ERROR creating panel {self.objectName()}: {str(e)}")
+            traceback.print_exc()
+            self.placeholder.setText(f"Failed to load panel:\n{str(e)}")
+            self.panel_failed.emit(str(e))
+            return None
+        finally:
+            self._loading = False
+
+        self._panel = panel
+        super().setWidget(panel)
+        self.placeholder.deleteLater()
+        self.placeholder = None
+        if self.pending_state is not None and hasattr(panel, "restore_state"):
+            panel.restore_state(self.pending_state)
+        self.pending_state = None
+        self.panel_loaded.emit(panel)
+        return panel
+
+    def widget(self) -> QWidget:
+        """Return the panel, building it first (callers expect the real panel)"""
+        self.load()
+        return super().widget()
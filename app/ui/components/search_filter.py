@@ -0,0 +1,139 @@
+"""
+Search Filter Component
+
+Shared search-as-you-type filtering for reference panels. A panel builds
+its item model once, storing a lowercase search key on each row, and shows
+it through a SearchFilterProxyModel. Typing only re-evaluates the proxy's
+filter; no widgets or items are recreated. SearchDebouncer delays the
+filter until the user pauses typing.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import Qt, QObject, QPersistentModelIndex, QSortFilterProxyModel, QTimer
+from PySide6.QtWidgets import QAbstractItemView, QLineEdit
+
+# Item data role holding a row's precomputed lowercase search text
+SEARCH_KEY_ROLE = Qt.UserRole + 100
+
+# First free item data role for panel-specific filter fields
+FILTER_ROLE = Qt.UserRole + 101
+
+DEFAULT_DEBOUNCE_MS = 150
+
+
+def search_key(*parts: Any) -> str:
+    """Build the lowercase search key for a row from its searchable fields"""
+    return "\n".join(str(part) for part in parts if part).lower()
+
+
+class SearchFilterProxyModel(QSortFilterProxyModel):
+    """
+    Proxy model filtering rows on a precomputed search key and field filters
+
+    A row is shown when its SEARCH_KEY_ROLE text (column 0) contains the
+    search text and every field filter accepts it. For trees, a parent is
+    shown when any of its children match.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setRecursiveFilteringEnabled(True)
+        self._search_text = ""
+        self._field_filters: Dict[int, Tuple[Any, Callable[[Any, Any], bool]]] = {}
+
+    def set_search_text(self, text: str):
+        """Show only rows whose search key contains the text (case-insensitive)"""
+        text = (text or "").strip().lower()
+        if text != self._search_text:
+            self._refilter(lambda: setattr(self, "_search_text", text))
+
+    def set_field_filter(self, role: int, value: Any, match: Optional[Callable[[Any, Any], bool]] = None):
+        """
+        Filter rows on the data stored under an item data role
+
+        Args:
+            role: Item data role of the field (column 0)
+            value: Required value, or None to remove the filter
+            match: Optional callable(row_value, value) -> bool, equality by default
+        """
+        current = self._field_filters.get(role)
+        if value is None:
+            if current is not None:
+                self._refilter(lambda: self._field_filters.pop(role))
+        elif current is None or current[0] != value:
+            self._refilter(lambda: self._field_filters.__setitem__(role, (value, match or (lambda a, b: a == b))))
+
+    def _refilter(self, change: Callable[[], Any]):
+        """Apply a change to the filter criteria and re-evaluate the rows"""
+        if hasattr(self, "beginFilterChange"):
+            self.beginFilterChange()
+            change()
+            self.endFilterChange()
+        else:
+            change()
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        """Check a source row against the search text and field filters"""
+        if not self._search_text and not self._field_filters:
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self._search_text and self._search_text not in (index.data(SEARCH_KEY_ROLE) or ""):
+            return False
+        for role, (value, match) in self._field_filters.items():
+            if not match(index.data(role), value):
+                return False
+        return True
+
+
+@contextmanager
+def keep_current_row(view: QAbstractItemView):
+    """
+    Keep a filtered view's current row while its filter changes
+
+    Without this, a view whose current row is filtered out moves the
+    selection to a neighbouring row, which panels would treat as the user
+    picking another entry. Inside the block selection signals are held; the
+    current row is restored if it is still shown, otherwise cleared.
+    """
+    proxy = view.model()
+    selection_model = view.selectionModel()
+    current = QPersistentModelIndex(proxy.mapToSource(view.currentIndex()))
+    selection_model.blockSignals(True)
+    try:
+        yield
+    finally:
+        index = proxy.mapFromSource(current) if current.isValid() else current
+        if index.isValid():
+            view.setCurrentIndex(index)
+        else:
+            selection_model.clear()
+        selection_model.blockSignals(False)
+        view.viewport().update()
+
+
+class SearchDebouncer(QObject):
+    """Calls back with a line edit's text once typing has paused"""
+
+    def __init__(self, line_edit: QLineEdit, callback: Callable[[str], Any], delay_ms: int = DEFAULT_DEBOUNCE_MS):
+        """
+        Args:
+            line_edit: Search box to watch
+            callback: Callable receiving the search text
+            delay_ms: Quiet period after the last keystroke
+        """
+        super().__init__(line_edit)
+        self.line_edit = line_edit
+        self.callback = callback
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+        line_edit.textChanged.connect(lambda _text: self.timer.start())
+
+    def flush(self):
+        """Apply the current text now, e.g. after setting it programmatically"""
+        self.timer.stop()
+        self.callback(self.line_edit.text())
@@ -20,10 +20,6 @@ from app.ui.layout_name_dialog import LayoutNameDialog
 from app.ui.layout_select_dialog import LayoutSelectDialog
 from app.ui.panel_settings_dialog import PanelSettingsDialog
 
-# Import the panels we need to connect
-from app.ui.panels.monster_panel import MonsterPanel
-from app.ui.panels.session_notes_panel import SessionNotesPanel
-
 
 class MainWindow(QMainWindow):
     """
@@ -638,6 +634,19 @@ class MainWindow(QMainWindow):
         status_bar = QStatusBar()
         self.setStatusBar(status_bar)
         status_bar.showMessage("Ready")
+        
+        # LLM response cache counters (updated from worker threads via a queued signal)
+        self.llm_cache_label = QLabel()
+        self.llm_cache_label.setToolTip("LLM response cache hits / misses this session")
+        status_bar.addPermanentWidget(self.llm_cache_label)
+        self._update_llm_cache_label(0, 0)
+        # The LLM service is created after startup; connect once it exists
+        self.app_state.call_when_services_ready(
+            lambda: self.app_state.llm_service.cache_stats_changed.connect(self._update_llm_cache_label))
+    
+    def _update_llm_cache_label(self, hits, misses):
+        """Show the LLM response cache counters in the status bar"""
+        self.llm_cache_label.setText(f"LLM cache: {hits} hits / {misses} misses")
     
     def _load_initial_layout(self):
         """Load the initial layout"""
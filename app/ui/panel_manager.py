@@ -5,30 +5,47 @@ Panel management system for the DM Screen application
 Handles creating, organizing, and managing dockable panels.
 """
 
+import importlib
+from functools import partial
+
 from PySide6.QtWidgets import QDockWidget, QMessageBox, QLabel, QWidget
 from PySide6.QtCore import Qt, QObject
 from PySide6.QtGui import QPalette, QColor
 
-# Import all panel types
-from app.ui.panels.combat_tracker_panel import CombatTrackerPanel
-from app.ui.panels.dice_roller_panel import DiceRollerPanel
-from app.ui.panels.conditions_panel import ConditionsPanel
-from app.ui.panels.rules_reference_panel import RulesReferencePanel
-from app.ui.panels.monster_panel import MonsterPanel
-from app.ui.panels.spell_reference_panel import SpellReferencePanel
-# from app.ui.panels.minimal_spell_panel import MinimalSpellPanel
-from app.ui.panels.session_notes_panel import SessionNotesPanel
-from app.ui.panels.weather_panel import WeatherPanel
-from app.ui.panels.time_tracker_panel import TimeTrackerPanel
+from app.ui.components.lazy_dock import LazyDockWidget
 from app.ui.panels.panel_category import PanelCategory
-from app.ui.panels.player_character_panel import PlayerCharacterPanel
-from app.ui.panels.llm_panel import LLMPanel  # Import the new LLM panel
-from app.ui.panels.npc_generator_panel import NPCGeneratorPanel  # Import the NPC Generator panel
-from app.ui.panels.rules_clarification_panel import RulesClarificationPanel  # Import the Rules Clarification panel
-from app.ui.panels.location_generator_panel import LocationGeneratorPanel  # Import the Location Generator panel
-from app.ui.panels.treasure_generator_panel import TreasureGeneratorPanel # Import Treasure Generator
-from app.ui.panels.encounter_generator_panel import EncounterGeneratorPanel # Import Encounter Generator
-from app.ui.panels.combat_log_panel import CombatLogPanel
+
+# Panel types in creation order: panel_id -> (module, class name, title).
+# Panel modules are only imported when a panel is first shown; the title
+# is what the panel reports, so the dock title does not change on load.
+PANEL_TYPES = {
+    "combat_tracker": ("app.ui.panels.combat_tracker_panel", "CombatTrackerPanel", "Combat Tracker"),
+    "dice_roller": ("app.ui.panels.dice_roller_panel", "DiceRollerPanel", "Dice Roller"),
+    "conditions": ("app.ui.panels.conditions_panel", "ConditionsPanel", "Conditions Reference"),
+    "rules_reference": ("app.ui.panels.rules_reference_panel", "RulesReferencePanel", "Rules Reference"),
+    "monster": ("app.ui.panels.monster_panel", "MonsterPanel", "Monster Reference"),
+    "spell_reference": ("app.ui.panels.spell_reference_panel", "SpellReferencePanel", "Spell Reference"),
+    "session_notes": ("app.ui.panels.session_notes_panel", "SessionNotesPanel", "Session Notes"),
+    "player_character": ("app.ui.panels.player_character_panel", "PlayerCharacterPanel", "Player Characters"),
+    "weather": ("app.ui.panels.weather_panel", "WeatherPanel", "Weather & Environment"),
+    "time_tracker": ("app.ui.panels.time_tracker_panel", "TimeTrackerPanel", "Time & Travel"),
+    "llm": ("app.ui.panels.llm_panel", "LLMPanel", "llm"),
+    "npc_generator": ("app.ui.panels.npc_generator_panel", "NPCGeneratorPanel", "npc_generator"),
+    "rules_clarification": ("app.ui.panels.rules_clarification_panel", "RulesClarificationPanel", "rules_clarification"),
+    "location_generator": ("app.ui.panels.location_generator_panel", "LocationGeneratorPanel", "location_generator"),
+    "treasure_generator": ("app.ui.panels.treasure_generator_panel", "TreasureGeneratorPanel", "treasure_generator"),
+    "encounter_generator": ("app.ui.panels.encounter_generator_panel", "EncounterGeneratorPanel", "encounter_generator"),
+    "combat_log": ("app.ui.panels.combat_log_panel", "CombatLogPanel", "Combat Log"),
+}
+
+# Signals forwarded between panels: (source panel, signal, target panel, slot).
+# The target is looked up (and built if needed) when the signal is emitted.
+PANEL_CONNECTIONS = (
+    ("monster", "add_combatant_signal", "combat_tracker", "add_combatant_group"),
+    ("player_character", "add_to_combat", "combat_tracker", "add_character"),
+    ("npc_generator", "npc_generated_signal", "player_character", "add_npc_character"),
+    ("combat_tracker", "combat_log_signal", "combat_log", "add_log_entry"),
+)
 
 
 class PanelManager(QObject):
@@ -45,32 +62,14 @@ class PanelManager(QObject):
         self.panel_categories = {}  # Group panels by category
         self.current_theme = app_state.get_setting("theme", "dark")
         
-        # Initialize panels
+        # Initialize panels (their contents are built when first shown)
         self._init_panels()
-        
-        # Connect panel signals
-        self._connect_panel_signals()
     
     def _init_panels(self):
-        """Initialize all available panels"""
-        # Create panels but don't show them all by default
-        self.panels["combat_tracker"] = self._create_panel(CombatTrackerPanel, "combat_tracker")
-        self.panels["dice_roller"] = self._create_panel(DiceRollerPanel, "dice_roller")
-        self.panels["conditions"] = self._create_panel(ConditionsPanel, "conditions")
-        self.panels["rules_reference"] = self._create_panel(RulesReferencePanel, "rules_reference")
-        self.panels["monster"] = self._create_panel(MonsterPanel, "monster")
-        self.panels["spell_reference"] = self._create_panel(SpellReferencePanel, "spell_reference")
-        self.panels["session_notes"] = self._create_panel(SessionNotesPanel, "session_notes")
-        self.panels["player_character"] = self._create_panel(PlayerCharacterPanel, "player_character")
-        self.panels["weather"] = self._create_panel(WeatherPanel, "weather")
-        self.panels["time_tracker"] = self._create_panel(TimeTrackerPanel, "time_tracker")
-        self.panels["llm"] = self._create_panel(LLMPanel, "llm")  # Add the LLM panel
-        self.panels["npc_generator"] = self._create_panel(NPCGeneratorPanel, "npc_generator")  # Add the NPC Generator panel
-        self.panels["rules_clarification"] = self._create_panel(RulesClarificationPanel, "rules_clarification")  # Add the Rules Clarification panel
-        self.panels["location_generator"] = self._create_panel(LocationGeneratorPanel, "location_generator")  # Add the Location Generator panel
-        self.panels["treasure_generator"] = self._create_panel(TreasureGeneratorPanel, "treasure_generator") # Initialize Treasure Generator
-        self.panels["encounter_generator"] = self._create_panel(EncounterGeneratorPanel, "encounter_generator") # Initialize Encounter Generator
-        self.panels["combat_log"] = self._create_panel(CombatLogPanel, "combat_log")
+        """Create a placeholder dock for every available panel"""
+        # Create docks but don't show them all by default
+        for panel_id in PANEL_TYPES:
+            self.panels[panel_id] = self._create_panel(panel_id)
         
         # Organize panels by category
         self._organize_panels_by_category()
@@ -174,42 +173,51 @@ class PanelManager(QObject):
                 self.panels[panel_id] != first_panel):
                 self.main_window.tabifyDockWidget(first_panel, self.panels[panel_id])
     
-    def _create_panel(self, panel_class, panel_id):
-        """Create a new panel instance wrapped in a QDockWidget"""
-        try:
-            # Create panel instance
-            panel = panel_class(self.app_state)
-            
-            # Create dock widget
-            dock = QDockWidget(panel.title, self.main_window)
-            dock.setWidget(panel)
-            dock.setObjectName(panel_class.__name__)
-            dock.setFeatures(
-                QDockWidget.DockWidgetClosable |
-                QDockWidget.DockWidgetMovable |
-                QDockWidget.DockWidgetFloatable
-            )
-            
-            # Apply category styling
-            self._apply_panel_styling(dock, panel_id)
-            
-            # Hide by default to avoid overlap
-            dock.hide()
-            
-            return dock
-            
-        except Exception as e:
-            # Log the error and show message, but don't stop the app
-            print(f"ERROR creating panel {panel_class.__name__}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(
-                self.main_window,
-                "Panel Creation Error",
-                f"Failed to create {panel_class.__name__}: {str(e)}"
-            )
-            # raise e # Don't re-raise, return None instead
-            return None # Return None if creation failed
+    def _tabify_multiple(self, docks):
+        """Tabify a list of dock widgets with the first one"""
+        for dock in docks[1:]:
+            self.main_window.tabifyDockWidget(docks[0], dock)
+    
+    def _create_panel(self, panel_id):
+        """Create the dock widget for a panel; the panel itself is built on first show"""
+        module_name, class_name, title = PANEL_TYPES[panel_id]
+        
+        dock = LazyDockWidget(title, partial(self._build_panel, panel_id), self.main_window)
+        dock.setObjectName(class_name)  # Used by saveState/restoreState
+        dock.setFeatures(
+            QDockWidget.DockWidgetClosable |
+            QDockWidget.DockWidgetMovable |
+            QDockWidget.DockWidgetFloatable
+        )
+        dock.panel_loaded.connect(partial(self._on_panel_loaded, panel_id))
+        dock.panel_failed.connect(partial(self._on_panel_failed, class_name))
+        
+        # Apply category styling
+        self._apply_panel_styling(dock, panel_id)
+        
+        # Hide by default to avoid overlap
+        dock.hide()
+        
+        return dock
+    
+    def _build_panel(self, panel_id):
+        """Import and instantiate a panel class"""
+        module_name, class_name, _ = PANEL_TYPES[panel_id]
+        print(f"[PanelManager] Building panel '{panel_id}'")
+        panel_class = getattr(importlib.import_module(module_name), class_name)
+        return panel_class(self.app_state)
+    
+    def _on_panel_loaded(self, panel_id, panel):
+        """Finish setting up a panel that has just been built"""
+        self._connect_panel_signals(panel_id, panel)
+    
+    def _on_panel_failed(self, class_name, error):
+        """Report a panel that could not be built, without stopping the app"""
+        QMessageBox.critical(
+            self.main_window,
+            "Panel Creation Error",
+            f"Failed to create {class_name}: {error}"
+        )
     
     def _apply_panel_styling(self, dock, panel_id):
         """Apply color coding and styling to the panel based on its category"""
@@ -269,79 +277,23 @@ class PanelManager(QObject):
                 70  # Slightly transparent
             )
     
-    def _connect_panel_signals(self):
-        """Connect signals between panels for inter-panel communication"""
-        print("[PanelManager] Attempting to connect panel signals...")
+    def _connect_panel_signals(self, panel_id, panel):
+        """
+        Connect a newly built panel's signals to the panels that receive them
+        
+        Targets are resolved when a signal is emitted, so the receiving panel
+        is built on demand (e.g. adding a monster builds the combat tracker).
+        """
         try:
-            # Get references to panels, checking if they exist and are valid
-            combat_tracker_dock = self.panels.get("combat_tracker")
-            monster_dock = self.panels.get("monster")
-            pc_dock = self.panels.get("player_character")
-            npc_dock = self.panels.get("npc_generator")
-            combat_log_dock = self.panels.get("combat_log")
-
-            # Get actual panel widgets, checking for None
-            combat_tracker = combat_tracker_dock.widget() if combat_tracker_dock else None
-            monster_panel = monster_dock.widget() if monster_dock else None
-            pc_panel = pc_dock.widget() if pc_dock else None
-            npc_panel = npc_dock.widget() if npc_dock else None
-            combat_log_panel = combat_log_dock.widget() if combat_log_dock else None
-
-            # Connect MonsterPanel -> CombatTracker
-            if monster_panel and combat_tracker:
-                if hasattr(monster_panel, 'add_combatant_signal') and hasattr(combat_tracker, 'add_combatant_group'):
-                    monster_panel.add_combatant_signal.connect(combat_tracker.add_combatant_group)
-                    print("[PanelManager] Connected MonsterPanel -> CombatTracker")
-                else:
-                    print("[PanelManager] Failed to connect Monster -> Combat: Missing signal/slot")
-            else:
-                 print("[PanelManager] Skipped Monster -> Combat connection (panel missing)")
-
-            # Connect PlayerCharacterPanel -> CombatTracker
-            if pc_panel and combat_tracker:
-                if hasattr(pc_panel, 'add_to_combat') and hasattr(combat_tracker, 'add_character'):
-                    pc_panel.add_to_combat.connect(combat_tracker.add_character)
-                    print("[PanelManager] Connected PlayerCharacterPanel -> CombatTracker")
-                else:
-                     print("[PanelManager] Failed to connect PC -> Combat: Missing signal/slot")
-            else:
-                 print("[PanelManager] Skipped PC -> Combat connection (panel missing)")
-                 
-            # Connect NPCGeneratorPanel -> PlayerCharacterPanel
-            if npc_panel and pc_panel:
-                if hasattr(npc_panel, 'npc_generated_signal') and hasattr(pc_panel, 'add_npc_character'):
-                    npc_panel.npc_generated_signal.connect(pc_panel.add_npc_character)
-                    print("[PanelManager] Connected NPC Generator -> PlayerCharacterPanel")
-                else:
-                    print("[PanelManager] Failed to connect NPC -> PC: Missing signal/slot")
-            else:
-                print("[PanelManager] Skipped NPC -> PC connection (panel missing)")
-            
-            # Connect CombatTrackerPanel -> CombatLogPanel
-            if combat_tracker and combat_log_panel:
-                if hasattr(combat_tracker, 'combat_log_signal'): # Assuming combat_tracker emits this
-                    # Find the correct slot on combat_log_panel 
-                    # Assuming it's called add_log_entry based on previous code snippets
-                    if hasattr(combat_log_panel, 'add_log_entry'):
-                        combat_tracker.combat_log_signal.connect(combat_log_panel.add_log_entry)
-                        print("[PanelManager] Connected CombatTracker -> CombatLog")
-                    else:
-                        print("[PanelManager] Failed to connect Combat -> Log: CombatLogPanel missing add_log_entry slot")
-                else:
-                    print("[PanelManager] Failed to connect Combat -> Log: CombatTrackerPanel missing combat_log_signal")
-            else:
-                print("[PanelManager] Skipped Combat -> Log connection (panel missing)")
-            
-            # Connect CombatTrackerPanel -> PlayerCharacterPanel (for viewing details)
-            # This might not be needed if viewing details directly shows the panel?
-            # Consider if direct calls are better than signals here.
-            # if combat_tracker and pc_panel:
-            #     if hasattr(combat_tracker, 'view_character_details') and hasattr(pc_panel, 'select_character_by_name'):
-            #         combat_tracker.view_character_details.connect(pc_panel.select_character_by_name)
-            #         print("[PanelManager] Connected CombatTracker -> PlayerCharacterPanel (View Details)")
-
-            # Add more connections as needed...
-            
+            for source_id, signal_name, target_id, slot_name in PANEL_CONNECTIONS:
+                if source_id != panel_id:
+                    continue
+                signal = getattr(panel, signal_name, None)
+                if signal is None:
+                    print(f"[PanelManager] Failed to connect {source_id} -> {target_id}: Missing signal {signal_name}")
+                    continue
+                signal.connect(partial(self._forward_signal, target_id, slot_name))
+                print(f"[PanelManager] Connected {source_id}.{signal_name} -> {target_id}.{slot_name}")
         except Exception as e:
             print(f"[PanelManager] ERROR connecting panel signals: {e}")
             import traceback
@@ -352,6 +304,15 @@ class PanelManager(QObject):
                 f"Failed to connect panel signals: {str(e)}"
             )
     
+    def _forward_signal(self, target_id, slot_name, *args):
+        """Deliver a panel signal to a slot on another panel, building it if needed"""
+        target = self.get_panel_widget(target_id)
+        slot = getattr(target, slot_name, None)
+        if slot is None:
+            print(f"[PanelManager] Dropped signal for {target_id}: Missing slot {slot_name}")
+            return
+        slot(*args)
+    
     def create_panel(self, panel_type):
         """Create a panel of the specified type
         
@@ -361,27 +322,6 @@ class PanelManager(QObject):
         Returns:
             QDockWidget: Created panel, or None if type is invalid
         """
-        # Map panel_type to panel class
-        panel_class_map = {
-            "combat_tracker": CombatTrackerPanel,
-            "dice_roller": DiceRollerPanel,
-            "monster": MonsterPanel,
-            "conditions": ConditionsPanel,
-            "rules_reference": RulesReferencePanel,
-            "spell_reference": SpellReferencePanel,
-            "session_notes": SessionNotesPanel,
-            "player_character": PlayerCharacterPanel,
-            "weather": WeatherPanel,
-            "time_tracker": TimeTrackerPanel,
-            "llm": LLMPanel,  # Add LLM panel to the map
-            "npc_generator": NPCGeneratorPanel,  # Add NPC Generator panel to the map
-            "rules_clarification": RulesClarificationPanel,  # Add Rules Clarification panel to the map
-            "location_generator": LocationGeneratorPanel,  # Add Location Generator panel to the map
-            "treasure_generator": TreasureGeneratorPanel, # Add Treasure Generator panel to the map
-            "encounter_generator": EncounterGeneratorPanel, # Add Encounter Generator panel to the map
-            "combat_log": CombatLogPanel
-        }
-        
         if panel_type in self.panels and self.panels[panel_type]:
             # Panel already exists, toggle visibility
             if self.panels[panel_type].isVisible():
@@ -392,8 +332,8 @@ class PanelManager(QObject):
             return self.panels[panel_type]
         
         # Create new panel based on type
-        if panel_type in panel_class_map:
-            self.panels[panel_type] = self._create_panel(panel_class_map[panel_type], panel_type)
+        if panel_type in PANEL_TYPES:
+            self.panels[panel_type] = self._create_panel(panel_type)
         else:
             QMessageBox.warning(
                 self.main_window,
@@ -408,7 +348,7 @@ class PanelManager(QObject):
             self.panels[panel_type].raise_()
             
             # Try to place the panel in a sensible location based on category
-            self._tabify_panel_with_category(panel_type, self.panels[panel_type].content.PANEL_CATEGORY)
+            self._tabify_panel_with_category(panel_type, PanelCategory.get_category(panel_type))
         
         return self.panels[panel_type]
     
@@ -459,22 +399,28 @@ class PanelManager(QObject):
         """Save the state of all panels"""
         state = {}
         for name, dock in self.panels.items():
-            if dock and dock.widget():
-                panel = dock.widget()
-                if hasattr(panel, "save_state"):
-                    state[name] = panel.save_state()
+            if not dock:
+                continue
+            if dock.is_loaded:
+                if hasattr(dock.panel, "save_state"):
+                    state[name] = dock.panel.save_state()
+            elif dock.pending_state is not None:
+                # Never shown since it was restored: keep the restored state
+                state[name] = dock.pending_state
         return state
     
     def restore_state(self, state):
-        """Restore the state of all panels"""
+        """Restore the state of all panels (applied when a panel is first built)"""
         if not state:
             return
             
         for name, panel_state in state.items():
             if name in self.panels and self.panels[name]:
-                panel = self.panels[name].widget()
-                if panel and hasattr(panel, "restore_state"):
-                    panel.restore_state(panel_state)
+                dock = self.panels[name]
+                if not dock.is_loaded:
+                    dock.pending_state = panel_state
+                elif hasattr(dock.panel, "restore_state"):
+                    dock.panel.restore_state(panel_state)
     
     def get_panel(self, name):
         """
@@ -504,6 +450,19 @@ class PanelManager(QObject):
         
         print(f"Panel {name} found: {panel is not None}")
         return panel
+    
+    def get_panel_widget(self, name):
+        """
+        Get the panel widget inside a dock, building it if needed
+        
+        Args:
+            name: Panel ID or name
+            
+        Returns:
+            The panel widget or None if not found
+        """
+        dock = self.get_panel(name)
+        return dock.widget() if dock else None
 
     def toggle_panel(self, panel_type):
         """Toggle a panel on or off"""
@@ -562,7 +521,8 @@ class PanelManager(QObject):
                 self.panels[panel_id].setFloating(False)
                 
                 # Set minimum sizes for panels to prevent excessive squishing
-                panel_widget = self.panels[panel_id].widget()
+                # (panels that were never shown have nothing to size yet)
+                panel_widget = self.panels[panel_id].panel
                 if panel_widget:
                     # Set reasonable minimum sizes based on panel type
                     category = PanelCategory.get_category(panel_id)
@@ -801,19 +761,19 @@ class PanelManager(QObject):
         if "combat_tracker" in self.panels and self.panels["combat_tracker"] and "dice_roller" in self.panels and self.panels["dice_roller"]:
             # Tabify combat tracker and combat log
             if "combat_log" in self.panels and self.panels["combat_log"]:
-                self.tabifyDockWidget(
+                self.main_window.tabifyDockWidget(
                     self.panels["combat_tracker"],
                     self.panels["combat_log"]
                 )
                 # Split them horizontally with dice roller
-                self.splitDockWidget(
+                self.main_window.splitDockWidget(
                     self.panels["combat_tracker"],
                     self.panels["dice_roller"],
                     Qt.Horizontal
                 )
             else:
                 # If no combat log, just split combat tracker and dice roller
-                self.splitDockWidget(
+                self.main_window.splitDockWidget(
                     self.panels["combat_tracker"],
                     self.panels["dice_roller"],
                     Qt.Horizontal
@@ -852,7 +812,7 @@ class PanelManager(QObject):
         # If both combat tracker and dice roller are shown, split them horizontally
         if "combat_tracker" in self.panels and self.panels["combat_tracker"] and \
            "dice_roller" in self.panels and self.panels["dice_roller"]:
-            self.splitDockWidget(
+            self.main_window.splitDockWidget(
                 self.panels["combat_tracker"],
                 self.panels["dice_roller"],
                 Qt.Horizontal
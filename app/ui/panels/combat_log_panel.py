@@ -2,28 +2,37 @@
 Combat log panel for tracking and displaying combat actions
 
 Features:
-- Chronological log of all combat actions
+- Chronological log of all combat actions, virtualized for long sessions
 - Timestamped entries
 - Action categories (damage, healing, conditions, etc.)
 - Filtering by action type
 - Export functionality
 - Clear log option
+- Persistent per-session log that survives restarts and crashes
 - Turn and round tracking
 - Initiative order changes
 - Status effect application
 """
 
 import datetime
+import sqlite3
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
+    QWidget, QVBoxLayout, QHBoxLayout, QListView,
     QPushButton, QComboBox, QLabel, QLineEdit, 
-    QTableWidget, QTableWidgetItem, QHeaderView,
-    QCheckBox, QGroupBox, QMessageBox, QFileDialog
+    QAbstractItemView, QMessageBox, QFileDialog
 )
-from PySide6.QtCore import Qt, Signal, Slot, QSize
-from PySide6.QtGui import QColor, QTextCharFormat, QFont, QIcon
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer
 
+from app.data.combat_log_store import TURN_DELTA_CATEGORY
+from app.ui.components.search_filter import SearchDebouncer
 from app.ui.panels.base_panel import BasePanel
+from app.ui.panels.combat_log_view import (
+    CATEGORY_ROLE, MAX_MEMORY_ENTRIES, CombatLogDelegate, CombatLogFilterProxyModel, CombatLogModel,
+    LogEntry
+)
+
+# File in the data directory receiving entries evicted from memory
+SPILL_FILE_NAME = "combat_log_spill.jsonl"
 
 # Action Categories for filtering
 ACTION_CATEGORIES = [
@@ -40,86 +49,34 @@ ACTION_CATEGORIES = [
     "Other"
 ]
 
-class LogEntry:
-    """Class to represent a combat log entry"""
-    def __init__(self, timestamp, category, actor, target, action, result, round_num=None, turn_num=None):
-        self.timestamp = timestamp  # When the action occurred
-        self.category = category    # Type of action (from ACTION_CATEGORIES)
-        self.actor = actor          # Who performed the action
-        self.target = target        # Who received the action (if applicable)
-        self.action = action        # Description of the action
-        self.result = result        # Result of the action
-        self.round_num = round_num  # Combat round when action occurred
-        self.turn_num = turn_num    # Combat turn when action occurred
-    
-    def __str__(self):
-        time_str = self.timestamp.strftime("%H:%M:%S")
-        round_turn = ""
-        if self.round_num is not None and self.turn_num is not None:
-            round_turn = f"[Round {self.round_num}, Turn {self.turn_num}] "
-        
-        target_str = ""
-        if self.target:
-            target_str = f" → {self.target}"
-            
-        result_str = ""
-        if self.result:
-            result_str = f": {self.result}"
-            
-        return f"[{time_str}] {round_turn}{self.actor}{target_str} {self.action}{result_str}"
-    
-    def to_html(self):
-        """Convert log entry to HTML for rich display"""
-        time_str = self.timestamp.strftime("%H:%M:%S")
-        
-        # Color coding based on category
-        category_colors = {
-            "Attack": "#3498db",    # Blue
-            "Damage": "#e74c3c",    # Red
-            "Healing": "#2ecc71",   # Green
-            "Status Effect": "#9b59b6", # Purple
-            "Initiative": "#f39c12", # Orange
-            "Movement": "#95a5a6",  # Gray
-            "Death Save": "#c0392b", # Dark Red
-            "Spell Cast": "#8e44ad", # Dark Purple
-            "Item Use": "#d35400",  # Dark Orange
-            "Other": "#7f8c8d"      # Dark Gray
-        }
-        
-        color = category_colors.get(self.category, "#000000")
-        
-        # Build HTML components
-        time_html = f"<span style='color: #7f8c8d; font-size: 0.9em;'>[{time_str}]</span>"
-        
-        round_turn_html = ""
-        if self.round_num is not None and self.turn_num is not None:
-            round_turn_html = f"<span style='color: #f39c12; font-weight: bold;'>[Round {self.round_num}, Turn {self.turn_num}]</span> "
-        
-        actor_html = f"<span style='font-weight: bold;'>{self.actor}</span>"
-        
-        target_html = ""
-        if self.target:
-            target_html = f" <span style='color: #7f8c8d;'>→</span> <span style='font-weight: bold;'>{self.target}</span>"
-            
-        action_html = f"<span style='color: {color};'>{self.action}</span>"
-        
-        result_html = ""
-        if self.result:
-            result_html = f": <span>{self.result}</span>"
-            
-        return f"{time_html} {round_turn_html}{actor_html}{target_html} {action_html}{result_html}"
-
 class CombatLogPanel(BasePanel):
     """Panel for logging and displaying combat actions"""
     
     def __init__(self, app_state):
         """Initialize the combat log panel"""
         super().__init__(app_state, "Combat Log")
-        self.log_entries = []  # List to store all log entries
         self.current_filter = "All"  # Default filter
+    
+    @property
+    def log_entries(self):
+        """The log entries held in memory, oldest first"""
+        return self.log_model.entries()
         
     def _setup_ui(self):
         """Set up the combat log UI"""
+        # Entries are written to the persistent combat log store and shown
+        # from a ring buffer model. Without a store, entries evicted from
+        # memory are spilled to a file in the data directory instead.
+        self.store = getattr(self.app_state, "combat_log_store", None)
+        data_dir = getattr(self.app_state, "data_dir", None)
+        self.log_model = CombatLogModel(
+            capacity=MAX_MEMORY_ENTRIES,
+            spill_path=data_dir / SPILL_FILE_NAME if data_dir and self.store is None else None,
+            parent=self
+        )
+        self.proxy_model = CombatLogFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.log_model)
+        
         # Main layout
         layout = QVBoxLayout()
         
@@ -135,17 +92,32 @@ class CombatLogPanel(BasePanel):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search...")
-        self.search_input.textChanged.connect(self._apply_filter)
+        self.search_debouncer = SearchDebouncer(self.search_input, self.proxy_model.set_search_text)
         filter_layout.addWidget(self.search_input)
         
         layout.addLayout(filter_layout)
         
-        # Log display area
-        self.log_display = QTextEdit()
-        self.log_display.setReadOnly(True)
+        # Log display area: only the visible rows are laid out and painted
+        self.log_display = QListView()
+        self.log_display.setModel(self.proxy_model)
+        self.log_display.setItemDelegate(CombatLogDelegate(self.log_display))
+        self.log_display.setUniformItemSizes(True)
+        self.log_display.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.log_display.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.log_display.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.log_display.setStyleSheet("font-family: monospace;")
         layout.addWidget(self.log_display)
         
+        # Follow new entries while the view is scrolled to the bottom. A
+        # burst of entries scrolls once, as scrolling lays out the view.
+        self._follow_log = True
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(0)
+        self._scroll_timer.timeout.connect(self.log_display.scrollToBottom)
+        self.proxy_model.rowsAboutToBeInserted.connect(self._check_follow_log)
+        self.proxy_model.rowsInserted.connect(self._scroll_to_new_entries)
+        
         # Control buttons
         button_layout = QHBoxLayout()
         
@@ -166,6 +138,42 @@ class CombatLogPanel(BasePanel):
         
         # Set the layout
         self.setLayout(layout)
+        
+        # Pick up a session left unfinished by a crash
+        self._resume_unfinished_session()
+    
+    def _resume_unfinished_session(self):
+        """Reload the latest session that was never ended, if no session is active"""
+        if self.store is None or self.store.active_session_id is not None:
+            return
+        try:
+            unfinished = self.store.sessions(unfinished_only=True)
+        except sqlite3.Error as e:
+            print(f"[CombatLogPanel] Error reading combat log sessions: {e}")
+            return
+        if unfinished:
+            self._load_session(unfinished[0]["id"])
+    
+    def _load_session(self, session_id):
+        """Continue a stored session, showing its newest entries"""
+        self.store.resume_session(session_id)
+        records = self.store.entries(session_id, exclude_categories=(TURN_DELTA_CATEGORY,),
+                                     limit=MAX_MEMORY_ENTRIES, newest=True)
+        self.log_model.set_entries(self._entry_from_record(record) for record in records)
+    
+    @staticmethod
+    def _entry_from_record(record):
+        """Convert a stored CombatLogRecord to a LogEntry"""
+        return LogEntry(
+            datetime.datetime.fromisoformat(record.timestamp),
+            record.category,
+            record.actor,
+            record.target,
+            record.payload.get("action", ""),
+            record.payload.get("result"),
+            record.round,
+            record.turn
+        )
     
     def add_log_entry(self, category, actor, action, target=None, result=None, round_num=None, turn_num=None):
         """Add a new entry to the combat log"""
@@ -181,10 +189,17 @@ class CombatLogPanel(BasePanel):
                     turn_num = combat_tracker.current_turn
         
         entry = LogEntry(timestamp, category, actor, target, action, result, round_num, turn_num)
-        self.log_entries.append(entry)
         
-        # Update the display
-        self._update_display()
+        # Appended as a new row; existing rows are not touched
+        self.log_model.append(entry)
+        
+        # Queue it for the persistent log (written in the background)
+        if self.store is not None:
+            try:
+                self.store.append(category, actor, target, round_num, turn_num,
+                                  payload={"action": action, "result": result}, timestamp=timestamp)
+            except sqlite3.Error as e:
+                print(f"[CombatLogPanel] Error storing combat log entry: {e}")
         
         return entry
     
@@ -195,36 +210,22 @@ class CombatLogPanel(BasePanel):
         return None
     
     def _apply_filter(self):
-        """Apply filters to the log display"""
+        """Apply the category filter to the log display"""
         self.current_filter = self.filter_combo.currentText()
-        self._update_display()
+        self.proxy_model.set_field_filter(
+            CATEGORY_ROLE, None if self.current_filter == "All" else self.current_filter)
     
-    def _update_display(self):
-        """Update the log display with filtered entries"""
-        self.log_display.clear()
-        
-        # Get search text
-        search_text = self.search_input.text().lower()
-        
-        # Build HTML content
-        html_content = "<html><body>"
-        
-        for entry in reversed(self.log_entries):  # Newest entries at the top
-            # Apply category filter
-            if self.current_filter != "All" and entry.category != self.current_filter:
-                continue
-                
-            # Apply search filter
-            if search_text:
-                entry_text = str(entry).lower()
-                if search_text not in entry_text:
-                    continue
-            
-            # Add entry to display
-            html_content += f"<div>{entry.to_html()}</div>"
-        
-        html_content += "</body></html>"
-        self.log_display.setHtml(html_content)
+    def _check_follow_log(self):
+        """Remember whether the view is at the bottom before rows are added"""
+        if self._scroll_timer.isActive():
+            return  # rows added earlier in this burst are not laid out yet
+        scrollbar = self.log_display.verticalScrollBar()
+        self._follow_log = scrollbar.value() >= scrollbar.maximum()
+    
+    def _scroll_to_new_entries(self):
+        """Keep the newest entry in view unless the user scrolled up"""
+        if self._follow_log:
+            self._scroll_timer.start()
     
     def _clear_log(self):
         """Clear the combat log"""
@@ -237,8 +238,10 @@ class CombatLogPanel(BasePanel):
         )
         
         if confirm == QMessageBox.Yes:
-            self.log_entries.clear()
-            self._update_display()
+            self.log_model.clear()
+            # The stored session is kept; new entries start a new one
+            if self.store is not None:
+                self.store.end_session()
     
     def _export_log(self):
         """Export the combat log to a file"""
@@ -253,20 +256,20 @@ class CombatLogPanel(BasePanel):
             return
             
         try:
-            with open(file_path, 'w') as f:
+            with open(file_path, 'w', encoding='utf-8') as f:
                 if file_path.endswith('.html'):
                     # Export as HTML
                     f.write("<html><head><style>")
                     f.write("body { font-family: Arial, sans-serif; }")
                     f.write("</style></head><body>")
                     
-                    for entry in self.log_entries:
+                    for entry in self._history():
                         f.write(f"<div>{entry.to_html()}</div>")
                         
                     f.write("</body></html>")
                 else:
                     # Export as plain text
-                    for entry in self.log_entries:
+                    for entry in self._history():
                         f.write(f"{str(entry)}\n")
                         
             QMessageBox.information(
@@ -281,6 +284,13 @@ class CombatLogPanel(BasePanel):
                 f"Failed to export combat log: {str(e)}"
             )
     
+    def _history(self):
+        """Every entry of the log, including those no longer held in memory"""
+        if self.store is not None and self.store.active_session_id is not None:
+            records = self.store.entries(exclude_categories=(TURN_DELTA_CATEGORY,))
+            return [self._entry_from_record(record) for record in records]
+        return self.log_model.iter_history()
+    
     def _add_manual_entry(self):
         """Add a manual entry to the log"""
         # This would open a dialog to add custom entries
@@ -367,19 +377,15 @@ class CombatLogPanel(BasePanel):
     
     def save_state(self):
         """Save the combat log state"""
+        # With a store, the entries are saved there and only the session is referenced
+        if self.store is not None:
+            return {
+                "session_id": self.store.active_session_id,
+                "current_filter": self.current_filter
+            }
+        
         # Convert log entries to serializable format
-        serialized_entries = []
-        for entry in self.log_entries:
-            serialized_entries.append({
-                "timestamp": entry.timestamp.isoformat(),
-                "category": entry.category,
-                "actor": entry.actor,
-                "target": entry.target,
-                "action": entry.action,
-                "result": entry.result,
-                "round_num": entry.round_num,
-                "turn_num": entry.turn_num
-            })
+        serialized_entries = [entry.to_dict() for entry in self.log_model.entries()]
         
         return {
             "log_entries": serialized_entries,
@@ -390,27 +396,16 @@ class CombatLogPanel(BasePanel):
         """Restore the combat log state"""
         if not state:
             return
-            
-        self.log_entries = []
         
-        # Restore log entries
-        if "log_entries" in state:
-            for entry_data in state["log_entries"]:
-                # Parse timestamp string back to datetime
-                timestamp = datetime.datetime.fromisoformat(entry_data["timestamp"])
-                
-                entry = LogEntry(
-                    timestamp,
-                    entry_data["category"],
-                    entry_data["actor"],
-                    entry_data["target"],
-                    entry_data["action"],
-                    entry_data["result"],
-                    entry_data["round_num"],
-                    entry_data["turn_num"]
-                )
-                
-                self.log_entries.append(entry)
+        # Restore log entries in one model update
+        if state.get("session_id") and self.store is not None:
+            try:
+                self._load_session(state["session_id"])
+            except sqlite3.Error as e:
+                print(f"[CombatLogPanel] Error loading combat log session: {e}")
+        elif "log_entries" in state:
+            self.log_model.set_entries(
+                LogEntry.from_dict(entry_data) for entry_data in state["log_entries"])
         
         # Restore filter
         if "current_filter" in state:
@@ -419,5 +414,5 @@ class CombatLogPanel(BasePanel):
             if index >= 0:
                 self.filter_combo.setCurrentIndex(index)
         
-        # Update the display
-        self._update_display() 
\ No newline at end of file
+        # Show the newest entries
+        self.log_display.scrollToBottom()
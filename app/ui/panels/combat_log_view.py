@@ -0,0 +1,391 @@
+"""
+Model and delegate for the combat log panel
+
+Entries live in a fixed-capacity ring buffer exposed through
+CombatLogModel. New entries are appended as inserted rows, so the view and
+its filter proxy only process the new rows instead of re-rendering the
+whole log. CombatLogDelegate paints each row directly with uniform row
+heights, so a QListView only lays out and paints the visible rows however
+long the log grows.
+
+When the ring buffer is full the oldest entries are evicted in batches.
+With a spill file configured they are appended to it as JSON lines, and
+iter_history() still returns the complete log for export.
+"""
+
+import datetime
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+from app.ui.components.search_filter import FILTER_ROLE, SEARCH_KEY_ROLE, SearchFilterProxyModel
+
+logger = logging.getLogger(__name__)
+
+# Entries kept in memory before the oldest are evicted
+MAX_MEMORY_ENTRIES = 100_000
+
+# Item data role holding the LogEntry of a row
+ENTRY_ROLE = Qt.UserRole
+
+# Item data role holding the category, for SearchFilterProxyModel.set_field_filter
+CATEGORY_ROLE = FILTER_ROLE
+
+# Color coding based on category
+CATEGORY_COLORS = {
+    "Attack": "#3498db",    # Blue
+    "Damage": "#e74c3c",    # Red
+    "Healing": "#2ecc71",   # Green
+    "Status Effect": "#9b59b6", # Purple
+    "Initiative": "#f39c12", # Orange
+    "Movement": "#95a5a6",  # Gray
+    "Death Save": "#c0392b", # Dark Red
+    "Spell Cast": "#8e44ad", # Dark Purple
+    "Item Use": "#d35400",  # Dark Orange
+    "Other": "#7f8c8d"      # Dark Gray
+}
+
+MUTED_COLOR = "#7f8c8d"
+ROUND_COLOR = "#f39c12"
+
+
+class LogEntry:
+    """Class to represent a combat log entry"""
+
+    __slots__ = ("timestamp", "category", "actor", "target", "action", "result",
+                 "round_num", "turn_num", "_search_key")
+
+    def __init__(self, timestamp, category, actor, target, action, result, round_num=None, turn_num=None):
+        self.timestamp = timestamp  # When the action occurred
+        self.category = category    # Type of action (from ACTION_CATEGORIES)
+        self.actor = actor          # Who performed the action
+        self.target = target        # Who received the action (if applicable)
+        self.action = action        # Description of the action
+        self.result = result        # Result of the action
+        self.round_num = round_num  # Combat round when action occurred
+        self.turn_num = turn_num    # Combat turn when action occurred
+        self._search_key = None
+
+    def __str__(self):
+        time_str = self.timestamp.strftime("%H:%M:%S")
+        round_turn = ""
+        if self.round_num is not None and self.turn_num is not None:
+            round_turn = f"[Round {self.round_num}, Turn {self.turn_num}] "
+
+        target_str = ""
+        if self.target:
+            target_str = f" → {self.target}"
+
+        result_str = ""
+        if self.result:
+            result_str = f": {self.result}"
+
+        return f"[{time_str}] {round_turn}{self.actor}{target_str} {self.action}{result_str}"
+
+    @property
+    def search_key(self):
+        """Lowercase text searched by the log filter, built once"""
+        if self._search_key is None:
+            self._search_key = str(self).lower()
+        return self._search_key
+
+    def to_html(self):
+        """Convert log entry to HTML for rich display"""
+        time_str = self.timestamp.strftime("%H:%M:%S")
+        color = CATEGORY_COLORS.get(self.category, "#000000")
+
+        # Build HTML components
+        time_html = f"<span style='color: {MUTED_COLOR}; font-size: 0.9em;'>[{time_str}]</span>"
+
+        round_turn_html = ""
+        if self.round_num is not None and self.turn_num is not None:
+            round_turn_html = f"<span style='color: {ROUND_COLOR}; font-weight: bold;'>[Round {self.round_num}, Turn {self.turn_num}]</span> "
+
+        actor_html = f"<span style='font-weight: bold;'>{self.actor}</span>"
+
+        target_html = ""
+        if self.target:
+            target_html = f" <span style='color: {MUTED_COLOR};'>→</span> <span style='font-weight: bold;'>{self.target}</span>"
+
+        action_html = f"<span style='color: {color};'>{self.action}</span>"
+
+        result_html = ""
+        if self.result:
+            result_html = f": <span>{self.result}</span>"
+
+        return f"{time_html} {round_turn_html}{actor_html}{target_html} {action_html}{result_html}"
+
+    def to_dict(self):
+        """Convert the entry to a JSON-serializable dictionary"""
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "category": self.category,
+            "actor": self.actor,
+            "target": self.target,
+            "action": self.action,
+            "result": self.result,
+            "round_num": self.round_num,
+            "turn_num": self.turn_num
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create an entry from a dictionary made by to_dict()"""
+        return cls(
+            datetime.datetime.fromisoformat(data["timestamp"]),
+            data["category"],
+            data["actor"],
+            data.get("target"),
+            data["action"],
+            data.get("result"),
+            data.get("round_num"),
+            data.get("turn_num")
+        )
+
+
+class EntryRing:
+    """Fixed-capacity ring buffer with O(1) append, indexing and eviction"""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._items = []
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index: int):
+        if not 0 <= index < self._size:
+            raise IndexError("ring index out of range")
+        return self._items[(self._head + index) % self.capacity]
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self._items[(self._head + index) % self.capacity]
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def append(self, item):
+        """Append an item; the ring must not be full"""
+        if self.full:
+            raise IndexError("ring is full")
+        if len(self._items) < self.capacity:
+            self._items.append(item)
+        else:
+            self._items[(self._head + self._size) % self.capacity] = item
+        self._size += 1
+
+    def pop_oldest(self, count: int) -> List:
+        """Remove and return the oldest items"""
+        count = min(count, self._size)
+        popped = []
+        for _ in range(count):
+            popped.append(self._items[self._head])
+            self._items[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+        self._size -= count
+        return popped
+
+    def clear(self):
+        self._items = []
+        self._head = 0
+        self._size = 0
+
+
+class CombatLogModel(QAbstractListModel):
+    """Append-only list model of combat log entries, oldest first"""
+
+    def __init__(self, capacity: int = MAX_MEMORY_ENTRIES, spill_path: Optional[Path] = None, parent=None):
+        """
+        Args:
+            capacity: Entries kept in memory
+            spill_path: Optional JSON lines file receiving evicted entries
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._ring = EntryRing(capacity)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.spilled_count = 0
+        # Evicting in batches keeps the row removal cost off most appends
+        self.evict_batch = max(1, capacity // 100)
+        if self.spill_path and self.spill_path.exists():
+            self.spill_path.unlink()  # left over from a previous session
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ring)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._ring[index.row()]
+        if role == SEARCH_KEY_ROLE:
+            return entry.search_key
+        if role == CATEGORY_ROLE:
+            return entry.category
+        if role == ENTRY_ROLE:
+            return entry
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return str(entry)
+        return None
+
+    # Entries
+
+    def entry(self, row: int) -> LogEntry:
+        return self._ring[row]
+
+    def entries(self) -> List[LogEntry]:
+        """The entries held in memory, oldest first"""
+        return list(self._ring)
+
+    def append(self, entry: LogEntry):
+        """Append one entry as a new last row"""
+        self.extend([entry])
+
+    def extend(self, entries: Iterable[LogEntry]):
+        """Append entries as new last rows, evicting the oldest if needed"""
+        entries = list(entries)
+        while entries:
+            if self._ring.full:
+                self._evict(self.evict_batch)
+            chunk = entries[:self._ring.capacity - len(self._ring)]
+            entries = entries[len(chunk):]
+            first = len(self._ring)
+            self.beginInsertRows(QModelIndex(), first, first + len(chunk) - 1)
+            for entry in chunk:
+                self._ring.append(entry)
+            self.endInsertRows()
+
+    def clear(self):
+        """Remove all entries, including spilled ones"""
+        self.beginResetModel()
+        self._ring.clear()
+        self.endResetModel()
+        self.spilled_count = 0
+        if self.spill_path and self.spill_path.exists():
+            self.spill_path.unlink()
+
+    def set_entries(self, entries: Iterable[LogEntry]):
+        """Replace the log, e.g. when restoring saved state"""
+        self.clear()
+        self.extend(entries)
+
+    def iter_history(self) -> Iterator[LogEntry]:
+        """All entries oldest first, reading evicted ones back from the spill file"""
+        if self.spilled_count and self.spill_path and self.spill_path.exists():
+            with open(self.spill_path, encoding="utf-8") as f:
+                for line in f:
+                    yield LogEntry.from_dict(json.loads(line))
+        yield from list(self._ring)
+
+    def _evict(self, count: int):
+        self.beginRemoveRows(QModelIndex(), 0, min(count, len(self._ring)) - 1)
+        evicted = self._ring.pop_oldest(count)
+        self.endRemoveRows()
+        if self.spill_path is None:
+            return
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry.to_dict()) + "\n" for entry in evicted)
+            self.spilled_count += len(evicted)
+        except OSError as e:
+            logger.warning("Could not spill combat log entries to %s: %s", self.spill_path, e)
+
+
+class CombatLogFilterProxyModel(SearchFilterProxyModel):
+    """
+    SearchFilterProxyModel reading entries straight from a CombatLogModel
+
+    Checking the entry's attributes avoids a model index and data() call per
+    field, which dominates filtering a log of 100k entries.
+    """
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._search_text and not self._field_filters:
+            return True
+        entry = self.sourceModel().entry(source_row)
+        if self._search_text and self._search_text not in entry.search_key:
+            return False
+        for role, (value, match) in self._field_filters.items():
+            if not match(entry.category if role == CATEGORY_ROLE else None, value):
+                return False
+        return True
+
+
+class CombatLogDelegate(QStyledItemDelegate):
+    """
+    Paints a log entry as one line of colored segments
+
+    Rows have a fixed height, so views can use uniform item sizes; text that
+    does not fit is elided and the full entry is shown as a tooltip.
+    """
+
+    PADDING = 2
+
+    def _fonts(self, option):
+        font = QFont(option.font)
+        bold = QFont(option.font)
+        bold.setBold(True)
+        return font, bold
+
+    def sizeHint(self, option, index):
+        font, bold = self._fonts(option)
+        height = max(QFontMetrics(font).height(), QFontMetrics(bold).height()) + 2 * self.PADDING
+        return QSize(QFontMetrics(font).horizontalAdvance(index.data(Qt.DisplayRole) or ""), height)
+
+    def _segments(self, entry, text_color):
+        """Text, color and boldness of each part of an entry"""
+        segments = [(f"[{entry.timestamp.strftime('%H:%M:%S')}] ", QColor(MUTED_COLOR), False)]
+        if entry.round_num is not None and entry.turn_num is not None:
+            segments.append((f"[Round {entry.round_num}, Turn {entry.turn_num}] ", QColor(ROUND_COLOR), True))
+        segments.append((str(entry.actor), text_color, True))
+        if entry.target:
+            segments.append((" → ", QColor(MUTED_COLOR), False))
+            segments.append((str(entry.target), text_color, True))
+        segments.append((f" {entry.action}", QColor(CATEGORY_COLORS.get(entry.category, MUTED_COLOR)), False))
+        if entry.result:
+            segments.append((f": {entry.result}", text_color, False))
+        return segments
+
+    def paint(self, painter, option, index):
+        entry = index.data(ENTRY_ROLE)
+        if entry is None:
+            super().paint(painter, option, index)
+            return
+
+        style = option.widget.style() if option.widget else None
+        if style:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+        selected = bool(option.state & QStyle.State_Selected)
+        text_color = option.palette.highlightedText().color() if selected else option.palette.text().color()
+
+        font, bold = self._fonts(option)
+        rect = option.rect.adjusted(self.PADDING * 2, 0, -self.PADDING * 2, 0)
+        x = rect.left()
+        painter.save()
+        for text, color, is_bold in self._segments(entry, text_color):
+            segment_font = bold if is_bold else font
+            metrics = QFontMetrics(segment_font)
+            available = rect.right() - x
+            if available <= 0:
+                break
+            width = metrics.horizontalAdvance(text)
+            if width > available:
+                text = metrics.elidedText(text, Qt.ElideRight, available)
+                width = available
+            painter.setFont(segment_font)
+            painter.setPen(text_color if selected else color)
+            painter.drawText(x, rect.top(), width, rect.height(), Qt.AlignVCenter | Qt.AlignLeft, text)
+            x += width
+        painter.restore()
@@ -30,10 +30,9 @@ from PySide6.QtCore import Qt, QTimer, Signal, Slot, QSize, QMetaObject, Q_ARG,
 from PySide6.QtGui import QColor, QFont, QTextCharFormat, QBrush, QPixmap, QImage, QTextCursor, QPalette, QAction, QKeySequence
 import random
 import re
-import json
-import copy
 import time
 import threading
+import traceback
 import gc
 import hashlib
 import logging # Add logging import
@@ -44,7 +43,11 @@ from .combat_dialogs import (
     SavingThrowDialog, ABILITIES
 )
 
+from .combat_turn_pacer import TurnPacer, PACING_PRESETS, DEFAULT_PACING_MS
+from app.combat.combat_state import copy_combat_state
+from app.combat.turn_delta import TurnDeltaTracker
 from .combat_utils import get_attr, roll_dice, extract_dice_formula
+from app.core.dice import compile_expression, make_dice_roller
 
 from app.ui.panels.base_panel import BasePanel
 from app.ui.panels.panel_category import PanelCategory
@@ -55,6 +58,7 @@ from app.ui.panels.combat_constants import CONDITIONS
 from app.ui.panels.combat_tracker_delegates import CurrentTurnDelegate, HPUpdateDelegate, InitiativeUpdateDelegate
 from app.ui.panels.combat_utils import extract_dice_formula, roll_dice, get_attr
 from app.ui.panels.combatant_manager import CombatantManager
+from app.ui.panels.combatant_store import CombatantStore
 
 
 # --- End modularized imports ---
@@ -142,6 +146,9 @@ class CombatTrackerPanel(BasePanel):
     # Signal to request monster details from MonsterPanel
     request_monster_details = Signal(str) # Emits monster name or ID
 
+    # Carries a TurnDelta from the resolver thread to the turn pacer (queued)
+    turn_delta_ready = Signal(object)
+
     @property
     def current_turn(self):
         """Get the current turn index"""
@@ -186,9 +193,17 @@ class CombatTrackerPanel(BasePanel):
         # New: live combat log
         self.combat_log_widget = None
         
+        # Paced playback of resolver turn updates (the resolver itself never sleeps)
+        self.turn_pacer = TurnPacer(self.app_state.get_setting("combat_turn_pacing_ms", DEFAULT_PACING_MS))
+        self.turn_pacer.frame_ready.connect(self._update_ui)
+        self._turn_delta_tracker = None
+        
         # Initialize base panel (calls _setup_ui)
         super().__init__(app_state, "Combat Tracker")
         
+        # Resolver-thread turn deltas reach the pacer through the event loop
+        self.turn_delta_ready.connect(self.turn_pacer.enqueue, Qt.QueuedConnection)
+        
         print("[CombatTracker] Basic attributes initialized")
         
         # Set up our custom delegates after the table is created
@@ -301,6 +316,7 @@ class CombatTrackerPanel(BasePanel):
         # Create initiative table
         self.initiative_table = QTableWidget(0, 8)  # Changed to 8 columns
         self.initiative_table.setHorizontalHeaderLabels(["Name", "Initiative", "HP", "Max HP", "AC", "Status", "Conc.", "Type"])
+        self.combatant_store = CombatantStore(self.initiative_table)
         self.initiative_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.initiative_table.setSelectionMode(QTableWidget.ExtendedSelection)
         # Allow editing via double‑click or pressing a key, but NOT on single
@@ -471,6 +487,31 @@ class CombatTrackerPanel(BasePanel):
         self.fast_resolve_button.clicked.connect(self._fast_resolve_combat)
         control_layout.addWidget(self.fast_resolve_button)
 
+        # Resolution mode used by Fast Resolve (per fight)
+        self.resolution_mode_combo = QComboBox()
+        self.resolution_mode_combo.addItem("LLM narrates outcome", "legacy")
+        self.resolution_mode_combo.addItem("Single call + local dice", "combined")
+        self.resolution_mode_combo.addItem("Local rules engine (no LLM)", "local")
+        self.resolution_mode_combo.setToolTip(
+            "How Fast Resolve handles each turn:\n"
+            "- LLM narrates outcome: the LLM decides and describes the result\n"
+            "- Single call + local dice: one LLM call returns the action's mechanics,\n"
+            "  dice are rolled locally and applied by the rules engine (faster)\n"
+            "- Local rules engine: actions are chosen from the stat blocks by simple\n"
+            "  tactics (best expected damage, focus fire, heal when low); no LLM calls"
+        )
+        control_layout.addWidget(self.resolution_mode_combo)
+
+        # Playback speed for Fast Resolve turn updates
+        self.pacing_combo = QComboBox()
+        for label, interval_ms in PACING_PRESETS:
+            self.pacing_combo.addItem(label, interval_ms)
+        pacing_index = self.pacing_combo.findData(self.turn_pacer.interval_ms)
+        self.pacing_combo.setCurrentIndex(pacing_index if pacing_index >= 0 else self.pacing_combo.findData(DEFAULT_PACING_MS))
+        self.pacing_combo.setToolTip("How fast resolved turns are played back in the tracker")
+        self.pacing_combo.currentIndexChanged.connect(self._pacing_changed)
+        control_layout.addWidget(self.pacing_combo)
+
         # Reset Combat button
         self.reset_button = QPushButton("Reset Combat")
         self.reset_button.clicked.connect(self._reset_combat)
@@ -662,13 +703,7 @@ class CombatTrackerPanel(BasePanel):
         """Find the row of a monster by its unique ID"""
         if monster_id is None:
             return -1
-            
-        for row in range(self.initiative_table.rowCount()):
-            name_item = self.initiative_table.item(row, 0)
-            if name_item and name_item.data(Qt.UserRole + 2) == monster_id:
-                return row
-                
-        return -1
+        return self.combatant_store.row_of(monster_id)
     
     def _sort_initiative(self):
         """Sort the initiative list in descending order."""
@@ -1515,6 +1550,14 @@ class CombatTrackerPanel(BasePanel):
             f"{self.current_round - 1} rounds ({minutes} minutes)"
         )
     
+    def _pacing_changed(self, index):
+        """Apply and remember the selected turn playback speed"""
+        interval_ms = self.pacing_combo.itemData(index)
+        if interval_ms is None:
+            return
+        self.turn_pacer.set_interval(interval_ms)
+        self.app_state.set_setting("combat_turn_pacing_ms", interval_ms)
+    
     def _reset_combat(self):
         """Reset the entire combat tracker to its initial state."""
         # Log combat reset
@@ -1534,6 +1577,10 @@ class CombatTrackerPanel(BasePanel):
         )
         
         if reply == QMessageBox.Yes:
+            # Drop any turn updates still waiting to be played back
+            self.turn_pacer.clear()
+            self._turn_delta_tracker = None
+            
             # Clear the table
             self.initiative_table.setRowCount(0)
             
@@ -1655,11 +1702,6 @@ class CombatTrackerPanel(BasePanel):
             self.result = result
             self.error = error
     
-    class _UpdateUIEvent(QEvent):
-        def __init__(self, turn_state):
-            super().__init__(QEvent.Type(QEvent.User + 106))
-            self.turn_state = turn_state
-    
     class _SetResolvingEvent(QEvent):
         def __init__(self, is_resolving):
             super().__init__(QEvent.Type(QEvent.User + 107))
@@ -1749,6 +1791,9 @@ class CombatTrackerPanel(BasePanel):
                         "No combatants in the tracker to resolve."
                     ))
                     return
+                combat_state["resolution_mode"] = self.resolution_mode_combo.currentData()
+                # Turn updates are sent as deltas against what the table shows now
+                self._turn_delta_tracker = TurnDeltaTracker(combat_state["combatants"])
                 
                 # Step 3: Clear and prepare the combat log
                 QApplication.instance().postEvent(self, CombatTrackerPanel._ProgressEvent("Preparing combat log..."))
@@ -1758,25 +1803,11 @@ class CombatTrackerPanel(BasePanel):
                 QApplication.instance().postEvent(self, CombatTrackerPanel._AddInitialStateEvent(combat_state))
                 
                 # Step 5: Setup the dice roller function that will be passed to the resolver
-                def dice_roller(expr):
-                    """Parse and roll a dice expression like '1d20+5'. Returns the integer result."""
-                    try:
-                        import re, random
-                        match = re.match(r"(\d*)d(\d+)([+-]\d+)?", expr.replace(' ', ''))
-                        if not match:
-                            return 0
-                        num, die, mod = match.groups()
-                        num = int(num) if num else 1
-                        die = int(die)
-                        mod = int(mod) if mod else 0
-                        total = sum(random.randint(1, die) for _ in range(num)) + mod
-                        
-                        # Log the roll to the combat log via a custom event
-                        QApplication.instance().postEvent(self, CombatTrackerPanel._LogDiceEvent(expr, total))
-                        return total
-                    except Exception as e:
-                        print(f"[CombatTracker] Error in dice roller: {e}")
-                        return 10  # Provide a reasonable default
+                # Every roll is logged to the combat log via a custom event
+                dice_roller = make_dice_roller(
+                    on_roll=lambda expr, total: QApplication.instance().postEvent(
+                        self, CombatTrackerPanel._LogDiceEvent(expr, total))
+                )
                 
                 # Step 6: Setup completion callback
                 def completion_callback(result, error):
@@ -1801,8 +1832,8 @@ class CombatTrackerPanel(BasePanel):
                     """Callback for per-turn updates if signals aren't working"""
                     print(f"[CombatTracker] Manual turn update callback received data with "
                           f"{len(turn_state.get('combatants', []))} combatants")
-                    # Forward to our wrapper method via a custom event
-                    QApplication.instance().postEvent(self, CombatTrackerPanel._UpdateUIEvent(turn_state))
+                    # The wrapper is thread-safe: it snapshots a TurnDelta here and queues it
+                    self._update_ui_wrapper(turn_state)
                 
                 # Step 8: Start the actual combat resolution
                 QApplication.instance().postEvent(self, CombatTrackerPanel._SetResolvingEvent(True))
@@ -1858,15 +1889,7 @@ class CombatTrackerPanel(BasePanel):
         """Handle custom events posted to our panel"""
         from PySide6.QtWidgets import QApplication, QMessageBox
         
-        if event.type() == QEvent.Type(QEvent.User + 1):
-            # This is our UpdateUIEvent for JSON
-            try:
-                self._update_ui(event.json_data)
-                return True
-            except Exception as e:
-                print(f"[CombatTracker] Error in event handler UI update: {e}")
-                return False
-        elif event.type() == QEvent.Type(QEvent.User + 100):
+        if event.type() == QEvent.Type(QEvent.User + 100):
             # Progress event
             self.fast_resolve_button.setText(event.message)
             QApplication.processEvents()
@@ -1897,10 +1920,6 @@ class CombatTrackerPanel(BasePanel):
             # Process result event
             self._process_resolution_ui(event.result, event.error)
             return True
-        elif event.type() == QEvent.Type(QEvent.User + 106):
-            # Update UI event
-            self._update_ui_wrapper(event.turn_state)
-            return True
         elif event.type() == QEvent.Type(QEvent.User + 107):
             # Set resolving event
             self._is_resolving_combat = event.is_resolving
@@ -1930,166 +1949,32 @@ class CombatTrackerPanel(BasePanel):
             
         return super().event(event)
 
-    # This method remains, but it's the wrapper for thread-safe UI updates
     def _update_ui_wrapper(self, turn_state):
-        """Thread-safe wrapper to update UI during combat (used by the resolver)"""
-        # Serialize the turn state to JSON
+        """
+        Thread-safe entry point for resolver turn updates.
+        
+        Called on the resolver thread. The turn state is reduced to an
+        immutable TurnDelta (only combatants and fields that changed since
+        the previous update) and handed to the turn pacer through a queued
+        signal, so nothing is serialized and the UI is only touched on the
+        main thread.
+        """
         try:
-            import json
-            import traceback
-            from PySide6.QtCore import QMetaObject, Qt, Q_ARG
-            from PySide6.QtWidgets import QApplication
-            from PySide6.QtCore import QEvent
-            
-            # Debug count of combatants
-            combatants = turn_state.get("combatants", [])
-            print(f"[CombatTracker] _update_ui_wrapper called with turn state containing {len(combatants)} combatants")
-            
-            # Ensure the turn state is serializable by sanitizing it
-            def sanitize_object(obj):
-                """Recursively sanitize an object to ensure it's JSON serializable"""
-                if isinstance(obj, dict):
-                    return {str(k): sanitize_object(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [sanitize_object(item) for item in obj]
-                elif isinstance(obj, (int, float, bool, str)) or obj is None:
-                    return obj
-                else:
-                    return str(obj)  # Convert any other types to strings
-            
-            # Apply sanitization
-            sanitized_turn_state = sanitize_object(turn_state)
-            
-            # Serialize to JSON with error handling
-            try:
-                json_string = json.dumps(sanitized_turn_state)
-                print(f"[CombatTracker] Successfully serialized turn state to JSON ({len(json_string)} chars)")
-            except Exception as e:
-                print(f"[CombatTracker] Error serializing turn state: {e}")
-                traceback.print_exc()
-                # Create a minimal valid JSON object as fallback
-                json_string = json.dumps({
-                    "round": turn_state.get("round", 1),
-                    "current_turn_index": turn_state.get("current_turn_index", 0),
-                    "combatants": []
-                })
-            
-            # Pass the JSON string as an argument
-            print("[CombatTracker] Using QMetaObject.invokeMethod for thread-safe UI update")
-            try:
-                result = QMetaObject.invokeMethod(
-                    self, 
-                    '_update_ui', 
-                    Qt.QueuedConnection,  # Ensures it queues in the main thread's event loop
-                    Q_ARG(str, json_string)  # Pass JSON string instead of dict/object
-                )
-                if not result:
-                    print("[CombatTracker] WARNING: QMetaObject.invokeMethod returned False, trying alternative method")
-                    # Try direct call with a slight delay (as fallback)
-                    def delayed_update():
-                        try:
-                            self._update_ui(json_string)
-                        except Exception as e:
-                            print(f"[CombatTracker] Error in delayed update: {e}")
-                    
-                    # Schedule for execution in main thread after a slight delay
-                    QApplication.instance().postDelayed(delayed_update, 100)
-                
-                # Force process events to ensure UI updates (helps with thread sync issues)
-                QApplication.processEvents()
-                
-            except Exception as e:
-                print(f"[CombatTracker] Critical error in invokeMethod: {e}")
-                traceback.print_exc()
-                # As a last resort, try to post a user event to update UI
-                try:
-                    # Create a custom event 
-                    class UpdateUIEvent(QEvent):
-                        def __init__(self, json_data):
-                            super().__init__(QEvent.Type(QEvent.User + 1))
-                            self.json_data = json_data
-                    
-                    # Post the event to our panel
-                    QApplication.postEvent(self, UpdateUIEvent(json_string))
-                    print("[CombatTracker] Posted custom event as last resort for UI update")
-                except Exception as e2:
-                    print(f"[CombatTracker] All UI update methods failed: {e2}")
-                    traceback.print_exc()
-                    
+            if self._turn_delta_tracker is None:
+                self._turn_delta_tracker = TurnDeltaTracker()
+            self.turn_delta_ready.emit(self._turn_delta_tracker.diff(turn_state))
         except Exception as e:
-            print(f"[CombatTracker] Unhandled error in _update_ui_wrapper: {e}")
+            print(f"[CombatTracker] Error in _update_ui_wrapper: {e}")
             traceback.print_exc()
 
-    # Also add a custom event handler to handle our backup approach
-    def _event_duplicate_backup(self, event):
-        """Handle custom events posted to our panel"""
-        if event.type() == QEvent.Type(QEvent.User + 1):
-            # This is our UpdateUIEvent
-            try:
-                self._update_ui(event.json_data)
-                return True
-            except Exception as e:
-                print(f"[CombatTracker] Error in event handler UI update: {e}")
-                return False
-        return super().event(event)
-
-    # Make the actual UI update function a slot callable by the wrapper
-    # The slot now accepts a string (JSON)
-    @Slot(str)
-    def _update_ui(self, turn_state_json):
-        """Update UI after each turn (runs in main thread via _update_ui_wrapper)."""
-        # Deserialize the JSON string back into a dictionary
-        try:
-            # First check if the JSON string is valid
-            if not turn_state_json or turn_state_json == '{}':
-                print(f"[CombatTracker] Error: Empty or invalid turn_state_json")
-                return
-            
-            # Clean the JSON string to remove any invalid characters
-            import re
-            turn_state_json = re.sub(r'[\x00-\x1F\x7F]', '', turn_state_json)
-            
-            # Additional safety for broken JSON
-            if not turn_state_json.strip().startswith('{'):
-                print(f"[CombatTracker] Error: Invalid JSON format, does not start with '{{'. First 100 chars: {turn_state_json[:100]}")
-                # Try to extract a JSON object if present
-                json_match = re.search(r'(\{.*\})', turn_state_json)
-                if json_match:
-                    turn_state_json = json_match.group(1)
-                    print(f"[CombatTracker] Extracted potential JSON object: {turn_state_json[:50]}...")
-                else:
-                    # Create a minimal valid state
-                    turn_state_json = '{}'
-            
-            # Attempt to parse JSON
-            import json
-            import traceback
-            from PySide6.QtWidgets import QApplication
-            turn_state = json.loads(turn_state_json)
-            if not isinstance(turn_state, dict):
-                print(f"[CombatTracker] Error: Deserialized turn_state is not a dict: {type(turn_state)}")
-                turn_state = {} # Use empty dict on error
-        except json.JSONDecodeError as e:
-            print(f"[CombatTracker] Error deserializing turn_state JSON: {e}")
-            print(f"[CombatTracker] JSON string causing error (first 100 chars): {turn_state_json[:100]}")
-            # Fallback to an empty dict
-            turn_state = {} 
-        except Exception as e:
-            print(f"[CombatTracker] Unexpected error in deserializing turn_state: {e}")
-            traceback.print_exc()
-            # Fallback to an empty dict
-            turn_state = {} 
-            
-        # Existing logic from the original update_ui function
+    @Slot(object)
+    def _update_ui(self, delta):
+        """Apply one TurnDelta released by the turn pacer (main thread)."""
         try:
-            # Extract state
-            round_num = turn_state.get("round", 1)
-            current_idx = turn_state.get("current_turn_index", 0)
-            combatants = turn_state.get("combatants", [])
-            latest_action = turn_state.get("latest_action", {})
-            
-            # Debug logging
-            print(f"\n[CombatTracker] DEBUG: Received updated turn state with {len(combatants)} combatants")
+            round_num = delta.round
+            current_idx = delta.current_turn_index
+            combatants = [c.as_dict() for c in delta.combatants]
+            latest_action = delta.latest_action or {}
             
             # Update round counter
             self.round_spin.setValue(round_num)
@@ -2098,15 +1983,13 @@ class CombatTrackerPanel(BasePanel):
             self.current_turn = current_idx
             self._update_highlight()
             
-            # Apply combatant updates to the table
+            # Apply combatant updates to the table (only changed cells are written)
             if combatants:
-                # Make a copy of combatants to avoid any reference issues
-                import copy
-                combatants_copy = copy.deepcopy(combatants)
-                self._update_combatants_in_table(combatants_copy)
-                
-                # Force UI refresh after table update
-                QApplication.processEvents()
+                self._update_combatants_in_table(combatants)
+            
+            # Record the delta in the persistent combat log so the fight can be replayed
+            if not delta.replayed:
+                self._record_turn_delta(delta)
             
             # Log the action to combat log
             if latest_action:
@@ -2123,13 +2006,14 @@ class CombatTrackerPanel(BasePanel):
                     dice_strs = [f"{d.get('purpose', 'Roll')}: {d.get('expression', '')} = {d.get('result', '')}" 
                                 for d in dice]
                     dice_summary = "\n".join(dice_strs)
-                    self._log_combat_action(
-                        "Turn", 
-                        actor, 
-                        action, 
-                        result=f"{result}\n\nDice Rolls:\n{dice_summary}"
-                    )
-                else:
+                    if not delta.replayed:
+                        self._log_combat_action(
+                            "Turn", 
+                            actor, 
+                            action, 
+                            result=f"{result}\n\nDice Rolls:\n{dice_summary}"
+                        )
+                elif not delta.replayed:
                     self._log_combat_action(
                         "Turn", 
                         actor, 
@@ -2165,28 +2049,40 @@ class CombatTrackerPanel(BasePanel):
                 # Scroll to the bottom to see latest entries
                 scrollbar = self.combat_log_text.verticalScrollBar()
                 scrollbar.setValue(scrollbar.maximum())
-                
-                # Force UI update after appending to combat log
-                QApplication.processEvents()
-            
-            # Release any references to copied data
-            combatants_copy = None
-            latest_action = None
-            
-            # Process any UI events to ensure the table updates
-            QApplication.processEvents()
-            
-            # Force garbage collection
-            import gc
-            gc.collect()
         except Exception as e:
-            import traceback
             traceback.print_exc()
             print(f"[CombatTracker] Error in UI update: {str(e)}")
 
-            # Force UI refresh even on error
-            from PySide6.QtWidgets import QApplication
-            QApplication.processEvents()
+    def _record_turn_delta(self, delta):
+        """Queue an applied turn delta for the persistent combat log"""
+        store = getattr(self.app_state, 'combat_log_store', None)
+        if store is None:
+            return
+        try:
+            store.record_turn_delta(delta)
+        except Exception as e:
+            print(f"[CombatTracker] Error recording turn delta: {e}")
+
+    def replay_combat_log(self, session_id=None, up_to_round=None):
+        """
+        Re-drive the tracker from the turn deltas recorded in the combat log
+        
+        The deltas are played back through the turn pacer like a live fight
+        and applied to the combatants in the table by instance ID. They are
+        not logged again.
+        
+        Args:
+            session_id: Combat log session to replay, the current one by default
+            up_to_round: Stop after this round (e.g. to rewind a fight)
+            
+        Returns:
+            Number of turn updates queued
+        """
+        store = getattr(self.app_state, 'combat_log_store', None)
+        if store is None:
+            return 0
+        self.turn_pacer.clear()
+        return store.replay(self.turn_pacer.enqueue, session_id, up_to_round)
 
     def _add_initial_combat_state_to_log(self, combat_state):
         """Add initial combat state to the log at the start of combat"""
@@ -2374,106 +2270,61 @@ class CombatTrackerPanel(BasePanel):
         """
         Update the initiative table with new combatant data.
         
+        Rows are found by instance_id (falling back to name) through the
+        combatant store, and only cells whose values changed are written.
+        
         Args:
             combatants: List of combatant dictionaries with updated values
         """
-        print(f"\n[CombatTracker] DEBUG: Updating table with HP values from resolver:")
-        for c in combatants:
-            print(f"[CombatTracker] DEBUG: Incoming update for {c.get('name', 'Unknown')}: HP {c.get('hp', 'N/A')}")
-            
-        # Collect the combatants by name for easier lookup
-        combatants_by_name = {}
-        for combatant in combatants:
-            name = combatant.get("name", "")
-            if name and name not in ["Nearest Enemy", "Enemy", "Target"] and "Enemy" not in name:
-                combatants_by_name[name] = combatant
+        store = self.combatant_store
         
         # Block signals during programmatic updates
         self.initiative_table.blockSignals(True)
         try:
-            # Loop through rows in the table and update with corresponding combatant data
-            for row in range(self.initiative_table.rowCount()):
-                name_item = self.initiative_table.item(row, 0)
-                if not name_item:
-                    continue
-                    
-                name = name_item.text()
-                if not name or name not in combatants_by_name:
+            for combatant in combatants:
+                name = combatant.get("name", "")
+                if not name or name in ["Nearest Enemy", "Enemy", "Target"] or "Enemy" in name:
                     continue
                 
-                # Get the corresponding combatant data
-                combatant = combatants_by_name[name]
+                row = store.row_of(combatant.get("instance_id"), name)
+                if row < 0:
+                    continue
+                current = store.record(row)
                 
                 # Update HP
                 if "hp" in combatant:
-                    hp_item = self.initiative_table.item(row, 2)
-                    if hp_item:
-                        old_hp = hp_item.text()
-                        hp_value = combatant["hp"]
-                        
-                        # Track max_hp for consistency check
-                        max_hp_item = self.initiative_table.item(row, 3)
-                        max_hp = 0
-                        if max_hp_item and max_hp_item.text():
-                            try:
-                                max_hp = int(max_hp_item.text())
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        try:
-                            # Convert to integer - use clear, strict parsing here
-                            if isinstance(hp_value, int):
-                                new_hp = hp_value
-                                print(f"[CombatTracker] DEBUG: Integer HP value {hp_value} for {name}")
-                            elif isinstance(hp_value, str) and hp_value.strip().isdigit():
-                                new_hp = int(hp_value.strip())
-                                print(f"[CombatTracker] DEBUG: String HP value '{hp_value}' converted to {new_hp} for {name}")
-                            else:
-                                # More complex string - extract first integer
-                                import re
-                                match = re.search(r'\d+', str(hp_value))
-                                if match:
-                                    new_hp = int(match.group(0))
-                                    print(f"[CombatTracker] DEBUG: Extracted HP value {new_hp} from complex string '{hp_value}' for {name}")
-                                else:
-                                    # Keep existing HP if parsing fails
-                                    new_hp = int(old_hp) if old_hp.isdigit() else 0
-                                    print(f"[CombatTracker] DEBUG: Failed to parse HP from '{hp_value}', keeping {new_hp} for {name}")
-                                
-                            # Ensure HP is not greater than max_hp (if max_hp is known and positive)
-                            if max_hp > 0 and "max_hp" not in combatant and new_hp > max_hp:
-                                print(f"[CombatTracker] WARNING: HP value {new_hp} exceeds max_hp {max_hp} for {name}, setting HP = max_hp")
-                                new_hp = max_hp
-                                
-                            # Set HP in table
-                            if str(new_hp) != old_hp:
-                                hp_item.setText(str(new_hp))
-                                print(f"[CombatTracker] Updated {name} HP from {old_hp} to {new_hp}")
-                                
-                                # Also update self.combatants dictionary if this row is in it
-                                if row in self.combatants and isinstance(self.combatants[row], dict):
-                                    self.combatants[row]['current_hp'] = new_hp
-                                    print(f"[CombatTracker] Updated internal combatants dictionary for {name}: HP = {new_hp}")
-                        except Exception as e:
-                            print(f"[CombatTracker] Error processing HP update for {name}: {e}")
+                    hp_value = combatant["hp"]
+                    if isinstance(hp_value, int):
+                        new_hp = hp_value
+                    else:
+                        # Strings like "12" or "12 (after damage)" - use the first integer
+                        match = re.search(r'\d+', str(hp_value))
+                        new_hp = int(match.group(0)) if match else current["hp"]
+                        if not match:
+                            print(f"[CombatTracker] Failed to parse HP from '{hp_value}', keeping {new_hp} for {name}")
+                    
+                    # Ensure HP is not greater than max_hp (if max_hp is known and positive)
+                    max_hp = current["max_hp"]
+                    if max_hp > 0 and "max_hp" not in combatant and new_hp > max_hp:
+                        print(f"[CombatTracker] WARNING: HP value {new_hp} exceeds max_hp {max_hp} for {name}, setting HP = max_hp")
+                        new_hp = max_hp
+                    
+                    old_hp = current["hp"]
+                    if store.set_value(row, "hp", new_hp):
+                        print(f"[CombatTracker] Updated {name} HP from {old_hp} to {new_hp}")
+                        # Also update self.combatants dictionary if this row is in it
+                        if row in self.combatants and isinstance(self.combatants[row], dict):
+                            self.combatants[row]['current_hp'] = new_hp
                 
-                # Update status (this code remains the same)
+                # Update status
                 if "status" in combatant:
-                    status_item = self.initiative_table.item(row, 5)
-                    if status_item:
-                        old_status = status_item.text()
-                        new_status = combatant["status"]
-                        if old_status != new_status:
-                            status_item.setText(new_status)
-                            print(f"[CombatTracker] Updated {name} status from '{old_status}' to '{new_status}'")
+                    old_status = current["status"]
+                    if store.set_value(row, "status", combatant["status"]):
+                        print(f"[CombatTracker] Updated {name} status from '{old_status}' to '{combatant['status']}'")
                 
                 # Update concentration if present
                 if "concentration" in combatant:
-                    conc_item = self.initiative_table.item(row, 6)
-                    if conc_item:
-                        new_state = Qt.Checked if combatant["concentration"] else Qt.Unchecked
-                        if conc_item.checkState() != new_state:
-                            conc_item.setCheckState(new_state)
+                    store.set_value(row, "concentration", bool(combatant["concentration"]))
                 
                 # Handle death saves if present
                 if "death_saves" in combatant:
@@ -2481,99 +2332,35 @@ class CombatTrackerPanel(BasePanel):
                     self.death_saves[row] = combatant["death_saves"]
                     
                     # Display in status (if not already shown)
-                    status_item = self.initiative_table.item(row, 5)
-                    if status_item:
-                        current_status = status_item.text()
+                    current_status = current["status"]
+                    if "death save" not in current_status.lower():
                         successes = combatant["death_saves"].get("successes", 0)
                         failures = combatant["death_saves"].get("failures", 0)
+                        death_saves_text = f"Death Saves: {successes}S/{failures}F"
+                        new_status = f"{current_status}, {death_saves_text}" if current_status else death_saves_text
+                        store.set_value(row, "status", new_status)
                         
-                        # If status doesn't already mention death saves, add them
-                        if "death save" not in current_status.lower():
-                            death_saves_text = f"Death Saves: {successes}S/{failures}F"
-                            if current_status:
-                                new_status = f"{current_status}, {death_saves_text}"
-                            else:
-                                new_status = death_saves_text
-                            status_item.setText(new_status)
-                            
-                            # Log death save progress
-                            self._log_combat_action(
-                                "Death Save", 
-                                name, 
-                                "death saves", 
-                                result=f"{successes} successes, {failures} failures"
-                            )
+                        # Log death save progress
+                        self._log_combat_action(
+                            "Death Save", 
+                            name, 
+                            "death saves", 
+                            result=f"{successes} successes, {failures} failures"
+                        )
         finally:
             # Ensure signals are unblocked
             self.initiative_table.blockSignals(False)
-        
-        # Ensure the table is updated visually - moved outside the loop
-        self.initiative_table.viewport().update()
-        from PySide6.QtWidgets import QApplication
-        QApplication.processEvents()
     
     def _gather_combat_state(self):
         """Gather the current state of the combat from the table."""
         combatants = []
         
-        print(f"\n[CombatTracker] DEBUG: Gathering combat state with current HP values from table:")
-        
-        for row in range(self.initiative_table.rowCount()):
-            # Basic combatant data
-            name_item = self.initiative_table.item(row, 0)
-            initiative_item = self.initiative_table.item(row, 1)
-            hp_item = self.initiative_table.item(row, 2)
-            max_hp_item = self.initiative_table.item(row, 3)
-            ac_item = self.initiative_table.item(row, 4)
-            status_item = self.initiative_table.item(row, 5)
-            conc_item = self.initiative_table.item(row, 6)
-            type_item = self.initiative_table.item(row, 7)
-            
-            # Get values or defaults
-            name = name_item.text() if name_item else "Unknown"
-            initiative = int(initiative_item.text() or "0") if initiative_item else 0
-            hp = int(hp_item.text() or "0") if hp_item else 0
-            # Get max_hp from specific max_hp column
-            max_hp = int(max_hp_item.text() or str(hp)) if max_hp_item else hp
-            ac = int(ac_item.text() or "10") if ac_item else 10
-            status = status_item.text() if status_item else ""
-            concentration = conc_item.checkState() == Qt.Checked if conc_item else False
-            combatant_type = type_item.text() if type_item else "unknown"
-            
-            # Get monster ID from name item if it's a monster
-            monster_id = None
-            if name_item:
-                # Get instance_id regardless of type (both monsters and characters need consistent IDs)
-                monster_id = name_item.data(Qt.UserRole + 2)
-                
-                if not monster_id:
-                    # Generate a unique ID if none exists
-                    import time
-                    import hashlib
-                    timestamp = int(time.time())
-                    hash_base = f"{name}_{timestamp}_{row}"
-                    monster_id = hashlib.md5(hash_base.encode()).hexdigest()[:8]
-                    # Store the ID back on the item for future reference
-                    name_item.setData(Qt.UserRole + 2, monster_id)
-                    print(f"[CombatTracker] Generated new instance ID {monster_id} for {name}")
-                else:
-                    print(f"[CombatTracker] Using existing instance ID {monster_id} for {name}")
-            
-            # Debug print current HP values
-            print(f"[CombatTracker] DEBUG: Table row {row}: {name} - HP: {hp}/{max_hp} {' (ID: ' + str(monster_id) + ')' if monster_id else ''}")
-            
-            # Create combatant dictionary
-            combatant = {
-                "name": name,
-                "initiative": initiative,
-                "hp": hp,
-                "max_hp": max_hp,
-                "ac": ac,
-                "status": status,
-                "concentration": concentration,
-                "type": combatant_type,
-                "instance_id": monster_id if monster_id else f"combatant_{row}"  # Ensure every combatant has a unique ID
-            }
+        # Typed row values come from the combatant store; only rows that changed
+        # since the last gather are parsed from the table again
+        for row, record in enumerate(self.combatant_store.records()):
+            combatant = dict(record)
+            name = combatant["name"]
+            combatant_type = combatant["type"]
             
             # Add more detailed information if available in the self.combatants dictionary
             if row in self.combatants:
@@ -3563,17 +3350,9 @@ class CombatTrackerPanel(BasePanel):
             return 10
             
         try:
-            # Extract dice components
-            count = int(dice_match.group(1))
-            sides = int(dice_match.group(2))
-            modifier = 0
-            if dice_match.group(3):
-                modifier = int(dice_match.group(3))
-                
             # Roll the dice
-            rolls = [random.randint(1, sides) for _ in range(count)]
-            total = sum(rolls) + modifier
-            print(f"[CombatTracker] Dice rolls: {rolls}, modifier: {modifier}, total: {total}")
+            total, details = compile_expression(dice_match.group(0)).roll_detailed()
+            print(f"[CombatTracker] Dice rolls: {details}, total: {total}")
             return max(1, total)  # Ensure at least 1 HP
         except (ValueError, TypeError, IndexError) as e:
             print(f"[CombatTracker] Error rolling dice: {e}")
@@ -4995,6 +4774,12 @@ class CombatTrackerPanel(BasePanel):
         
         print("[CombatTracker] _process_resolution_ui called - processing combat results")
         
+        # Let queued turn updates finish playing before showing the final result
+        if self.turn_pacer.pending():
+            print(f"[CombatTracker] Deferring final result until {self.turn_pacer.pending()} queued turn updates have played")
+            self.turn_pacer.run_when_drained(lambda: self._process_resolution_ui(result, error))
+            return
+        
         try:
             # Cancel safety timers if they exist
             if hasattr(self, '_safety_timer') and self._safety_timer:
@@ -5048,8 +4833,8 @@ class CombatTrackerPanel(BasePanel):
             except Exception as log_error:
                 print(f"[CombatTracker] Error preserving existing log: {log_error}")
             
-            # Make a deep copy of result to prevent reference issues
-            local_result = copy.deepcopy(result)
+            # The resolver is finished with the result; a shallow copy is enough
+            local_result = dict(result)
             
             # Clear the original reference to help GC
             result = None
@@ -5065,8 +4850,8 @@ class CombatTrackerPanel(BasePanel):
             
             print(f"[CombatTracker] Processing combat results: {len(combatants)} combatants, {len(log_entries)} log entries, {round_count} rounds")
             
-            # Make another deep copy of combatants to ensure no reference issues during updates
-            combatants_copy = copy.deepcopy(combatants)
+            # Copy the per-fight fields of the combatants (stat blocks are shared) before applying them
+            combatants_copy = copy_combat_state({"combatants": combatants})["combatants"]
             
             # Clear original reference
             combatants = None
@@ -0,0 +1,113 @@
+# app/ui/panels/combat_turn_pacer.py - Paced playback of combat turn updates
+"""
+Paced playback of turn updates produced by the combat resolver.
+
+The resolver runs as fast as the LLM allows and never sleeps; every turn
+update it produces is queued here on the UI thread. The pacer releases
+one update per interval so the tracker can animate the fight at a
+readable speed, or releases everything immediately in max speed mode.
+"""
+
+from collections import deque
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+
+# Playback speeds offered by the combat tracker: (label, interval in ms)
+PACING_PRESETS = [
+    ("Slow", 1500),
+    ("Normal", 500),
+    ("Fast", 150),
+    ("Max speed", 0),
+]
+
+DEFAULT_PACING_MS = 500
+
+
+class TurnPacer(QObject):
+    """Queue of turn updates released to the UI at a fixed rate"""
+
+    # Emitted on the UI thread for every released turn update (a TurnDelta)
+    frame_ready = Signal(object)
+
+    # Emitted when the last queued update has been released
+    drained = Signal()
+
+    def __init__(self, interval_ms=DEFAULT_PACING_MS, parent=None):
+        super().__init__(parent)
+        self._queue = deque()
+        self._on_drained = []
+        self._interval_ms = max(0, int(interval_ms))
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_tick)
+
+    @property
+    def interval_ms(self):
+        """Milliseconds between released updates (0 = max speed)"""
+        return self._interval_ms
+
+    def set_interval(self, interval_ms):
+        """Change the playback rate; takes effect for the next update"""
+        self._interval_ms = max(0, int(interval_ms))
+        if self._interval_ms == 0:
+            self._timer.stop()
+            self._flush()
+        elif self._timer.isActive():
+            self._timer.setInterval(self._interval_ms)
+
+    def pending(self):
+        """Number of queued updates not yet released"""
+        return len(self._queue)
+
+    @Slot(object)
+    def enqueue(self, turn_update):
+        """
+        Queue a turn update.
+
+        Call through a queued connection when the update comes from a
+        worker thread. An update arriving while the pacer is idle is
+        released right away; after each release the next one waits for
+        the configured interval.
+        """
+        self._queue.append(turn_update)
+        if self._interval_ms == 0:
+            self._flush()
+        elif not self._timer.isActive():
+            self._release_one()
+            self._timer.start(self._interval_ms)
+
+    def run_when_drained(self, callback):
+        """Call callback once every queued update has been released"""
+        if not self._queue:
+            callback()
+            return
+        self._on_drained.append(callback)
+
+    def clear(self):
+        """Drop queued updates and pending callbacks (e.g. combat reset)"""
+        self._timer.stop()
+        self._queue.clear()
+        self._on_drained.clear()
+
+    def _flush(self):
+        while self._queue:
+            self.frame_ready.emit(self._queue.popleft())
+        self._finish()
+
+    def _release_one(self):
+        self.frame_ready.emit(self._queue.popleft())
+        if not self._queue:
+            self._finish()
+
+    def _on_tick(self):
+        if self._queue:
+            self._release_one()
+        else:
+            # Interval elapsed with nothing queued - go idle
+            self._timer.stop()
+
+    def _finish(self):
+        callbacks, self._on_drained = self._on_drained, []
+        for callback in callbacks:
+            callback()
+        self.drained.emit()
@@ -2,9 +2,10 @@
 """
 Utility functions for the combat tracker panel: dice rolling, attribute extraction, etc.
 """
-import random
 import re
 
+from app.core import dice
+
 def extract_dice_formula(hp_value):
     """Extract dice formula from a string or dict HP value."""
     if isinstance(hp_value, str):
@@ -23,10 +24,7 @@ def roll_dice(formula):
     match = re.match(r"(\d+)d(\d+)([+-]\d+)?", formula)
     if not match:
         return 0
-    num = int(match.group(1))
-    die = int(match.group(2))
-    mod = int(match.group(3) or 0)
-    return sum(random.randint(1, die) for _ in range(num)) + mod
+    return dice.roll(match.group(0))
 
 def get_attr(obj, attr, default=None, alt_attrs=None):
     """Get attribute from object or dict, trying alternate attribute names if specified."""
@@ -0,0 +1,189 @@
+# combatant_store.py
+"""
+Combatant store for the combat tracker's initiative table.
+
+Keeps a typed record of every table row keyed by instance_id, so turn updates
+can find a combatant's row in constant time and write only the cells whose
+values changed. The store listens to the table's own item model: dataChanged
+marks just the touched rows stale, and row inserts/removals/moves/sorts
+rebuild the instance_id -> row index lazily on the next lookup. Rows are only
+re-parsed from item text after they change, never on every state gather.
+"""
+import hashlib
+import time
+
+from PySide6.QtCore import Qt
+
+# Table columns in display order
+COLUMNS = ("name", "initiative", "hp", "max_hp", "ac", "status", "concentration", "type")
+COLUMN = {key: col for col, key in enumerate(COLUMNS)}
+
+# Item data role holding the combatant's instance ID on the name item
+INSTANCE_ID_ROLE = Qt.UserRole + 2
+
+
+def _to_int(text, default):
+    """Parse table text as an int, falling back to default"""
+    text = str(text).strip()
+    try:
+        return int(text) if text else default
+    except ValueError:
+        return default
+
+
+class CombatantStore:
+    """Typed, instance_id-keyed view of the rows of a QTableWidget"""
+
+    def __init__(self, table):
+        self.table = table
+        self._records = {}        # row -> record dict (only for rows parsed since their last change)
+        self._row_by_id = {}      # instance_id -> row
+        self._row_by_name = {}    # name -> row (fallback for updates without an ID)
+        self._index_valid = False
+        self._writing = False
+
+        model = table.model()
+        model.dataChanged.connect(self._on_data_changed)
+        for signal in (model.rowsInserted, model.rowsRemoved, model.rowsMoved,
+                       model.layoutChanged, model.modelReset):
+            signal.connect(self.invalidate)
+
+    # ------------------------------------------------------------------
+    # Change tracking
+    # ------------------------------------------------------------------
+
+    def invalidate(self, *args):
+        """Forget every cached row and the row index (rows were added, removed or moved)"""
+        self._records.clear()
+        self._index_valid = False
+
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        if self._writing:
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._records.pop(row, None)
+        if top_left.column() == COLUMN["name"]:
+            # Names and instance IDs live in column 0
+            self._index_valid = False
+
+    def _rebuild_index(self):
+        self._row_by_id.clear()
+        self._row_by_name.clear()
+        for row in range(self.table.rowCount()):
+            name_item = self.table.item(row, COLUMN["name"])
+            if not name_item:
+                continue
+            instance_id = name_item.data(INSTANCE_ID_ROLE)
+            if instance_id is not None:
+                self._row_by_id[instance_id] = row
+            self._row_by_name.setdefault(name_item.text(), row)
+        self._index_valid = True
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def row_of(self, instance_id=None, name=None):
+        """
+        Find the table row of a combatant.
+
+        Args:
+            instance_id: Instance ID stored on the name item
+            name: Combatant name, used when the ID is missing or unknown
+
+        Returns:
+            Row index, or -1 if not found
+        """
+        if not self._index_valid:
+            self._rebuild_index()
+        if instance_id is not None and instance_id in self._row_by_id:
+            return self._row_by_id[instance_id]
+        if name is not None:
+            return self._row_by_name.get(name, -1)
+        return -1
+
+    def record(self, row):
+        """
+        Typed values of one row (parsed from item text only if the row changed).
+
+        Rows without an instance ID are given a generated one, stored back on
+        the name item so later lookups are stable.
+        """
+        cached = self._records.get(row)
+        if cached is not None:
+            return cached
+
+        table = self.table
+        items = [table.item(row, col) for col in range(len(COLUMNS))]
+        text = [item.text() if item else "" for item in items]
+
+        name = text[COLUMN["name"]] if items[COLUMN["name"]] else "Unknown"
+        hp = _to_int(text[COLUMN["hp"]], 0)
+        conc_item = items[COLUMN["concentration"]]
+
+        instance_id = None
+        name_item = items[COLUMN["name"]]
+        if name_item:
+            instance_id = name_item.data(INSTANCE_ID_ROLE)
+            if not instance_id:
+                hash_base = f"{name}_{int(time.time())}_{row}"
+                instance_id = hashlib.md5(hash_base.encode()).hexdigest()[:8]
+                self._writing = True
+                try:
+                    name_item.setData(INSTANCE_ID_ROLE, instance_id)
+                finally:
+                    self._writing = False
+                self._index_valid = False
+                print(f"[CombatantStore] Generated new instance ID {instance_id} for {name}")
+
+        record = {
+            "name": name,
+            "initiative": _to_int(text[COLUMN["initiative"]], 0),
+            "hp": hp,
+            "max_hp": _to_int(text[COLUMN["max_hp"]], hp),
+            "ac": _to_int(text[COLUMN["ac"]], 10),
+            "status": text[COLUMN["status"]],
+            "concentration": conc_item.checkState() == Qt.Checked if conc_item else False,
+            "type": text[COLUMN["type"]] if items[COLUMN["type"]] else "unknown",
+            "instance_id": instance_id or f"combatant_{row}",
+        }
+        self._records[row] = record
+        return record
+
+    def records(self):
+        """Typed values of every row, in table order"""
+        return [self.record(row) for row in range(self.table.rowCount())]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def set_value(self, row, key, value):
+        """
+        Write one field of a row if it differs from the current value.
+
+        Only the changed cell is touched, so the table model emits dataChanged
+        for that single index.
+
+        Returns:
+            True if the cell changed
+        """
+        record = self.record(row)
+        if record.get(key) == value:
+            return False
+        item = self.table.item(row, COLUMN[key])
+        if item is None:
+            return False
+
+        self._writing = True
+        try:
+            if key == "concentration":
+                item.setCheckState(Qt.Checked if value else Qt.Unchecked)
+            else:
+                item.setText(str(value))
+        finally:
+            self._writing = False
+        record[key] = value
+        if key == "name":
+            self._index_valid = False
+        return True
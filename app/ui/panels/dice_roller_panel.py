@@ -4,15 +4,14 @@ Dice roller panel for the DM Screen application
 
 Provides a flexible dice rolling system with support for:
 - Standard D&D dice (d4, d6, d8, d10, d12, d20, d100)
-- Custom dice expressions (e.g. 2d6+3)
+- Custom dice expressions (e.g. 2d6+3, 4d6kh3, d20adv, 2d6r1, 3d6!)
 - Advantage/disadvantage rolls
+- Exact odds for custom expressions (average, spread, P(total >= target))
 - Roll history
 - Saved custom rolls
 - Mini mode for non-obtrusive operation
 """
 
-import re
-import random
 import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
@@ -20,13 +19,19 @@ from PySide6.QtWidgets import (
     QSpinBox, QComboBox, QCheckBox, QMessageBox,
     QScrollArea, QSizePolicy, QMenu, QInputDialog
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal, QThreadPool, QRunnable
 from PySide6.QtGui import QFont, QColor, QPalette, QTextDocument, QIcon
 from app.ui.panels.base_panel import BasePanel
+from app.ui.components.search_filter import SearchDebouncer
+from app.core.dice import compile_expression, roll, DiceError
+from app.core.dice_probability import distribution
 
 class DiceRollerPanel(BasePanel):
     """Panel for rolling dice and managing roll history"""
     
+    # Emitted from the worker thread: request number, Distribution or None, error text
+    probability_ready = Signal(int, object, str)
+    
     def __init__(self, app_state):
         """Initialize the dice roller panel"""
         # Initialize with default values before parent init
@@ -129,7 +134,7 @@ class DiceRollerPanel(BasePanel):
         # Roll input field
         input_layout = QHBoxLayout()
         self.roll_input = QLineEdit()
-        self.roll_input.setPlaceholderText("Enter roll (e.g. 2d6+3 or 1d8+2d4+5)")
+        self.roll_input.setPlaceholderText("Enter roll (e.g. 2d6+3, 4d6kh3, d20adv)")
         self.roll_input.returnPressed.connect(self._custom_roll)
         input_layout.addWidget(self.roll_input)
         
@@ -146,6 +151,35 @@ class DiceRollerPanel(BasePanel):
         custom_roll_group.setLayout(custom_roll_layout)
         layout.addWidget(custom_roll_group)
         
+        # Exact odds for the custom roll expression
+        probability_group = QGroupBox("Probability")
+        probability_layout = QVBoxLayout()
+        
+        target_layout = QHBoxLayout()
+        target_layout.addWidget(QLabel("Chance of rolling at least:"))
+        self.probability_target = QSpinBox()
+        self.probability_target.setRange(-10000, 100000)
+        self.probability_target.setValue(10)
+        self.probability_target.valueChanged.connect(self._show_probability)
+        target_layout.addWidget(self.probability_target)
+        target_layout.addStretch()
+        probability_layout.addLayout(target_layout)
+        
+        self.probability_label = QLabel()
+        self.probability_label.setTextFormat(Qt.RichText)
+        self.probability_label.setWordWrap(True)
+        probability_layout.addWidget(self.probability_label)
+        
+        probability_group.setLayout(probability_layout)
+        layout.addWidget(probability_group)
+        # Odds are computed on a worker thread once typing pauses, so a large
+        # expression never blocks the UI; stale results are dropped
+        self._probability_request = 0
+        self._distribution = None
+        self.probability_ready.connect(self._on_probability_ready)
+        self.probability_debouncer = SearchDebouncer(self.roll_input, self._update_probability)
+        self._update_probability(self.roll_input.text())
+        
         # Advantage/Disadvantage section
         adv_group = QGroupBox("D20 with Advantage/Disadvantage")
         adv_layout = QHBoxLayout()
@@ -280,7 +314,7 @@ class DiceRollerPanel(BasePanel):
     
     def _quick_roll_mini(self, sides):
         """Perform a quick roll in mini mode"""
-        result = random.randint(1, sides)
+        result = roll(f"1d{sides}")
         self._update_mini_result(f"d{sides}", result)
         self._add_to_history(f"d{sides}", result)
     
@@ -301,17 +335,8 @@ class DiceRollerPanel(BasePanel):
     
     def _roll_with_advantage_mini(self, is_advantage):
         """Roll with advantage/disadvantage in mini mode"""
-        roll1 = random.randint(1, 20)
-        roll2 = random.randint(1, 20)
-        
-        if is_advantage:
-            result = max(roll1, roll2)
-            roll_type = "Advantage"
-        else:
-            result = min(roll1, roll2)
-            roll_type = "Disadvantage"
-        
-        details = f"[{roll1}, {roll2}]"
+        roll_type = "Advantage" if is_advantage else "Disadvantage"
+        result, details = compile_expression("d20adv" if is_advantage else "d20dis").roll_detailed()
         self._update_mini_result(f"d20 {roll_type}", result, details)
         self._add_to_history(f"d20 with {roll_type}", result, details)
     
@@ -341,7 +366,7 @@ class DiceRollerPanel(BasePanel):
     
     def _quick_roll(self, sides):
         """Perform a quick roll of a single die"""
-        result = random.randint(1, sides)
+        result = roll(f"1d{sides}")
         self._add_to_history(f"d{sides}", result)
     
     def _custom_roll(self):
@@ -360,70 +385,61 @@ class DiceRollerPanel(BasePanel):
     
     def _roll_with_advantage(self, is_advantage):
         """Roll with advantage or disadvantage"""
-        roll1 = random.randint(1, 20)
-        roll2 = random.randint(1, 20)
-        
-        if is_advantage:
-            result = max(roll1, roll2)
-            roll_type = "Advantage"
-        else:
-            result = min(roll1, roll2)
-            roll_type = "Disadvantage"
-        
-        details = f"[{roll1}, {roll2}]"
+        roll_type = "Advantage" if is_advantage else "Disadvantage"
+        result, details = compile_expression("d20adv" if is_advantage else "d20dis").roll_detailed()
         self._add_to_history(f"d20 with {roll_type}", result, details)
     
-    def _parse_and_roll(self, expression):
-        """Parse and evaluate a dice roll expression"""
-        # Remove all spaces for easier parsing
-        expression = expression.replace(" ", "").lower()
-        
-        # For complex expressions with multiple dice types and modifiers
-        dice_pattern = r'(\d+)?d(\d+)'  # Pattern for dice components like 2d6
-        modifier_pattern = r'([+-]\d+)'  # Pattern for modifiers like +3
+    def _update_probability(self, text):
+        """Start computing the exact odds of the expression in the custom roll field"""
+        self._probability_request += 1
+        self._distribution = None
+        expression = text.strip().lower()
+        if not expression:
+            self.probability_label.setText("Enter a roll above to see its odds.")
+            return
         
-        # Find all dice components (like 2d6, 1d8)
-        dice_components = re.finditer(dice_pattern, expression)
+        self.probability_label.setText("<span style='color: #888;'>Calculating...</span>")
+        request = self._probability_request
         
-        # Track the result
-        all_rolls = []  # Store all individual dice rolls
-        total = 0
-        rolls_text = []  # For display purposes
+        def compute():
+            try:
+                result, error = distribution(expression), ""
+            except ValueError as e:
+                result, error = None, str(e)
+            try:
+                self.probability_ready.emit(request, result, error)
+            except RuntimeError:
+                pass  # Panel was deleted while computing
         
-        # Process each dice component
-        for match in dice_components:
-            count = int(match.group(1)) if match.group(1) else 1
-            sides = int(match.group(2))
-            
-            if count > 100:
-                raise ValueError("Too many dice (maximum 100 per type)")
-            if sides > 1000:
-                raise ValueError("Die has too many sides (maximum 1000)")
-            
-            # Roll the dice
-            rolls = [random.randint(1, sides) for _ in range(count)]
-            all_rolls.extend(rolls)
-            total += sum(rolls)
-            
-            # Format for the details display
-            rolls_text.append(f"{count}d{sides}[{', '.join(map(str, rolls))}]")
-        
-        # If no dice were found, the expression is invalid
-        if not rolls_text:
-            raise ValueError("Invalid dice expression format")
-            
-        # Find all modifiers (like +3, -2)
-        modifiers = re.finditer(modifier_pattern, expression)
-        for match in modifiers:
-            mod = int(match.group(1))
-            total += mod
-            # Only add non-zero modifiers to the display
-            if mod != 0:
-                rolls_text.append(f"{'+' if mod > 0 else ''}{mod}")
-        
-        # Format details
-        details = " ".join(rolls_text)
-        return total, details
+        QThreadPool.globalInstance().start(QRunnable.create(compute))
+    
+    def _on_probability_ready(self, request, dist, error):
+        """Show a computed distribution unless the expression has changed since"""
+        if request != self._probability_request:
+            return
+        if dist is None:
+            self.probability_label.setText(f"<span style='color: #888;'>{error}</span>")
+            return
+        self._distribution = dist
+        self._show_probability()
+    
+    def _show_probability(self, *args):
+        """Show the odds of the current distribution for the target value"""
+        dist = self._distribution
+        if dist is None:
+            return
+        target = self.probability_target.value()
+        chance = dist.at_least(target)
+        self.probability_label.setText(
+            f"<b>{chance:.1%}</b> to roll {target} or more<br>"
+            f"Average {dist.mean:.2f} (±{dist.std:.2f}), range {dist.minimum}–{dist.maximum}, "
+            f"median {dist.percentile(0.5)}"
+        )
+    
+    def _parse_and_roll(self, expression):
+        """Parse and evaluate a dice roll expression"""
+        # Compiled expressions are cached by the dice engine; DiceError is a ValueError
+        return compile_expression(expression).roll_detailed()
     
     def _add_to_history(self, expression, result, details=None):
         """Add a roll to the history"""
@@ -605,26 +621,10 @@ class DiceRollerPanel(BasePanel):
     
     def _is_valid_formula(self, formula):
         """Check if a dice formula is valid"""
-        # Remove spaces for easier validation
-        formula = formula.replace(" ", "").lower()
-        
-        # For complex dice expressions
-        dice_pattern = r'(\d+)?d(\d+)'  # Pattern for dice components like 2d6
-        modifier_pattern = r'([+-]\d+)'  # Pattern for modifiers like +3
-        
-        # Check if there's at least one dice component
-        dice_matches = list(re.finditer(dice_pattern, formula))
-        if not dice_matches:
+        try:
+            return compile_expression(formula).has_dice
+        except DiceError:
             return False
-            
-        # Build a pattern that combines dice and modifiers
-        # This checks that the formula consists entirely of valid dice/modifier components
-        full_pattern = dice_pattern + '|' + modifier_pattern
-        all_components = re.findall(full_pattern, formula)
-        
-        # If the joined components don't equal the original formula, there's invalid content
-        joined = ''.join(''.join(match) for match in all_components)
-        return joined == formula
     
     def _save_current_formula(self):
         """Save the current formula"""
@@ -14,12 +14,14 @@ from PySide6.QtCore import Qt, Signal
 import json
 import logging
 import random
+import threading
 
 from app.ui.panels.base_panel import BasePanel
 # Need access to db_manager for checking/saving monsters
 from app.data.db_manager import DatabaseManager
 from app.core.models.monster import Monster # Import Monster dataclass
 from app.core.llm_integration import generate_monster_stat_block # Assuming this function exists
+from app.combat.encounter_simulator import simulate, build_party, build_encounter_state
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,11 @@ class EncounterGeneratorPanel(BasePanel):
     generation_result = Signal(str, str) # response_str, error_str
     # Signal to add multiple monsters to combat tracker
     add_group_to_combat = Signal(list) # List of monster dicts
+    # Signal for Monte Carlo results
+    simulation_result = Signal(object, str) # SimulationResult or None, note/error
+
+    # Number of fights simulated for each generated encounter
+    SIMULATION_FIGHTS = 2000
 
     def __init__(self, app_state, panel_id=None):
         panel_id = panel_id or self.PANEL_TYPE
@@ -71,7 +78,13 @@ class EncounterGeneratorPanel(BasePanel):
         self.difficulty_combo = QComboBox()
         self.difficulty_combo.addItems(["Easy", "Medium", "Hard", "Deadly", "Random"])
         self.difficulty_combo.setCurrentText("Medium")
-        config_layout.addRow("Desired Difficulty:", self.difficulty_combo)
+        # Simulated outcome of the generated encounter, shown next to the difficulty
+        self.simulation_label = QLabel("")
+        self.simulation_label.setWordWrap(True)
+        difficulty_layout = QHBoxLayout()
+        difficulty_layout.addWidget(self.difficulty_combo)
+        difficulty_layout.addWidget(self.simulation_label, 1)
+        config_layout.addRow("Desired Difficulty:", difficulty_layout)
         
         self.environment_input = QLineEdit()
         self.environment_input.setPlaceholderText("e.g., Forest, Cave, Dungeon room, Urban alley")
@@ -122,6 +135,7 @@ class EncounterGeneratorPanel(BasePanel):
         self.generate_button.clicked.connect(self._generate_encounter)
         self.generation_result.connect(self._process_generation_ui)
         self.add_to_combat_button.clicked.connect(self._add_encounter_to_combat)
+        self.simulation_result.connect(self._show_simulation_result)
         # Connect the add_group_to_combat signal later in PanelManager
 
     def _load_settings(self):
@@ -359,6 +373,7 @@ Example JSON:
             
             self.results_display.setPlainText(display_text)
             self.add_to_combat_button.setEnabled(True)
+            self._simulate_encounter()
             
         except json.JSONDecodeError as e:
             error_msg = f"Failed to parse LLM response as JSON: {e}\nRaw response:\n{response}"
@@ -499,6 +514,52 @@ Example JSON:
             logger.error(error_msg)
             QMessageBox.critical(self, "Addition Failed", error_msg)
 
+    def _simulate_encounter(self):
+        """Estimate the encounter outcome with the local combat engine in the background."""
+        monsters = []
+        missing = []
+        for name in self.current_encounter_data.get("monsters", []) if self.current_encounter_data else []:
+            monster = self.db_manager.get_monster_by_name(name)
+            if monster:
+                monsters.append(monster.to_dict())
+            else:
+                missing.append(name)
+        if not monsters:
+            self.simulation_label.setText("")
+            return
+        
+        party = build_party(self.level_spinbox.value(), self.players_spinbox.value())
+        state = build_encounter_state(party, monsters)
+        note = f"Not simulated: {', '.join(missing)}" if missing else ""
+        self.simulation_label.setText("Simulating...")
+        
+        def run():
+            try:
+                result = simulate(state, fights=self.SIMULATION_FIGHTS)
+            except Exception as e:
+                logger.error(f"Encounter simulation failed: {e}", exc_info=True)
+                self.simulation_result.emit(None, str(e))
+                return
+            self.simulation_result.emit(result, note)
+        
+        threading.Thread(target=run, daemon=True).start()
+
+    def _show_simulation_result(self, result, note):
+        """Show the simulated win chance, length and death risks next to the difficulty."""
+        if result is None:
+            self.simulation_label.setText("Simulation failed")
+            self.simulation_label.setToolTip(note)
+            return
+        self.simulation_label.setText(result.summary())
+        tooltip = [f"{result.fights} simulated fights against a standard level "
+                   f"{self.level_spinbox.value()} party ({result.elapsed:.1f}s)"]
+        tooltip += [f"{name}: {p:.0%} chance of dying"
+                    for name, p in sorted(result.death_probability.items(), key=lambda item: -item[1])
+                    if name in result.party]
+        if note:
+            tooltip.append(note)
+        self.simulation_label.setToolTip("\n".join(tooltip))
+
     def _reset_ui_state(self):
         self.is_generating = False
         self.generate_button.setEnabled(True)
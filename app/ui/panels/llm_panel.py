@@ -229,6 +229,10 @@ class LLMPanel(BasePanel):
         
         # Current conversation tracking
         self.current_conversation_id = None
+        
+        # Request being streamed into the chat, and whether any text has arrived yet
+        self.current_request_id = None
+        self.streaming_started = False
     
     def _init_ui(self):
         """Initialize the panel UI"""
@@ -310,6 +314,7 @@ class LLMPanel(BasePanel):
         self.llm_service.completion_ready.connect(self.handle_llm_completion)
         print("[DEBUG] Connected completion_ready signal to handle_llm_completion")
         self.llm_service.completion_error.connect(self.handle_llm_error)
+        self.llm_service.completion_chunk.connect(self.handle_llm_chunk)
     
     def _load_available_models(self):
         """Load available models into the combo box"""
@@ -414,32 +419,59 @@ class LLMPanel(BasePanel):
         # Get model settings
         temperature = self.settings_widget.get_temperature()
         max_tokens = self.settings_widget.get_max_tokens()
-        # Send to LLM service (no callback)
-        self.llm_service.generate_completion_async(
+        # Send to LLM service (no callback); the reply is streamed into the chat
+        self.streaming_started = False
+        self.current_request_id = self.llm_service.generate_completion_async(
             model_id,
             messages,
             system_prompt=system_prompt,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            stream=True
         )
-
-    def handle_llm_completion(self, response, request_id):
-        """Handle completion from the LLM service (signal-based)"""
-        # DEBUG: Print response and request_id to console for debugging callback
-        print(f"[DEBUG] handle_llm_completion called with response: {repr(response)}, request_id: {repr(request_id)}")
-        # Remove loading message (last message)
+    
+    def _remove_loading_message(self):
+        """Remove the "Generating response..." message (last message)"""
         cursor = self.chat_area.chat_display.textCursor()
         cursor.movePosition(QTextCursor.End)
         cursor.movePosition(QTextCursor.StartOfBlock, QTextCursor.KeepAnchor)
         cursor.movePosition(QTextCursor.PreviousBlock, QTextCursor.KeepAnchor)
         cursor.movePosition(QTextCursor.PreviousBlock, QTextCursor.KeepAnchor)
         cursor.removeSelectedText()
-        if response is None:
-            # Show error
-            self.chat_area.add_message("system", f"Error: No response from LLM.")
+    
+    def handle_llm_chunk(self, chunk, request_id):
+        """Append streamed text from the LLM service to the chat"""
+        if request_id != self.current_request_id:
             return
-        # Add response to chat
-        self.chat_area.add_message("assistant", response)
+        display = self.chat_area.chat_display
+        if not self.streaming_started:
+            # Replace the loading message with the assistant's reply as it arrives
+            self.streaming_started = True
+            self._remove_loading_message()
+            display.append("<b>Assistant:</b>")
+            display.append("")
+        display.moveCursor(QTextCursor.End)
+        display.insertPlainText(chunk)
+        display.verticalScrollBar().setValue(display.verticalScrollBar().maximum())
+
+    def handle_llm_completion(self, response, request_id):
+        """Handle completion from the LLM service (signal-based)"""
+        # DEBUG: Print response and request_id to console for debugging callback
+        print(f"[DEBUG] handle_llm_completion called with response: {repr(response)}, request_id: {repr(request_id)}")
+        if request_id != self.current_request_id:
+            return
+        if self.streaming_started:
+            # The reply is already in the chat; close the message
+            self.chat_area.chat_display.append("")
+        else:
+            # Remove loading message (last message)
+            self._remove_loading_message()
+            if response is None:
+                # Show error
+                self.chat_area.add_message("system", f"Error: No response from LLM.")
+                return
+            # Add response to chat
+            self.chat_area.add_message("assistant", response)
         # --- DEBUG: Show raw LLM response in chat area ---
         # This is for debugging purposes. Remove or comment out when not needed.
         self.chat_area.add_message("system", f"DEBUG: Raw LLM response: {repr(response)}")
@@ -23,6 +23,7 @@ from app.ui.panels.base_panel import BasePanel
 from app.utils.markdown_utils import markdown_to_html  # Import the Markdown utility
 from app.utils.link_handler import handle_dnd_link, generate_entity_from_selection  # Import the shared dnd:// link handler and entity generator
 from app.ui.dialogs.detail_dialog import DetailDialog
+from app.core.llm_integration.batch_generation import generate_batch
 
 
 class LocationGeneratorPanel(BasePanel):
@@ -40,6 +41,9 @@ class LocationGeneratorPanel(BasePanel):
     
     # Signal for thread-safe communication between worker and UI
     generation_result = Signal(str, str)  # response, error
+    generation_chunk = Signal(str)  # streamed text
+    batch_progress = Signal(int, int)  # locations done, locations requested
+    batch_result = Signal(object)  # BatchResult or exception
     
     def __init__(self, app_state, panel_id=None):
         """Initialize the Location Generator panel"""
@@ -213,7 +217,15 @@ class LocationGeneratorPanel(BasePanel):
         
         self.clear_button = QPushButton("Clear")
         
+        # Batch size (more than one location is generated in parallel and saved automatically)
+        self.batch_spinner = QSpinBox()
+        self.batch_spinner.setRange(1, 50)
+        self.batch_spinner.setValue(1)
+        self.batch_spinner.setToolTip("Number of locations to generate. Batches are saved automatically.")
+        
         buttons_layout.addWidget(self.generate_button)
+        buttons_layout.addWidget(QLabel("Count:"))
+        buttons_layout.addWidget(self.batch_spinner)
         buttons_layout.addWidget(self.save_button)
         buttons_layout.addWidget(self.save_to_notes_button)
         buttons_layout.addWidget(self.clear_button)
@@ -400,6 +412,9 @@ class LocationGeneratorPanel(BasePanel):
         
         # Connect thread-safe signal for LLM generation results
         self.generation_result.connect(self._update_ui_with_generation_result)
+        self.generation_chunk.connect(self._append_generation_chunk)
+        self.batch_progress.connect(self._update_batch_progress)
+        self.batch_result.connect(self._save_batch_result)
         
         # Set up HTML link click handling
         self.location_display.setOpenLinks(False)
@@ -454,16 +469,84 @@ class LocationGeneratorPanel(BasePanel):
         self.status_label.setText("Generating location...")
         self.status_label.setStyleSheet("color: blue;")
         self.generate_button.setEnabled(False)
+        self.location_display.clear()
+        
+        count = self.batch_spinner.value()
+        if count > 1:
+            self._generate_location_batch(model_id, prompt, count, params)
+            return
         
         # Call LLM service
         self.llm_service.generate_completion_async(
             model=model_id,
             messages=[{"role": "user", "content": prompt}],
             callback=self._handle_generation_result,
+            stream=True,
+            chunk_callback=self.generation_chunk.emit,
             temperature=0.7,
             max_tokens=4000
         )
     
+    def _generate_location_batch(self, model_id, prompt, count, params):
+        """Generate several locations concurrently; they are saved together when all are done"""
+        self.status_label.setText(f"Generating {count} locations...")
+        self.batch_request = {"model_id": model_id, "prompt": prompt, "params": params}
+        future = self.llm_service.run_async(generate_batch(
+            self.llm_service, model_id, prompt, count, "locations", on_progress=self.batch_progress.emit
+        ))
+        future.add_done_callback(lambda f: self.batch_result.emit(f.exception() or f.result()))
+    
+    def _update_batch_progress(self, done, total):
+        """Show batch progress (runs in UI thread)"""
+        self.status_label.setText(f"Generating locations... {done}/{total}")
+    
+    def _save_batch_result(self, result):
+        """Save a finished batch in one transaction and list it (runs in UI thread)"""
+        self.is_generating = False
+        self.generate_button.setEnabled(True)
+        
+        if isinstance(result, Exception) or not result.entities:
+            error = result if isinstance(result, Exception) else "; ".join(result.errors)
+            self.status_label.setText(f"Error: {error}")
+            self.status_label.setStyleSheet("color: red;")
+            return
+        
+        params = self.batch_request["params"]
+        items = [
+            {
+                "title": location.get("name", "Unnamed Location"),
+                "content_type": "location",
+                "content": json.dumps(location, indent=2),
+                "model_id": self.batch_request["model_id"],
+                "prompt": self.batch_request["prompt"],
+                "tags": ["location", params["type"], params["environment"], params["size"]]
+            }
+            for location in result.entities
+        ]
+        try:
+            content_ids = self.llm_data_manager.add_generated_content_batch(items)
+        except Exception as e:
+            QMessageBox.warning(self, "Save Error", f"Could not save locations: {str(e)}")
+            return
+        
+        for content_id, item in zip(content_ids, items):
+            self.location_generated.emit({
+                "id": content_id,
+                "title": item["title"],
+                "content": item["content"],
+                "type": "location"
+            })
+        
+        lines = [f"## {len(items)} locations saved", ""]
+        lines += [f"- **{item['title']}**" for item in items]
+        self.location_display.setMarkdown("\n".join(lines))
+        
+        status = f"Saved {len(items)} of {result.requested} locations"
+        if result.errors:
+            status += f" ({len(result.errors)} requests failed)"
+        self.status_label.setText(status)
+        self.status_label.setStyleSheet("color: green;" if not result.errors else "color: orange;")
+    
     def _get_generation_params(self):
         """Get parameters for location generation from form fields"""
         params = {
@@ -561,6 +644,11 @@ class LocationGeneratorPanel(BasePanel):
             # Signal the response to the main thread
             self.generation_result.emit(response, None)
     
+    def _append_generation_chunk(self, chunk):
+        """Show streamed text as it arrives (runs in UI thread)"""
+        self.location_display.moveCursor(QTextCursor.End)
+        self.location_display.insertPlainText(chunk)
+    
     def _update_ui_with_generation_result(self, response, error):
         """Update the UI with generation results (called in the main thread)"""
         # Reset generating state
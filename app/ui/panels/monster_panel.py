@@ -17,17 +17,21 @@ from pathlib import Path
 
 from PySide6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QListWidget, QTextEdit, QLineEdit, QWidget,
+    QListView, QTextEdit, QLineEdit, QWidget,
     QSpinBox, QComboBox, QDialog, QDialogButtonBox,
     QFormLayout, QTabWidget, QScrollArea, QFrame,
     QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
-    QListWidgetItem, QApplication # Added QApplication
+    QAbstractItemView, QApplication # Added QApplication
 )
-from PySide6.QtCore import Qt, Signal, QTimer, QEvent
-from PySide6.QtGui import QFont, QIcon, QPixmap
+from PySide6.QtCore import Qt, Signal, QTimer, QEvent, QModelIndex
+from PySide6.QtGui import QFont, QIcon, QPixmap, QStandardItemModel, QStandardItem
 
 from app.ui.panels.base_panel import BasePanel
-from app.core.models.monster import Monster # Import Monster dataclass
+from app.ui.components.search_filter import (
+    SearchFilterProxyModel, SearchDebouncer, SEARCH_KEY_ROLE, FILTER_ROLE, keep_current_row
+)
+from app.core.models.monster import Monster, MonsterSummary # Import Monster dataclasses
+from app.data.monster_index import CR_TO_XP, SIZES, parse_cr, summary_for_monster
 # Import the dialog
 from app.ui.dialogs.monster_edit_dialog import MonsterEditDialog
 # Assuming db_manager and llm_service are accessible via app_state
@@ -38,48 +42,28 @@ from app.ui.dialogs.monster_edit_dialog import MonsterEditDialog
 # Setup logger for this module
 logger = logging.getLogger(__name__)
 
-# CR to XP mapping (from D&D 5e DMG or Basic Rules)
-CR_TO_XP = {
-    "0": 10,
-    "1/8": 25,
-    "1/4": 50,
-    "1/2": 100,
-    "1": 200,
-    "2": 450,
-    "3": 700,
-    "4": 1100,
-    "5": 1800,
-    "6": 2300,
-    "7": 2900,
-    "8": 3900,
-    "9": 5000,
-    "10": 5900,
-    "11": 7200,
-    "12": 8400,
-    "13": 10000,
-    "14": 11500,
-    "15": 13000,
-    "16": 15000,
-    "17": 18000,
-    "18": 20000,
-    "19": 22000,
-    "20": 25000,
-    "21": 33000,
-    "22": 41000,
-    "23": 50000,
-    "24": 62000,
-    "25": 75000,
-    "26": 90000,
-    "27": 105000,
-    "28": 120000,
-    "29": 135000,
-    "30": 155000
-}
-
 def get_xp_for_cr(cr_string: str) -> int:
     """Convert a CR string (like '1/2' or '5') to its XP value."""
     return CR_TO_XP.get(str(cr_string), 0) # Return 0 if CR not found
 
+# Item data roles for the monster list filters
+CR_ROLE = FILTER_ROLE
+TYPE_ROLE = FILTER_ROLE + 1
+SIZE_ROLE = FILTER_ROLE + 2
+
+# Types listed in the type filter; "Other" matches every type not listed
+MONSTER_TYPES = [
+    "Aberration", "Beast", "Celestial", "Construct",
+    "Dragon", "Elemental", "Fey", "Fiend", "Giant",
+    "Humanoid", "Monstrosity", "Ooze", "Plant", "Undead"
+]
+
+def _type_matches(monster_type: str, wanted: str) -> bool:
+    """Match a normalized monster type against the type filter selection."""
+    if wanted == "other":
+        return monster_type not in {t.lower() for t in MONSTER_TYPES}
+    return monster_type == wanted
+
 class MonsterPanel(BasePanel):
     """Panel for viewing and managing monster/NPC stat blocks"""
     
@@ -97,7 +81,9 @@ class MonsterPanel(BasePanel):
         # Get services from app_state
         self.db_manager = app_state.db_manager
         self.llm_service = app_state.llm_service # Assuming LLM service is here
-        self.monsters: List[Monster] = []  # Store loaded Monster objects
+        # Lightweight index summaries; full Monster objects are loaded on selection
+        self.monster_summaries: List[MonsterSummary] = []
+        self.monster_items: Dict[tuple, QStandardItem] = {}  # (id, is_custom) -> list model item
         self.current_monster: Optional[Monster] = None
         super().__init__(app_state, "Monster Reference") # Calls _setup_ui via BasePanel
 
@@ -116,11 +102,11 @@ class MonsterPanel(BasePanel):
 
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search monsters...")
-        # Use a timer to avoid filtering on every keystroke (optional enhancement)
-        self.search_input.textChanged.connect(self._filter_monsters)
+        # Filter once typing pauses rather than on every keystroke
+        self.search_debouncer = SearchDebouncer(self.search_input, lambda text: self._filter_monsters())
         search_layout.addWidget(self.search_input)
 
-        # TODO: CR filter needs to handle string values like "1/2" correctly
+        # CRs are compared numerically, so "1/2" also matches "0.5"
         self.cr_filter = QComboBox()
         self.cr_filter.addItem("All CRs")
         # Add common fractional CRs first
@@ -131,14 +117,16 @@ class MonsterPanel(BasePanel):
         self.type_filter = QComboBox()
         self.type_filter.addItem("All Types")
         # Add common monster types
-        self.type_filter.addItems([
-            "Aberration", "Beast", "Celestial", "Construct",
-            "Dragon", "Elemental", "Fey", "Fiend", "Giant",
-            "Humanoid", "Monstrosity", "Ooze", "Plant", "Undead", "Other" # Added Other
-        ])
+        self.type_filter.addItems(MONSTER_TYPES + ["Other"])
         self.type_filter.currentTextChanged.connect(self._filter_monsters)
         search_layout.addWidget(self.type_filter)
 
+        self.size_filter = QComboBox()
+        self.size_filter.addItem("All Sizes")
+        self.size_filter.addItems(list(SIZES))
+        self.size_filter.currentTextChanged.connect(self._filter_monsters)
+        search_layout.addWidget(self.size_filter)
+
         main_layout.addLayout(search_layout)
 
         # --- Split view ---
@@ -146,8 +134,15 @@ class MonsterPanel(BasePanel):
 
         # --- Monster list ---
         list_layout = QVBoxLayout()
-        self.monster_list = QListWidget()
-        self.monster_list.currentItemChanged.connect(self._on_monster_selected) # Renamed method
+        # The model is built once per load; filtering only updates the proxy
+        self.monster_model = QStandardItemModel(self)
+        self.monster_proxy = SearchFilterProxyModel(self)
+        self.monster_proxy.setSourceModel(self.monster_model)
+        self.monster_list = QListView()
+        self.monster_list.setModel(self.monster_proxy)
+        self.monster_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.monster_list.setUniformItemSizes(True)
+        self.monster_list.selectionModel().currentChanged.connect(self._on_monster_selected) # Renamed method
         list_layout.addWidget(self.monster_list)
 
         # --- List Buttons ---
@@ -286,13 +281,12 @@ class MonsterPanel(BasePanel):
             self.generate_image_btn.setToolTip("Generate an image in the style of the D&D Monster Manual")
 
     def _load_initial_monsters(self):
-        """Load all monsters from the database on startup."""
+        """Load the monster summaries from the compendium index on startup."""
         logger.info("Loading initial monster list from database...")
         try:
-            # Fetch all monsters (standard and custom) initially
-            # search_monsters returns List[Monster]
-            self.monsters = self.db_manager.search_monsters("", include_custom=True, include_standard=True)
-            logger.info(f"Loaded {len(self.monsters)} monsters.")
+            # Fetch all monsters (standard and custom) initially, without their stat blocks
+            self.monster_summaries = self.db_manager.get_monster_summaries()
+            logger.info(f"Loaded {len(self.monster_summaries)} monsters.")
             self._populate_monster_list()
         except Exception as e:
             logger.error(f"Failed to load initial monsters: {e}", exc_info=True)
@@ -301,57 +295,75 @@ class MonsterPanel(BasePanel):
              self._update_button_states() # Ensure buttons are correct state initially
 
     def _populate_monster_list(self):
-        """Populate the monster list widget based on current filters and loaded data."""
-        self.monster_list.clear()
-        self.monster_list.blockSignals(True) # Block signals during population
-
-        search_text = self.search_input.text().lower().strip()
-        cr_filter = self.cr_filter.currentText()
-        type_filter = self.type_filter.currentText().lower() # Lowercase for comparison
-
-        logger.debug(f"Filtering monsters. Search: '{search_text}', CR: '{cr_filter}', Type: '{type_filter}'")
-
-        count = 0
-        for monster in self.monsters:
-            # Apply filters
-            if search_text and search_text not in monster.name.lower():
-                continue
-
-            # CR Filtering - needs careful comparison for fractions
-            if cr_filter != "All CRs":
-                 # Normalize CR for comparison (e.g., "1/2" vs "0.5") - simplistic for now
-                 # A more robust solution might involve converting CRs to numerical values
-                 if monster.challenge_rating != cr_filter:
-                     # Basic check, might miss equivalent CRs (e.g. "5.0" vs "5")
-                     continue
-
-            # Type Filtering
-            if type_filter != "all types":
-                 # Check if the selected type is a substring of the monster's type
-                 # Handles cases like "humanoid (elf)" matching "humanoid"
-                 if type_filter not in monster.type.lower():
-                     continue
-
-            # If all filters pass, add to list
-            item = QListWidgetItem(monster.name)
-            # Store tuple (id, is_custom) in UserRole for later retrieval
-            item.setData(Qt.UserRole, (monster.id, monster.is_custom))
-            # Optional: Add tooltip with basic info like CR/Type
-            item.setToolTip(f"CR: {monster.challenge_rating}, Type: {monster.type}, Source: {monster.source}")
-            self.monster_list.addItem(item)
-            count += 1
-
-        self.monster_list.blockSignals(False) # Unblock signals
-        logger.debug(f"Populated list with {count} monsters.")
+        """Rebuild the monster list model from the loaded summaries and apply the current filters."""
+        selection_model = self.monster_list.selectionModel()
+        selection_model.blockSignals(True) # Block signals during population
+        self.monster_model.clear()
+        self.monster_items = {}
+        for summary in self.monster_summaries:
+            self.monster_model.appendRow(self._create_monster_item(summary))
+        selection_model.blockSignals(False) # Unblock signals
+        logger.debug(f"Populated list model with {len(self.monster_summaries)} monsters.")
+
+        self._apply_monster_filters()
         # Reselect the current monster if it's still in the filtered list
         if self.current_monster:
-            items = self.monster_list.findItems(self.current_monster.name, Qt.MatchExactly)
-            if items:
-                self.monster_list.setCurrentItem(items[0])
-
-    def _on_monster_selected(self, current: QListWidgetItem, previous: QListWidgetItem):
+            self._select_monster(self.current_monster.id, self.current_monster.is_custom)
+
+    def _create_monster_item(self, summary: MonsterSummary) -> QStandardItem:
+        """Create the list model item for a monster summary, with its filter fields."""
+        item = QStandardItem()
+        self._update_monster_item(item, summary)
+        self.monster_items[summary.key] = item
+        return item
+
+    def _update_monster_item(self, item: QStandardItem, summary: MonsterSummary):
+        """Set a list model item's text, tooltip and filter fields from a monster summary."""
+        item.setText(summary.name)
+        # Store tuple (id, is_custom) in UserRole for later retrieval
+        item.setData(summary.key, Qt.UserRole)
+        item.setData(summary.name.lower(), SEARCH_KEY_ROLE)
+        item.setData(summary.cr, CR_ROLE)
+        item.setData(summary.type, TYPE_ROLE)
+        item.setData(summary.size, SIZE_ROLE)
+        # Optional: Add tooltip with basic info like CR/Type
+        item.setToolTip(f"CR: {summary.challenge_rating} ({summary.xp} XP), Type: {summary.type}, "
+                        f"Size: {summary.size}, Source: {summary.source}")
+
+    def _apply_monster_filters(self):
+        """Apply the search text and combo box filters to the list proxy."""
+        search_text = self.search_input.text()
+        cr_filter = self.cr_filter.currentText()
+        type_filter = self.type_filter.currentText().lower() # Lowercase for comparison
+        size_filter = self.size_filter.currentText()
+
+        logger.debug(f"Filtering monsters. Search: '{search_text}', CR: '{cr_filter}', Type: '{type_filter}', Size: '{size_filter}'")
+        self.monster_proxy.set_search_text(search_text)
+        self.monster_proxy.set_field_filter(CR_ROLE, None if cr_filter == "All CRs" else parse_cr(cr_filter))
+        # Types are normalized in the index, e.g. "humanoid (elf)" is stored as "humanoid"
+        self.monster_proxy.set_field_filter(
+            TYPE_ROLE, None if type_filter == "all types" else type_filter, _type_matches)
+        self.monster_proxy.set_field_filter(SIZE_ROLE, None if size_filter == "All Sizes" else size_filter)
+
+    def _monster_index(self, monster_id: int, is_custom: bool) -> QModelIndex:
+        """Return the list index of a monster, or an invalid index if it is filtered out."""
+        item = self.monster_items.get((monster_id, is_custom))
+        if item is None:
+            return QModelIndex()
+        return self.monster_proxy.mapFromSource(item.index())
+
+    def _select_monster(self, monster_id: int, is_custom: bool) -> bool:
+        """Select a monster in the list and scroll to it, if it is visible."""
+        index = self._monster_index(monster_id, is_custom)
+        if not index.isValid():
+            return False
+        self.monster_list.setCurrentIndex(index)
+        self.monster_list.scrollTo(index)
+        return True
+
+    def _on_monster_selected(self, current: QModelIndex, previous: QModelIndex):
         """Display the selected monster's stat block and update button states."""
-        if not current:
+        if current is None or not current.isValid():
             self.current_monster = None
             self._clear_monster_details()
             self._update_button_states()
@@ -359,21 +371,12 @@ class MonsterPanel(BasePanel):
 
         try:
             monster_id, is_custom = current.data(Qt.UserRole)
-            logger.debug(f"Monster selected: ID={monster_id}, IsCustom={is_custom}, Name='{current.text()}'")
-
-            # Find the monster in the loaded list (more efficient than DB query)
-            found_monster = None
-            for m in self.monsters:
-                if m.id == monster_id and m.is_custom == is_custom:
-                    found_monster = m
-                    break
-
-            if found_monster:
-                self.current_monster = found_monster
-                logger.debug(f"Found monster in memory: {self.current_monster.name}")
+            logger.debug(f"Monster selected: ID={monster_id}, IsCustom={is_custom}, Name='{current.data()}'")
+
+            # Load the full stat block only now that the monster is selected
+            if self.current_monster and (self.current_monster.id, self.current_monster.is_custom) == (monster_id, is_custom):
+                logger.debug(f"Monster already loaded: {self.current_monster.name}")
             else:
-                # Fallback: If not found in memory list (should not happen if list is correct), fetch from DB
-                logger.warning(f"Monster ID {monster_id} (Custom: {is_custom}) not found in memory list. Fetching from DB.")
                 self.current_monster = self.db_manager.get_monster_by_id(monster_id, is_custom)
                 if not self.current_monster:
                      logger.error(f"Failed to fetch monster ID {monster_id} from DB.")
@@ -594,12 +597,12 @@ class MonsterPanel(BasePanel):
 
     def _filter_monsters(self):
         """Filter the monster list based on search text and combo boxes."""
-        # We repopulate based on the full self.monsters list according to filters
-        self._populate_monster_list()
+        # Only the proxy is re-evaluated; the list items are kept
+        with keep_current_row(self.monster_list):
+            self._apply_monster_filters()
         # Clear display if current selection is filtered out
         if self.current_monster:
-             items = self.monster_list.findItems(self.current_monster.name, Qt.MatchExactly)
-             if not items:
+             if not self._monster_index(self.current_monster.id, self.current_monster.is_custom).isValid():
                   self._clear_monster_details()
                   self.current_monster = None
                   self._update_button_states()
@@ -728,16 +731,10 @@ class MonsterPanel(BasePanel):
             saved_monster = dialog.get_saved_monster()
             if saved_monster: # Check if we got a valid monster back (implies successful save and ID set)
                 self._add_or_update_monster_in_list(saved_monster)
-                self._populate_monster_list()
                 self.custom_monster_created.emit(saved_monster.name)
                 logger.info(f"Custom monster '{saved_monster.name}' created and saved.")
                 # ... select new monster in list ...
-                for i in range(self.monster_list.count()):
-                    item = self.monster_list.item(i)
-                    data = item.data(Qt.UserRole)
-                    if isinstance(data, tuple) and data == (saved_monster.id, True):
-                        self.monster_list.setCurrentItem(item)
-                        break
+                self._select_monster(saved_monster.id, True)
             else:
                  # This path might be hit if accept() succeeded but get_saved_monster returned None (save failed silently?)
                  logger.error("Monster creation dialog accepted, but could not retrieve valid saved monster object from dialog.")
@@ -758,21 +755,13 @@ class MonsterPanel(BasePanel):
                     # Update the panel's current selection ONLY if edit succeeded
                     self.current_monster = edited_monster
                     self._add_or_update_monster_in_list(edited_monster)
-                    self._populate_monster_list()
                     # We don't need to emit the signal here as we're editing an existing monster
                     # self.custom_monster_created.emit(edited_monster.name) - Remove or comment this line
                     logger.info(f"Custom monster '{edited_monster.name}' updated.")
                     # ... reselect edited monster ...
-                    found = False
-                    for i in range(self.monster_list.count()):
-                         item = self.monster_list.item(i)
-                         data = item.data(Qt.UserRole)
-                         if isinstance(data, tuple) and data == (edited_monster.id, True):
-                             self.monster_list.setCurrentItem(item)
-                             self._on_monster_selected(item, None)
-                             found = True
-                             break
-                    if not found:
+                    if self._select_monster(edited_monster.id, True):
+                         self._on_monster_selected(self.monster_list.currentIndex(), None)
+                    else:
                          self.monster_list.clearSelection()
                          self._on_monster_selected(None, None)
                     logger.info(f"Custom monster '{edited_monster.name}' updated.")
@@ -802,11 +791,14 @@ class MonsterPanel(BasePanel):
                     if success:
                         logger.info(f"Successfully deleted monster ID {monster_id} from database.")
                         # Remove from internal list
-                        self.monsters = [m for m in self.monsters if not (m.id == monster_id and m.is_custom)]
-                        # Clear selection and repopulate list
+                        self.monster_summaries = [m for m in self.monster_summaries
+                                                  if m.key != (monster_id, True)]
+                        # Clear selection and remove the list item
                         self.current_monster = None
                         self._clear_monster_details()
-                        self._populate_monster_list()
+                        item = self.monster_items.pop((monster_id, True), None)
+                        if item is not None:
+                            self.monster_model.removeRow(item.row())
                         self._update_button_states()
                         QMessageBox.information(self, "Deleted", f"Monster '{monster_name}' deleted.")
                     else:
@@ -846,63 +838,51 @@ class MonsterPanel(BasePanel):
         self.search_input.setText("")
         self.cr_filter.setCurrentText("All CRs")
         self.type_filter.setCurrentText("All Types")
+        self.size_filter.setCurrentText("All Sizes")
         
         # Refresh the list
-        self._populate_monster_list()
+        self.search_debouncer.flush()
         
         # Find the monster in the list (case-insensitive match)
-        monster_name_lower = monster_name.lower()
-        for i in range(self.monster_list.count()):
-            item = self.monster_list.item(i)
-            if item.text().lower() == monster_name_lower:
-                # Select this monster
-                self.monster_list.setCurrentItem(item)
-                # Ensure it's visible
-                self.monster_list.scrollToItem(item)
+        monster = self.find_monster_by_name(monster_name)
+        if monster:
+            if (monster.id, monster.is_custom) not in self.monster_items:
+                # Monster found in database but not in our list, add it
+                self._add_or_update_monster_in_list(monster)
+            # Select this monster and ensure it's visible
+            if self._select_monster(monster.id, monster.is_custom):
                 # Process events to ensure UI updates
                 QApplication.processEvents()
                 return True
         
-        # If not found in the list, try to find it in the database
-        monster = self.db_manager.get_monster_by_name(monster_name)
-        if monster:
-            # Monster found in database but not in our list, add it
-            self.monsters.append(monster)
-            self._populate_monster_list()
-            
-            # Now select it
-            for i in range(self.monster_list.count()):
-                item = self.monster_list.item(i)
-                if item.text().lower() == monster_name_lower:
-                    self.monster_list.setCurrentItem(item)
-                    self.monster_list.scrollToItem(item)
-                    # Process events to ensure UI updates
-                    QApplication.processEvents()
-                    return True
-        
         logger.warning(f"Monster '{monster_name}' not found")
         return False
         
     # Helper to update internal list after create/edit
     def _add_or_update_monster_in_list(self, updated_monster: Monster):
-        """Adds or updates a monster in the internal self.monsters list."""
+        """Adds or updates a monster's summary and list item."""
         if not updated_monster or updated_monster.id is None:
             logger.warning("Attempted to add/update invalid monster in internal list.")
             return
 
-        found = False
-        for i, monster in enumerate(self.monsters):
+        summary = summary_for_monster(updated_monster)
+        key = (updated_monster.id, updated_monster.is_custom)
+        for i, existing in enumerate(self.monster_summaries):
             # Match by ID and is_custom flag
-            if monster.id == updated_monster.id and monster.is_custom == updated_monster.is_custom:
-                self.monsters[i] = updated_monster # Replace existing entry
-                found = True
+            if existing.key == key:
+                self.monster_summaries[i] = summary # Replace existing entry
                 logger.debug(f"Updated monster ID {updated_monster.id} in internal list.")
                 break
-        if not found:
-            self.monsters.append(updated_monster) # Add new entry
+        else:
+            self.monster_summaries.append(summary) # Add new entry
             logger.debug(f"Added new monster ID {updated_monster.id} to internal list.")
-            # Optional: Resort list if needed (e.g., after adding)
-            # self.monsters.sort(key=lambda m: m.name)
+
+        # Update the list model item in place; the proxy re-filters the changed row
+        item = self.monster_items.get(key)
+        if item is not None:
+            self._update_monster_item(item, summary)
+        else:
+            self.monster_model.appendRow(self._create_monster_item(summary))
 
     def find_monster_by_name(self, monster_name):
         """Find a monster by its name and return the full monster data.
@@ -915,10 +895,12 @@ class MonsterPanel(BasePanel):
         Returns:
             Monster: The monster object if found, None otherwise
         """
-        # Iterate through all loaded monsters
-        for monster in self.monsters:
-            if monster.name.lower() == monster_name.lower():
-                return monster
+        # Look the name up in the loaded summaries, then load the full monster
+        for summary in self.monster_summaries:
+            if summary.name.lower() == monster_name.lower():
+                monster = self.db_manager.get_monster_by_id(summary.id, summary.is_custom)
+                if monster:
+                    return monster
                 
         # If not found in memory, try to find in database
         try:
@@ -926,7 +908,7 @@ class MonsterPanel(BasePanel):
             monster = self.db_manager.get_monster_by_name(monster_name)
             if monster:
                 # Add to loaded monsters for future reference
-                self.monsters.append(monster)
+                self._add_or_update_monster_in_list(monster)
                 return monster
         except Exception as e:
             logger.error(f"Error finding monster '{monster_name}' in database: {e}")
@@ -18,6 +18,7 @@ from PySide6.QtGui import QIcon, QAction, QTextCursor, QFont
 import json
 
 from app.ui.panels.base_panel import BasePanel
+from app.core.llm_integration.batch_generation import generate_batch
 
 
 class NPCGeneratorPanel(BasePanel):
@@ -35,6 +36,9 @@ class NPCGeneratorPanel(BasePanel):
     
     # Signal for thread-safe communication between worker and UI
     generation_result = Signal(str, str)  # response, error
+    generation_chunk = Signal(str)  # streamed text
+    batch_progress = Signal(int, int)  # NPCs done, NPCs requested
+    batch_result = Signal(object)  # BatchResult or exception
     
     def __init__(self, app_state, panel_id=None):
         """Initialize the NPC Generator panel"""
@@ -195,7 +199,15 @@ class NPCGeneratorPanel(BasePanel):
         
         self.clear_button = QPushButton("Clear")
         
+        # Batch size (more than one NPC is generated in parallel and saved automatically)
+        self.batch_spinner = QSpinBox()
+        self.batch_spinner.setRange(1, 50)
+        self.batch_spinner.setValue(1)
+        self.batch_spinner.setToolTip("Number of NPCs to generate. Batches are saved automatically.")
+        
         buttons_layout.addWidget(self.generate_button)
+        buttons_layout.addWidget(QLabel("Count:"))
+        buttons_layout.addWidget(self.batch_spinner)
         buttons_layout.addWidget(self.save_button)
         buttons_layout.addWidget(self.clear_button)
         
@@ -244,6 +256,9 @@ class NPCGeneratorPanel(BasePanel):
         
         # Connect thread-safe signal for LLM generation results
         self.generation_result.connect(self._update_ui_with_generation_result)
+        self.generation_chunk.connect(self._append_generation_chunk)
+        self.batch_progress.connect(self._update_batch_progress)
+        self.batch_result.connect(self._save_batch_result)
     
     def _load_settings(self):
         """Load models and settings"""
@@ -294,16 +309,85 @@ class NPCGeneratorPanel(BasePanel):
         self.status_label.setText("Generating NPC...")
         self.status_label.setStyleSheet("color: blue;")
         self.generate_button.setEnabled(False)
+        self.npc_display.clear()
+        
+        count = self.batch_spinner.value()
+        if count > 1:
+            self._generate_npc_batch(model_id, prompt, count)
+            return
         
         # Call LLM service
         self.llm_service.generate_completion_async(
             model=model_id,
             messages=[{"role": "user", "content": prompt}],
             callback=self._handle_generation_result,
+            stream=True,
+            chunk_callback=self.generation_chunk.emit,
             temperature=0.7,
             max_tokens=4000
         )
     
+    def _generate_npc_batch(self, model_id, prompt, count):
+        """Generate several NPCs concurrently; they are saved together when all are done"""
+        self.status_label.setText(f"Generating {count} NPCs...")
+        self.batch_request = {"model_id": model_id, "prompt": prompt}
+        future = self.llm_service.run_async(generate_batch(
+            self.llm_service, model_id, prompt, count, "NPCs", on_progress=self.batch_progress.emit
+        ))
+        future.add_done_callback(lambda f: self.batch_result.emit(f.exception() or f.result()))
+    
+    def _update_batch_progress(self, done, total):
+        """Show batch progress (runs in UI thread)"""
+        self.status_label.setText(f"Generating NPCs... {done}/{total}")
+    
+    def _save_batch_result(self, result):
+        """Save a finished batch in one transaction and list it (runs in UI thread)"""
+        self.is_generating = False
+        self.generate_button.setEnabled(True)
+        
+        if isinstance(result, Exception) or not result.entities:
+            error = result if isinstance(result, Exception) else "; ".join(result.errors)
+            self.status_label.setText(f"Error: {error}")
+            self.status_label.setStyleSheet("color: red;")
+            return
+        
+        items = [
+            {
+                "title": npc.get("name", "Unnamed NPC"),
+                "content_type": "npc",
+                "content": json.dumps(npc, indent=2),
+                "model_id": self.batch_request["model_id"],
+                "prompt": self.batch_request["prompt"],
+                "tags": ["npc", npc.get("race", ""), npc.get("role", "")]
+            }
+            for npc in result.entities
+        ]
+        try:
+            content_ids = self.llm_data_manager.add_generated_content_batch(items)
+        except Exception as e:
+            QMessageBox.warning(self, "Save Error", f"Could not save NPCs: {str(e)}")
+            return
+        
+        for content_id, item in zip(content_ids, items):
+            self.npc_generated.emit({
+                "id": content_id,
+                "title": item["title"],
+                "content": item["content"],
+                "type": "npc"
+            })
+        
+        lines = [f"## {len(items)} NPCs saved", ""]
+        for npc in result.entities:
+            details = " ".join(str(npc[key]) for key in ("race", "role") if npc.get(key))
+            lines.append(f"- **{npc.get('name', 'Unnamed NPC')}**" + (f" ({details})" if details else ""))
+        self.npc_display.setMarkdown("\n".join(lines))
+        
+        status = f"Saved {len(items)} of {result.requested} NPCs"
+        if result.errors:
+            status += f" ({len(result.errors)} requests failed)"
+        self.status_label.setText(status)
+        self.status_label.setStyleSheet("color: green;" if not result.errors else "color: orange;")
+    
     def _get_generation_params(self):
         """Get parameters for NPC generation from form fields"""
         params = {
@@ -432,6 +516,11 @@ class NPCGeneratorPanel(BasePanel):
             error if error else ""
         )
     
+    def _append_generation_chunk(self, chunk):
+        """Show streamed text as it arrives (runs in UI thread)"""
+        self.npc_display.moveCursor(QTextCursor.End)
+        self.npc_display.insertPlainText(chunk)
+    
     def _update_ui_with_generation_result(self, response, error):
         """Update UI with generation result (runs in UI thread)"""
         self.is_generating = False
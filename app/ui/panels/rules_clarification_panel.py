@@ -34,6 +34,7 @@ class RulesClarificationPanel(BasePanel):
     
     # Signal for thread-safe communication between worker and UI
     generation_result = Signal(str, str)  # response, error
+    generation_chunk = Signal(str)  # streamed text
     
     def __init__(self, app_state, panel_id=None):
         """Initialize the Rules Clarification panel"""
@@ -205,6 +206,7 @@ class RulesClarificationPanel(BasePanel):
         
         # Connect thread-safe signal for LLM generation results
         self.generation_result.connect(self._update_ui_with_generation_result)
+        self.generation_chunk.connect(self._append_generation_chunk)
     
     def _load_settings(self):
         """Load models and settings"""
@@ -298,6 +300,8 @@ class RulesClarificationPanel(BasePanel):
         self.status_label.setText("Generating rule clarification...")
         self.status_label.setStyleSheet("color: blue;")
         self.query_button.setEnabled(False)
+        self.rule_display.clear()
+        self.rule_display.setStyleSheet("")
         
         # Add to history list
         short_query = query_text[:50] + ("..." if len(query_text) > 50 else "")
@@ -314,6 +318,9 @@ class RulesClarificationPanel(BasePanel):
             model=model_id,
             messages=[{"role": "user", "content": prompt}],
             callback=self._handle_generation_result,
+            stream=True,
+            chunk_callback=self.generation_chunk.emit,
+            content_type="rules",
             temperature=0.7,
             max_tokens=4000  # Increased to 4000 for longer responses
         )
@@ -343,6 +350,11 @@ Format your answer in clear sections with markdown formatting for readability. M
             error if error else ""
         )
     
+    def _append_generation_chunk(self, chunk):
+        """Show streamed text as it arrives (runs in UI thread)"""
+        self.rule_display.moveCursor(QTextCursor.End)
+        self.rule_display.insertPlainText(chunk)
+    
     def _update_ui_with_generation_result(self, response, error):
         """Update UI with generation result (runs in UI thread)"""
         self.is_generating = False
@@ -10,13 +10,17 @@ Features:
 
 from PySide6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTreeWidget, QTreeWidgetItem, QTextEdit, QLineEdit,
-    QWidget, QSplitter, QMenu, QToolBar, QComboBox, QMessageBox, QApplication
+    QTextEdit, QLineEdit,
+    QWidget, QSplitter, QMenu, QToolBar, QComboBox, QMessageBox, QApplication,
+    QTreeView, QAbstractItemView
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont, QIcon, QAction
+from PySide6.QtCore import Qt, Signal, QModelIndex
+from PySide6.QtGui import QFont, QIcon, QAction, QStandardItemModel, QStandardItem
 
 from app.ui.panels.base_panel import BasePanel
+from app.ui.components.search_filter import (
+    SearchFilterProxyModel, SearchDebouncer, SEARCH_KEY_ROLE, FILTER_ROLE, search_key, keep_current_row
+)
 
 # D&D 5e Basic Rules Categories and Content
 RULES = {
@@ -136,6 +140,10 @@ Slow: Able to stealth"""
     }
 }
 
+# Item data roles: (category, rule) of a rule item, and the category of every item
+RULE_ROLE = FILTER_ROLE
+CATEGORY_ROLE = FILTER_ROLE + 1
+
 class RulesReferencePanel(BasePanel):
     """Panel for quick access to D&D 5e basic rules"""
     
@@ -144,6 +152,7 @@ class RulesReferencePanel(BasePanel):
         self.current_category = None
         self.current_rule = None
         self.bookmarks = set()
+        self.rule_items = {}  # (category, rule) -> tree model item
         
         # Create bookmark icon with fallbacks
         self.bookmark_icon = QIcon.fromTheme("bookmark")
@@ -167,7 +176,7 @@ class RulesReferencePanel(BasePanel):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search rules...")
-        self.search_input.textChanged.connect(self._filter_rules)
+        self.search_debouncer = SearchDebouncer(self.search_input, lambda text: self._filter_rules())
         search_layout.addWidget(self.search_input)
         
         self.category_filter = QComboBox()
@@ -181,12 +190,17 @@ class RulesReferencePanel(BasePanel):
         # Create splitter for resizable sections
         splitter = QSplitter(Qt.Horizontal)
         
-        # Rules tree
-        self.rules_tree = QTreeWidget()
+        # Rules tree - the model is built once; filtering only updates the proxy
+        self.rules_model = QStandardItemModel(self)
+        self.rules_proxy = SearchFilterProxyModel(self)
+        self.rules_proxy.setSourceModel(self.rules_model)
+        self.rules_tree = QTreeView()
+        self.rules_tree.setModel(self.rules_proxy)
         self.rules_tree.setHeaderHidden(True)
+        self.rules_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.rules_tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.rules_tree.customContextMenuRequested.connect(self._show_context_menu)
-        self.rules_tree.currentItemChanged.connect(self._show_rule)
+        self.rules_tree.selectionModel().currentChanged.connect(self._show_rule)
         splitter.addWidget(self.rules_tree)
         
         # Rule content
@@ -240,79 +254,53 @@ class RulesReferencePanel(BasePanel):
         self._populate_rules_tree()
         
         # Show first rule by default
-        if self.rules_tree.topLevelItemCount() > 0:
-            first_item = self.rules_tree.topLevelItem(0)
-            if first_item.childCount() > 0:
-                self.rules_tree.setCurrentItem(first_item.child(0))
+        first_index = self.rules_proxy.index(0, 0)
+        if self.rules_proxy.rowCount(first_index) > 0:
+            self.rules_tree.setCurrentIndex(self.rules_proxy.index(0, 0, first_index))
     
     def _populate_rules_tree(self):
-        """Populate the rules tree with categories and rules"""
-        self.rules_tree.clear()
-        
-        # Get current filter
-        category_filter = self.category_filter.currentText()
-        search_text = self.search_input.text().lower()
-        
-        def matches_filter(text):
-            """Check if text matches the search filter"""
-            if not search_text:
-                return True
-            return search_text in text.lower()
+        """Build the rules tree model with categories and rules, then apply the filters"""
+        self.rules_model.clear()
+        self.rule_items = {}
         
         # Process each category
         for category in sorted(RULES.keys()):
-            # Skip if category filter is active
-            if category_filter != "All Categories" and category_filter != category:
-                continue
-                
-            # Check if any rule in this category matches the search
-            category_matches = matches_filter(category)
-            rules_match = False
+            category_item = QStandardItem(category)
+            category_item.setData(category, CATEGORY_ROLE)
+            category_item.setData(search_key(category), SEARCH_KEY_ROLE)
             
-            for rule in RULES[category]:
-                rule_text = RULES[category][rule]
-                if category_matches or matches_filter(rule) or matches_filter(rule_text):
-                    rules_match = True
-                    break
-                    
-            if not rules_match and not category_matches:
-                continue
-                
-            # Add category
-            category_item = QTreeWidgetItem([category])
-            category_item.setExpanded(True)
-            self.rules_tree.addTopLevelItem(category_item)
-            
-            # Add rules
+            # Add rules; the category name is part of each rule's search key,
+            # so searching for a category shows all of its rules
             for rule in sorted(RULES[category].keys()):
-                rule_text = RULES[category][rule]
-                if not search_text or matches_filter(rule) or matches_filter(rule_text) or category_matches:
-                    rule_item = QTreeWidgetItem([rule])
-                    
-                    # Mark bookmarked rules with bold font and a special icon
-                    if (category, rule) in self.bookmarks:
-                        font = rule_item.font(0)
-                        font.setBold(True)
-                        rule_item.setFont(0, font)
-                        
-                        # Add star icon or text indicator for bookmarks
-                        rule_item.setText(0, f"★ {rule}")
-                    
-                    category_item.addChild(rule_item)
+                rule_item = QStandardItem(rule)
+                rule_item.setData((category, rule), RULE_ROLE)
+                rule_item.setData(category, CATEGORY_ROLE)
+                rule_item.setData(search_key(category, rule, RULES[category][rule]), SEARCH_KEY_ROLE)
+                self.rule_items[(category, rule)] = rule_item
+                self._update_bookmark_marker(category, rule)
+                category_item.appendRow(rule_item)
+            
+            self.rules_model.appendRow(category_item)
+        
+        self._filter_rules()
+    
+    def _update_bookmark_marker(self, category, rule):
+        """Mark a bookmarked rule with bold font and a star, or clear the marker"""
+        rule_item = self.rule_items.get((category, rule))
+        if rule_item is None:
+            return
+        is_bookmarked = (category, rule) in self.bookmarks
+        font = rule_item.font()
+        font.setBold(is_bookmarked)
+        rule_item.setFont(font)
+        rule_item.setText(f"★ {rule}" if is_bookmarked else rule)
     
     def _show_rule(self, current, previous):
         """Display the selected rule content"""
-        if not current or not current.parent():
+        if current is None or not current.isValid() or not current.data(RULE_ROLE):
             return
             
-        category = current.parent().text(0)
-        rule_text = current.text(0)
-        
-        # Remove star prefix if present
-        if rule_text.startswith("★ "):
-            rule = rule_text[2:]  # Remove the star and space
-        else:
-            rule = rule_text
+        category, rule = current.data(RULE_ROLE)
         
         if category in RULES and rule in RULES[category]:
             self.current_category = category
@@ -330,7 +318,12 @@ class RulesReferencePanel(BasePanel):
     
     def _filter_rules(self):
         """Filter the rules tree based on search text and category"""
-        self._populate_rules_tree()
+        category_filter = self.category_filter.currentText()
+        with keep_current_row(self.rules_tree):
+            self.rules_proxy.set_search_text(self.search_input.text())
+            self.rules_proxy.set_field_filter(
+                CATEGORY_ROLE, None if category_filter == "All Categories" else category_filter)
+        self.rules_tree.expandAll()
     
     def _toggle_bookmark(self, checked):
         """Toggle bookmark for the current rule"""
@@ -342,29 +335,22 @@ class RulesReferencePanel(BasePanel):
         else:
             self.bookmarks.discard((self.current_category, self.current_rule))
             
-        self._populate_rules_tree()
+        self._update_bookmark_marker(self.current_category, self.current_rule)
     
     def _show_context_menu(self, position):
         """Show the context menu for a tree item"""
-        item = self.rules_tree.itemAt(position)
-        if not item:
+        index = self.rules_tree.indexAt(position)
+        if not index.isValid():
             return
             
         # Only show for rule items (not categories)
-        if item.parent() is None:
+        if not index.data(RULE_ROLE):
             return
             
         menu = QMenu(self)
         
         # Get the rule info
-        category = item.parent().text(0)
-        rule_text = item.text(0)
-        
-        # Remove star prefix if present
-        if rule_text.startswith("★ "):
-            rule = rule_text[2:]  # Remove the star and space
-        else:
-            rule = rule_text
+        category, rule = index.data(RULE_ROLE)
         
         # Check if this rule is bookmarked
         is_bookmarked = (category, rule) in self.bookmarks
@@ -386,10 +372,12 @@ class RulesReferencePanel(BasePanel):
                 self.bookmarks.remove((category, rule))
             else:
                 self.bookmarks.add((category, rule))
-            self._populate_rules_tree()
+            self._update_bookmark_marker(category, rule)
+            if (category, rule) == (self.current_category, self.current_rule):
+                self.bookmark_action.setChecked((category, rule) in self.bookmarks)
         elif action == add_to_notes_action:
             # Set the current item to ensure rule is loaded
-            self.rules_tree.setCurrentItem(item)
+            self.rules_tree.setCurrentIndex(index)
             # Add to session notes
             self._add_to_session_notes()
     
@@ -423,9 +411,12 @@ class RulesReferencePanel(BasePanel):
         # Restore filters
         self.category_filter.setCurrentText(state.get("category_filter", "All Categories"))
         self.search_input.setText(state.get("search_text", ""))
+        self.search_debouncer.flush()
         
-        # Repopulate rules with restored filters and bookmarks
-        self._populate_rules_tree()
+        # Update bookmark markers and apply the restored filters
+        for category, rule in self.rule_items:
+            self._update_bookmark_marker(category, rule)
+        self._filter_rules()
         
         # Restore selection
         if "current_category" in state and "current_rule" in state:
@@ -433,28 +424,24 @@ class RulesReferencePanel(BasePanel):
     
     def _select_rule(self, category, rule):
         """Select a specific rule in the tree"""
-        for i in range(self.rules_tree.topLevelItemCount()):
-            category_item = self.rules_tree.topLevelItem(i)
-            if category_item.text(0) == category:
-                for j in range(category_item.childCount()):
-                    rule_item = category_item.child(j)
-                    if rule_item.text(0) == rule:
-                        self.rules_tree.setCurrentItem(rule_item)
-                        return
+        rule_item = self.rule_items.get((category, rule))
+        if rule_item is not None:
+            index = self.rules_proxy.mapFromSource(rule_item.index())
+            if index.isValid():
+                self.rules_tree.setCurrentIndex(index)
     
     def _add_to_session_notes(self):
         """Add the selected rule to the session notes"""
         notes_widget = None
         
         # Get the current selection
-        current_item = self.rules_tree.currentItem()
-        if not current_item:
+        current_index = self.rules_tree.currentIndex()
+        if not current_index.isValid() or not current_index.data(RULE_ROLE):
             QMessageBox.warning(self, "No Selection", "Please select a rule first")
             return
 
         # Extract the rule data
-        category = current_item.parent().text(0)
-        rule = current_item.text(0)
+        category, rule = current_index.data(RULE_ROLE)
         
         # Format the content for notes
         title = f"Rule: {category} - {rule}"
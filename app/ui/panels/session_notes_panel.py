@@ -354,6 +354,8 @@ class SessionNotesPanel(BasePanel):
         # Initialize data before calling the parent constructor
         self.notes = []
         self.filtered_notes = []
+        self.notes_from_db = False
+        self.search_snippets = {}
         self.all_tags = []
         self.current_note = None
         
@@ -513,6 +515,7 @@ class SessionNotesPanel(BasePanel):
             # Use database to load notes
             query = "SELECT * FROM session_notes ORDER BY updated_at DESC"
             self.notes = self.app_state.db_manager.execute_query(query)
+            self.notes_from_db = True
             
             # If no notes found, create an empty list
             if not self.notes:
@@ -528,6 +531,7 @@ class SessionNotesPanel(BasePanel):
         except Exception as e:
             print(f"Error loading notes from database: {e}")
             # Fall back to mock data for testing/development
+            self.notes_from_db = False
             self.notes = self._get_mock_notes()
             self.filtered_notes = self.notes.copy()
             self._update_notes_list()
@@ -594,6 +598,10 @@ class SessionNotesPanel(BasePanel):
             if note.get('tags'):
                 tags = note['tags'].split(',')
                 tooltip += f"\nTags: {', '.join(tags)}"
+            # Show the matching passage when searching
+            snippet = self.search_snippets.get(note['id'])
+            if snippet:
+                tooltip = tooltip.replace("\n", "<br>") + f"<br><br>{snippet}"
             item.setToolTip(tooltip)
             self.notes_list.addItem(item)
         # Defensive coding: prevents KeyError if notes are missing timestamp fields
@@ -632,11 +640,24 @@ class SessionNotesPanel(BasePanel):
         search_text = self.search_input.text().lower()
         tag_filter = self.tag_filter.currentData()
         
+        # Ranked full-text search in the database, with matching snippets
+        matches = self._search_notes(search_text) if search_text.strip() else None
+        self.search_snippets = {}
+        if matches is not None:
+            notes_by_id = {note['id']: note for note in self.notes}
+            candidates = []
+            for match in matches:
+                if match['id'] in notes_by_id:
+                    candidates.append(notes_by_id[match['id']])
+                    self.search_snippets[match['id']] = match['snippet']
+        else:
+            candidates = self.notes
+        
         self.filtered_notes = []
         
-        for note in self.notes:
+        for note in candidates:
             # Check if note matches search text
-            if search_text and search_text not in note['title'].lower() and search_text not in note['content'].lower():
+            if matches is None and search_text and search_text not in note['title'].lower() and search_text not in note['content'].lower():
                 continue
             
             # Check if note has the selected tag
@@ -647,6 +668,22 @@ class SessionNotesPanel(BasePanel):
         
         self._update_notes_list()
     
+    def _search_notes(self, search_text):
+        """
+        Search the session notes full-text index
+        
+        Returns:
+            Matching notes, best match first, or None if the index cannot
+            be used (e.g. mock notes are shown) and notes should be scanned
+        """
+        if not self.notes_from_db:
+            return None
+        try:
+            return self.app_state.db_manager.search_session_notes(search_text, limit=len(self.notes) or 1)
+        except Exception as e:
+            print(f"Error searching notes: {e}")
+            return None
+    
     def _note_selected(self, item):
         """Handle note selection"""
         note_id = item.data(Qt.UserRole)
@@ -8,14 +8,22 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QComboBox, QPushButton, QScrollArea, QTextEdit, QSplitter,
     QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget,
-    QFormLayout, QSpinBox, QGroupBox
+    QFormLayout, QSpinBox, QGroupBox, QTableView, QAbstractItemView
 )
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QStandardItemModel, QStandardItem
 
 from app.ui.panels.base_panel import BasePanel
+from app.ui.components.search_filter import (
+    SearchFilterProxyModel, SearchDebouncer, SEARCH_KEY_ROLE, FILTER_ROLE, keep_current_row
+)
 from app.data.spells import get_all_spells, get_spell_schools
 
+# Item data roles for the spell table filters
+LEVEL_ROLE = FILTER_ROLE
+SCHOOL_ROLE = FILTER_ROLE + 1
+CLASS_ROLE = FILTER_ROLE + 2
+
 
 class SpellReferencePanel(BasePanel):
     """
@@ -26,7 +34,6 @@ class SpellReferencePanel(BasePanel):
         """Initialize the spell reference panel"""
         # Initialize data before calling the parent constructor
         self.spells = []
-        self.filtered_spells = []
         self.current_spell = None
         
         # Call parent constructor which will call _setup_ui
@@ -80,7 +87,7 @@ class SpellReferencePanel(BasePanel):
         # Search box
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search spells...")
-        self.search_input.textChanged.connect(self._filter_spells)
+        self.search_debouncer = SearchDebouncer(self.search_input, lambda text: self._filter_spells())
         filter_layout.addWidget(self.search_input)
         
         # Level filter
@@ -118,17 +125,23 @@ class SpellReferencePanel(BasePanel):
         splitter = QSplitter(Qt.Orientation.Vertical)
         
         # Spell table
-        self.spell_table = QTableWidget(0, 4)
-        self.spell_table.setHorizontalHeaderLabels(["Name", "Level", "School", "Casting Time"])
+        # The model is built once; filtering only updates the proxy
+        self.spell_model = QStandardItemModel(0, 4, self)
+        self.spell_model.setHorizontalHeaderLabels(["Name", "Level", "School", "Casting Time"])
+        self.spell_proxy = SearchFilterProxyModel(self)
+        self.spell_proxy.setSourceModel(self.spell_model)
+        self.spell_table = QTableView()
+        self.spell_table.setModel(self.spell_proxy)
         self.spell_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.spell_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.spell_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
         self.spell_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
         self.spell_table.verticalHeader().setVisible(False)
-        self.spell_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.spell_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.spell_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.spell_table.cellClicked.connect(self._show_spell_details)
+        self.spell_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.spell_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.spell_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.spell_table.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self._show_spell_details(current.row(), current.column()))
         splitter.addWidget(self.spell_table)
         
         # Spell details area
@@ -298,68 +311,51 @@ class SpellReferencePanel(BasePanel):
             # Import here to avoid circular imports
             from app.data.spells import get_all_spells
             self.spells = get_all_spells()
-            self.filtered_spells = self.spells.copy()
             self._update_spell_table()
         except Exception as e:
             print(f"Error loading spells: {e}")
             # Fall back to empty spell list if there's an error
             self.spells = []
-            self.filtered_spells = []
             self._update_spell_table()
     
     def _update_spell_table(self):
-        """Update the spell table with current filtered spells"""
-        self.spell_table.setRowCount(0)
+        """Rebuild the spell table model from the loaded spells"""
+        self.spell_model.removeRows(0, self.spell_model.rowCount())
         
-        for idx, spell in enumerate(self.filtered_spells):
-            self.spell_table.insertRow(idx)
-            
-            name_item = QTableWidgetItem(spell['name'])
-            self.spell_table.setItem(idx, 0, name_item)
+        for spell in self.spells:
+            name_item = QStandardItem(spell['name'])
+            # Precomputed search key and filter fields
+            name_item.setData(spell['name'].lower(), SEARCH_KEY_ROLE)
+            name_item.setData(spell['level'], LEVEL_ROLE)
+            name_item.setData(spell['school'], SCHOOL_ROLE)
+            name_item.setData((spell['class'] or '').lower(), CLASS_ROLE)
             
             level_text = "Cantrip" if spell['level'] == 0 else str(spell['level'])
-            level_item = QTableWidgetItem(level_text)
-            self.spell_table.setItem(idx, 1, level_item)
-            
-            school_item = QTableWidgetItem(spell['school'])
-            self.spell_table.setItem(idx, 2, school_item)
-            
-            casting_time_item = QTableWidgetItem(spell['casting_time'])
-            self.spell_table.setItem(idx, 3, casting_time_item)
+            row = [name_item, QStandardItem(level_text), QStandardItem(spell['school']),
+                   QStandardItem(spell['casting_time'])]
+            self.spell_model.appendRow(row)
     
     def _filter_spells(self):
         """Filter spells based on search, level, school, and class"""
-        search_text = self.search_input.text().lower()
         level = self.level_filter.currentData()
         school = self.school_filter.currentData()
         class_name = self.class_filter.currentData()
         
-        self.filtered_spells = []
-        
-        for spell in self.spells:
-            # Check if spell matches all criteria
-            if search_text and search_text not in spell['name'].lower():
-                continue
-                
-            if level != -1 and spell['level'] != level:
-                continue
-                
-            if school and spell['school'] != school:
-                continue
-                
-            if class_name and class_name.lower() not in spell['class'].lower():
-                continue
-                
-            self.filtered_spells.append(spell)
-        
-        self._update_spell_table()
+        with keep_current_row(self.spell_table):
+            self.spell_proxy.set_search_text(self.search_input.text())
+            self.spell_proxy.set_field_filter(LEVEL_ROLE, None if level == -1 else level)
+            self.spell_proxy.set_field_filter(SCHOOL_ROLE, school or None)
+            self.spell_proxy.set_field_filter(
+                CLASS_ROLE, class_name.lower() if class_name else None,
+                lambda classes, wanted: wanted in classes)
     
     def _show_spell_details(self, row, column):
-        """Show details for the selected spell"""
-        if row < 0 or row >= len(self.filtered_spells):
+        """Show details for the spell in a row of the (filtered) table"""
+        if row < 0 or row >= self.spell_proxy.rowCount():
             return
             
-        spell = self.filtered_spells[row]
+        source_row = self.spell_proxy.mapToSource(self.spell_proxy.index(row, 0)).row()
+        spell = self.spells[source_row]
         self.current_spell = spell
         
         # Update UI with spell details
@@ -9,9 +9,11 @@ from PySide6.QtWidgets import (
     QSpinBox, QComboBox, QTextEdit, QGroupBox, QMessageBox
 )
 from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QTextCursor
 import json # For parsing LLM response
 
 from app.ui.panels.base_panel import BasePanel
+from app.core.llm_integration.batch_generation import generate_batch
 
 
 class TreasureGeneratorPanel(BasePanel):
@@ -26,6 +28,9 @@ class TreasureGeneratorPanel(BasePanel):
     
     # Signal for thread-safe communication (similar to other generator panels)
     generation_result = Signal(str, str) # response, error
+    generation_chunk = Signal(str) # streamed text
+    batch_progress = Signal(int, int) # hoards done, hoards requested
+    batch_result = Signal(object) # BatchResult or exception
 
     def __init__(self, app_state, panel_id=None):
         """Initialize the Treasure Generator panel."""
@@ -78,9 +83,17 @@ class TreasureGeneratorPanel(BasePanel):
         input_row2.addWidget(self.context_input)
         config_layout.addLayout(input_row2)
 
-        # Generate Button
+        # Generate Button, with a batch size (batches are generated in parallel and saved automatically)
+        generate_row = QHBoxLayout()
         self.generate_button = QPushButton("Generate Treasure")
-        config_layout.addWidget(self.generate_button)
+        generate_row.addWidget(self.generate_button)
+        generate_row.addWidget(QLabel("Count:"))
+        self.batch_spinbox = QSpinBox()
+        self.batch_spinbox.setRange(1, 50)
+        self.batch_spinbox.setValue(1)
+        self.batch_spinbox.setToolTip("Number of treasures to generate. Batches are saved automatically.")
+        generate_row.addWidget(self.batch_spinbox)
+        config_layout.addLayout(generate_row)
         
         main_layout.addWidget(config_group)
 
@@ -106,6 +119,9 @@ class TreasureGeneratorPanel(BasePanel):
         self.generate_button.clicked.connect(self._generate_treasure)
         # Connect generation_result signal to a UI update slot
         self.generation_result.connect(self._process_generation_ui)
+        self.generation_chunk.connect(self._append_generation_chunk)
+        self.batch_progress.connect(self._update_batch_progress)
+        self.batch_result.connect(self._save_batch_result)
         # Connect save button
         self.save_to_notes_button.clicked.connect(self._save_to_notes)
 
@@ -141,16 +157,24 @@ class TreasureGeneratorPanel(BasePanel):
             self.is_generating = True
             self.generate_button.setEnabled(False)
             self.generate_button.setText("Generating...")
-            self.results_display.setPlainText("Generating treasure with AI...")
+            self.results_display.clear()
+            self.results_display.setPlaceholderText("Generating treasure with AI...")
 
             print(f"--- Treasure Generator Prompt (Model: {model_id}) ---")
             print(prompt)
             print("----------------------------------------------")
 
+            count = self.batch_spinbox.value()
+            if count > 1:
+                self._generate_treasure_batch(model_id, prompt, count, params)
+                return
+
             self.llm_service.generate_completion_async(
                 model=model_id,
                 messages=[{"role": "user", "content": prompt}],
                 callback=self._handle_generation_result,
+                stream=True,
+                chunk_callback=self.generation_chunk.emit,
                 temperature=0.7,
                 max_tokens=4000  # Increased to 4000 for longer responses
             )
@@ -158,6 +182,54 @@ class TreasureGeneratorPanel(BasePanel):
             QMessageBox.critical(self, "Error", f"Failed to start generation: {e}")
             self._reset_ui_state()
 
+    def _generate_treasure_batch(self, model_id, prompt, count, params):
+        """Generate several treasures concurrently; they are saved together when all are done."""
+        self.results_display.setPlaceholderText(f"Generating {count} treasures with AI...")
+        self.batch_request = {"model_id": model_id, "prompt": prompt, "params": params}
+        future = self.llm_service.run_async(generate_batch(
+            self.llm_service, model_id, prompt, count, "treasures", on_progress=self.batch_progress.emit
+        ))
+        future.add_done_callback(lambda f: self.batch_result.emit(f.exception() or f.result()))
+
+    def _update_batch_progress(self, done, total):
+        """Show batch progress in the main GUI thread."""
+        self.generate_button.setText(f"Generating... {done}/{total}")
+
+    def _save_batch_result(self, result):
+        """Save a finished batch in one transaction and show it in the main GUI thread."""
+        self._reset_ui_state()
+
+        if isinstance(result, Exception) or not result.entities:
+            error = result if isinstance(result, Exception) else "; ".join(result.errors)
+            QMessageBox.critical(self, "Generation Error", f"Error generating treasure: {error}")
+            self.results_display.setPlainText(f"Error: {error}")
+            return
+
+        params = self.batch_request["params"]
+        items = [
+            {
+                "title": f"{params['type']} treasure (CR {params['cr']}) #{index}",
+                "content_type": "treasure",
+                "content": json.dumps(treasure, indent=2),
+                "model_id": self.batch_request["model_id"],
+                "prompt": self.batch_request["prompt"],
+                "tags": ["treasure", params["type"], f"CR {params['cr']}"]
+            }
+            for index, treasure in enumerate(result.entities, start=1)
+        ]
+        try:
+            self.llm_data_manager.add_generated_content_batch(items)
+        except Exception as e:
+            QMessageBox.warning(self, "Save Error", f"Could not save treasure: {e}")
+            return
+
+        summary = f"Saved {len(items)} of {result.requested} treasures"
+        if result.errors:
+            summary += f" ({len(result.errors)} requests failed)"
+        self.results_display.setPlainText(
+            summary + "\n\n" + "\n\n".join(f"{item['title']}\n{item['content']}" for item in items)
+        )
+
     def _get_generation_params(self):
         """Gather parameters from the UI fields."""
         return {
@@ -228,6 +300,11 @@ class TreasureGeneratorPanel(BasePanel):
         """Handle LLM result in background thread and emit signal."""
         self.generation_result.emit(response, error)
 
+    def _append_generation_chunk(self, chunk):
+        """Show streamed text as it arrives (runs in UI thread)."""
+        self.results_display.moveCursor(QTextCursor.End)
+        self.results_display.insertPlainText(chunk)
+
     def _process_generation_ui(self, response, error):
         """Process LLM result in main GUI thread."""
         self._reset_ui_state()
@@ -276,6 +353,7 @@ class TreasureGeneratorPanel(BasePanel):
         self.is_generating = False
         self.generate_button.setEnabled(True)
         self.generate_button.setText("Generate Treasure")
+        self.results_display.setPlaceholderText("Generated treasure will appear here...")
         # Don't disable save button on reset, allow saving after generation
         # self.save_to_notes_button.setEnabled(False) 
         # Don't clear current_treasure_data here, allow saving after error reset
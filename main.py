@@ -14,9 +14,10 @@ import logging
 from pathlib import Path
 import threading
 
+from app.core.startup import StartupProfiler
+
 # Force single-thread OpenAI API
 os.environ["OPENAI_API_REQUEST_TIMEOUT"] = "60"
-os.environ["PYTHONMALLOC"] = "debug"  # Enable debug malloc
 
 # Configure thread limits
 threading.stack_size(16 * 1024 * 1024)  # 16MB stack size
@@ -28,16 +29,17 @@ sys.setrecursionlimit(3000)  # Increase from default 1000
 app_dir = Path(__file__).parent
 sys.path.append(str(app_dir))
 
-# Configure memory usage
-gc.set_threshold(100, 5, 2)  # More aggressive garbage collection
-
-from PySide6.QtWidgets import QApplication
-from app.core.app_state import AppState
-from app.core.patched_app_state import apply_patches
-from app.ui.main_window import MainWindow
-
 def main():
     """Main application entry point"""
+    # --profile-startup prints per-phase and per-import timings once the
+    # services are ready, and writes them to startup_profile.txt
+    profiler = StartupProfiler(enabled="--profile-startup" in sys.argv)
+    argv = [arg for arg in sys.argv if arg != "--profile-startup"]
+    
+    with profiler.phase("Import Qt"):
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import QApplication
+    
     # Set up logging
     log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     root_logger = logging.getLogger()
@@ -64,7 +66,9 @@ def main():
     # Apply stability patches
     logging.info("Applying stability patches")
     try:
-        apply_patches()
+        with profiler.phase("Apply patches"):
+            from app.core.patched_app_state import apply_patches
+            apply_patches()
         logging.info("Stability patches applied successfully")
     except Exception as e:
         logging.error(f"Error applying patches: {e}", exc_info=True)
@@ -73,16 +77,35 @@ def main():
     gc.collect()
     
     # Create the Qt Application
-    app = QApplication(sys.argv)
-    app.setApplicationName("DM Screen")
-    app.setApplicationVersion("0.5.0")
+    with profiler.phase("Create QApplication"):
+        app = QApplication(argv)
+        app.setApplicationName("DM Screen")
+        app.setApplicationVersion("0.5.0")
     
-    # Initialize application state~
-    app_state = AppState()
+    # Initialize application state (the LLM services are created later)
+    with profiler.phase("Initialize application state"):
+        from app.core.app_state import AppState
+        app_state = AppState()
     
     # Create and show the main window
-    window = MainWindow(app_state)
-    window.show()
+    with profiler.phase("Import main window"):
+        from app.ui.main_window import MainWindow
+    with profiler.phase("Create main window"):
+        window = MainWindow(app_state)
+        window.show()
+    
+    # Load the LLM services in the background once the window has painted
+    from app.core.service_loader import ServiceLoader
+    service_loader = ServiceLoader(app_state, profiler)
+    if profiler.enabled:
+        service_loader.services_ready.connect(
+            lambda: profiler.finish(app_dir / 'startup_profile.txt'))
+    
+    def on_first_paint():
+        profiler.mark("First paint")
+        service_loader.start()
+    
+    QTimer.singleShot(0, on_first_paint)
     
     # Set up cleanup on exit
     app.aboutToQuit.connect(app_state.close)
@@ -0,0 +1,67 @@
+"""
+Unit tests for batch LLM content generation.
+"""
+
+import asyncio
+import json
+import unittest
+from app.core.llm_integration.batch_generation import generate_batch, parse_entities, split_batch
+
+class FakeService:
+    """Answers each request with as many NPCs as it asked for"""
+
+    def __init__(self, fail_every=None):
+        self.requests = []
+        self.fail_every = fail_every
+
+    async def agenerate_completion(self, model, messages, temperature, max_tokens, use_cache):
+        self.requests.append(messages[0]["content"])
+        index = len(self.requests)
+        if self.fail_every and index % self.fail_every == 0:
+            raise RuntimeError("rate limited")
+        prompt = messages[0]["content"]
+        count = int(prompt.split("Generate ")[-1].split(" ")[0]) if "BATCH REQUEST" in prompt else 1
+        await asyncio.sleep(0)
+        npcs = [{"name": f"NPC {index}.{i}"} for i in range(count)]
+        return "```json\n" + json.dumps(npcs if count > 1 else npcs[0]) + "\n```"
+
+class TestBatchGeneration(unittest.TestCase):
+    """Test cases for batch generation"""
+
+    def test_split_batch(self):
+        self.assertEqual(split_batch(10, 4), [4, 4, 2])
+        self.assertEqual(split_batch(1, 4), [1])
+        self.assertEqual(split_batch(3, 0), [1, 1, 1])
+
+    def test_parse_entities(self):
+        """Arrays, single objects, wrapped lists and surrounding text are accepted"""
+        self.assertEqual(parse_entities('[{"name": "A"}, {"name": "B"}]'), [{"name": "A"}, {"name": "B"}])
+        self.assertEqual(parse_entities('{"name": "A", "traits": ["brave"]}'), [{"name": "A", "traits": ["brave"]}])
+        self.assertEqual(parse_entities('{"npcs": [{"name": "A"}]}'), [{"name": "A"}])
+        self.assertEqual(parse_entities('{"npcs": [{"name": "A"}, {"name": "B"}], "count": 2}'),
+                         [{"name": "A"}, {"name": "B"}])
+        self.assertEqual(parse_entities('{"name": "A", "actions": [{"name": "Club"}]}'),
+                         [{"name": "A", "actions": [{"name": "Club"}]}])
+        self.assertEqual(parse_entities('Here you go:\n[{"name": "A"}]\nEnjoy!'), [{"name": "A"}])
+        self.assertEqual(parse_entities("not json"), [])
+
+    def test_entities_are_packed_into_few_requests(self):
+        service = FakeService()
+        progress = []
+        result = asyncio.run(generate_batch(service, "model", "Make an NPC in JSON.", 25, "tavern NPCs",
+                                            per_request=5, on_progress=lambda done, total: progress.append(done)))
+        self.assertEqual(len(result.entities), 25)
+        self.assertEqual(len({npc["name"] for npc in result.entities}), 25)
+        self.assertEqual(len(service.requests), 5)
+        self.assertIn("exactly 5", service.requests[0])
+        self.assertEqual((progress[-1], result.errors), (25, []))
+
+    def test_failed_requests_are_reported(self):
+        """Entities from successful requests are kept when others fail"""
+        result = asyncio.run(generate_batch(FakeService(fail_every=2), "model", "Make an NPC.", 8, "NPCs", per_request=2))
+        self.assertEqual(len(result.entities), 4)
+        self.assertEqual(result.errors, ["rate limited"] * 2)
+        self.assertEqual(result.requested, 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Unit tests for bulk JSON import.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from app.data import bulk_import, db_manager
+from app.data.db_manager import DatabaseManager
+
+SPELL = {"name": "Fire Bolt", "level": 0, "school": "Evocation", "casting_time": "1 action", "range": "120 feet",
+         "components": "V, S", "duration": "Instantaneous", "description": "A mote of fire…", "class": "Wizard",
+         "source": "PHB"}
+
+class TestBulkImport(unittest.TestCase):
+    """Test cases for streaming, validating and importing JSON records"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        with mock.patch.object(db_manager, "get_database_path", return_value=Path(self.tmp_dir) / "test.db"):
+            self.db = DatabaseManager(None)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def write_json(self, data, name="data.json"):
+        path = Path(self.tmp_dir) / name
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8-sig")
+        return path
+
+    def test_records_are_streamed(self):
+        """Records split across tiny chunks, including multi-byte text and numbers, decode intact"""
+        records = [{"name": f"Élan {i}", "value": 12345 + i, "tags": ["a", "ü"]} for i in range(50)]
+        path = self.write_json(records)
+        self.assertEqual(list(bulk_import.iter_json_records(path, chunk_size=7)), records)
+        self.assertEqual(list(bulk_import.iter_json_records(self.write_json({"name": "One"}))), [{"name": "One"}])
+        self.assertEqual(list(bulk_import.iter_json_records(self.write_json([]))), [])
+
+    def test_records_are_validated(self):
+        schema = bulk_import.table_schema(self.db.connection, "spells")
+        row = bulk_import.validate_record(dict(SPELL, level="3", components=["V", "S"]), schema)
+        self.assertEqual((row["level"], row["components"]), (3, '["V", "S"]'))
+        for record, message in [(dict(SPELL, colour="red"), "unknown columns colour"),
+                                ({"name": "Shield"}, "missing required columns level"),
+                                (dict(SPELL, level="cantrip"), "expects an integer"),
+                                ([SPELL], "expected an object")]:
+            with self.assertRaisesRegex(bulk_import.ImportValidationError, message):
+                bulk_import.validate_record(record, schema)
+
+    def test_import_json_data(self):
+        """Valid records are imported in batches and invalid ones skipped"""
+        spells = [dict(SPELL, name=f"Spell {i}", level=i % 10) for i in range(1200)]
+        spells[10] = {"name": "Broken"}
+        progress = []
+        with mock.patch.object(bulk_import, "BATCH_SIZE", 500):
+            count = self.db.import_json_data("spells", self.write_json(spells),
+                                             progress=lambda *args: progress.append(args))
+        self.assertEqual(count, 1199)
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) AS n FROM spells")[0]["n"], 1199)
+        self.assertEqual([imported for imported, _, _ in progress], [500, 1000, 1199])
+        self.assertEqual(progress[-1][1], progress[-1][2])
+
+    def test_import_is_all_or_nothing(self):
+        """A database error rolls back every record of the import"""
+        spells = [dict(SPELL, id=1), dict(SPELL, id=2), dict(SPELL, id=1)]
+        self.assertEqual(self.db.import_json_data("spells", self.write_json(spells)), 0)
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) AS n FROM spells")[0]["n"], 0)
+        self.assertEqual(self.db.import_json_data("no_such_table", self.write_json([SPELL])), 0)
+
+    def test_monster_import_updates_the_index(self):
+        monster = {"name": "Goblin", "type": "humanoid (goblinoid)", "cr": "1/4", "size": "Small",
+                   "alignment": "neutral evil", "ac": 15, "hp": "7 (2d6)", "speed": "30 ft.", "str": 8, "dex": 14,
+                   "con": 10, "int": 10, "wis": 8, "cha": 8, "source": "MM"}
+        self.assertEqual(self.db.import_json_data("monsters", self.write_json([monster])), 1)
+        self.assertEqual([summary.name for summary in self.db.get_monster_summaries(types=["humanoid"])],
+                         ["Goblin"])
+
+if __name__ == "__main__":
+    unittest.main()
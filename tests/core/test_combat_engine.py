@@ -0,0 +1,169 @@
+"""
+Unit tests for the local (LLM-free) combat engine.
+"""
+
+import random
+import unittest
+from unittest.mock import MagicMock
+from app.core.combat_resolver import CombatResolver
+from app.combat.combat_engine import (
+    CombatEngine, RuleBasedPolicy, parse_action, get_combatant_actions,
+    hit_probability, resolve_action_spec
+)
+
+SCIMITAR = {"name": "Scimitar", "description": "Melee Weapon Attack: +4 to hit, reach 5 ft., one target. Hit: 5 (1d6 + 2) slashing damage."}
+FIRE_BREATH = {"name": "Fire Breath (Recharge 5-6)", "description": "The dragon exhales fire in a 15-foot cone. Each creature in that area must make a DC 13 Dexterity saving throw, taking 24 (7d6) fire damage on a failed save, or half as much damage on a successful one."}
+MULTIATTACK = {"name": "Multiattack", "description": "The dragon makes three attacks: one with its bite and two with its claws."}
+BITE = {"name": "Bite", "description": "Melee Weapon Attack: +6 to hit, reach 5 ft., one target. Hit: 9 (1d10 + 4) piercing damage."}
+CLAW = {"name": "Claw", "description": "Melee Weapon Attack: +6 to hit, reach 5 ft., one target. Hit: 7 (1d6 + 4) slashing damage."}
+DART = {"name": "Poison Dart (1/Day)", "description": "Ranged Weapon Attack: +6 to hit, range 30 ft., one target. Hit: 14 (4d6) poison damage."}
+CURE = {"name": "Cure Wounds", "description": "A creature you touch regains 7 (1d8 + 3) hit points."}
+
+class TestActionParsing(unittest.TestCase):
+    """Test cases for stat block parsing"""
+
+    def test_parse_weapon_attack(self):
+        """Attack bonus and damage dice come from the description"""
+        action = parse_action(SCIMITAR)
+        self.assertEqual(action.attack_bonus, 4)
+        self.assertEqual(action.damage, ["1d6+2"])
+        self.assertAlmostEqual(action.average_damage, 5.5)
+
+    def test_parse_save_with_recharge(self):
+        """Save DC, ability, half damage, area and recharge are recognised"""
+        action = parse_action(FIRE_BREATH)
+        self.assertEqual((action.save_dc, action.save_ability), (13, "dexterity"))
+        self.assertTrue(action.half_on_save)
+        self.assertTrue(action.area)
+        self.assertEqual(action.recharge, (5, 6))
+        self.assertEqual(action.damage, ["7d6"])
+
+    def test_parse_multiattack(self):
+        """Multiattack parts are counted per weapon"""
+        action = parse_action(MULTIATTACK)
+        self.assertEqual(action.multiattack, [("bite", 1), ("claws", 2)])
+
+    def test_character_without_actions_gets_default_weapon(self):
+        """Combatants with no parsable actions fall back to a weapon attack"""
+        actions = get_combatant_actions({"name": "Fighter", "attack_bonus": 7, "damage": "2d6+4"})
+        self.assertEqual(len(actions), 1)
+        self.assertEqual((actions[0].attack_bonus, actions[0].damage), (7, ["2d6+4"]))
+
+class TestRuleBasedPolicy(unittest.TestCase):
+    """Test cases for rule-based action selection"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.policy = RuleBasedPolicy()
+        self.dragon = {"name": "Dragon", "type": "monster", "hp": 75, "max_hp": 75, "ac": 17,
+                       "actions": [MULTIATTACK, BITE, CLAW, FIRE_BREATH]}
+        self.fighter = {"name": "Fighter", "type": "character", "hp": 40, "max_hp": 40, "ac": 18}
+        self.wizard = {"name": "Wizard", "type": "character", "hp": 6, "max_hp": 20, "ac": 12}
+
+    def test_focus_fire_on_weakest_enemy(self):
+        """Multiattack targets the enemy that goes down soonest"""
+        self.dragon["recharge_abilities"] = {FIRE_BREATH["name"]: {"available": False}}
+        spec = self.policy.choose(self.dragon, [self.dragon, self.fighter, self.wizard])
+        self.assertEqual(spec["action"], "Multiattack")
+        self.assertEqual(len(spec["attacks"]), 3)
+        self.assertTrue(all(a["target"] == "Wizard" for a in spec["attacks"]))
+
+    def test_prefers_highest_expected_damage(self):
+        """An available area breath beats the multiattack against two healthy targets"""
+        self.wizard["hp"] = 20
+        spec = self.policy.choose(self.dragon, [self.dragon, self.fighter, self.wizard])
+        self.assertEqual(spec["action"], FIRE_BREATH["name"])
+        self.assertEqual(spec["uses_ability"], FIRE_BREATH["name"])
+        self.assertEqual(len(spec["targets"]), 2)
+
+    def test_heals_ally_when_low(self):
+        """A healer tends to an ally at or below the heal threshold"""
+        cleric = {"name": "Cleric", "type": "character", "hp": 20, "max_hp": 20, "ac": 16, "actions": [CURE]}
+        spec = self.policy.choose(cleric, [cleric, self.wizard, self.dragon])
+        self.assertEqual(spec["targets"], ["Wizard"])
+        self.assertEqual(spec["healing"], "1d8+3")
+
+    def test_hit_probability_bounds(self):
+        """Natural 1 and natural 20 bound the hit chance"""
+        self.assertAlmostEqual(hit_probability(0, 30), 0.05)
+        self.assertAlmostEqual(hit_probability(20, 5), 0.95)
+        self.assertAlmostEqual(hit_probability(5, 15), 0.55)
+
+class TestCombatEngine(unittest.TestCase):
+    """Test cases for full local combat resolution"""
+
+    def _state(self):
+        return {"round": 1, "combatants": [
+            {"name": "Fighter", "type": "character", "hp": 44, "max_hp": 44, "ac": 18, "initiative": 15,
+             "attack_bonus": 7, "damage": "1d8+4"},
+            {"name": "Goblin 1", "type": "monster", "hp": 7, "max_hp": 7, "ac": 15, "initiative": 12,
+             "actions": [SCIMITAR]},
+            {"name": "Goblin 2", "type": "monster", "hp": 7, "max_hp": 7, "ac": 15, "initiative": 10,
+             "actions": [SCIMITAR]},
+        ]}
+
+    def test_seeded_fight_is_reproducible(self):
+        """The same seed gives the same fight"""
+        first = CombatEngine(rng=random.Random(7)).run(self._state())
+        second = CombatEngine(rng=random.Random(7)).run(self._state())
+        self.assertEqual(first["winner"], second["winner"])
+        self.assertEqual(first["log"], second["log"])
+
+    def test_fight_ends_with_a_winner(self):
+        """A strong fighter beats two goblins and the input state is untouched"""
+        state = self._state()
+        result = CombatEngine(rng=random.Random(1)).run(state)
+        self.assertEqual(result["winner"], "party")
+        self.assertTrue(all(c["status"] == "Dead" for c in result["updates"] if c["type"] == "monster"))
+        self.assertEqual(state["combatants"][1]["hp"], 7)
+        self.assertNotIn("_parsed_actions", result["updates"][0])
+
+    def test_downed_character_makes_death_saves(self):
+        """Characters at 0 HP roll a death save instead of acting"""
+        combatants = self._state()["combatants"]
+        combatants[0].update(hp=0, status="Unconscious")
+        log = []
+        CombatEngine(rng=random.Random(3))._take_turn(combatants, 0, 1, log)
+        self.assertEqual([entry["action"] for entry in log], ["Death Save"])
+        saves = combatants[0]["death_saves"]
+        self.assertGreater(saves["successes"] + saves["failures"], 0)
+        self.assertEqual(combatants[1]["hp"], 7)
+
+    def test_attack_spills_over_to_next_target(self):
+        """An attack aimed at a target that already dropped moves to the next one"""
+        combatants = self._state()["combatants"]
+        combatants[1]["hp"] = 0
+        spec = {"action": "Longsword", "targets": ["Goblin 1", "Goblin 2"],
+                "attacks": [{"target": "Goblin 1", "attack_bonus": 7, "damage": "1d8+4"}]}
+        rolls = iter([15, 6])
+        result = resolve_action_spec(spec, combatants, 0, lambda expression: next(rolls))
+        self.assertEqual(result["updates"], [{"name": "Goblin 2", "hp": 1}])
+
+    def test_resolver_local_mode_makes_no_llm_call(self):
+        """The resolver's local mode resolves a turn with the rule-based policy"""
+        service = MagicMock()
+        resolver = CombatResolver(service)
+        resolver._fight_resolution_mode = CombatResolver.RESOLUTION_MODE_LOCAL
+        combatants = self._state()["combatants"]
+        result = resolver._process_turn(combatants, 1, 1, lambda expression: 15 if expression == "1d20" else 4)
+        service.generate_completion.assert_not_called()
+        self.assertEqual(result["action"], "Scimitar")
+        self.assertEqual(result["updates"], [{"name": "Fighter", "hp": 40}])
+        self.assertIn("_parsed_actions", combatants[1])
+
+    def test_resolver_local_mode_counts_limited_uses(self):
+        """A 1/Day ability is used once, and the stat block is parsed once per fight"""
+        resolver = CombatResolver(MagicMock())
+        resolver._fight_resolution_mode = CombatResolver.RESOLUTION_MODE_LOCAL
+        combatants = self._state()["combatants"]
+        combatants[1]["actions"] = [SCIMITAR, DART]
+        actions = [resolver._process_turn(combatants, 1, round_num, lambda expression: 15)["action"]
+                   for round_num in (1, 2)]
+        self.assertEqual(actions, ["Poison Dart (1/Day)", "Scimitar"])
+        self.assertEqual(combatants[1]["_uses_left"], {"Poison Dart (1/Day)": 0})
+        parsed = combatants[1]["_parsed_actions"]
+        resolver._process_turn(combatants, 1, 3, lambda expression: 15)
+        self.assertIs(combatants[1]["_parsed_actions"], parsed)
+
+if __name__ == "__main__":
+    unittest.main()
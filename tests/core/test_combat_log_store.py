@@ -0,0 +1,98 @@
+"""
+Unit tests for the persistent combat log store.
+"""
+
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from app.combat.turn_delta import TurnDeltaTracker
+from app.data.combat_log_store import TURN_DELTA_CATEGORY, CombatLogStore
+from app.data.connection import ConnectionManager
+
+def _state(round_num, goblin_hp):
+    return {"round": round_num, "current_turn_index": 0,
+            "combatants": [{"name": "Goblin", "instance_id": "g1", "hp": goblin_hp, "max_hp": 7}],
+            "latest_action": {"actor": "Fighter", "action": "Longsword", "result": "Hit"}}
+
+class TestCombatLogStore(unittest.TestCase):
+    """Test cases for CombatLogStore"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.connections = ConnectionManager(Path(self.tmp_dir) / "test.db")
+        self.store = CombatLogStore(self.connections)
+
+    def tearDown(self):
+        self.store.close()
+        self.connections.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_entries_are_written_in_the_background(self):
+        """Appends return at once and are committed by the writer thread in batches"""
+        for i in range(1000):
+            self.store.append("Attack", f"Goblin {i % 3}", "Fighter", round_num=i // 100 + 1, turn_num=i % 100,
+                              payload={"action": "attacked", "result": i})
+        self.assertEqual(self.store._writer.name, "CombatLogWriter")
+        self.assertNotEqual(self.store._writer.ident, threading.get_ident())
+        records = self.store.entries()
+        self.assertEqual([record.payload["result"] for record in records], list(range(1000)))
+        self.assertEqual(len(self.store.entries(actor="Goblin 1")), 333)
+        self.assertEqual([record.turn for record in self.store.entries(round_num=3, actor="Goblin 0")][:3],
+                         [1, 4, 7])
+        self.assertEqual([record.payload["result"] for record in self.store.entries(limit=2, newest=True)],
+                         [998, 999])
+
+    def test_queries_use_the_indexes(self):
+        conn = self.connections.get()
+        for where in ("session_id = ? AND actor = ?", "session_id = ? AND round = ?"):
+            plan = " ".join(row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM combat_log WHERE {where} ORDER BY id", ("s", "x")))
+            self.assertIn("USING INDEX", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_log_is_append_only(self):
+        self.store.append("Other", "DM", payload={"action": "noted"})
+        self.store.flush()
+        with self.assertRaisesRegex(sqlite3.IntegrityError, "append-only"):
+            self.connections.get().execute("UPDATE combat_log SET actor = 'Someone'")
+        self.connections.rollback()
+
+    def test_sessions(self):
+        """Sessions that were never ended are reported for crash recovery"""
+        self.store.append("Other", "DM")
+        first = self.store.active_session_id
+        second = self.store.start_session("Ambush")
+        self.store.append("Other", "DM")
+        self.store.append("Other", "DM")
+        sessions = {session["id"]: session for session in self.store.sessions()}
+        self.assertIsNotNone(sessions[first]["ended_at"])
+        self.assertEqual((sessions[second]["title"], sessions[second]["entry_count"]), ("Ambush", 2))
+        self.assertEqual([session["id"] for session in self.store.sessions(unfinished_only=True)], [second])
+        self.store.delete_session(second)
+        self.assertEqual([session["id"] for session in self.store.sessions()], [first])
+        self.assertIsNone(self.store.active_session_id)
+
+    def test_close_writes_queued_entries(self):
+        self.store.append("Other", "DM")
+        session_id = self.store.active_session_id
+        self.store.close()
+        reopened = CombatLogStore(self.connections)
+        self.assertEqual(len(reopened.entries(session_id)), 1)
+        self.assertEqual(reopened.sessions(unfinished_only=True), [])
+
+    def test_replay(self):
+        tracker = TurnDeltaTracker()
+        for round_num, hp in ((1, 7), (2, 3), (3, 0)):
+            self.store.record_turn_delta(tracker.diff(_state(round_num, hp)))
+        self.store.append("Turn", "Fighter", payload={"action": "Longsword"})
+        replayed = []
+        self.assertEqual(self.store.replay(replayed.append, up_to_round=2), 2)
+        self.assertTrue(all(delta.replayed for delta in replayed))
+        self.assertEqual([dict(delta.combatants[0].changes)["hp"] for delta in replayed], [7, 3])
+        self.assertEqual(len(self.store.entries(categories=(TURN_DELTA_CATEGORY,))), 3)
+
+if __name__ == "__main__":
+    unittest.main()
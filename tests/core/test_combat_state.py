@@ -0,0 +1,104 @@
+"""
+Unit tests for combat state snapshots.
+"""
+
+import copy
+import unittest
+from app.combat.combat_state import CombatHistory, CombatSnapshot, copy_combat_state
+from app.combat.turn_delta import TurnDeltaTracker
+
+def _state():
+    return {
+        "round": 1,
+        "current_turn_index": 0,
+        "combatants": [
+            {"name": "Goblin", "instance_id": "g1", "type": "monster", "hp": 7, "max_hp": 7, "status": "",
+             "actions": [{"name": "Scimitar", "description": "Melee Weapon Attack: +4 to hit"}],
+             "action_economy": {"action": True, "reaction": True}},
+            {"name": "Fighter", "instance_id": "f1", "type": "character", "hp": 30, "max_hp": 30, "status": "",
+             "death_saves": {"successes": 0, "failures": 0}, "conditions": {}},
+        ],
+    }
+
+class TestCopyCombatState(unittest.TestCase):
+    """Test cases for copy_combat_state"""
+
+    def test_per_fight_fields_are_copied_and_stat_blocks_shared(self):
+        original = _state()
+        expected = copy.deepcopy(original)
+        state = copy_combat_state(original)
+        goblin, fighter = state["combatants"]
+        goblin["hp"] = 0
+        goblin["action_economy"]["action"] = False
+        fighter["death_saves"]["failures"] = 2
+        fighter["conditions"]["prone"] = {"source": "Goblin"}
+        self.assertEqual(original, expected)
+        self.assertIs(goblin["actions"], original["combatants"][0]["actions"])
+
+class TestCombatSnapshot(unittest.TestCase):
+    """Test cases for CombatSnapshot and CombatHistory"""
+
+    def test_unchanged_combatants_are_shared(self):
+        """The next snapshot only allocates the combatants that changed"""
+        state = _state()
+        first = CombatSnapshot.from_state(state)
+        self.assertIs(CombatSnapshot.from_state(state, first).combatants, first.combatants)
+
+        state["combatants"][0]["hp"] = 2
+        state["round"] = 2
+        second = CombatSnapshot.from_state(state, first)
+        self.assertIsNot(second.combatants[0], first.combatants[0])
+        self.assertIs(second.combatants[1], first.combatants[1])
+        self.assertIs(second.combatants[0].stat_block, first.combatants[0].stat_block)
+        self.assertEqual([(c.key, changes) for c, changes in second.changes_since(first)], [("g1", (("hp", 2),))])
+        self.assertEqual((first.combatant("g1")["hp"], second.combatant("g1")["hp"]), (7, 2))
+
+    def test_snapshots_are_immutable_and_detached(self):
+        state = _state()
+        snapshot = CombatSnapshot.from_state(state)
+        state["combatants"][1]["death_saves"]["failures"] = 3
+        fighter = snapshot.combatant("f1")
+        self.assertEqual(fighter["death_saves"]["failures"], 0)
+        with self.assertRaises(AttributeError):
+            fighter.name = "Rogue"
+        with self.assertRaises(AttributeError):
+            snapshot.round = 3
+        with self.assertRaises(TypeError):
+            fighter["death_saves"]["failures"] = 1
+
+    def test_with_combatant(self):
+        snapshot = CombatSnapshot.from_state(_state())
+        changed = snapshot.with_combatant("f1", hp=12, status="Prone")
+        self.assertEqual((changed.combatant("f1")["hp"], changed.combatant("f1")["status"]), (12, "Prone"))
+        self.assertEqual(snapshot.combatant("f1")["hp"], 30)
+        self.assertIs(changed.combatants[0], snapshot.combatants[0])
+        with self.assertRaises(KeyError):
+            snapshot.with_combatant("nobody", hp=1)
+
+    def test_history_undo_and_rewind(self):
+        state = _state()
+        history = CombatHistory()
+        for round_num in (1, 2, 3):
+            for turn in (0, 1):
+                state["round"], state["current_turn_index"] = round_num, turn
+                state["combatants"][0]["hp"] = 7 - round_num * 2 - turn
+                history.record(state)
+        self.assertEqual(len(history), 6)
+        self.assertEqual(history.undo().combatant("g1")["hp"], 1)
+        rewound = history.rewind(1)
+        self.assertEqual((len(history), rewound.round, rewound.combatant("g1")["hp"]), (2, 1, 4))
+        resumed = rewound.to_state()
+        self.assertEqual(resumed["combatants"][0]["hp"], 4)
+        self.assertEqual(resumed["combatants"][0]["actions"], state["combatants"][0]["actions"])
+        self.assertEqual(resumed["combatants"][1]["death_saves"], {"successes": 0, "failures": 0})
+
+    def test_tracker_keeps_history(self):
+        tracker = TurnDeltaTracker(_state()["combatants"])
+        state = _state()
+        state["combatants"][1]["status"] = "Prone"
+        tracker.diff(state)
+        self.assertEqual(len(tracker.history), 2)
+        self.assertIs(tracker.history[1].combatants[0], tracker.history[0].combatants[0])
+
+if __name__ == "__main__":
+    unittest.main()
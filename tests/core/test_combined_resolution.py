@@ -0,0 +1,91 @@
+"""
+Unit tests for the single-call (combined) resolution mode of CombatResolver.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from app.core.combat_resolver import CombatResolver
+
+class TestCombinedResolution(unittest.TestCase):
+    """Test cases for structured resolution applied by local dice rolls"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.mock_llm_service = MagicMock()
+        self.mock_llm_service.get_available_models.return_value = [{"id": "test-model", "name": "Test"}]
+        self.resolver = CombatResolver(self.mock_llm_service)
+        self.resolver._fight_resolution_mode = CombatResolver.RESOLUTION_MODE_COMBINED
+
+        self.combatants = [
+            {"name": "Goblin", "type": "monster", "hp": 7, "max_hp": 7, "ac": 15, "initiative": 14},
+            {"name": "Fighter", "type": "character", "hp": 30, "max_hp": 40, "ac": 18, "initiative": 10,
+             "saves": {"dexterity": 2}},
+            {"name": "Wizard", "type": "character", "hp": 12, "max_hp": 20, "ac": 12, "initiative": 8},
+        ]
+
+    def _roller(self, results):
+        """Return a dice roller that yields fixed results in order"""
+        rolls = iter(results)
+        return lambda expression: next(rolls)
+
+    def test_attack_hit_applies_damage(self):
+        """An attack that meets AC applies the rolled damage"""
+        spec = {"action": "Scimitar", "targets": ["Fighter"],
+                "attacks": [{"attack_bonus": 4, "damage": "1d6+2"}]}
+        result = self.resolver._apply_structured_resolution(spec, self.combatants, 0, self._roller([14, 5]))
+
+        self.assertEqual(result["updates"], [{"name": "Fighter", "hp": 25}])
+        self.assertEqual(len(result["dice"]), 2)
+
+    def test_attack_miss_applies_nothing(self):
+        """An attack below AC does not roll damage"""
+        spec = {"action": "Scimitar", "targets": ["Fighter"],
+                "attacks": [{"attack_bonus": 4, "damage": "1d6+2"}]}
+        result = self.resolver._apply_structured_resolution(spec, self.combatants, 0, self._roller([10]))
+
+        self.assertEqual(result["updates"], [])
+        self.assertEqual(len(result["dice"]), 1)
+
+    def test_natural_twenty_doubles_damage_dice(self):
+        """A natural 20 hits regardless of AC and doubles the damage dice"""
+        rolled = []
+        def roller(expression):
+            rolled.append(expression)
+            return 20 if expression == "1d20" else 9
+        spec = {"action": "Scimitar", "targets": ["Fighter"],
+                "attacks": [{"attack_bonus": -5, "damage": "1d6+2"}]}
+        result = self.resolver._apply_structured_resolution(spec, self.combatants, 0, roller)
+
+        self.assertIn("2d6+2", rolled)
+        self.assertEqual(result["updates"], [{"name": "Fighter", "hp": 21}])
+
+    def test_save_for_half_damage(self):
+        """Targets that succeed on a save take half damage"""
+        spec = {"action": "Fire Breath", "targets": ["Fighter", "Wizard"],
+                "save": {"ability": "dex", "dc": 12, "damage": "4d6", "half_on_save": True}}
+        # damage 10, Fighter rolls 11 (+2 = 13, saves), Wizard rolls 5 (fails)
+        result = self.resolver._apply_structured_resolution(spec, self.combatants, 0, self._roller([10, 11, 5]))
+
+        self.assertIn({"name": "Fighter", "hp": 25}, result["updates"])
+        self.assertIn({"name": "Wizard", "hp": 2}, result["updates"])
+
+    def test_healing_is_capped_at_max_hp(self):
+        """Healing never raises HP above max HP"""
+        spec = {"action": "Cure Wounds", "targets": ["Fighter"], "healing": "1d8+3"}
+        result = self.resolver._apply_structured_resolution(spec, self.combatants, 2, self._roller([11]))
+
+        self.assertEqual(result["updates"], [{"name": "Fighter", "hp": 40}])
+
+    def test_combined_turn_uses_single_llm_call(self):
+        """Combined mode resolves a turn with exactly one completion request"""
+        self.mock_llm_service.generate_completion.return_value = (
+            '```json\n{"action": "Scimitar", "targets": ["Fighter"], '
+            '"attacks": [{"attack_bonus": 4, "damage": "1d6+2"}]}\n```'
+        )
+        result = self.resolver._process_turn(self.combatants, 0, 1, self._roller([18, 4]))
+
+        self.assertEqual(self.mock_llm_service.generate_completion.call_count, 1)
+        self.assertEqual(result["updates"], [{"name": "Fighter", "hp": 26}])
+
+if __name__ == "__main__":
+    unittest.main()
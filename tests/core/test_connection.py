@@ -0,0 +1,125 @@
+"""
+Unit tests for the per-thread SQLite connection manager.
+"""
+
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from PySide6.QtCore import QRunnable, QThreadPool
+from app.data.connection import ConnectionManager
+
+class _Worker(QRunnable):
+    """Thread pool task that queries before and after a signal"""
+
+    def __init__(self, connections):
+        super().__init__()
+        self.connections = connections
+        self.opened, self.resume = threading.Event(), threading.Event()
+        self.results = []
+
+    def run(self):
+        try:
+            self.results.append(self.connections.get().execute("SELECT COUNT(*) FROM notes").fetchone()[0])
+            self.opened.set()
+            self.resume.wait(5)
+            self.results.append(self.connections.get().execute("SELECT COUNT(*) FROM notes").fetchone()[0])
+        except sqlite3.Error as e:
+            self.results.append(e)
+        finally:
+            self.opened.set()
+
+class TestConnectionManager(unittest.TestCase):
+    """Test cases for ConnectionManager"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.connections = ConnectionManager(Path(self.tmp_dir) / "test.db", timeout=2)
+        with self.connections.transaction() as connection:
+            connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, title TEXT)")
+
+    def tearDown(self):
+        self.connections.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def in_thread(self, function):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(function()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def count(self):
+        return self.connections.get().execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def test_connections_are_configured_per_thread(self):
+        connection = self.connections.get()
+        self.assertIs(self.connections.get(), connection)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(connection.execute("PRAGMA synchronous").fetchone()[0], 1)
+        self.assertIsNot(self.in_thread(self.connections.get), connection)
+
+    def test_reads_are_not_blocked_by_a_writer(self):
+        """The UI thread can read while a worker holds a write transaction open"""
+        writing, done = threading.Event(), threading.Event()
+
+        def write():
+            with self.connections.transaction() as connection:
+                connection.execute("INSERT INTO notes (title) VALUES ('Goblin ambush')")
+                writing.set()
+                done.wait(5)
+
+        worker = threading.Thread(target=write)
+        worker.start()
+        writing.wait(5)
+        self.assertEqual(self.count(), 0)
+        done.set()
+        worker.join()
+        self.assertEqual(self.count(), 1)
+
+    def test_transaction_defers_commits(self):
+        with self.connections.transaction() as connection:
+            connection.execute("INSERT INTO notes (title) VALUES ('One')")
+            self.connections.commit()
+            self.assertEqual(self.in_thread(self.count), 0)
+        self.assertEqual(self.in_thread(self.count), 1)
+
+        with self.assertRaises(ValueError):
+            with self.connections.transaction() as connection:
+                connection.execute("INSERT INTO notes (title) VALUES ('Two')")
+                with self.connections.transaction():
+                    connection.execute("INSERT INTO notes (title) VALUES ('Three')")
+                raise ValueError
+        self.assertEqual(self.count(), 1)
+        self.assertFalse(self.connections.in_transaction())
+
+    def test_qt_worker_keeps_its_connection(self):
+        """Threads started by Qt are not in threading.enumerate() but keep their connection"""
+        pool = QThreadPool()
+        worker = _Worker(self.connections)
+        worker.setAutoDelete(False)
+        pool.start(worker)
+        worker.opened.wait(5)
+        self.in_thread(self.connections.get)
+        worker.resume.set()
+        pool.waitForDone()
+        self.assertEqual(worker.results, [0, 0])
+
+    def test_finished_thread_connection_is_closed(self):
+        worker_connection = self.in_thread(self.connections.get)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            worker_connection.execute("SELECT 1")
+        self.assertEqual(list(self.connections._connections.values()), [self.connections.get()])
+
+    def test_close_closes_every_thread(self):
+        worker_connection = self.in_thread(self.connections.get)
+        self.connections.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            worker_connection.execute("SELECT 1")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            self.connections.get()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Unit tests for decision prefetching during turn-by-turn combat resolution.
+"""
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+from PySide6.QtCore import QThreadPool
+from app.core.decision_prefetch import DecisionPrefetcher
+from app.core.combat_resolver import CombatResolver
+
+class FakeLLMService:
+    """Minimal LLM service that records requests and answers from a pool thread"""
+
+    def __init__(self, reply='{"action": "Scimitar", "target": "Fighter"}'):
+        self.thread_pool = QThreadPool()
+        self.reply = reply
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def generate_completion(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000,
+                            use_cache=True, content_type=None):
+        with self._lock:
+            self.calls.append(messages[-1]["content"])
+        return self.reply
+
+    def get_available_models(self):
+        return [{"id": "test-model", "name": "Test"}]
+
+class TestDecisionPrefetcher(unittest.TestCase):
+    """Test cases for the DecisionPrefetcher class"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.service = FakeLLMService()
+        self.prefetcher = DecisionPrefetcher(self.service, max_pending=2)
+        self.goblin = {"name": "Goblin", "instance_id": "g1", "hp": 7, "status": ""}
+        self.request = {"model": "test-model", "messages": [{"role": "user", "content": "goblin"}]}
+
+    def test_prefetched_reply_is_used_once(self):
+        """A valid prefetched reply is returned and then removed"""
+        self.assertTrue(self.prefetcher.submit(self.goblin, self.request))
+        self.assertEqual(self.prefetcher.take(self.goblin, timeout=5), self.service.reply)
+        self.assertIsNone(self.prefetcher.take(self.goblin, timeout=5))
+        self.assertEqual(self.prefetcher.stats["used"], 1)
+
+    def test_changed_combatant_invalidates_reply(self):
+        """Damage taken after the request makes the prefetched reply stale"""
+        self.prefetcher.submit(self.goblin, self.request)
+        self.goblin["hp"] = 3
+        self.assertIsNone(self.prefetcher.take(self.goblin, timeout=5))
+        self.assertEqual(self.prefetcher.stats["invalidated"], 1)
+
+    def test_resubmit_replaces_only_stale_request(self):
+        """Submitting again keeps a fresh request and replaces a stale one"""
+        self.assertTrue(self.prefetcher.submit(self.goblin, self.request))
+        self.assertFalse(self.prefetcher.submit(self.goblin, self.request))
+        self.goblin["conditions"] = {"POISONED": {}}
+        self.assertTrue(self.prefetcher.submit(self.goblin, self.request))
+        self.assertEqual(self.prefetcher.pending_count(), 1)
+
+    def test_max_pending_is_respected(self):
+        """No more than max_pending requests are held at once"""
+        for i in range(3):
+            self.prefetcher.submit({"name": f"Goblin {i}", "hp": 7}, self.request)
+        self.assertEqual(self.prefetcher.pending_count(), 2)
+
+class TestResolverPrefetch(unittest.TestCase):
+    """Test cases for prefetch scheduling in CombatResolver"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.service = FakeLLMService()
+        self.resolver = CombatResolver(self.service)
+        self.resolver._decision_prefetcher = DecisionPrefetcher(self.service)
+        self.combatants = [
+            {"name": "Fighter", "type": "character", "hp": 30, "max_hp": 40, "ac": 18, "initiative": 15},
+            {"name": "Goblin", "type": "monster", "hp": 7, "max_hp": 7, "ac": 15, "initiative": 12},
+            {"name": "Dragon", "type": "monster", "hp": 100, "max_hp": 100, "ac": 18, "initiative": 10,
+             "recharge_abilities": {"Fire Breath": {"available": False, "recharge_text": "Recharge 5-6"}}},
+        ]
+
+    def test_prefetch_skips_combatants_awaiting_recharge(self):
+        """Only combatants whose prompt cannot change at turn start are prefetched"""
+        self.resolver._prefetch_upcoming_decisions(self.combatants, [1, 2], 1)
+        self.assertTrue(self.resolver._decision_prefetcher.is_pending(self.combatants[1]))
+        self.assertFalse(self.resolver._decision_prefetcher.is_pending(self.combatants[2]))
+
+    def test_prefetched_prompt_is_for_upcoming_combatant(self):
+        """The prefetched prompt describes the upcoming combatant, not the active one"""
+        self.resolver._prefetch_upcoming_decisions(self.combatants, [1], 1)
+        self.resolver._decision_prefetcher.take(self.combatants[1], timeout=5)
+        self.assertIn("You are playing as: Goblin", self.service.calls[0])
+
+    def test_reply_targeting_downed_combatant_is_discarded(self):
+        """A prefetched decision aimed at a combatant who has since dropped is re-requested"""
+        self.resolver._prefetch_upcoming_decisions(self.combatants, [1], 1)
+        self.combatants[0]["hp"] = 0
+        self.assertIsNone(self.resolver._take_prefetched_decision(self.combatants[1], self.combatants))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for the shared dice engine.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+from app.core import dice
+from app.core.dice import compile_expression, roll, make_dice_roller, DiceError
+
+class TestDiceParsing(unittest.TestCase):
+    """Test cases for compiling dice expressions"""
+
+    def test_expressions_are_cached(self):
+        """The same expression compiles to the same object"""
+        self.assertIs(compile_expression("2d6+3"), compile_expression("2d6+3"))
+
+    def test_modifiers(self):
+        """Keep, drop, advantage, reroll and explode modifiers are recognised"""
+        self.assertEqual(compile_expression("4d6kh3").terms[0].keep, ("h", 3))
+        self.assertEqual(compile_expression("4d6dl1").terms[0].keep, ("h", 3))
+        self.assertEqual(compile_expression("d20adv").notation(), "2d20kh1")
+        self.assertEqual(compile_expression("d20dis").notation(), "2d20kl1")
+        self.assertEqual(compile_expression("2d6ro<3").terms[0].reroll, ("<", 3))
+        self.assertTrue(compile_expression("2d6ro<3").terms[0].reroll_once)
+        self.assertEqual(compile_expression("3d6!").terms[0].explode, 6)
+        self.assertEqual(compile_expression("3d6!>4").terms[0].explode, 5)
+        self.assertEqual(compile_expression("D% - 2").notation(), "1d100-2")
+
+    def test_invalid_expressions(self):
+        """Invalid expressions raise DiceError, which is a ValueError"""
+        for expression in ["", "abc", "2d", "2d6+", "1d6r<7", "d1!", "101d6", "1d1001"]:
+            with self.assertRaises(ValueError, msg=expression):
+                compile_expression(expression)
+
+    def test_exact_averages(self):
+        """Averages are exact, including keep-highest and rerolls"""
+        self.assertAlmostEqual(compile_expression("2d6+3").average, 10.0)
+        self.assertAlmostEqual(compile_expression("d20adv").average, 13.825)
+        self.assertAlmostEqual(compile_expression("4d6kh3").average, 12.2446, places=4)
+        self.assertAlmostEqual(compile_expression("2d6r1").average, 8.0)
+        self.assertAlmostEqual(compile_expression("1d6!").average, 4.2)
+        self.assertAlmostEqual(compile_expression("2d6+3").dice_average, 7.0)
+
+    def test_doubled_dice_for_criticals(self):
+        """Critical hits double the dice but not the modifier"""
+        self.assertEqual(compile_expression("1d8+2d6+4").doubled_dice().notation(), "2d8+4d6+4")
+
+class TestDiceRolling(unittest.TestCase):
+    """Test cases for rolling"""
+
+    def test_seeded_rolls_are_reproducible(self):
+        """The same generator state gives the same rolls"""
+        first = [roll("3d6!+1", rng=random.Random(4)) for _ in range(3)]
+        second = [roll("3d6!+1", rng=random.Random(4)) for _ in range(3)]
+        self.assertEqual(first, second)
+
+    def test_rolls_stay_in_range(self):
+        """Single rolls respect the minimum and maximum"""
+        rng = random.Random(1)
+        for expression in ["2d6+3", "4d6kh3", "2d6r1", "d20dis-1"]:
+            compiled = compile_expression(expression)
+            for _ in range(500):
+                self.assertTrue(compiled.minimum <= compiled.roll(rng) <= compiled.maximum, expression)
+
+    def test_detailed_roll_marks_dropped_dice(self):
+        """Dropped dice are shown in parentheses and the total uses the kept dice"""
+        total, details = compile_expression("4d6kh3+2").roll_detailed(random.Random(3))
+        self.assertTrue(details.startswith("4d6kh3["))
+        self.assertEqual(details.count("("), 1)
+        kept = [int(face.strip("!")) for face in details[7:details.index("]")].split(", ") if "(" not in face]
+        self.assertEqual(total, sum(kept) + 2)
+
+    def test_bulk_rolls(self):
+        """roll(expression, n) returns n totals whose mean matches the average"""
+        results = roll("4d6kh3", 20000, random.Random(9))
+        self.assertEqual(len(results), 20000)
+        self.assertAlmostEqual(sum(int(r) for r in results) / 20000, 12.2446, delta=0.1)
+
+    def test_bulk_rolls_without_numpy(self):
+        """The pure Python fallback returns a list"""
+        with patch.object(dice, "np", None):
+            results = roll("d20adv", 100, random.Random(2))
+        self.assertIsInstance(results, list)
+        self.assertTrue(all(1 <= r <= 20 for r in results))
+
+    def test_dice_roller_callback_and_default(self):
+        """Resolver dice rollers report every roll and return the default for bad input"""
+        rolled = []
+        roller = make_dice_roller(random.Random(5), on_roll=lambda expr, total: rolled.append(expr), default=0)
+        self.assertTrue(2 <= roller("2d6") <= 12)
+        self.assertEqual(roller("fireball"), 0)
+        self.assertEqual(rolled, ["2d6"])
+
+    def test_dice_roller_ignores_trailing_text(self):
+        """Expressions from the LLM often carry a damage type or 'to hit' after the dice"""
+        roller = make_dice_roller(random.Random(5), default=0)
+        for _ in range(20):
+            self.assertTrue(4 <= roller("1d8+3 slashing") <= 11)
+            self.assertTrue(6 <= roller("1d20+5 to hit") <= 25)
+            self.assertTrue(3 <= roller("2d6 + 1, fire") <= 13)
+        with patch.object(dice, "logger") as logger:
+            self.assertEqual(roller("slashing 1d8"), 0)
+        logger.warning.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Unit tests for exact dice probability distributions.
+"""
+
+import time
+import unittest
+from app.core.dice import compile_expression, DiceError
+from app.core.dice_probability import (
+    distribution, probability_at_least, hit_probability, attack_probabilities,
+    expected_attack_damage, save_success_probability, expected_save_damage
+)
+
+class TestDistribution(unittest.TestCase):
+    """Test cases for expression distributions"""
+
+    def test_two_dice_pmf(self):
+        """2d6 has the familiar triangular distribution"""
+        dist = distribution("2d6")
+        for total in range(2, 13):
+            self.assertAlmostEqual(dist.probability(total), (6 - abs(total - 7)) / 36)
+        self.assertAlmostEqual(sum(p for _, p in dist.items()), 1.0)
+        self.assertAlmostEqual(probability_at_least("2d6+3", 10), 21 / 36)
+
+    def test_matches_dice_engine_averages(self):
+        """Means agree with the dice engine's exact averages"""
+        for expression in ["4d6kh3", "4d6kl3", "d20adv", "d20dis", "2d6r1", "1d6!", "3d8-1d4+2"]:
+            self.assertAlmostEqual(distribution(expression).mean, compile_expression(expression).average, msg=expression)
+        self.assertAlmostEqual(distribution("4d6kh3").mean, 12.2446, places=4)
+        self.assertAlmostEqual(distribution("d20adv").mean, 13.825)
+        self.assertAlmostEqual(distribution("2d6r1").mean, 8.0)
+
+    def test_keep_highest_extremes(self):
+        """Keeping the highest of 4d6 can only roll 3 in one way"""
+        dist = distribution("4d6kh3")
+        self.assertEqual((dist.minimum, dist.maximum), (3, 18))
+        self.assertAlmostEqual(dist.probability(3), 1 / 6 ** 4)
+        self.assertAlmostEqual(dist.probability(18), 21 / 6 ** 4)
+
+    def test_subtraction_and_clamping(self):
+        """Negative terms and minimum damage are handled"""
+        dist = distribution("1d4-3")
+        self.assertEqual(dist.minimum, -2)
+        self.assertAlmostEqual(dist.clamp_min(0).mean, 0.25)
+        self.assertEqual(distribution("1d6-1d6").minimum, -5)
+
+    def test_too_many_outcomes(self):
+        """Huge expressions raise DiceError instead of hanging"""
+        with self.assertRaises(DiceError):
+            distribution("1d1000!")
+
+    def test_expensive_keep_is_rejected(self):
+        """Keep terms with few totals but a huge state space are refused quickly"""
+        start = time.perf_counter()
+        for expression in ("60d20kh30", "100d20kh50"):
+            with self.assertRaises(DiceError):
+                distribution(expression)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(distribution("60d20kh1").maximum, 20)
+
+class TestCombatQueries(unittest.TestCase):
+    """Test cases for attack and save probabilities"""
+
+    def test_hit_probability(self):
+        """Natural 1 misses, natural 20 hits, advantage squares the miss chance"""
+        self.assertAlmostEqual(hit_probability(5, 15), 0.55)
+        self.assertAlmostEqual(hit_probability(5, 15, advantage=True), 1 - 0.45 ** 2)
+        self.assertAlmostEqual(hit_probability(5, 15, disadvantage=True), 0.55 ** 2)
+        self.assertAlmostEqual(hit_probability(5, 15, advantage=True, disadvantage=True), 0.55)
+        self.assertAlmostEqual(hit_probability(0, 30), 0.05)
+        self.assertAlmostEqual(hit_probability(20, 5), 0.95)
+        self.assertAlmostEqual(attack_probabilities(5, 15, advantage=True)[1], 0.0975)
+
+    def test_expected_attack_damage(self):
+        """Critical hits double the damage dice but not the modifier"""
+        self.assertAlmostEqual(expected_attack_damage(5, 15, "1d8+3"), 0.5 * 7.5 + 0.05 * 12)
+
+    def test_saves(self):
+        """Save chances ignore natural rolls; half damage rounds down"""
+        self.assertAlmostEqual(save_success_probability(2, 15), 0.4)
+        self.assertAlmostEqual(save_success_probability(0, 25), 0.0)
+        self.assertAlmostEqual(expected_save_damage(2, 15, "8d6", half_on_save=False), 0.6 * 28)
+        self.assertAlmostEqual(expected_save_damage(0, 11, "1d2"), 0.5 * 1.5 + 0.5 * 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Unit tests for the Monte Carlo encounter simulator.
+"""
+
+import unittest
+from app.combat.encounter_simulator import (
+    simulate, build_party, build_encounter_state, combatant_from_monster
+)
+
+GOBLIN = {
+    "name": "Goblin", "ac": "15 (leather armor, shield)", "hp": "7 (2d6)", "dex": 14, "wis": 8,
+    "actions": [{"name": "Scimitar", "description": "Melee Weapon Attack: +4 to hit, reach 5 ft., one target. Hit: 5 (1d6 + 2) slashing damage."}],
+}
+
+class TestEncounterSimulator(unittest.TestCase):
+    """Test cases for the encounter simulator"""
+
+    def test_combatant_from_monster(self):
+        """Monster dictionaries become monster combatants"""
+        combatant = combatant_from_monster(GOBLIN)
+        self.assertEqual((combatant["type"], combatant["hp"], combatant["ac"]), ("monster", 7, 15))
+        self.assertEqual(combatant["saves"]["dexterity"], 2)
+        self.assertEqual(combatant["saves"]["wisdom"], -1)
+
+    def test_duplicate_monsters_are_numbered(self):
+        """Several monsters of one kind get unique names"""
+        state = build_encounter_state(build_party(1, 2), [GOBLIN, GOBLIN])
+        self.assertEqual([c["name"] for c in state["combatants"]],
+                         ["Character 1", "Character 2", "Goblin 1", "Goblin 2"])
+
+    def test_seeded_simulation_is_reproducible(self):
+        """The same seed gives the same counts"""
+        state = build_encounter_state(build_party(3, 4), [GOBLIN] * 4)
+        first = simulate(state, fights=200, processes=1, seed=5)
+        second = simulate(state, fights=200, processes=1, seed=5)
+        self.assertEqual((first.party_wins, first.total_rounds, first.deaths),
+                         (second.party_wins, second.total_rounds, second.deaths))
+
+    def test_statistics(self):
+        """An easy fight is usually won and every goblin usually dies"""
+        state = build_encounter_state(build_party(5, 4), [GOBLIN] * 3)
+        result = simulate(state, fights=300, processes=1, seed=1)
+        self.assertEqual(result.fights, 300)
+        self.assertGreater(result.win_probability, 0.9)
+        self.assertGreater(result.expected_rounds, 0)
+        self.assertGreater(result.death_probability["Goblin 1"], 0.9)
+        self.assertEqual(result.party, ["Character 1", "Character 2", "Character 3", "Character 4"])
+        self.assertIn("Party wins", result.summary())
+
+    def test_process_pool_merges_chunks(self):
+        """Fights split across processes are all counted"""
+        state = build_encounter_state(build_party(2, 2), [GOBLIN] * 2)
+        result = simulate(state, fights=1001, processes=2, seed=3)
+        self.assertEqual(result.fights, 1001)
+        self.assertEqual(result.party_wins + result.monster_wins + result.draws, 1001)
+
+if __name__ == "__main__":
+    unittest.main()
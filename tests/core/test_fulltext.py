@@ -0,0 +1,123 @@
+"""
+Unit tests for the SQLite full-text search indexes.
+"""
+
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+from app.data import fulltext, llm_data_manager
+from app.data.llm_data_manager import LLMDataManager
+
+class TestFullTextSearch(unittest.TestCase):
+    """Test cases for the session notes full-text index"""
+
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute('''
+        CREATE TABLE session_notes (
+            id INTEGER PRIMARY KEY, title TEXT NOT NULL, content TEXT NOT NULL,
+            tags TEXT, created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+        )
+        ''')
+        self.add_note("Session 1: Campaign Start", "The party met Lord Markelhay in Fallcrest.", "session")
+        if not fulltext.ensure_fts_index(self.connection, "session_notes"):
+            self.skipTest("SQLite was built without FTS5")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def add_note(self, title, content, tags=""):
+        cursor = self.connection.execute(
+            "INSERT INTO session_notes (title, content, tags, created_at, updated_at) VALUES (?, ?, ?, '', '')",
+            (title, content, tags))
+        self.connection.commit()
+        return cursor.lastrowid
+
+    def titles(self, text):
+        return [row["title"] for row in fulltext.search(self.connection, "session_notes", text)]
+
+    def test_existing_rows_are_indexed(self):
+        self.assertEqual(self.titles("markelhay"), ["Session 1: Campaign Start"])
+
+    def test_triggers_keep_index_current(self):
+        note_id = self.add_note("Dragon lair", "A red dragon sleeps on its hoard.")
+        self.assertEqual(self.titles("dragon"), ["Dragon lair"])
+
+        self.connection.execute("UPDATE session_notes SET content = 'Only kobolds remain.' WHERE id = ?", (note_id,))
+        self.assertEqual(self.titles("hoard"), [])
+        self.assertEqual(self.titles("kobolds"), ["Dragon lair"])
+
+        self.connection.execute("DELETE FROM session_notes WHERE id = ?", (note_id,))
+        self.assertEqual(self.titles("kobolds"), [])
+
+    def test_ranking_prefix_and_snippet(self):
+        """Title matches rank first, the last word matches as a prefix"""
+        self.add_note("Goblin ambush", "Goblins attacked on the road.")
+        self.add_note("Market day", "A goblin was seen near the stalls.")
+        results = fulltext.search(self.connection, "session_notes", "gob")
+        self.assertEqual([row["title"] for row in results][0], "Goblin ambush")
+        self.assertEqual(len(results), 2)
+        self.assertIn("<b>", results[1]["snippet"])
+        self.assertEqual(self.titles("the par"), ["Session 1: Campaign Start"])
+
+    def test_user_input_is_not_parsed_as_query_syntax(self):
+        self.assertEqual(self.titles('"Lord" AND (NEAR'), [])
+        self.assertEqual(self.titles("Fallcrest."), ["Session 1: Campaign Start"])
+        self.assertEqual(self.titles("  ,; "), [])
+
+    def test_search_is_fast_on_large_campaigns(self):
+        rows = [(f"Session {i}", f"Notes for session {i} about the town of Town{i} and its people.", "session")
+                for i in range(20000)]
+        self.connection.executemany(
+            "INSERT INTO session_notes (title, content, tags, created_at, updated_at) VALUES (?, ?, ?, '', '')", rows)
+        self.connection.commit()
+        start = time.perf_counter()
+        results = fulltext.search(self.connection, "session_notes", "town12345", limit=50)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(results), 1)
+        self.assertLess(elapsed, 0.05)
+
+class TestGeneratedContentSearch(unittest.TestCase):
+    """Test cases for LLMDataManager.search_generated_content with and without FTS5"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        with mock.patch.object(llm_data_manager, "get_database_path", return_value=Path(self.tmp_dir) / "test.db"), \
+                mock.patch.object(llm_data_manager, "get_app_dir", return_value=Path(self.tmp_dir)):
+            self.manager = LLMDataManager(SimpleNamespace())
+        for title, content_type in (("Goblin boss", "npc"), ("Goblin cave", "location"), ("Old tavern", "location")):
+            self.manager.add_generated_content(title, content_type, f"{title} notes.", "model", "prompt", tags=["test"])
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def titles(self, query, content_type=None):
+        return sorted(row["title"] for row in self.manager.search_generated_content(query, content_type))
+
+    def check_search(self):
+        self.assertEqual(self.titles("goblin"), ["Goblin boss", "Goblin cave"])
+        self.assertEqual(self.titles("goblin ca"), ["Goblin cave"])
+        self.assertEqual(self.titles("goblin", "location"), ["Goblin cave"])
+        self.assertEqual(self.titles(""), ["Goblin boss", "Goblin cave", "Old tavern"])
+        self.assertEqual(self.titles(" !? "), ["Goblin boss", "Goblin cave", "Old tavern"])
+        self.assertEqual(self.titles(None, "location"), ["Goblin cave", "Old tavern"])
+
+    def test_full_text_search(self):
+        if not self.manager.fts_enabled:
+            self.skipTest("SQLite was built without FTS5")
+        self.check_search()
+
+    def test_substring_fallback(self):
+        """Without FTS5 the same queries find the same rows"""
+        self.manager.fts_enabled = False
+        self.check_search()
+        self.assertEqual(self.titles("obli"), ["Goblin boss", "Goblin cave"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for the persistent LLM response cache.
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from app.core.llm_cache import LLMResponseCache, cache_key
+from app.core.llm_service import LLMService, ModelInfo
+
+MODEL = ModelInfo.OPENAI_GPT4O_MINI
+MESSAGES = [{"role": "user", "content": "Can a prone creature take opportunity attacks?"}]
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test cases for LLMResponseCache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "cache.db"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_covers_every_request_field(self):
+        """Changing any part of the request changes the key"""
+        base = cache_key(MODEL, None, MESSAGES, 0, 500)
+        self.assertEqual(base, cache_key(MODEL, "", list(MESSAGES), 0.0, 500))
+        variants = [
+            cache_key(ModelInfo.OPENAI_GPT4O, None, MESSAGES, 0, 500),
+            cache_key(MODEL, "You are a rules expert", MESSAGES, 0, 500),
+            cache_key(MODEL, None, [{"role": "user", "content": "Other question"}], 0, 500),
+            cache_key(MODEL, None, MESSAGES, 0.7, 500),
+            cache_key(MODEL, None, MESSAGES, 0, 800),
+        ]
+        self.assertNotIn(base, variants)
+
+    def test_persists_across_instances(self):
+        """Responses survive a restart and count as hits"""
+        stats = []
+        cache = LLMResponseCache(self.path, on_stats=lambda hits, misses: stats.append((hits, misses)))
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", "Yes.", MODEL, "rules")
+        cache.close()
+
+        reopened = LLMResponseCache(self.path)
+        self.assertEqual(reopened.get("k"), "Yes.")
+        self.assertEqual((reopened.hits, reopened.misses), (1, 0))
+        self.assertEqual(stats, [(0, 1)])
+
+    def test_ttl_per_content_type(self):
+        """Combat is never stored and expired entries are misses"""
+        cache = LLMResponseCache(self.path, ttls={"rules": 0.05})
+        cache.put("combat", "Goblin attacks", MODEL, "combat")
+        cache.put("rules", "Yes.", MODEL, "rules")
+        self.assertIsNone(cache.get("combat"))
+        self.assertEqual(cache.get("rules"), "Yes.")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("rules"))
+
+    def test_lru_eviction(self):
+        """The least recently used entries go first once a limit is exceeded"""
+        cache = LLMResponseCache(self.path, max_entries=2, memory_entries=0)
+        cache.put("a", "A", MODEL)
+        time.sleep(0.01)
+        cache.put("b", "B", MODEL)
+        time.sleep(0.01)
+        cache.get("a")
+        cache.put("c", "C", MODEL)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), ("A", "C"))
+
+        sized = LLMResponseCache(Path(self.tmp.name) / "sized.db", max_bytes=10)
+        sized.put("x", "12345678", MODEL)
+        sized.put("y", "12345678", MODEL)
+        self.assertEqual(sized.stats()["entries"], 1)
+
+class TestLLMServiceCaching(unittest.TestCase):
+    """generate_completion consults the cache only when it should"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.service = LLMService.__new__(LLMService)
+        self.service.app_state = SimpleNamespace(get_setting=lambda key, default=None: default)
+        self.service.response_cache = LLMResponseCache(Path(self.tmp.name) / "cache.db")
+        self.calls = []
+        self.service._generate_uncached = lambda *args, **kwargs: self.calls.append(args) or f"reply {len(self.calls)}"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_deterministic_requests_are_cached(self):
+        first = self.service.generate_completion(MODEL, MESSAGES, temperature=0)
+        start = time.perf_counter()
+        second = self.service.generate_completion(MODEL, MESSAGES, temperature=0)
+        elapsed = time.perf_counter() - start
+        self.assertEqual((first, second, len(self.calls)), ("reply 1", "reply 1", 1))
+        self.assertLess(elapsed, 0.01)
+
+    def test_bypass_and_uncached_requests(self):
+        """use_cache=False, untyped sampled requests and combat always reach the provider"""
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0, use_cache=False)
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0, use_cache=False)
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0.7)
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0.7)
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0, content_type="combat")
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0, content_type="combat")
+        self.assertEqual(len(self.calls), 6)
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0.7, content_type="rules")
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0.7, content_type="rules")
+        self.assertEqual(len(self.calls), 7)
+
+class TestLazyResponseCache(unittest.TestCase):
+    """The cache database is created by the first cacheable request, not by LLMService()"""
+
+    def test_cache_opens_on_first_cacheable_request(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            app_state = SimpleNamespace(app_dir=Path(tmp), get_setting=lambda key, default=None: default)
+            service = LLMService(app_state)
+            service._generate_uncached = lambda *args, **kwargs: "reply"
+            cache_path = Path(tmp) / "data" / "llm" / "response_cache.db"
+            service.generate_completion(MODEL, MESSAGES, temperature=0.7)
+            self.assertFalse(cache_path.exists())
+            service.generate_completion(MODEL, MESSAGES, temperature=0)
+            self.assertTrue(cache_path.exists())
+            service.close()
+
+if __name__ == "__main__":
+    unittest.main()
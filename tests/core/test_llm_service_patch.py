@@ -0,0 +1,75 @@
+"""
+Unit tests for the LLM service request layer patch.
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from app.core.llm_service import ModelInfo, ModelProvider
+from app.core.llm_service_patch import (
+    ProviderConcurrency, freeze_messages, patch_llm_service, patch_generate_completion
+)
+
+class FakeService:
+    """Records concurrency and the messages each call received"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.received = []
+        self.lock = threading.Lock()
+
+    def generate_completion(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.received.append(messages)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return "ok"
+
+class FakeAppState:
+    def __init__(self, setting):
+        self.setting = setting
+
+    def get_setting(self, key, default=None):
+        return self.setting if key == "llm_max_concurrent_requests" else default
+
+class TestLLMServicePatch(unittest.TestCase):
+    """Test cases for the generate_completion request layer"""
+
+    def _patched(self, limits):
+        service = FakeService()
+        service.request_limiter = ProviderConcurrency(limits)
+        return patch_generate_completion(service)
+
+    def test_concurrency_is_bounded_per_provider(self):
+        """No more than the provider limit run at once, but calls do overlap"""
+        service = self._patched({ModelProvider.OPENAI: 3})
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: service.generate_completion(ModelInfo.OPENAI_GPT4O_MINI, []), range(12)))
+        self.assertEqual(service.peak, 3)
+
+    def test_messages_are_snapshotted(self):
+        """Changes the caller makes after the call starts are not seen"""
+        service = self._patched({})
+        messages = [{"role": "user", "content": "hello"}]
+        service.generate_completion(ModelInfo.OPENAI_GPT4O_MINI, messages, "system")
+        messages[0]["content"] = "changed"
+        self.assertEqual(service.received[0], [{"role": "user", "content": "hello"}])
+        self.assertEqual(freeze_messages(messages), (("user", "changed"),))
+
+    def test_limits_from_settings(self):
+        """An int applies to every provider; a dict sets providers individually"""
+        service = patch_llm_service(FakeService(), FakeAppState(6))
+        self.assertEqual(service.request_limiter.limits[ModelProvider.ANTHROPIC], 6)
+        service = patch_llm_service(FakeService(), FakeAppState({"anthropic": 1}))
+        self.assertEqual(service.request_limiter.limits[ModelProvider.ANTHROPIC], 1)
+        self.assertEqual(service.request_limiter.limits[ModelProvider.OPENAI], 4)
+        service = patch_llm_service(FakeService(), FakeAppState({"bogus": 1}))
+        self.assertEqual(service.request_limiter.limits[ModelProvider.OPENAI], 4)
+
+if __name__ == "__main__":
+    unittest.main()
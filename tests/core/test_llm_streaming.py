@@ -0,0 +1,156 @@
+"""
+Unit tests for streamed and asyncio LLM completions.
+"""
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from PySide6.QtWidgets import QApplication
+from app.core.llm_async import AsyncLLMBackend
+from app.core.llm_service import LLMService, ModelInfo, ModelProvider
+
+MODEL = ModelInfo.OPENAI_GPT4O_MINI
+MESSAGES = [{"role": "user", "content": "Describe a tavern."}]
+
+def _event(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+class FakeCompletions:
+    """Returns a chunk stream when stream=True, otherwise a whole response"""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.streamed = []
+
+    def create(self, model, messages, temperature, max_tokens, stream=False):
+        self.streamed.append(stream)
+        if stream:
+            return iter([_event(piece) for piece in self.pieces] + [SimpleNamespace(choices=[])])
+        message = SimpleNamespace(content="".join(self.pieces))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+class FakeAsyncCompletions:
+    """Async stand-in for chat.completions that records peak concurrency"""
+
+    def __init__(self, pieces, delay=0.0):
+        self.pieces = pieces
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, model, messages, temperature, max_tokens, stream=False):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        if stream:
+            return self._stream()
+        message = SimpleNamespace(content="".join(self.pieces))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def _stream(self):
+        for piece in self.pieces:
+            yield _event(piece)
+
+class TestLLMStreaming(unittest.TestCase):
+    """Test cases for streaming through LLMService and LLMWorker"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        settings = {"openai_api_key": None, "anthropic_api_key": None}
+        app_state = SimpleNamespace(app_dir=Path(self.tmp.name), get_setting=lambda key, default=None: settings.get(key, default))
+        self.service = LLMService(app_state)
+        self.completions = FakeCompletions(["The ", "Prancing ", "Pony"])
+        self.service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunks_are_delivered_in_order(self):
+        chunks = []
+        response = self.service.generate_completion(MODEL, MESSAGES, on_chunk=chunks.append)
+        self.assertEqual(chunks, ["The ", "Prancing ", "Pony"])
+        self.assertEqual(response, "The Prancing Pony")
+        self.assertEqual(self.completions.streamed, [True])
+
+    def test_cached_response_arrives_as_one_chunk(self):
+        self.service.generate_completion(MODEL, MESSAGES, temperature=0)
+        chunks = []
+        response = self.service.generate_completion(MODEL, MESSAGES, temperature=0, on_chunk=chunks.append)
+        self.assertEqual(chunks, [response])
+        self.assertEqual(self.completions.streamed, [False])
+
+    def test_async_request_emits_chunk_signals_with_request_id(self):
+        """Chunks are signalled as they arrive, then the callback gets the full text"""
+        backend = self.service._get_async_backend()
+        backend.submit(asyncio.sleep(0)).result()
+        backend._clients[ModelProvider.OPENAI] = SimpleNamespace(
+            chat=SimpleNamespace(completions=FakeAsyncCompletions(["The ", "Prancing ", "Pony"])))
+        signalled, results, done = [], [], threading.Event()
+        self.service.completion_chunk.connect(lambda chunk, request_id: signalled.append((chunk, request_id)))
+        self.service.generate_completion_async(MODEL, MESSAGES, request_id="req-1", stream=True,
+                                               callback=lambda response, error: (results.append((response, error)), done.set()))
+        self.assertTrue(done.wait(5))
+        # Signals from the backend thread are queued to the service's thread
+        QApplication.processEvents()
+        self.assertEqual(signalled, [("The ", "req-1"), ("Prancing ", "req-1"), ("Pony", "req-1")])
+        self.assertEqual(results, [("The Prancing Pony", None)])
+        self.service.close()
+
+    def test_async_request_uses_the_cache_off_the_loop_thread(self):
+        """The SQLite response cache is not read or written on the backend loop"""
+        backend = self.service._get_async_backend()
+
+        async def _loop_thread():
+            return threading.current_thread()
+
+        loop_thread = backend.submit(_loop_thread()).result()
+        backend._clients[ModelProvider.OPENAI] = SimpleNamespace(
+            chat=SimpleNamespace(completions=FakeAsyncCompletions(["The ", "Prancing ", "Pony"])))
+        cache, threads = self.service.response_cache, []
+        cache_get, cache_put = cache.get, cache.put
+        cache.get = lambda *args: (threads.append(threading.current_thread()), cache_get(*args))[1]
+        cache.put = lambda *args: (threads.append(threading.current_thread()), cache_put(*args))[1]
+        for _ in range(2):
+            self.assertEqual(self.service.submit_completion(MODEL, MESSAGES, temperature=0).result(5), "The Prancing Pony")
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+        self.service.close()
+
+class TestAsyncLLMBackend(unittest.TestCase):
+    """Test cases for the asyncio backend"""
+
+    def setUp(self):
+        self.completions = FakeAsyncCompletions(["ok"], delay=0.05)
+        self.backend = AsyncLLMBackend(lambda provider: "key", {ModelProvider.OPENAI: 5})
+        self.backend.submit(asyncio.sleep(0)).result()
+        self.backend._clients[ModelProvider.OPENAI] = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+
+    def tearDown(self):
+        self.backend._clients.clear()
+        self.backend.shutdown()
+
+    def test_requests_overlap_on_one_loop_up_to_the_limit(self):
+        """20 requests share one thread; at most the provider limit are in flight"""
+        start = time.perf_counter()
+        futures = [self.backend.submit(self.backend.complete(MODEL, MESSAGES)) for _ in range(20)]
+        self.assertEqual([f.result(5) for f in futures], ["ok"] * 20)
+        self.assertEqual(self.completions.peak, 5)
+        self.assertLess(time.perf_counter() - start, 20 * 0.05)
+
+    def test_awaitable_from_another_event_loop(self):
+        """agenerate_completion can be awaited from a caller's own loop"""
+        service = SimpleNamespace(submit_completion=lambda *args: self.backend.submit(self.backend.complete(*args[:5])))
+        result = asyncio.run(LLMService.agenerate_completion(service, MODEL, MESSAGES))
+        self.assertEqual(result, "ok")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Unit tests for lazy monster loading through DatabaseManager.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from app.core.models.monster import Monster
+from app.data import db_manager
+from app.data.db_manager import DatabaseManager
+
+class TestMonsterCache(unittest.TestCase):
+    """Test cases for the monster summaries and the LRU monster cache"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        with mock.patch.object(db_manager, "get_database_path", return_value=Path(self.tmp_dir) / "test.db"):
+            self.db = DatabaseManager(None)
+        self.monsters = [self.db.save_custom_monster(Monster(name=f"Slime {i}", is_custom=True, challenge_rating="1/2"))
+                         for i in range(3)]
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_summaries_come_from_the_index(self):
+        summaries = self.db.get_monster_summaries(cr_max=0.5)
+        self.assertEqual([summary.name for summary in summaries], ["Slime 0", "Slime 1", "Slime 2"])
+        self.assertEqual(summaries[0].key, (self.monsters[0].id, True))
+
+    def test_loaded_monsters_are_cached(self):
+        monster_id = self.monsters[0].id
+        first = self.db.get_monster_by_id(monster_id, is_custom=True)
+        with mock.patch("app.core.models.monster.Monster.from_db_row") as from_db_row:
+            self.assertEqual(self.db.get_monster_by_id(monster_id, is_custom=True), first)
+            from_db_row.assert_not_called()
+
+    def test_changing_a_loaded_monster_does_not_change_the_cache(self):
+        monster_id = self.monsters[0].id
+        monster = self.db.get_monster_by_id(monster_id, is_custom=True)
+        monster.name = "Half-edited"
+        monster.challenge_rating = "5"
+        reloaded = self.db.get_monster_by_id(monster_id, is_custom=True)
+        self.assertIsNot(reloaded, monster)
+        self.assertEqual((reloaded.name, reloaded.challenge_rating), ("Slime 0", "1/2"))
+        reloaded.name = "Edited again"
+        self.assertEqual(self.db.get_monster_by_id(monster_id, is_custom=True).name, "Slime 0")
+
+    def test_save_and_delete_invalidate_the_cache(self):
+        monster = self.db.get_monster_by_id(self.monsters[1].id, is_custom=True)
+        edited = Monster(id=monster.id, name="Grey Slime", is_custom=True, challenge_rating="2")
+        self.db.save_custom_monster(edited)
+        reloaded = self.db.get_monster_by_id(monster.id, is_custom=True)
+        self.assertEqual((reloaded.name, reloaded.challenge_rating), ("Grey Slime", "2"))
+        self.assertEqual(self.db.get_monster_summaries(search="grey")[0].cr, 2.0)
+
+        self.db.delete_custom_monster(monster.id)
+        self.assertIsNone(self.db.get_monster_by_id(monster.id, is_custom=True))
+        self.assertEqual(self.db.get_monster_summaries(search="grey"), [])
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(db_manager, "MONSTER_CACHE_SIZE", 2):
+            for monster in self.monsters:
+                self.db.get_monster_by_id(monster.id, is_custom=True)
+        self.assertEqual(list(self.db._monster_cache), [(self.monsters[1].id, True), (self.monsters[2].id, True)])
+
+if __name__ == "__main__":
+    unittest.main()
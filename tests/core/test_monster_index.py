@@ -0,0 +1,93 @@
+"""
+Unit tests for the monster compendium index.
+"""
+
+import json
+import sqlite3
+import unittest
+from app.data import monster_index
+from app.data.monster_index import normalize_type, parse_cr, xp_for_cr
+
+class TestMonsterIndex(unittest.TestCase):
+    """Test cases for the monster compendium index"""
+
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute('''
+        CREATE TABLE monsters (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, type TEXT NOT NULL, cr TEXT NOT NULL,
+            size TEXT NOT NULL, alignment TEXT NOT NULL, source TEXT NOT NULL
+        )
+        ''')
+        self.connection.execute('''
+        CREATE TABLE custom_monsters (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, data TEXT NOT NULL,
+            created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+        )
+        ''')
+        self.connection.executemany(
+            "INSERT INTO monsters (name, type, cr, size, alignment, source) VALUES (?, ?, ?, ?, ?, 'MM')", [
+                ("Goblin", "humanoid (goblinoid)", "1/4", "Small", "neutral evil"),
+                ("Orc", "Humanoid (orc)", "0.5", "medium", "chaotic evil"),
+                ("Young Red Dragon", "dragon", "10", "Large", "chaotic evil"),
+                ("Swarm of Rats", "swarm of Tiny beasts", "1/4", "Medium", "unaligned"),
+            ])
+        self.add_custom(1, "Bog Ooze", {"type": "ooze", "cr": "2", "size": "Large"}, "2024-01-01")
+        self.connection.commit()
+        monster_index.sync_monster_index(self.connection)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def add_custom(self, monster_id, name, data, updated_at):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO custom_monsters (id, name, data, created_at, updated_at) VALUES (?, ?, ?, '', ?)",
+            (monster_id, name, json.dumps(data), updated_at))
+        self.connection.commit()
+
+    def names(self, **facets):
+        return [summary.name for summary in monster_index.query_summaries(self.connection, **facets)]
+
+    def test_normalization(self):
+        self.assertEqual([parse_cr(cr) for cr in ["1/2", "0.5", "5", "5 (1,800 XP)", 3, "?"]],
+                         [0.5, 0.5, 5.0, 5.0, 3.0, None])
+        self.assertEqual((xp_for_cr(0.25), xp_for_cr(10.0), xp_for_cr(None)), (50, 5900, 0))
+        self.assertEqual(normalize_type("Humanoid (elf)"), ("humanoid", "elf"))
+        self.assertEqual(normalize_type("swarm of Tiny beasts"), ("beast", "swarm"))
+
+    def test_faceted_queries(self):
+        """CR ranges are numeric; types and sizes match the normalized values"""
+        self.assertEqual(self.names(cr_min=0.25, cr_max=0.5), ["Goblin", "Orc", "Swarm of Rats"])
+        self.assertEqual(self.names(types=["Humanoid"]), ["Goblin", "Orc"])
+        self.assertEqual(self.names(sizes=["large"], include_standard=False), ["Bog Ooze"])
+        self.assertEqual(self.names(search="o", cr_min=1), ["Bog Ooze", "Young Red Dragon"])
+        self.assertEqual(self.names(search="%"), [])
+        orc = monster_index.query_summaries(self.connection, search="orc")[0]
+        self.assertEqual((orc.cr, orc.xp, orc.size, orc.subtype, orc.key),
+                         (0.5, 100, "Medium", "orc", (2, False)))
+        self.assertFalse(hasattr(orc, "__dict__"))
+
+    def test_facet_counts(self):
+        counts = monster_index.facet_counts(self.connection)
+        self.assertEqual(counts["cr"], [(0.25, 2), (0.5, 1), (2.0, 1), (10.0, 1)])
+        self.assertEqual(counts["type"], [("beast", 1), ("dragon", 1), ("humanoid", 2), ("ooze", 1)])
+        self.assertEqual([size for size, _ in counts["size"]], ["Small", "Medium", "Large"])
+
+    def test_out_of_date_index_is_rebuilt(self):
+        """Changes made without updating the index are picked up on the next sync"""
+        self.add_custom(1, "Bog Ooze", {"type": "ooze", "cr": "5", "size": "Large"}, "2024-02-01")
+        self.assertFalse(monster_index.index_is_current(self.connection))
+        monster_index.sync_monster_index(self.connection)
+        self.assertEqual(self.names(cr_min=5, include_standard=False), ["Bog Ooze"])
+        self.assertTrue(monster_index.index_is_current(self.connection))
+
+    def test_entries_are_updated_and_removed(self):
+        entry = monster_index.index_entry(2, True, "Mimic", "2", "monstrosity (shapechanger)", "Medium",
+                                          "neutral", "Custom", "2024-03-01")
+        monster_index.update_monster_entry(self.connection, entry)
+        self.assertEqual(self.names(types=["monstrosity"]), ["Mimic"])
+        monster_index.remove_monster_entry(self.connection, 2, is_custom=True)
+        self.assertEqual(self.names(types=["monstrosity"]), [])
+
+if __name__ == "__main__":
+    unittest.main()
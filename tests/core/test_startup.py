@@ -0,0 +1,100 @@
+"""
+Unit tests for startup profiling and deferred service creation.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from PySide6.QtWidgets import QApplication
+from app.core.startup import StartupProfiler
+from app.core.service_loader import ServiceLoader
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test cases for StartupProfiler"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        sys.path.insert(0, self.tmp_dir)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp_dir)
+        for name in ("startup_outer", "startup_inner"):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_phases_and_imports_are_timed(self):
+        Path(self.tmp_dir, "startup_inner.py").write_text("import time\ntime.sleep(0.05)\n")
+        Path(self.tmp_dir, "startup_outer.py").write_text("import startup_inner\n")
+        profiler = StartupProfiler()
+        with profiler.phase("Import"):
+            import startup_outer
+        profiler.mark("Done")
+        text = profiler.finish(Path(self.tmp_dir) / "profile.txt")
+
+        self.assertIs(startup_outer.__loader__, startup_outer.__spec__.loader)
+        self.assertNotIn(profiler.import_timer, sys.meta_path)
+        (name, duration), = [(name, duration) for name, _, duration in profiler.phases if name == "Import"]
+        self.assertGreaterEqual(duration, 0.05)
+        inner_own, inner_total = profiler.import_timer.times["startup_inner"]
+        outer_own, outer_total = profiler.import_timer.times["startup_outer"]
+        self.assertGreaterEqual(inner_own, 0.05)
+        self.assertLess(outer_own, 0.05)
+        self.assertGreaterEqual(outer_total, inner_total)
+        self.assertIn("startup_inner", text)
+        self.assertEqual(Path(self.tmp_dir, "profile.txt").read_text().strip(), text)
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = StartupProfiler(enabled=False)
+        with profiler.phase("Import"):
+            pass
+        profiler.mark("Done")
+        self.assertEqual(profiler.phases, [])
+        self.assertIsNone(profiler.import_timer)
+
+class TestDeferredServices(unittest.TestCase):
+    """Test cases for creating the LLM services after startup"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        with mock.patch.dict(os.environ, {"DM_SCREEN_DATA_DIR": self.tmp_dir}):
+            from app.core.app_state import AppState
+            self.app_state = AppState()
+
+    def tearDown(self):
+        self.app_state.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_services_are_created_on_first_use(self):
+        ready = []
+        self.assertFalse(self.app_state.services_ready)
+        self.app_state.call_when_services_ready(lambda: ready.append(True))
+        self.assertEqual(ready, [])
+        self.assertIs(self.app_state.combat_resolver.llm_service, self.app_state.llm_service)
+        self.assertEqual(ready, [True])
+        self.app_state.call_when_services_ready(lambda: ready.append(True))
+        self.assertEqual(ready, [True, True])
+
+    def test_service_loader(self):
+        """Modules are imported in the background and the services created on the UI thread"""
+        loader = ServiceLoader(self.app_state, modules=("app.core.llm_service", "no_such_module"))
+        ready = []
+        loader.services_ready.connect(lambda: ready.append(self.app_state.services_ready))
+        loader.start()
+        deadline = time.monotonic() + 30
+        while not ready and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(ready, [True])
+        self.assertIs(self.app_state.llm_service.thread(), self.app.thread())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for combat turn deltas.
+"""
+
+import json
+import unittest
+from dataclasses import FrozenInstanceError
+from app.combat.turn_delta import TurnDelta, TurnDeltaTracker
+
+def _state(goblin_hp=7, fighter_status="", dice=None):
+    return {
+        "round": 2,
+        "current_turn_index": 1,
+        "combatants": [
+            {"name": "Goblin", "instance_id": "g1", "hp": goblin_hp, "max_hp": 7, "status": "", "actions": [{"name": "Scimitar"}]},
+            {"name": "Fighter", "instance_id": "f1", "hp": 30, "max_hp": 30, "status": fighter_status,
+             "death_saves": {"successes": 0, "failures": 0}},
+        ],
+        "latest_action": {"actor": "Fighter", "action": "Longsword", "dice": dice or [{"expression": "1d8+3", "result": 7}]},
+    }
+
+class TestTurnDelta(unittest.TestCase):
+    """Test cases for TurnDeltaTracker"""
+
+    def test_only_changed_fields_are_sent(self):
+        """Unchanged combatants and untracked fields are left out"""
+        tracker = TurnDeltaTracker(_state()["combatants"])
+        delta = tracker.diff(_state(goblin_hp=0))
+        self.assertEqual((delta.round, delta.current_turn_index), (2, 1))
+        self.assertEqual(len(delta.combatants), 1)
+        self.assertEqual(delta.combatants[0].as_dict(), {"name": "Goblin", "instance_id": "g1", "hp": 0})
+
+    def test_deltas_are_relative_to_last_sent(self):
+        """A repeated state produces no combatant changes"""
+        tracker = TurnDeltaTracker()
+        self.assertEqual(len(tracker.diff(_state()).combatants), 2)
+        self.assertEqual(tracker.diff(_state()).combatants, ())
+        self.assertEqual(tracker.diff(_state(fighter_status="Prone")).combatants[0].changes, (("status", "Prone"),))
+
+    def test_delta_is_immutable_and_detached(self):
+        """Later changes to the resolver's state do not leak into a delta"""
+        state = _state()
+        delta = TurnDeltaTracker().diff(state)
+        state["latest_action"]["dice"][0]["result"] = 99
+        state["combatants"][1]["death_saves"]["failures"] = 3
+        self.assertEqual(delta.latest_action["dice"][0]["result"], 7)
+        self.assertEqual(dict(delta.combatants[1].changes)["death_saves"]["failures"], 0)
+        with self.assertRaises(TypeError):
+            delta.latest_action["actor"] = "Goblin"
+        with self.assertRaises(FrozenInstanceError):
+            delta.round = 3
+
+    def test_combatant_update_is_mutable_and_serializable(self):
+        """as_dict() hands plain dicts to the UI, which saves and edits them"""
+        update = TurnDeltaTracker().diff(_state()).combatants[1].as_dict()
+        self.assertEqual(json.loads(json.dumps(update))["death_saves"], {"successes": 0, "failures": 0})
+        update["death_saves"]["failures"] += 1
+
+    def test_delta_round_trips_through_json(self):
+        delta = TurnDeltaTracker().diff(_state())
+        restored = TurnDelta.from_dict(json.loads(json.dumps(delta.to_dict())))
+        self.assertTrue(restored.replayed)
+        self.assertEqual((restored.round, restored.combatants, restored.latest_action),
+                         (delta.round, delta.combatants, delta.latest_action))
+        with self.assertRaises(TypeError):
+            restored.latest_action["actor"] = "Goblin"
+
+if __name__ == "__main__":
+    unittest.main()
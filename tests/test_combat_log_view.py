@@ -0,0 +1,191 @@
+"""
+Unit tests for the virtualized combat log.
+"""
+
+import datetime
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from PySide6.QtWidgets import QApplication
+from app.combat.turn_delta import TurnDeltaTracker
+from app.data.combat_log_store import CombatLogStore
+from app.data.connection import ConnectionManager
+from app.ui.panels.combat_log_panel import SPILL_FILE_NAME, CombatLogPanel
+from app.ui.panels.combat_log_view import CombatLogModel, EntryRing, LogEntry
+
+def make_entry(i, category="Attack"):
+    return LogEntry(datetime.datetime(2024, 1, 1, 12, 0, i % 60), category, f"Goblin {i}", "Fighter",
+                    "attacked", f"Roll: {i}", 1, i)
+
+class TestEntryRing(unittest.TestCase):
+    """Test cases for EntryRing"""
+
+    def test_append_index_and_evict(self):
+        ring = EntryRing(4)
+        for i in range(4):
+            ring.append(i)
+        self.assertTrue(ring.full)
+        with self.assertRaises(IndexError):
+            ring.append(4)
+        self.assertEqual(ring.pop_oldest(3), [0, 1, 2])
+        for i in range(4, 7):
+            ring.append(i)
+        self.assertEqual(list(ring), [3, 4, 5, 6])
+        self.assertEqual((ring[0], ring[3]), (3, 6))
+        with self.assertRaises(IndexError):
+            ring[4]
+
+class TestCombatLogModel(unittest.TestCase):
+    """Test cases for CombatLogModel"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_entries_are_appended_as_rows(self):
+        """Appending inserts rows at the end without resetting the model"""
+        model = CombatLogModel(capacity=100)
+        resets, inserted = [], []
+        model.modelReset.connect(lambda: resets.append(True))
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.append(make_entry(0))
+        model.extend(make_entry(i) for i in range(1, 4))
+        self.assertEqual((resets, inserted), ([], [(0, 0), (1, 3)]))
+        self.assertEqual(model.index(3, 0).data(), str(model.entry(3)))
+
+    def test_evicted_entries_spill_to_disk(self):
+        spill_path = Path(self.tmp_dir) / "spill.jsonl"
+        model = CombatLogModel(capacity=200, spill_path=spill_path)
+        model.extend(make_entry(i) for i in range(450))
+        self.assertLessEqual(model.rowCount(), 200)
+        self.assertEqual(model.spilled_count + model.rowCount(), 450)
+        self.assertEqual([entry.actor for entry in model.iter_history()], [f"Goblin {i}" for i in range(450)])
+        model.clear()
+        self.assertFalse(spill_path.exists())
+        self.assertEqual(list(model.iter_history()), [])
+
+    def test_without_spill_file_oldest_entries_are_dropped(self):
+        model = CombatLogModel(capacity=10)
+        model.extend(make_entry(i) for i in range(25))
+        self.assertEqual(model.entries()[-1].actor, "Goblin 24")
+        self.assertEqual(len(list(model.iter_history())), model.rowCount())
+
+class TestCombatLogPanel(unittest.TestCase):
+    """Test cases for the combat log panel"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.panel = CombatLogPanel(SimpleNamespace(data_dir=Path(self.tmp_dir)))
+
+    def tearDown(self):
+        self.panel.deleteLater()
+        shutil.rmtree(self.tmp_dir)
+
+    def shown(self):
+        proxy = self.panel.proxy_model
+        return [proxy.index(row, 0).data() for row in range(proxy.rowCount())]
+
+    def test_filters(self):
+        self.panel.log_attack("Goblin", "Fighter", 15, hit=True, damage=4)
+        self.panel.log_healing("Cleric", "Fighter", 7)
+        self.panel.log_damage("Goblin", "Wizard", 3, "piercing")
+        self.panel.filter_combo.setCurrentText("Damage")
+        self.assertEqual(len(self.shown()), 1)
+        self.panel.filter_combo.setCurrentText("All")
+        self.panel.search_input.setText("FIGHTER")
+        self.panel.search_debouncer.flush()
+        self.assertEqual(len(self.shown()), 2)
+        self.panel.log_attack("Orc", "Fighter", 9, hit=False)
+        self.assertEqual(len(self.shown()), 3)
+        self.assertEqual(self.panel.log_model.spill_path, Path(self.tmp_dir) / SPILL_FILE_NAME)
+
+    def test_state_round_trip(self):
+        for i in range(5):
+            self.panel.add_log_entry("Other", f"DM {i}", "noted", round_num=2, turn_num=i)
+        self.panel.filter_combo.setCurrentText("Other")
+        state = self.panel.save_state()
+        restored = CombatLogPanel(SimpleNamespace(data_dir=Path(self.tmp_dir)))
+        restored.restore_state(state)
+        self.assertEqual([str(entry) for entry in restored.log_entries],
+                         [str(entry) for entry in self.panel.log_entries])
+        self.assertEqual(restored.filter_combo.currentText(), "Other")
+
+    def test_view_paints_visible_rows(self):
+        """Only the rows in view are painted"""
+        self.panel.resize(400, 300)
+        self.panel.show()
+        self.panel.log_model.extend(make_entry(i) for i in range(1000))
+        self.app.processEvents()
+        delegate = self.panel.log_display.itemDelegate()
+        painted = []
+        original_paint = delegate.paint
+        delegate.paint = lambda painter, option, index: (painted.append(index.row()),
+                                                         original_paint(painter, option, index))
+        self.panel.grab()
+        self.assertTrue(painted)
+        self.assertLess(len(painted), 100)
+        self.assertIn(999, painted)
+
+class TestStoredCombatLogPanel(unittest.TestCase):
+    """Test cases for the combat log panel backed by the persistent store"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.connections = ConnectionManager(Path(self.tmp_dir) / "test.db")
+        self.app_state = SimpleNamespace(data_dir=Path(self.tmp_dir),
+                                         combat_log_store=CombatLogStore(self.connections))
+
+    def tearDown(self):
+        self.app_state.combat_log_store.close()
+        self.connections.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_entries_are_persisted_and_restored(self):
+        panel = CombatLogPanel(self.app_state)
+        self.assertIsNone(panel.log_model.spill_path)
+        for i in range(3):
+            panel.log_damage("Goblin", "Fighter", i + 1, "slashing")
+        state = panel.save_state()
+        self.assertNotIn("log_entries", state)
+
+        # A new store, as after a restart
+        self.app_state.combat_log_store.close()
+        self.app_state.combat_log_store = CombatLogStore(self.connections)
+        restored = CombatLogPanel(self.app_state)
+        restored.restore_state(state)
+        self.assertEqual([str(entry) for entry in restored.log_entries], [str(entry) for entry in panel.log_entries])
+        restored.log_healing("Cleric", "Fighter", 5)
+        self.assertEqual(len(self.app_state.combat_log_store.entries(state["session_id"])), 4)
+
+    def test_unfinished_session_is_recovered(self):
+        """After a crash the panel reloads the session that was never ended"""
+        CombatLogPanel(self.app_state).log_attack("Orc", "Wizard", 17, hit=True)
+        store = self.app_state.combat_log_store
+        store.record_turn_delta(TurnDeltaTracker().diff({"round": 1, "current_turn_index": 0, "combatants": []}))
+        store.flush()
+        store._writer.queue.put(None)  # stop the writer without ending the session
+        store._writer.join()
+
+        self.app_state.combat_log_store = CombatLogStore(self.connections)
+        recovered = CombatLogPanel(self.app_state)
+        self.assertEqual([entry.actor for entry in recovered.log_entries], ["Orc"])
+        self.assertEqual(self.app_state.combat_log_store.active_session_id, store.active_session_id)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Unit tests for the combat tracker's combatant store.
+"""
+
+import unittest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+from app.ui.panels.combatant_store import CombatantStore, COLUMNS, INSTANCE_ID_ROLE
+
+class TestCombatantStore(unittest.TestCase):
+    """Test cases for the CombatantStore class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up a table with a few combatants"""
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.store = CombatantStore(self.table)
+        for name, instance_id, hp in [("Goblin", "g1", 7), ("Goblin", "g2", 5), ("Fighter", None, 30)]:
+            self._add_row(name, instance_id, hp)
+        self.changed = []
+        self.table.model().dataChanged.connect(lambda tl, br, roles=None: self.changed.append((tl.row(), tl.column())))
+
+    def _add_row(self, name, instance_id, hp):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        name_item = QTableWidgetItem(name)
+        if instance_id:
+            name_item.setData(INSTANCE_ID_ROLE, instance_id)
+        self.table.setItem(row, 0, name_item)
+        for col, text in enumerate(["12", str(hp), str(hp), "15", ""], start=1):
+            self.table.setItem(row, col, QTableWidgetItem(text))
+        conc_item = QTableWidgetItem()
+        conc_item.setCheckState(Qt.Unchecked)
+        self.table.setItem(row, 6, conc_item)
+        self.table.setItem(row, 7, QTableWidgetItem("monster"))
+
+    def test_typed_records(self):
+        """Rows are parsed into typed values and missing IDs are generated"""
+        record = self.store.record(0)
+        self.assertEqual((record["name"], record["hp"], record["ac"], record["instance_id"]), ("Goblin", 7, 15, "g1"))
+        generated = self.store.record(2)["instance_id"]
+        self.assertTrue(generated)
+        self.assertEqual(self.table.item(2, 0).data(INSTANCE_ID_ROLE), generated)
+
+    def test_lookup_by_instance_id(self):
+        """Duplicate names are told apart by instance ID"""
+        self.assertEqual(self.store.row_of("g2", "Goblin"), 1)
+        self.assertEqual(self.store.row_of("unknown", "Fighter"), 2)
+        self.assertEqual(self.store.row_of("missing"), -1)
+
+    def test_only_changed_cells_are_written(self):
+        """set_value skips unchanged values and touches a single cell otherwise"""
+        self.assertFalse(self.store.set_value(1, "hp", 5))
+        self.assertEqual(self.changed, [])
+        self.assertTrue(self.store.set_value(1, "hp", 2))
+        self.assertEqual(self.changed, [(1, 2)])
+        self.assertEqual(self.table.item(1, 2).text(), "2")
+        self.assertEqual(self.store.record(1)["hp"], 2)
+
+    def test_external_edits_and_moves_are_seen(self):
+        """Edits made directly on items and row changes refresh the store"""
+        self.store.records()
+        self.table.item(0, 2).setText("3")
+        self.assertEqual(self.store.record(0)["hp"], 3)
+        self.table.removeRow(0)
+        self.assertEqual(self.store.row_of("g2"), 0)
+        self.assertEqual(self.store.record(0)["instance_id"], "g2")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Unit tests for the dice roller's probability display.
+"""
+
+import time
+import unittest
+from types import SimpleNamespace
+from PySide6.QtWidgets import QApplication
+from app.ui.panels.dice_roller_panel import DiceRollerPanel
+
+class TestDiceProbability(unittest.TestCase):
+    """Test cases for the debounced, threaded probability display"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.panel = DiceRollerPanel(SimpleNamespace(save_panel_setting=lambda *args: None))
+
+    def tearDown(self):
+        self.panel.deleteLater()
+
+    def wait_for_result(self):
+        deadline = time.monotonic() + 5
+        while "Calculating" in self.panel.probability_label.text() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        return self.panel.probability_label.text()
+
+    def test_odds_are_computed_after_typing_pauses(self):
+        self.panel.roll_input.setText("2d")
+        self.panel.roll_input.setText("2d6")
+        self.assertTrue(self.panel.probability_debouncer.timer.isActive())
+        self.panel.probability_debouncer.flush()
+        self.assertIn("Calculating", self.panel.probability_label.text())
+        self.assertIn("to roll 10 or more", self.wait_for_result())
+        self.panel.probability_target.setValue(12)
+        self.assertIn("2.8%", self.panel.probability_label.text())
+
+    def test_stale_and_expensive_expressions(self):
+        """A result for an older expression is dropped; huge keep terms report an error"""
+        self.panel.roll_input.setText("100d20kh50")
+        self.panel.probability_debouncer.flush()
+        self.panel.roll_input.setText("1d4")
+        self.panel.probability_debouncer.flush()
+        self.assertIn("range 1–4", self.wait_for_result())
+        self.panel.roll_input.setText("100d20kh50")
+        self.panel.probability_debouncer.flush()
+        self.assertIn("too many dice", self.wait_for_result())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Unit tests for lazily built dock panels.
+"""
+
+import unittest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget
+from app.ui.components.lazy_dock import LazyDockWidget
+
+class StatefulPanel(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.state = None
+
+    def restore_state(self, state):
+        self.state = state
+
+class TestLazyDockWidget(unittest.TestCase):
+    """Test cases for LazyDockWidget"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.window = QMainWindow()
+        self.built = []
+        self.loaded = []
+
+    def tearDown(self):
+        self.window.close()
+
+    def make_dock(self, factory=None):
+        def build():
+            self.built.append(True)
+            return StatefulPanel()
+        dock = LazyDockWidget("Monsters", factory or build, self.window)
+        dock.panel_loaded.connect(self.loaded.append)
+        self.window.addDockWidget(Qt.LeftDockWidgetArea, dock)
+        dock.hide()
+        return dock
+
+    def test_panel_is_built_when_first_shown(self):
+        dock = self.make_dock()
+        self.window.show()
+        self.app.processEvents()
+        self.assertEqual((self.built, dock.is_loaded, dock.panel), ([], False, None))
+        dock.pending_state = {"filter": "goblin"}
+        dock.show()
+        self.app.processEvents()
+        self.assertTrue(dock.is_loaded)
+        self.assertIs(dock.widget(), dock.panel)
+        self.assertEqual(dock.panel.state, {"filter": "goblin"})
+        self.assertEqual(self.loaded, [dock.panel])
+        dock.hide()
+        dock.show()
+        self.assertEqual(len(self.built), 1)
+
+    def test_widget_builds_hidden_panel(self):
+        """Code asking for a hidden dock's widget gets the real panel"""
+        dock = self.make_dock()
+        self.assertIsInstance(dock.widget(), StatefulPanel)
+        self.assertTrue(dock.is_loaded)
+
+    def test_failed_panel_keeps_placeholder(self):
+        errors = []
+        dock = self.make_dock(factory=lambda: 1 / 0)
+        dock.panel_failed.connect(errors.append)
+        self.assertIsNone(dock.load())
+        self.assertIsNone(dock.load())
+        self.assertEqual(len(errors), 1)
+        self.assertIs(dock.widget(), dock.placeholder)
+        self.assertIn("Failed to load panel", dock.placeholder.text())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Unit tests for the shared search-as-you-type filter component.
+"""
+
+import unittest
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QApplication, QLineEdit, QListView
+from app.ui.components.search_filter import (
+    FILTER_ROLE, SEARCH_KEY_ROLE, SearchDebouncer, SearchFilterProxyModel, keep_current_row, search_key
+)
+
+class TestSearchFilterProxyModel(unittest.TestCase):
+    """Test cases for SearchFilterProxyModel"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Build a small monster list model"""
+        self.model = QStandardItemModel()
+        for name, cr in [("Goblin", "1/4"), ("Goblin Boss", "1"), ("Orc", "1/2"), ("Ogre", "2")]:
+            item = QStandardItem(name)
+            item.setData(search_key(name), SEARCH_KEY_ROLE)
+            item.setData(cr, FILTER_ROLE)
+            self.model.appendRow(item)
+        self.proxy = SearchFilterProxyModel()
+        self.proxy.setSourceModel(self.model)
+
+    def names(self):
+        return [self.proxy.index(row, 0).data() for row in range(self.proxy.rowCount())]
+
+    def test_search_text_is_case_insensitive(self):
+        self.proxy.set_search_text("  GOB ")
+        self.assertEqual(self.names(), ["Goblin", "Goblin Boss"])
+        self.proxy.set_search_text("")
+        self.assertEqual(len(self.names()), 4)
+
+    def test_field_filters_combine_with_search(self):
+        self.proxy.set_field_filter(FILTER_ROLE, "1/4")
+        self.assertEqual(self.names(), ["Goblin"])
+        self.proxy.set_field_filter(FILTER_ROLE, "1", lambda cr, wanted: cr.startswith(wanted))
+        self.proxy.set_search_text("o")
+        self.assertEqual(self.names(), ["Goblin", "Goblin Boss", "Orc"])
+        self.proxy.set_field_filter(FILTER_ROLE, None)
+        self.assertEqual(len(self.names()), 4)
+
+    def test_filtering_keeps_source_items(self):
+        """Filtering never recreates the model's items"""
+        first = self.model.item(0)
+        self.proxy.set_search_text("orc")
+        self.proxy.set_search_text("")
+        self.assertIs(self.model.item(0), first)
+
+    def test_tree_parents_shown_for_matching_children(self):
+        category = QStandardItem("Combat")
+        category.setData(search_key("Combat"), SEARCH_KEY_ROLE)
+        rule = QStandardItem("Opportunity Attacks")
+        rule.setData(search_key("Combat", "Opportunity Attacks"), SEARCH_KEY_ROLE)
+        category.appendRow(rule)
+        self.model.appendRow(category)
+        self.proxy.set_search_text("opportunity")
+        self.assertEqual(self.names(), ["Combat"])
+        self.assertEqual(self.proxy.rowCount(self.proxy.index(0, 0)), 1)
+
+    def test_current_row_is_kept_or_cleared(self):
+        """A filtered-out current row is cleared rather than moved to a neighbour"""
+        view = QListView()
+        view.setModel(self.proxy)
+        changes = []
+        view.selectionModel().currentChanged.connect(lambda current, previous: changes.append(current.data()))
+        view.setCurrentIndex(self.proxy.index(2, 0))
+        with keep_current_row(view):
+            self.proxy.set_search_text("o")
+        self.assertEqual(view.currentIndex().data(), "Orc")
+        with keep_current_row(view):
+            self.proxy.set_search_text("gob")
+        self.assertFalse(view.currentIndex().isValid())
+        self.assertEqual(changes, ["Orc"])
+
+class TestSearchDebouncer(unittest.TestCase):
+    """Test cases for SearchDebouncer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _wait(self, ms):
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+
+    def test_keystrokes_are_coalesced(self):
+        line_edit = QLineEdit()
+        searches = []
+        SearchDebouncer(line_edit, searches.append, delay_ms=20)
+        for text in ["g", "go", "gob"]:
+            line_edit.setText(text)
+        self.assertEqual(searches, [])
+        self._wait(100)
+        self.assertEqual(searches, ["gob"])
+
+    def test_flush_applies_immediately(self):
+        line_edit = QLineEdit()
+        searches = []
+        debouncer = SearchDebouncer(line_edit, searches.append, delay_ms=1000)
+        line_edit.setText("orc")
+        debouncer.flush()
+        self.assertEqual(searches, ["orc"])
+        self.assertFalse(debouncer.timer.isActive())
+
+if __name__ == "__main__":
+    unittest.main()
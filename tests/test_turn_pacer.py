@@ -0,0 +1,69 @@
+"""
+Unit tests for paced playback of combat turn updates.
+"""
+
+import unittest
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication
+from app.ui.panels.combat_turn_pacer import TurnPacer
+
+class TestTurnPacer(unittest.TestCase):
+    """Test cases for the TurnPacer class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up test data"""
+        self.released = []
+
+    def _pacer(self, interval_ms):
+        pacer = TurnPacer(interval_ms)
+        pacer.frame_ready.connect(self.released.append)
+        return pacer
+
+    def _wait(self, ms):
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+
+    def test_max_speed_releases_immediately(self):
+        """With a zero interval every update is released as it arrives"""
+        pacer = self._pacer(0)
+        for i in range(3):
+            pacer.enqueue(str(i))
+        self.assertEqual(self.released, ["0", "1", "2"])
+        self.assertEqual(pacer.pending(), 0)
+
+    def test_updates_are_released_at_interval(self):
+        """The first update is immediate; later ones wait for the timer"""
+        pacer = self._pacer(20)
+        for i in range(3):
+            pacer.enqueue(str(i))
+        self.assertEqual(self.released, ["0"])
+        self.assertEqual(pacer.pending(), 2)
+        self._wait(150)
+        self.assertEqual(self.released, ["0", "1", "2"])
+
+    def test_run_when_drained_waits_for_queue(self):
+        """Callbacks run only after the last queued update is released"""
+        pacer = self._pacer(20)
+        done = []
+        pacer.enqueue("0")
+        pacer.enqueue("1")
+        pacer.run_when_drained(lambda: done.append(list(self.released)))
+        self.assertEqual(done, [])
+        self._wait(100)
+        self.assertEqual(done, [["0", "1"]])
+
+    def test_switching_to_max_speed_flushes_queue(self):
+        """Selecting max speed releases everything still queued"""
+        pacer = self._pacer(1000)
+        for i in range(3):
+            pacer.enqueue(str(i))
+        pacer.set_interval(0)
+        self.assertEqual(self.released, ["0", "1", "2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the LLM request layer
+
+Measures the per-call overhead the generate_completion patch adds and the
+throughput of parallel callers, without touching the network. A fake
+provider stands in for the API (optionally sleeping to simulate latency).
+
+The "legacy" wrapper reproduces the previous patch for comparison:
+gc.collect() before and after every call, a deepcopy of the message
+history, and a process-wide lock around every OpenAI request, all under
+the aggressive gc.set_threshold(100, 5, 2) the app used to install.
+
+Usage:
+    python tools/llm_request_benchmark.py [--calls 200] [--history 40] [--heap 200000]
+                                          [--latency 0.05] [--threads 8]
+"""
+
+import argparse
+import copy
+import gc
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+parent_dir = Path(__file__).parent.parent
+sys.path.append(str(parent_dir))
+
+from app.core.llm_service import ModelInfo
+from app.core.llm_service_patch import patch_generate_completion
+
+MODEL = ModelInfo.OPENAI_GPT4O_MINI
+
+
+class FakeLLMService:
+    """Stands in for LLMService; optionally sleeps to simulate API latency"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def generate_completion(self, model, messages, system_prompt=None, temperature=0.7, max_tokens=1000):
+        if self.latency:
+            time.sleep(self.latency)
+        return f"{len(messages)} messages"
+
+
+def legacy_patch(service):
+    """The previous generate_completion patch, kept here only for comparison"""
+    original = service.generate_completion
+    api_lock = threading.RLock()
+
+    def patched(model, messages, system_prompt=None, temperature=0.7, max_tokens=1000):
+        gc.collect()
+        safe_messages = copy.deepcopy(messages)
+        with api_lock:
+            result = original(copy.deepcopy(model), safe_messages, system_prompt, temperature, max_tokens)
+        gc.collect()
+        return result
+
+    service.generate_completion = patched
+    return service
+
+
+def build_history(length):
+    """A combat-sized message history"""
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant",
+         "content": f"Turn {i}: " + "The goblin swings its scimitar at the fighter. " * 40}
+        for i in range(length)
+    ]
+
+
+def time_calls(service, messages, calls):
+    """Per-call latencies in milliseconds"""
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        service.generate_completion(MODEL, messages)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def time_parallel(service, messages, calls, threads):
+    """Wall time in seconds for calls spread over a thread pool"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: service.generate_completion(MODEL, messages), range(calls)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200, help="calls per measurement")
+    parser.add_argument("--history", type=int, default=40, help="messages in the history")
+    parser.add_argument("--heap", type=int, default=200000, help="live objects kept on the heap (app state stand-in)")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated API latency for the parallel run (s)")
+    parser.add_argument("--threads", type=int, default=8, help="parallel callers")
+    args = parser.parse_args()
+
+    # Keep a realistic amount of live objects around so full collections cost something
+    heap = [{"id": i, "tags": [i, str(i)]} for i in range(args.heap)]
+    gc.set_threshold(100, 5, 2)
+    messages = build_history(args.history)
+
+    print(f"Per-call overhead ({args.calls} calls, {args.history} messages, {len(heap)} live objects):")
+    for label, service in [("legacy", legacy_patch(FakeLLMService())),
+                           ("request layer", patch_generate_completion(FakeLLMService()))]:
+        samples = time_calls(service, messages, args.calls)
+        print(f"  {label:<14} mean {statistics.mean(samples):8.3f} ms   "
+              f"median {statistics.median(samples):8.3f} ms   max {max(samples):8.3f} ms")
+
+    calls = args.threads * 4
+    print(f"\nParallel throughput ({calls} calls, {args.threads} threads, {args.latency * 1000:.0f} ms simulated latency):")
+    for label, service in [("legacy", legacy_patch(FakeLLMService(args.latency))),
+                           ("request layer", patch_generate_completion(FakeLLMService(args.latency)))]:
+        elapsed = time_parallel(service, messages, calls, args.threads)
+        print(f"  {label:<14} {elapsed:6.2f} s   ({calls / elapsed:5.1f} calls/s)")
+
+
+if __name__ == "__main__":
+    main()